@@ -104,6 +104,14 @@ class Settings(BaseSettings):
     DB_ASYNC_POOL_TIMEOUT: int = int(os.getenv("DB_ASYNC_POOL_TIMEOUT", "30"))
     DB_ASYNC_POOL_RECYCLE: int = int(os.getenv("DB_ASYNC_POOL_RECYCLE", "1800"))
 
+    # Menu Store Settings
+    MENU_STORE_BULK_ENABLED: bool = os.getenv("MENU_STORE_BULK_ENABLED", "true").lower() == "true"
+    MENU_STORE_BATCH_SIZE: int = int(os.getenv("MENU_STORE_BATCH_SIZE", "500"))
+
+    # Menu Change Events (pg_notify after each sync / stock update)
+    MENU_CHANGES_ENABLED: bool = os.getenv("MENU_CHANGES_ENABLED", "true").lower() == "true"
+    MENU_CHANGES_CHANNEL: str = os.getenv("MENU_CHANGES_CHANNEL", "menu_changes")
+
     # API Client Settings
     HTTP_TIMEOUT: int = int(os.getenv("HTTP_TIMEOUT", "30"))
     HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
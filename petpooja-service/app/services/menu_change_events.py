@@ -0,0 +1,129 @@
+"""
+Menu Change Events
+Compact change sets published after a menu sync or stock update, so consumers
+(the chatbot's menu caches and vector index) apply only the delta instead of
+reloading the whole menu.
+
+Published with pg_notify on MENU_CHANGES_CHANNEL inside the writer's
+transaction: listeners receive it on commit, and never for a rolled back sync.
+
+Payload (JSON):
+    {
+        "change_id": "<hex>",
+        "source": "sync" | "stock",
+        "restaurant_id": "<restaurant uuid>",
+        "menusharingcode": "<code>",
+        "items": {"added": [...], "updated": [...], "removed": [...]},
+        "stock": {"in": [...], "out": [...]},
+        "categories_changed": false,
+        "full": false,
+        "counts": {...}
+    }
+
+Item ids are menu_item_id UUIDs. "stock" lists items whose availability
+flipped (a stock-only sync lists them only there). "full" asks consumers to
+reload the restaurant's menu: set when the change cannot be described item by
+item, or when the id lists do not fit in one notification.
+"""
+
+import json
+import logging
+import uuid
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD_BYTES = 7900
+
+
+def new_change_set(
+    restaurant_id: uuid.UUID,
+    menusharingcode: Optional[str],
+    source: str = "sync",
+    full: bool = False
+) -> Dict[str, Any]:
+    """Empty change set for one restaurant."""
+    return {
+        "change_id": uuid.uuid4().hex,
+        "source": source,
+        "restaurant_id": str(restaurant_id),
+        "menusharingcode": menusharingcode,
+        "items": {"added": [], "updated": [], "removed": []},
+        "stock": {"in": [], "out": []},
+        "categories_changed": False,
+        "full": full,
+        "counts": {},
+    }
+
+
+def add_ids(target: list, ids: Iterable[uuid.UUID]) -> None:
+    target.extend(str(i) for i in ids)
+
+
+def is_empty(change_set: Dict[str, Any]) -> bool:
+    """True when there is nothing for consumers to apply."""
+    return not (
+        change_set["full"]
+        or change_set["categories_changed"]
+        or any(change_set["items"].values())
+        or any(change_set["stock"].values())
+    )
+
+
+def summarize(change_set: Dict[str, Any]) -> Dict[str, Any]:
+    """Sizes of a change set, for logs and API results."""
+    return {
+        "added": len(change_set["items"]["added"]),
+        "updated": len(change_set["items"]["updated"]),
+        "removed": len(change_set["items"]["removed"]),
+        "stock_in": len(change_set["stock"]["in"]),
+        "stock_out": len(change_set["stock"]["out"]),
+        "categories_changed": change_set["categories_changed"],
+        "full": change_set["full"],
+    }
+
+
+def encode_change_set(change_set: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    JSON payload; id lists are dropped for a full reload when they do not fit.
+
+    Returns:
+        (payload, whether it asks for a full reload)
+    """
+    payload = json.dumps(change_set, separators=(",", ":"))
+    if len(payload.encode("utf-8")) <= _MAX_PAYLOAD_BYTES:
+        return payload, change_set["full"]
+
+    full = dict(change_set)
+    full["items"] = {"added": [], "updated": [], "removed": []}
+    full["stock"] = {"in": [], "out": []}
+    full["full"] = True
+    return json.dumps(full, separators=(",", ":")), True
+
+
+async def publish_menu_changes(db: AsyncSession, change_set: Dict[str, Any]) -> bool:
+    """
+    Queue the change set on MENU_CHANGES_CHANNEL (delivered when db commits).
+
+    A change set too large for one notification goes out as a full reload
+    (change_set["full"] is set accordingly).
+
+    Returns:
+        True if a notification was queued
+    """
+    if not settings.MENU_CHANGES_ENABLED or is_empty(change_set):
+        return False
+
+    payload, change_set["full"] = encode_change_set(change_set)
+    await db.execute(select(func.pg_notify(settings.MENU_CHANGES_CHANNEL, payload)))
+    logger.info(
+        f"Menu changes queued for restaurant {change_set['restaurant_id']} "
+        f"({change_set['source']}, {len(payload)} bytes): {summarize(change_set)}"
+    )
+    return True
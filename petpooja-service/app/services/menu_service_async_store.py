@@ -3,12 +3,17 @@ Menu Store Service - ASYNC VERSION
 Async functions for storing menu data with non-blocking database operations
 """
 
+import hashlib
 import logging
 import uuid
-from typing import Dict, Any
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
 
 from app.models.branch_models import BranchInfoTable, BranchLocationTable, BranchContactTable
 from app.models.chain_models import ChainInfoTable
@@ -19,6 +24,7 @@ from app.models.menu_models import (
 )
 from app.models.other_models import VariationGroups, Taxes, Discount, RestaurantTable
 from app.models.order_models import OrderTypeTable
+from app.services.menu_change_events import new_change_set, add_ids, publish_menu_changes, summarize
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +60,156 @@ def convert_status(value: str, default: str = "1") -> str:
     return "active" if str(value) == "1" else "inactive"
 
 
+def _new_counts() -> Dict[str, int]:
+    return {
+        "restaurants": 0, "ordertypes": 0, "group_categories": 0, "parent_categories": 0,
+        "categories": 0, "items": 0, "variations": 0, "addon_groups": 0, "addon_items": 0,
+        "attributes": 0, "taxes": 0, "discounts": 0, "updated": 0, "created": 0, "deleted": 0,
+        "unchanged": 0, "touched": 0
+    }
+
+
+def _get_menusharingcode(menu_data: Dict[str, Any], restaurant_id: str) -> str:
+    # restaurant_id parameter contains the menusharingcode
+    menusharingcode = restaurant_id
+
+    # Fallback: try to get from API response if not provided
+    if not menusharingcode:
+        if menu_data.get("restaurants") and len(menu_data["restaurants"]) > 0:
+            details = menu_data["restaurants"][0].get("details", {})
+            menusharingcode = details.get("menusharingcode")
+
+    if not menusharingcode:
+        raise MenuServiceError("Menu sharing code not found")
+    return menusharingcode
+
+
+async def _resolve_restaurant_async(
+    menu_data: Dict[str, Any],
+    menusharingcode: str,
+    db: AsyncSession,
+    counts: Dict[str, int]
+) -> uuid.UUID:
+    """
+    Find the restaurant_table row for a menusharingcode, creating the chain,
+    branch, restaurant, location and contact on first sync.
+    """
+    branch_id = None
+    db_restaurant_id = None
+
+    # Find existing branch - ASYNC
+    result = await db.execute(
+        select(BranchInfoTable).where(
+            BranchInfoTable.ext_petpooja_restaurant_id == menusharingcode
+        )
+    )
+    branch = result.scalar_one_or_none()
+
+    if branch:
+        branch_id = branch.branch_id
+        # Find restaurant - ASYNC
+        result = await db.execute(
+            select(RestaurantTable).where(RestaurantTable.branch_id == branch_id)
+        )
+        restaurant = result.scalar_one_or_none()
+
+        if restaurant:
+            db_restaurant_id = restaurant.restaurant_id
+        else:
+            # Create restaurant if doesn't exist
+            db_restaurant_id = uuid.uuid4()
+            restaurant = RestaurantTable(
+                restaurant_id=db_restaurant_id,
+                chain_id=branch.chain_id,
+                branch_id=branch_id,
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            )
+            db.add(restaurant)
+            await db.flush()
+    else:
+        # Create new chain, branch, and restaurant
+        restaurant_info = menu_data["restaurants"][0]
+        details = restaurant_info.get("details", {})
+        restaurant_name = details.get("restaurantname", f"Restaurant {menusharingcode}")
+
+        # Check if chain exists - ASYNC
+        result = await db.execute(
+            select(ChainInfoTable).where(ChainInfoTable.chain_name == restaurant_name)
+        )
+        existing_chain = result.scalar_one_or_none()
+
+        if existing_chain:
+            chain_id = existing_chain.chain_id
+        else:
+            chain_id = uuid.uuid4()
+            chain = ChainInfoTable(
+                chain_id=chain_id,
+                chain_name=restaurant_name,
+                chain_type="restaurant",
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            )
+            db.add(chain)
+            await db.flush()
+
+        # Create branch
+        branch_id = uuid.uuid4()
+        branch = BranchInfoTable(
+            branch_id=branch_id,
+            chain_id=chain_id,
+            branch_name=restaurant_name,
+            ext_petpooja_restaurant_id=menusharingcode,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
+        )
+        db.add(branch)
+        await db.flush()
+
+        # Create restaurant
+        db_restaurant_id = uuid.uuid4()
+        restaurant = RestaurantTable(
+            restaurant_id=db_restaurant_id,
+            chain_id=chain_id,
+            branch_id=branch_id,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
+        )
+        db.add(restaurant)
+        await db.flush()
+
+        # Create location if available
+        if details.get("address") or details.get("latitude") or details.get("longitude"):
+            location = BranchLocationTable(
+                branch_location_id=uuid.uuid4(),
+                branch_id=branch_id,
+                address_line=details.get("address", ""),
+                landmark=details.get("landmark", ""),
+                latitude=str(details.get("latitude", "")) if details.get("latitude") else None,
+                longitude=str(details.get("longitude", "")) if details.get("longitude") else None,
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            )
+            db.add(location)
+
+        # Create contact if available
+        if details.get("contact"):
+            contact = BranchContactTable(
+                branch_contact_id=uuid.uuid4(),
+                branch_id=branch_id,
+                contact_type="phone",
+                contact_value=details.get("contact"),
+                is_primary=True,
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            )
+            db.add(contact)
+
+        counts["restaurants"] = 1
+
+    return db_restaurant_id
+
+
 async def store_menu_async(
     menu_data: Dict[str, Any],
     restaurant_id: str,
@@ -63,6 +219,32 @@ async def store_menu_async(
     """
     Store menu data with create or update logic to prevent duplicates (ASYNC).
 
+    Uses the set-based bulk path (store_menu_bulk_async) unless
+    MENU_STORE_BULK_ENABLED=false, which falls back to the row-by-row path.
+
+    Args:
+        menu_data: Menu data from PetPooja API
+        restaurant_id: Restaurant ID (menusharingcode)
+        db: Async database session
+        internal_restaurant_id: Optional internal restaurant UUID
+
+    Returns:
+        Dict with success status and counts
+    """
+    if settings.MENU_STORE_BULK_ENABLED:
+        return await store_menu_bulk_async(menu_data, restaurant_id, db, internal_restaurant_id)
+    return await store_menu_rowwise_async(menu_data, restaurant_id, db, internal_restaurant_id)
+
+
+async def store_menu_rowwise_async(
+    menu_data: Dict[str, Any],
+    restaurant_id: str,
+    db: AsyncSession,
+    internal_restaurant_id: uuid.UUID = None
+) -> Dict[str, Any]:
+    """
+    Store menu data row by row: one SELECT (and INSERT/UPDATE) per entity (ASYNC).
+
     Args:
         menu_data: Menu data from PetPooja API
         restaurant_id: Restaurant ID (menusharingcode)
@@ -79,11 +261,7 @@ async def store_menu_async(
         logger.info(f"Number of items in API response: {len(menu_data.get('items', []))}")
         logger.info(f"Number of categories: {len(menu_data.get('categories', []))}")
 
-        counts = {
-            "restaurants": 0, "ordertypes": 0, "group_categories": 0, "parent_categories": 0,
-            "categories": 0, "items": 0, "variations": 0, "addon_groups": 0, "addon_items": 0,
-            "attributes": 0, "taxes": 0, "discounts": 0, "updated": 0, "created": 0, "deleted": 0
-        }
+        counts = _new_counts()
 
         # Track processed IDs for soft delete
         processed_ids = {
@@ -92,130 +270,9 @@ async def store_menu_async(
             "variations": [], "discounts": []
         }
 
-        # restaurant_id parameter contains the menusharingcode
-        menusharingcode = restaurant_id
-
-        # Fallback: try to get from API response if not provided
-        if not menusharingcode:
-            if menu_data.get("restaurants") and len(menu_data["restaurants"]) > 0:
-                details = menu_data["restaurants"][0].get("details", {})
-                menusharingcode = details.get("menusharingcode")
-
-        if not menusharingcode:
-            raise MenuServiceError("Menu sharing code not found")
-
-        branch_id = None
-        db_restaurant_id = None
-
-        # Find existing branch - ASYNC
-        result = await db.execute(
-            select(BranchInfoTable).where(
-                BranchInfoTable.ext_petpooja_restaurant_id == menusharingcode
-            )
-        )
-        branch = result.scalar_one_or_none()
-
-        if branch:
-            branch_id = branch.branch_id
-            # Find restaurant - ASYNC
-            result = await db.execute(
-                select(RestaurantTable).where(RestaurantTable.branch_id == branch_id)
-            )
-            restaurant = result.scalar_one_or_none()
-
-            if restaurant:
-                db_restaurant_id = restaurant.restaurant_id
-            else:
-                # Create restaurant if doesn't exist
-                db_restaurant_id = uuid.uuid4()
-                restaurant = RestaurantTable(
-                    restaurant_id=db_restaurant_id,
-                    chain_id=branch.chain_id,
-                    branch_id=branch_id,
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc)
-                )
-                db.add(restaurant)
-                await db.flush()
-        else:
-            # Create new chain, branch, and restaurant
-            restaurant_info = menu_data["restaurants"][0]
-            details = restaurant_info.get("details", {})
-            restaurant_name = details.get("restaurantname", f"Restaurant {restaurant_id}")
-
-            # Check if chain exists - ASYNC
-            result = await db.execute(
-                select(ChainInfoTable).where(ChainInfoTable.chain_name == restaurant_name)
-            )
-            existing_chain = result.scalar_one_or_none()
-
-            if existing_chain:
-                chain_id = existing_chain.chain_id
-            else:
-                chain_id = uuid.uuid4()
-                chain = ChainInfoTable(
-                    chain_id=chain_id,
-                    chain_name=restaurant_name,
-                    chain_type="restaurant",
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc)
-                )
-                db.add(chain)
-                await db.flush()
-
-            # Create branch
-            branch_id = uuid.uuid4()
-            branch = BranchInfoTable(
-                branch_id=branch_id,
-                chain_id=chain_id,
-                branch_name=restaurant_name,
-                ext_petpooja_restaurant_id=menusharingcode,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
-            )
-            db.add(branch)
-            await db.flush()
-
-            # Create restaurant
-            db_restaurant_id = uuid.uuid4()
-            restaurant = RestaurantTable(
-                restaurant_id=db_restaurant_id,
-                chain_id=chain_id,
-                branch_id=branch_id,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
-            )
-            db.add(restaurant)
-            await db.flush()
-
-            # Create location if available
-            if details.get("address") or details.get("latitude") or details.get("longitude"):
-                location = BranchLocationTable(
-                    branch_location_id=uuid.uuid4(),
-                    branch_id=branch_id,
-                    address_line=details.get("address", ""),
-                    landmark=details.get("landmark", ""),
-                    latitude=str(details.get("latitude", "")) if details.get("latitude") else None,
-                    longitude=str(details.get("longitude", "")) if details.get("longitude") else None,
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc)
-                )
-                db.add(location)
-
-            # Create contact if available
-            if details.get("contact"):
-                contact = BranchContactTable(
-                    branch_contact_id=uuid.uuid4(),
-                    branch_id=branch_id,
-                    contact_type="phone",
-                    contact_value=details.get("contact"),
-                    is_primary=True,
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc)
-                )
-                db.add(contact)
+        menusharingcode = _get_menusharingcode(menu_data, restaurant_id)
 
-            counts["restaurants"] = 1
+        db_restaurant_id = await _resolve_restaurant_async(menu_data, menusharingcode, db, counts)
 
         if db_restaurant_id is None:
             raise MenuServiceError("Cannot store menu data: restaurant_table entry not found")
@@ -826,8 +883,723 @@ async def store_menu_async(
             )
 
         await db.flush()
+
+        # Every row was rewritten: consumers reload the restaurant's menu
+        await publish_menu_changes(db, new_change_set(db_restaurant_id, menusharingcode, full=True))
         return {"success": True, "message": "Menu stored successfully", "counts": counts}
 
     except Exception as e:
         logger.error(f"Error storing menu: {str(e)}")
         raise MenuServiceError(f"Failed to store menu: {str(e)}")
+
+
+# ============================================================================
+# BULK (SET-BASED) STORE
+# ============================================================================
+
+async def _fetch_existing(
+    db: AsyncSession, key_column, *criteria
+) -> Tuple[Dict[Any, uuid.UUID], Dict[uuid.UUID, Dict[str, Any]]]:
+    """
+    Existing rows of key_column's table.
+
+    Returns:
+        (key -> primary key, the oldest row winning if a key is duplicated;
+         primary key -> stored row)
+    """
+    table = key_column.table
+    pk_column = list(table.primary_key.columns)[0]
+    result = await db.execute(select(table).where(*criteria).order_by(table.c.created_at))
+    id_map = {}
+    existing = {}
+    for row in result.mappings().all():
+        pk = row[pk_column.name]
+        existing[pk] = dict(row)
+        id_map.setdefault(row[key_column.name], pk)
+    return id_map, existing
+
+
+def _resolve_id(id_map: Dict[Any, uuid.UUID], key) -> uuid.UUID:
+    """Primary key for key: the existing row's, or a new one registered in id_map."""
+    pk = id_map.get(key)
+    if pk is None:
+        pk = id_map[key] = uuid.uuid4()
+    return pk
+
+
+def _normalize(value) -> str:
+    """Value as compared across payload and database (numerics at the columns' 2 decimals)."""
+    if value is None:
+        return "\x00"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (float, Decimal)):
+        return str(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+    return str(value)
+
+
+def _content_hash(row: Dict[str, Any], columns: Iterable[str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        digest.update(_normalize(row.get(column)).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+async def _bulk_upsert(
+    db: AsyncSession,
+    model,
+    rows: Dict[uuid.UUID, Dict[str, Any]],
+    existing: Optional[Dict[uuid.UUID, Dict[str, Any]]] = None,
+    counts: Optional[Dict[str, int]] = None,
+    update_columns: Optional[Iterable[str]] = None,
+    keep_existing_if_null: Iterable[str] = ()
+) -> Dict[uuid.UUID, Optional[Dict[str, Any]]]:
+    """
+    INSERT ... ON CONFLICT (primary key) DO UPDATE for new and changed rows,
+    MENU_STORE_BATCH_SIZE rows per execute.
+
+    Rows whose content hash (update columns except updated_at) matches the
+    stored row are skipped, so an unchanged entity keeps its updated_at.
+
+    Args:
+        rows: Row dicts (same keys) by primary key, so an entity repeated in the payload is written once
+        existing: Stored rows by primary key (from _fetch_existing); rows not in it are new
+        counts: Counts to add created / updated / unchanged / touched to
+        update_columns: Columns updated on conflict (default: all but the key and created_at);
+            empty to only insert new rows
+        keep_existing_if_null: Columns that keep their stored value when the new one is NULL
+
+    Returns:
+        Written rows: primary key -> stored row before the write (None if new)
+    """
+    if not rows:
+        return {}
+    existing = existing or {}
+    table = model.__table__
+    pk_column = list(table.primary_key.columns)[0]
+    first = next(iter(rows.values()))
+    if update_columns is None:
+        update_columns = [c for c in first if c not in (pk_column.name, "created_at")]
+    update_columns = list(update_columns)
+    keep_existing_if_null = list(keep_existing_if_null)
+    compared = [c for c in update_columns if c != "updated_at"]
+
+    changed: Dict[uuid.UUID, Optional[Dict[str, Any]]] = {}
+    unchanged = 0
+    for pk, row in rows.items():
+        previous = existing.get(pk)
+        if previous is None:
+            changed[pk] = None
+            continue
+        effective = row
+        if keep_existing_if_null:
+            effective = dict(row)
+            for column in keep_existing_if_null:
+                if effective.get(column) is None:
+                    effective[column] = previous.get(column)
+        if _content_hash(effective, compared) == _content_hash(previous, compared):
+            unchanged += 1
+        else:
+            changed[pk] = previous
+
+    if counts is not None:
+        created = sum(1 for previous in changed.values() if previous is None)
+        counts["created"] += created
+        counts["updated"] += len(changed) - created
+        counts["unchanged"] += unchanged
+        counts["touched"] += len(changed)
+    if not changed:
+        return changed
+
+    # Compiled once and executed per batch with a parameter list: asyncpg pipelines
+    # the batch (executemany) instead of one round trip per row
+    stmt = pg_insert(table)
+    if update_columns:
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        for column in keep_existing_if_null:
+            set_[column] = func.coalesce(stmt.excluded[column], table.c[column])
+        stmt = stmt.on_conflict_do_update(index_elements=[pk_column], set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[pk_column])
+
+    values = [rows[pk] for pk in changed]
+    batch_size = max(1, settings.MENU_STORE_BATCH_SIZE)
+    for start in range(0, len(values), batch_size):
+        await db.execute(stmt, values[start:start + batch_size])
+    return changed
+
+
+async def _replace_item_mappings(
+    db: AsyncSession,
+    model,
+    target_column,
+    item_rows: Dict[uuid.UUID, List[Dict[str, Any]]],
+    counts: Dict[str, int]
+) -> int:
+    """
+    Replace the mappings (taxes / addon groups) of items whose set changed.
+
+    Returns:
+        Number of items whose mappings were rewritten
+    """
+    if not item_rows:
+        return 0
+    result = await db.execute(
+        select(model.menu_item_id, target_column).where(model.menu_item_id.in_(list(item_rows)))
+    )
+    stored: Dict[uuid.UUID, List[uuid.UUID]] = {}
+    for menu_item_id, target_id in result.all():
+        stored.setdefault(menu_item_id, []).append(target_id)
+
+    changed = [
+        menu_item_id for menu_item_id, rows in item_rows.items()
+        if sorted(str(r[target_column.name]) for r in rows)
+        != sorted(str(t) for t in stored.get(menu_item_id, []))
+    ]
+    if not changed:
+        return 0
+
+    result = await db.execute(
+        delete(model)
+        .where(model.menu_item_id.in_(changed))
+        .execution_options(synchronize_session=False)
+    )
+    pk_column = list(model.__table__.primary_key.columns)[0]
+    new_rows = {row[pk_column.name]: row for menu_item_id in changed for row in item_rows[menu_item_id]}
+    await _bulk_upsert(db, model, new_rows, update_columns=())
+    counts["touched"] += result.rowcount + len(new_rows)
+    return len(changed)
+
+
+async def _soft_delete_missing(
+    db: AsyncSession,
+    model,
+    ext_column,
+    processed: List[int],
+    restaurant_id: uuid.UUID,
+    now: datetime
+) -> List[uuid.UUID]:
+    """
+    Soft-delete the restaurant's rows whose PetPooja id is no longer in the menu.
+
+    Returns:
+        Primary keys of the rows soft-deleted
+    """
+    if not processed:
+        return []
+    pk_column = list(model.__table__.primary_key.columns)[0]
+    result = await db.execute(
+        update(model)
+        .where(
+            model.restaurant_id == restaurant_id,
+            ext_column.isnot(None),
+            ext_column.notin_(processed),
+            model.is_deleted.isnot(True)
+        )
+        .values(is_deleted=True, updated_at=now)
+        .returning(pk_column)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
+
+async def store_menu_bulk_async(
+    menu_data: Dict[str, Any],
+    restaurant_id: str,
+    db: AsyncSession,
+    internal_restaurant_id: uuid.UUID = None
+) -> Dict[str, Any]:
+    """
+    Store menu data set-based and diff-based (ASYNC).
+
+    Existing rows are prefetched once per table and compared by content hash:
+    only new and changed rows are written (batched INSERT ... ON CONFLICT DO
+    UPDATE), item tax/addon mappings are replaced only for items whose set
+    changed, and entities missing from the menu are soft-deleted with one
+    UPDATE per table. The number of round trips no longer grows with the menu
+    size, and unchanged rows keep their updated_at.
+
+    The item-level change set (added / updated / removed ids, stock flips) is
+    published with publish_menu_changes on commit.
+
+    Arguments are the same as store_menu_async; the result also has
+    "changes" (change set sizes).
+    """
+    try:
+        start_time = datetime.now(timezone.utc)
+        counts = _new_counts()
+        menusharingcode = _get_menusharingcode(menu_data, restaurant_id)
+        logger.info(
+            f"Bulk storing menu for {menusharingcode}: {len(menu_data.get('items', []))} items, "
+            f"{len(menu_data.get('categories', []))} categories"
+        )
+
+        # One sync per branch at a time: the id maps below must hold until commit
+        await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(menusharingcode))))
+
+        db_restaurant_id = await _resolve_restaurant_async(menu_data, menusharingcode, db, counts)
+
+        if db_restaurant_id is None:
+            raise MenuServiceError("Cannot store menu data: restaurant_table entry not found")
+
+        now = datetime.now(timezone.utc)
+        processed_ids = {
+            "attributes": [], "parent_categories": [], "group_categories": [], "categories": [],
+            "taxes": [], "addon_groups": [], "addon_items": [], "items": [], "variations": [],
+            "discounts": []
+        }
+
+        # Existing rows (order types are global: only the ones in this menu)
+        ordertype_ids = [safe_int(o.get("ordertypeid")) for o in menu_data.get("ordertypes", [])]
+        ordertype_ids = [i for i in ordertype_ids if i]
+        ordertype_map, ordertype_existing = await _fetch_existing(
+            db, OrderTypeTable.ext_petpooja_order_type_id,
+            OrderTypeTable.ext_petpooja_order_type_id.in_(ordertype_ids)
+        ) if ordertype_ids else ({}, {})
+        attribute_map, attribute_existing = await _fetch_existing(
+            db, MenuItemAttribute.ext_petpooja_attributes_id, MenuItemAttribute.restaurant_id == db_restaurant_id
+        )
+        section_map, section_existing = await _fetch_existing(
+            db, MenuSections.ext_petpooja_parent_categories_id, MenuSections.restaurant_id == db_restaurant_id
+        )
+        category_map, category_existing = await _fetch_existing(
+            db, MenuCategories.ext_petpooja_group_category_id, MenuCategories.restaurant_id == db_restaurant_id
+        )
+        sub_category_map, sub_category_existing = await _fetch_existing(
+            db, MenuSubCategories.ext_petpooja_categories_id, MenuSubCategories.restaurant_id == db_restaurant_id
+        )
+        tax_map, tax_existing = await _fetch_existing(
+            db, Taxes.ext_petpooja_tax_id, Taxes.restaurant_id == db_restaurant_id
+        )
+        addon_group_map, addon_group_existing = await _fetch_existing(
+            db, MenuItemAddonGroup.ext_petpooja_addon_group_id, MenuItemAddonGroup.restaurant_id == db_restaurant_id
+        )
+        item_map, item_existing = await _fetch_existing(
+            db, MenuItem.ext_petpooja_item_id, MenuItem.restaurant_id == db_restaurant_id
+        )
+        variation_group_map, variation_group_existing = await _fetch_existing(
+            db, VariationGroups.variation_group_name, VariationGroups.restaurant_id == db_restaurant_id
+        )
+        variation_map, variation_existing = await _fetch_existing(
+            db, MenuItemVariation.ext_petpooja_variation_id, MenuItemVariation.restaurant_id == db_restaurant_id
+        )
+        discount_map, discount_existing = await _fetch_existing(
+            db, Discount.ext_petpooja_discount_id, Discount.restaurant_id == db_restaurant_id
+        )
+        # Addon items are matched by PetPooja id, else by (group, name)
+        addon_item_map, addon_item_existing = await _fetch_existing(
+            db, MenuItemAddonItem.ext_petpooja_addon_item_id, MenuItemAddonItem.restaurant_id == db_restaurant_id
+        )
+        addon_item_map.pop(None, None)
+        addon_item_name_map: Dict[tuple, uuid.UUID] = {}
+        for pk, row in addon_item_existing.items():
+            addon_item_name_map.setdefault((row["menu_item_addon_group_id"], row["menu_item_addon_item_name"]), pk)
+
+        # Order Types
+        ordertype_rows = {}
+        for order_type in menu_data.get("ordertypes", []):
+            petpooja_id = safe_int(order_type.get("ordertypeid"))
+            if not petpooja_id:
+                continue
+            pk = _resolve_id(ordertype_map, petpooja_id)
+            ordertype_rows[pk] = {
+                "order_type_id": pk,
+                "order_type_name": order_type.get("ordertype", ""),
+                "ext_petpooja_order_type_id": petpooja_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["ordertypes"] += 1
+
+        # Attributes
+        attribute_rows = {}
+        for attr in menu_data.get("attributes", []):
+            petpooja_id = safe_int(attr.get("attributeid"))
+            if not petpooja_id:
+                continue
+            processed_ids["attributes"].append(petpooja_id)
+            pk = _resolve_id(attribute_map, petpooja_id)
+            attribute_rows[pk] = {
+                "menu_item_attribute_id": pk,
+                "menu_item_attribute_name": attr.get("attribute", ""),
+                "menu_item_attribute_status": convert_status(attr.get("active", "1")),
+                "restaurant_id": db_restaurant_id,
+                "ext_petpooja_attributes_id": petpooja_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["attributes"] += 1
+
+        # Parent Categories -> MenuSections
+        section_rows = {}
+        for parent_cat in menu_data.get("parentcategories", []):
+            petpooja_id = safe_int(parent_cat.get("id"))
+            if not petpooja_id:
+                continue
+            processed_ids["parent_categories"].append(petpooja_id)
+            pk = _resolve_id(section_map, petpooja_id)
+            section_rows[pk] = {
+                "menu_section_id": pk,
+                "restaurant_id": db_restaurant_id,
+                "menu_section_name": parent_cat.get("name", ""),
+                "menu_section_rank": safe_int(parent_cat.get("rank")),
+                "menu_section_status": convert_status(parent_cat.get("status", "1")),
+                "menu_section_image_url": parent_cat.get("image_url", ""),
+                "ext_petpooja_parent_categories_id": petpooja_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["parent_categories"] += 1
+
+        # Group Categories -> MenuCategories
+        category_rows = {}
+        for group_cat in menu_data.get("group_categories", []):
+            petpooja_id = safe_int(group_cat.get("id"))
+            if not petpooja_id:
+                continue
+            processed_ids["group_categories"].append(petpooja_id)
+            pk = _resolve_id(category_map, petpooja_id)
+            category_rows[pk] = {
+                "menu_category_id": pk,
+                "restaurant_id": db_restaurant_id,
+                "menu_category_name": group_cat.get("name", ""),
+                "menu_category_rank": safe_int(group_cat.get("rank")),
+                "menu_category_status": convert_status(group_cat.get("status", "1")),
+                "ext_petpooja_group_category_id": petpooja_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["group_categories"] += 1
+
+        # Categories -> MenuSubCategories
+        sub_category_rows = {}
+        for category in menu_data.get("categories", []):
+            petpooja_id = safe_int(category.get("categoryid"))
+            if not petpooja_id:
+                continue
+            processed_ids["categories"].append(petpooja_id)
+            pk = _resolve_id(sub_category_map, petpooja_id)
+            sub_category_rows[pk] = {
+                "menu_sub_category_id": pk,
+                "restaurant_id": db_restaurant_id,
+                "sub_category_name": category.get("categoryname", ""),
+                "sub_category_rank": safe_int(category.get("categoryrank")),
+                "sub_category_status": convert_status(category.get("active", "1")),
+                "sub_category_timings": category.get("categorytimings", ""),
+                "sub_category_image_url": category.get("category_image_url", ""),
+                "ext_petpooja_categories_id": petpooja_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["categories"] += 1
+
+        # Taxes
+        tax_rows = {}
+        for tax in menu_data.get("taxes", []):
+            petpooja_id = safe_int(tax.get("taxid"))
+            if not petpooja_id:
+                continue
+            processed_ids["taxes"].append(petpooja_id)
+            pk = _resolve_id(tax_map, petpooja_id)
+            tax_rows[pk] = {
+                "tax_id": pk,
+                "restaurant_id": db_restaurant_id,
+                "tax_name": tax.get("taxname", ""),
+                "tax_percentage": safe_float(tax.get("tax")),
+                "tax_type": tax.get("taxtype", "1"),
+                "tax_rank": safe_int(tax.get("rank")),
+                "tax_status": convert_status(tax.get("active", "1")),
+                "tax_description": tax.get("description", ""),
+                "ext_petpooja_tax_id": petpooja_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["taxes"] += 1
+
+        # Addon Groups and Items
+        addon_group_rows = {}
+        addon_item_rows = {}
+        for addon_group in menu_data.get("addongroups", []):
+            petpooja_group_id = safe_int(addon_group.get("addongroupid"))
+            if not petpooja_group_id:
+                continue
+            processed_ids["addon_groups"].append(petpooja_group_id)
+            ag_id = _resolve_id(addon_group_map, petpooja_group_id)
+            addon_group_rows[ag_id] = {
+                "menu_item_addon_group_id": ag_id,
+                "restaurant_id": db_restaurant_id,
+                "menu_item_addon_group_name": addon_group.get("addongroup_name", ""),
+                "menu_item_addon_group_rank": safe_int(addon_group.get("addongroup_rank")),
+                "menu_item_addon_group_status": convert_status(addon_group.get("active", "1")),
+                "ext_petpooja_addon_group_id": petpooja_group_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["addon_groups"] += 1
+
+            for addon_item in addon_group.get("addongroupitems", []):
+                petpooja_addon_item_id = safe_int(addon_item.get("addonitemid"))
+                addon_item_name = addon_item.get("addonitem_name", "")
+
+                ai_id = None
+                if petpooja_addon_item_id:
+                    processed_ids["addon_items"].append(petpooja_addon_item_id)
+                    ai_id = addon_item_map.get(petpooja_addon_item_id)
+                if ai_id is None and addon_item_name:
+                    ai_id = addon_item_name_map.get((ag_id, addon_item_name))
+                if ai_id is None:
+                    ai_id = uuid.uuid4()
+                if petpooja_addon_item_id:
+                    addon_item_map[petpooja_addon_item_id] = ai_id
+                addon_item_name_map[(ag_id, addon_item_name)] = ai_id
+
+                addon_item_rows[ai_id] = {
+                    "menu_item_addon_id": ai_id,
+                    "menu_item_addon_group_id": ag_id,
+                    "restaurant_id": db_restaurant_id,
+                    "menu_item_addon_item_name": addon_item_name,
+                    "menu_item_addon_item_price": safe_float(addon_item.get("addonitem_price")),
+                    "menu_item_addon_item_rank": safe_int(addon_item.get("addonitem_rank")),
+                    "menu_item_addon_item_status": convert_status(addon_item.get("active", "1")),
+                    "ext_petpooja_addon_item_id": petpooja_addon_item_id if petpooja_addon_item_id else None,
+                    "is_deleted": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                counts["addon_items"] += 1
+
+        # Menu Items
+        item_rows = {}
+        # menu_item_id -> mapping rows; compared only for items that list taxes / addon groups
+        item_tax_rows: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+        item_addon_rows: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+        for item in menu_data.get("items", []):
+            petpooja_item_id = safe_int(item.get("itemid"))
+            if not petpooja_item_id:
+                continue
+            processed_ids["items"].append(petpooja_item_id)
+
+            raw_price = item.get("price")
+            if raw_price is None or raw_price == "" or raw_price == "0" or raw_price == 0:
+                logger.warning(f"Item '{item.get('itemname')}' (ID: {petpooja_item_id}) has empty/zero price: {repr(raw_price)}")
+
+            petpooja_category_id = safe_int(item.get("item_categoryid"))
+            menu_item_id = _resolve_id(item_map, petpooja_item_id)
+            item_rows[menu_item_id] = {
+                "menu_item_id": menu_item_id,
+                "restaurant_id": db_restaurant_id,
+                "menu_sub_category_id": sub_category_map.get(petpooja_category_id) if petpooja_category_id else None,
+                "menu_item_name": item.get("itemname", ""),
+                "menu_item_description": item.get("itemdescription", ""),
+                "menu_item_price": safe_float(raw_price),
+                "menu_item_status": convert_status(item.get("active", "1")),
+                "menu_item_rank": safe_int(item.get("itemrank")),
+                "menu_item_allow_variation": item.get("itemallowvariation") == "1",
+                "menu_item_allow_addon": item.get("itemallowaddon") == "1",
+                "menu_item_favorite": item.get("item_favorite") == "1",
+                "menu_item_is_recommended": item.get("is_recommend") == "1",
+                "menu_item_packaging_charges": safe_float(item.get("item_packingcharges")),
+                "menu_item_ignore_taxes": item.get("ignore_taxes") == "1",
+                "menu_item_ignore_discounts": item.get("ignore_discounts") == "1",
+                "menu_item_in_stock": item.get("in_stock", "2") == "2",
+                "menu_item_is_combo": item.get("is_combo") == "1",
+                "menu_item_markup_price": safe_float(item.get("markup_price")) if item.get("markup_price") else None,
+                "menu_item_minimum_preparation_time": safe_int(item.get("minimumpreparationtime")) if item.get("minimumpreparationtime") else None,
+                "menu_item_spice_level": item.get("item_info", {}).get("spice_level") if isinstance(item.get("item_info"), dict) else None,
+                "ext_petpooja_item_id": petpooja_item_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+            if item.get("item_tax", []):
+                item_tax_rows[menu_item_id] = [
+                    {
+                        "menu_item_tax_mapping_id": uuid.uuid4(),
+                        "menu_item_id": menu_item_id,
+                        "restaurant_id": db_restaurant_id,
+                        "tax_id": tax_map[safe_int(tax_id_str)],
+                        "created_at": now,
+                    }
+                    for tax_id_str in item["item_tax"]
+                    if safe_int(tax_id_str) and safe_int(tax_id_str) in tax_map
+                ]
+
+            if item.get("item_addon_grp", []):
+                item_addon_rows[menu_item_id] = [
+                    {
+                        "menu_item_addon_mapping_id": uuid.uuid4(),
+                        "menu_item_id": menu_item_id,
+                        "menu_item_addon_group_id": addon_group_map[safe_int(addon_grp_id_str)],
+                        "restaurant_id": db_restaurant_id,
+                        "created_at": now,
+                    }
+                    for addon_grp_id_str in item["item_addon_grp"]
+                    if safe_int(addon_grp_id_str) and safe_int(addon_grp_id_str) in addon_group_map
+                ]
+
+            counts["items"] += 1
+
+        # Variation groups (by name) and variations
+        variation_group_rows = {}
+        variation_rows = {}
+        if menu_data.get("variations"):
+            for group_name in {v.get("groupname", "") for v in menu_data["variations"]} - {""}:
+                pk = _resolve_id(variation_group_map, group_name)
+                variation_group_rows[pk] = {
+                    "variation_group_id": pk,
+                    "restaurant_id": db_restaurant_id,
+                    "variation_group_name": group_name,
+                    "variation_group_selection_type": "single",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+
+            for variation in menu_data["variations"]:
+                petpooja_variation_id = safe_int(variation.get("variationid"))
+                if not petpooja_variation_id:
+                    continue
+                processed_ids["variations"].append(petpooja_variation_id)
+
+                petpooja_item_id = safe_int(variation.get("itemid"))
+                group_name = variation.get("groupname", "")
+                pk = _resolve_id(variation_map, petpooja_variation_id)
+                variation_rows[pk] = {
+                    "menu_item_variation_id": pk,
+                    "menu_item_id": item_map.get(petpooja_item_id) if petpooja_item_id else None,
+                    "restaurant_id": db_restaurant_id,
+                    "variation_group_id": variation_group_map.get(group_name) if group_name else None,
+                    "menu_item_variation_name": variation.get("variationname", ""),
+                    "menu_item_variation_price": safe_float(variation.get("price")),
+                    "menu_item_variation_status": convert_status(variation.get("active", "1")),
+                    "menu_item_variation_rank": safe_int(variation.get("variationrank")),
+                    "menu_item_variation_allow_addon": variation.get("variationallowaddon") == "1",
+                    "menu_item_variation_packaging_charges": safe_float(variation.get("variation_packingcharges")) if variation.get("variation_packingcharges") else None,
+                    "menu_item_variation_markup_price": safe_float(variation.get("markup_price")) if variation.get("markup_price") else None,
+                    "ext_petpooja_variation_id": petpooja_variation_id,
+                    "is_deleted": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                counts["variations"] += 1
+
+        # Discounts
+        discount_rows = {}
+        for discount in menu_data.get("discounts", []):
+            petpooja_id = safe_int(discount.get("discountid"))
+            if not petpooja_id:
+                continue
+            processed_ids["discounts"].append(petpooja_id)
+            pk = _resolve_id(discount_map, petpooja_id)
+            discount_rows[pk] = {
+                "discount_id": pk,
+                "restaurant_id": db_restaurant_id,
+                "discount_name": discount.get("discountname", ""),
+                "discount_value": safe_float(discount.get("discount")),
+                "discount_type": "percentage",
+                "discount_rank": safe_int(discount.get("rank")),
+                "discount_status": convert_status(discount.get("active", "1")),
+                "ext_petpooja_discount_id": petpooja_id,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            counts["discounts"] += 1
+
+        # Write new and changed rows: parents before children
+        await _bulk_upsert(db, OrderTypeTable, ordertype_rows, ordertype_existing, counts)
+        await _bulk_upsert(db, MenuItemAttribute, attribute_rows, attribute_existing, counts)
+        section_changes = await _bulk_upsert(db, MenuSections, section_rows, section_existing, counts)
+        category_changes = await _bulk_upsert(db, MenuCategories, category_rows, category_existing, counts)
+        sub_category_changes = await _bulk_upsert(
+            db, MenuSubCategories, sub_category_rows, sub_category_existing, counts
+        )
+        await _bulk_upsert(db, Taxes, tax_rows, tax_existing, counts)
+        await _bulk_upsert(db, MenuItemAddonGroup, addon_group_rows, addon_group_existing, counts)
+        await _bulk_upsert(
+            db, MenuItemAddonItem, addon_item_rows, addon_item_existing, counts,
+            keep_existing_if_null=("ext_petpooja_addon_item_id",)
+        )
+        item_changes = await _bulk_upsert(
+            db, MenuItem, item_rows, item_existing, counts,
+            keep_existing_if_null=("menu_sub_category_id",)
+        )
+
+        mapped_items = await _replace_item_mappings(
+            db, MenuItemTaxMapping, MenuItemTaxMapping.tax_id, item_tax_rows, counts
+        )
+        mapped_items += await _replace_item_mappings(
+            db, MenuItemAddonMapping, MenuItemAddonMapping.menu_item_addon_group_id, item_addon_rows, counts
+        )
+
+        # Existing groups are only looked up by name: never rewritten
+        await _bulk_upsert(
+            db, VariationGroups, variation_group_rows, variation_group_existing, counts,
+            update_columns=("updated_at",)
+        )
+        await _bulk_upsert(
+            db, MenuItemVariation, variation_rows, variation_existing, counts,
+            keep_existing_if_null=("menu_item_id", "variation_group_id")
+        )
+        await _bulk_upsert(db, Discount, discount_rows, discount_existing, counts)
+
+        # Soft delete whatever PetPooja no longer sends
+        deleted = {}
+        for model, ext_column, key in (
+            (MenuItem, MenuItem.ext_petpooja_item_id, "items"),
+            (MenuItemVariation, MenuItemVariation.ext_petpooja_variation_id, "variations"),
+            (MenuItemAddonItem, MenuItemAddonItem.ext_petpooja_addon_item_id, "addon_items"),
+            (MenuItemAddonGroup, MenuItemAddonGroup.ext_petpooja_addon_group_id, "addon_groups"),
+            (MenuSubCategories, MenuSubCategories.ext_petpooja_categories_id, "categories"),
+            (MenuCategories, MenuCategories.ext_petpooja_group_category_id, "group_categories"),
+            (MenuSections, MenuSections.ext_petpooja_parent_categories_id, "parent_categories"),
+            (MenuItemAttribute, MenuItemAttribute.ext_petpooja_attributes_id, "attributes"),
+            (Taxes, Taxes.ext_petpooja_tax_id, "taxes"),
+            (Discount, Discount.ext_petpooja_discount_id, "discounts"),
+        ):
+            deleted[key] = await _soft_delete_missing(
+                db, model, ext_column, processed_ids[key], db_restaurant_id, now
+            )
+            counts["deleted"] += len(deleted[key])
+        counts["touched"] += counts["deleted"]
+
+        # Item-level change set for the chatbot's caches and vector index
+        change_set = new_change_set(db_restaurant_id, menusharingcode)
+        for menu_item_id, previous in item_changes.items():
+            if previous is None or previous.get("is_deleted"):
+                change_set["items"]["added"].append(str(menu_item_id))
+                continue
+            change_set["items"]["updated"].append(str(menu_item_id))
+            in_stock = item_rows[menu_item_id]["menu_item_in_stock"]
+            if bool(previous.get("menu_item_in_stock")) != in_stock:
+                change_set["stock"]["in" if in_stock else "out"].append(str(menu_item_id))
+        add_ids(change_set["items"]["removed"], deleted["items"])
+        change_set["categories_changed"] = bool(
+            section_changes or category_changes or sub_category_changes
+            or deleted["categories"] or deleted["group_categories"] or deleted["parent_categories"]
+        )
+        change_set["counts"] = {
+            key: counts[key] for key in ("created", "updated", "unchanged", "deleted", "touched")
+        }
+        published = await publish_menu_changes(db, change_set)
+        changes = {**summarize(change_set), "mapped_items": mapped_items, "published": published}
+
+        await db.flush()
+        elapsed_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        logger.info(
+            f"Bulk menu store for {menusharingcode} done in {elapsed_ms:.0f}ms: "
+            f"created={counts['created']} updated={counts['updated']} unchanged={counts['unchanged']} "
+            f"deleted={counts['deleted']} touched={counts['touched']} rows; changes={changes}"
+        )
+        return {"success": True, "message": "Menu stored successfully", "counts": counts, "changes": changes}
+
+    except Exception as e:
+        logger.error(f"Error storing menu: {str(e)}")
+        raise MenuServiceError(f"Failed to store menu: {str(e)}")
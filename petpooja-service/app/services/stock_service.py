@@ -12,6 +12,7 @@ from sqlalchemy import update, select
 from app.core.db_session_async import AsyncSessionLocal
 from app.models.menu_models import MenuItem, MenuItemAddonItem
 from app.models.branch_models import BranchInfoTable
+from app.services.menu_change_events import new_change_set, add_ids, publish_menu_changes
 
 logger = logging.getLogger(__name__)
 
@@ -155,23 +156,33 @@ async def update_item_stock(
             logger.warning(f"Branch not found for PetPooja restaurant ID: {restaurant_id}")
             return
 
-        # Update all items with the given PetPooja IDs
+        # Update the given PetPooja IDs whose stock actually flips
         result = await db.execute(
             update(MenuItem)
             .where(
                 MenuItem.ext_petpooja_item_id.in_(item_ids),
                 MenuItem.restaurant_id == branch.branch_id,  # Match by branch_id
-                MenuItem.is_deleted == False
+                MenuItem.is_deleted == False,
+                MenuItem.menu_item_in_stock.isnot(in_stock)
             )
             .values(
                 menu_item_in_stock=in_stock,
                 updated_at=datetime.utcnow()
             )
+            .returning(MenuItem.menu_item_id)
         )
+        flipped = list(result.scalars().all())
+
+        # Stock-only change set: the chatbot updates these items' availability
+        if flipped:
+            change_set = new_change_set(branch.branch_id, restaurant_id, source="stock")
+            add_ids(change_set["stock"]["in" if in_stock else "out"], flipped)
+            change_set["counts"] = {"touched": len(flipped)}
+            await publish_menu_changes(db, change_set)
 
         await db.commit()
 
-        items_updated = result.rowcount
+        items_updated = len(flipped)
         logger.info(
             f"Stock update complete: {items_updated}/{len(item_ids)} items updated - "
             f"{'Available' if in_stock else 'Out of Stock'}"
@@ -9,7 +9,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.schemas.webhook import OrderCallbackRequest, OrderStatus, PushMenuRequest
-from app.services.menu_service import store_menu, MenuServiceError
+from app.core.db_session_async import AsyncSessionLocal
+from app.services.menu_service_async_store import store_menu_async, MenuServiceError
 
 logger = logging.getLogger(__name__)
 
@@ -285,8 +286,15 @@ async def process_push_menu(menu_data: PushMenuRequest, db: Session = None) -> D
             f"Addons: {len(menu_dict.get('addongroups', []))}"
         )
 
-        # Store menu data using existing menu service
-        store_result = store_menu(menu_dict, restaurant_id)
+        # Store menu data (diff-based: only changed rows are written and the
+        # change set is published to the chatbot on commit)
+        async with AsyncSessionLocal() as session:
+            try:
+                store_result = await store_menu_async(menu_dict, restaurant_id, session)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
 
         # Extract counts from store result
         counts = store_result.get("counts", {})
@@ -295,7 +303,9 @@ async def process_push_menu(menu_data: PushMenuRequest, db: Session = None) -> D
             f"Push menu processed successfully - "
             f"Menusharingcode: {restaurant_id}, "
             f"Items: {counts.get('items', 0)}, "
-            f"Categories: {counts.get('categories', 0)}"
+            f"Categories: {counts.get('categories', 0)}, "
+            f"Touched rows: {counts.get('touched', 0)}, "
+            f"Changes: {store_result.get('changes', {})}"
         )
 
         return {
@@ -306,7 +316,8 @@ async def process_push_menu(menu_data: PushMenuRequest, db: Session = None) -> D
             "categories_processed": counts.get("categories", 0),
             "taxes_processed": counts.get("taxes", 0),
             "addons_processed": counts.get("addon_items", 0),
-            "counts": counts
+            "counts": counts,
+            "changes": store_result.get("changes", {})
         }
 
     except MenuServiceError as e:
@@ -0,0 +1,6 @@
+"""Shared test setup: tests import the service's app package without a running database."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
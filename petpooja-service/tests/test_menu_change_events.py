@@ -0,0 +1,45 @@
+"""Tests for menu change set encoding."""
+
+import json
+import uuid
+
+from app.services.menu_change_events import add_ids, encode_change_set, is_empty, new_change_set
+
+
+def _change_set(item_count):
+    change_set = new_change_set(uuid.uuid4(), "abc123")
+    add_ids(change_set["items"]["updated"], (uuid.uuid4() for _ in range(item_count)))
+    add_ids(change_set["stock"]["out"], [uuid.uuid4()])
+    return change_set
+
+
+def test_small_change_set_is_sent_item_by_item():
+    change_set = _change_set(3)
+
+    payload, full = encode_change_set(change_set)
+
+    assert not full
+    assert json.loads(payload) == change_set
+
+
+def test_oversized_change_set_becomes_full_reload():
+    change_set = _change_set(500)
+
+    payload, full = encode_change_set(change_set)
+
+    assert full
+    assert len(payload.encode("utf-8")) < 8000
+    decoded = json.loads(payload)
+    assert decoded["full"] is True
+    assert decoded["change_id"] == change_set["change_id"]
+    assert decoded["items"] == {"added": [], "updated": [], "removed": []}
+    assert decoded["stock"] == {"in": [], "out": []}
+    # The caller's change set is left as it was
+    assert len(change_set["items"]["updated"]) == 500
+
+
+def test_full_flag_survives_encoding():
+    change_set = new_change_set(uuid.uuid4(), None, full=True)
+
+    assert not is_empty(change_set)
+    assert encode_change_set(change_set)[1] is True
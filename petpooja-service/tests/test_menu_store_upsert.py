@@ -0,0 +1,88 @@
+"""Tests for _bulk_upsert change detection."""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.models.other_models import Taxes
+from app.services.menu_service_async_store import _bulk_upsert
+
+
+class _RecordingSession:
+    """Records execute() calls instead of talking to PostgreSQL."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def execute(self, statement, params=None):
+        self.batches.append(params)
+
+
+def _tax(tax_id, **values):
+    return {
+        "tax_id": tax_id,
+        "tax_name": "GST",
+        "tax_percentage": 5.0,
+        "tax_status": True,
+        "tax_description": None,
+        "updated_at": "2025-01-01T00:00:00",
+        **values,
+    }
+
+
+def _counts():
+    return {"created": 0, "updated": 0, "unchanged": 0, "touched": 0}
+
+
+@pytest.mark.asyncio
+async def test_only_new_and_changed_rows_are_written():
+    new_id, same_id, changed_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    existing = {
+        # Stored numerics come back as Decimal; updated_at is not compared
+        same_id: _tax(same_id, tax_percentage=Decimal("5.00"), updated_at="2024-06-01T00:00:00"),
+        changed_id: _tax(changed_id),
+    }
+    rows = {
+        new_id: _tax(new_id),
+        same_id: _tax(same_id),
+        changed_id: _tax(changed_id, tax_percentage=12.0),
+    }
+    db = _RecordingSession()
+    counts = _counts()
+
+    written = await _bulk_upsert(db, Taxes, rows, existing, counts)
+
+    assert written == {new_id: None, changed_id: existing[changed_id]}
+    assert counts == {"created": 1, "updated": 1, "unchanged": 1, "touched": 2}
+    assert [row["tax_id"] for batch in db.batches for row in batch] == [new_id, changed_id]
+
+
+@pytest.mark.asyncio
+async def test_null_does_not_count_as_change_for_kept_columns():
+    tax_id = uuid.uuid4()
+    existing = {tax_id: _tax(tax_id, tax_description="Goods and services")}
+    db = _RecordingSession()
+    counts = _counts()
+
+    written = await _bulk_upsert(
+        db, Taxes, {tax_id: _tax(tax_id)}, existing, counts, keep_existing_if_null=["tax_description"]
+    )
+
+    assert written == {}
+    assert counts["unchanged"] == 1
+    assert db.batches == []
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_batches(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MENU_STORE_BATCH_SIZE", 2)
+    rows = {tax_id: _tax(tax_id) for tax_id in (uuid.uuid4() for _ in range(5))}
+    db = _RecordingSession()
+
+    written = await _bulk_upsert(db, Taxes, rows)
+
+    assert list(written) == list(rows)
+    assert [len(batch) for batch in db.batches] == [2, 2, 1]
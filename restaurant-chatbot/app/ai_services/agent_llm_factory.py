@@ -10,13 +10,13 @@ across all 20 OpenAI accounts.
 
 import structlog
 from typing import Any, Optional, List, Union, Sequence
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.outputs import ChatResult, ChatGeneration
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 
+from app.ai_services.llm_callbacks import TokenTrackingCallback
 from app.ai_services.llm_manager import get_llm_manager, UnifiedLLMManager
 from app.core.config import config
 
@@ -171,23 +171,20 @@ class ManagedChatOpenAI(BaseChatModel):
         try:
             # Find available account with failover
             estimated_tokens = self._manager._estimate_tokens(messages)
-            account = await self._manager._find_available_account(
+            lease = await self._manager.acquire_account(
                 self.model,
                 estimated_tokens
             )
 
-            if not account:
+            if not lease:
                 raise Exception(
                     f"All accounts exhausted for model {self.model}. "
                     "Please try again in a moment."
                 )
+            account = lease.account
 
-            # Create ChatOpenAI with selected account
-            llm = ChatOpenAI(
-                model=self.model,
-                api_key=account.api_key,
-                temperature=self.temperature
-            )
+            # Pooled ChatOpenAI of the selected account
+            llm = account.get_chat_model(self.model, self.temperature)
 
             # Apply structured output if set
             structured_schema = getattr(self, '_structured_schema', None)
@@ -200,14 +197,13 @@ class ManagedChatOpenAI(BaseChatModel):
                 tool_kwargs = getattr(self, '_tool_kwargs', {})
                 llm = llm.bind_tools(self._bound_tools, **tool_kwargs)
 
-            # Invoke LLM
-            response = await llm.ainvoke(messages, stop=stop, **kwargs)
-
-            # Record usage
-            account.record_request(
-                self.model,
-                estimated_tokens,
-                self._manager._cooldown_seconds
+            # Invoke LLM (the callback settles the reservation with the actual
+            # usage and cools the account down on 429)
+            response = await llm.ainvoke(
+                messages,
+                config={"callbacks": [TokenTrackingCallback(lease.tracker.provider_name, lease, self.agent_name)]},
+                stop=stop,
+                **kwargs
             )
 
             logger.info(
@@ -274,19 +270,16 @@ class ManagedChatOpenAI(BaseChatModel):
         for attempt in range(max_retries):
             try:
                 estimated_tokens = self._manager._estimate_tokens(messages)
-                account = await self._manager._find_available_account(
+                lease = await self._manager.acquire_account(
                     self.model,
                     estimated_tokens
                 )
 
-                if not account:
+                if not lease:
                     raise Exception("No accounts available for retry")
+                account = lease.account
 
-                llm = ChatOpenAI(
-                    model=self.model,
-                    api_key=account.api_key,
-                    temperature=self.temperature
-                )
+                llm = account.get_chat_model(self.model, self.temperature)
 
                 # Apply structured output if set
                 if structured_schema:
@@ -298,12 +291,11 @@ class ManagedChatOpenAI(BaseChatModel):
                     tool_kwargs = getattr(self, '_tool_kwargs', {})
                     llm = llm.bind_tools(self._bound_tools, **tool_kwargs)
 
-                response = await llm.ainvoke(messages, stop=stop, **kwargs)
-
-                account.record_request(
-                    self.model,
-                    estimated_tokens,
-                    self._manager._cooldown_seconds
+                response = await llm.ainvoke(
+                    messages,
+                    config={"callbacks": [TokenTrackingCallback(lease.tracker.provider_name, lease, self.agent_name)]},
+                    stop=stop,
+                    **kwargs
                 )
 
                 logger.info(
@@ -6,18 +6,28 @@ Callbacks for tracking LLM usage and enabling proactive fallback.
 
 import structlog
 from typing import Any, Dict, List
-from langchain.callbacks.base import BaseCallbackHandler
+from langchain_core.callbacks import AsyncCallbackHandler
 from langchain_core.outputs import LLMResult
 
 logger = structlog.get_logger(__name__)
 
 
-class TokenTrackingCallback(BaseCallbackHandler):
+def get_total_tokens(message: Any) -> int:
+    """Total tokens the API reported for a chat response (0 if missing)."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return int(usage.get("total_tokens") or 0)
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    return int(token_usage.get("total_tokens") or 0)
+
+
+class TokenTrackingCallback(AsyncCallbackHandler):
     """
     Callback handler that tracks token usage and records it in the LLM Manager.
 
     This enables accurate capacity monitoring even when agents use bind_tools()
-    and call LLM directly instead of going through manager.ainvoke().
+    or with_structured_output() and call the LLM directly instead of going
+    through manager.ainvoke().
     """
 
     def __init__(self, provider_name: str, tracker: Any, agent_name: str = "unknown"):
@@ -26,7 +36,7 @@ class TokenTrackingCallback(BaseCallbackHandler):
 
         Args:
             provider_name: Name of the LLM provider (for logging)
-            tracker: LLMUsageTracker instance to record usage
+            tracker: LLMLease of the request (record_usage() / rate_limited())
             agent_name: Name of the agent using this LLM
         """
         super().__init__()
@@ -35,7 +45,7 @@ class TokenTrackingCallback(BaseCallbackHandler):
         self.agent_name = agent_name
         self._request_start_times: Dict[str, float] = {}
 
-    def on_llm_start(
+    async def on_llm_start(
         self,
         serialized: Dict[str, Any],
         prompts: List[str],
@@ -60,7 +70,7 @@ class TokenTrackingCallback(BaseCallbackHandler):
             prompt_count=len(prompts)
         )
 
-    def on_llm_end(
+    async def on_llm_end(
         self,
         response: LLMResult,
         **kwargs: Any
@@ -87,8 +97,8 @@ class TokenTrackingCallback(BaseCallbackHandler):
                 completion_tokens = token_usage.get("completion_tokens", 0)
 
                 if total_tokens > 0:
-                    # Record actual usage in tracker
-                    self.tracker.record_request(total_tokens)
+                    # Replace the reserved estimate with the actual usage
+                    await self.tracker.record_usage(total_tokens)
 
                     logger.info(
                         "llm_request_completed_tracked",
@@ -119,7 +129,7 @@ class TokenTrackingCallback(BaseCallbackHandler):
                 error=str(e)
             )
 
-    def on_llm_error(
+    async def on_llm_error(
         self,
         error: Exception,
         **kwargs: Any
@@ -133,6 +143,7 @@ class TokenTrackingCallback(BaseCallbackHandler):
         is_rate_limit = "429" in error_str or "rate_limit" in error_str.lower()
 
         if is_rate_limit:
+            await self.tracker.rate_limited()
             logger.error(
                 "llm_rate_limit_error_detected",
                 provider=self.provider_name,
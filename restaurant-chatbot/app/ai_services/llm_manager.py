@@ -7,19 +7,30 @@ Supports both gpt-4o and gpt-4o-mini with separate rate limit tracking per accou
 Features:
 - Validates API keys on startup (checks for credits)
 - Only adds accounts with valid credits to the pool
-- Round-robin load balancing across valid accounts
+- RPM/TPM sliding windows per account+model shared by all workers through
+  Redis (in-process fallback), settled with the actual usage tokens
+- Each request goes to the account with the most headroom; when all are
+  full it waits until the first one frees up
+- Long-lived, connection-pooled OpenAI clients per account (shared by chat,
+  translation and voice)
 """
 
 import os
 import asyncio
-from datetime import datetime, timedelta
+import time
+import uuid
+from datetime import datetime
 from collections import deque
 from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
 import structlog
 from langchain_core.messages import BaseMessage
 from langchain_openai import ChatOpenAI
-from openai import OpenAI, AuthenticationError, RateLimitError, APIError
+from openai import AsyncOpenAI, OpenAI, AuthenticationError, RateLimitError, APIError
+
+from app.ai_services.llm_callbacks import TokenTrackingCallback, get_total_tokens
+from app.ai_services.llm_rate_limiter import RATE_WINDOW_MS, get_shared_rate_limiter, window_member
+from app.ai_services.openai_http import PooledHTTPClient
 
 logger = structlog.get_logger(__name__)
 
@@ -78,7 +89,11 @@ class ModelUsageTracker:
     - Requests per minute (RPM)
     - Tokens per minute (TPM)
     - Buffer thresholds to prevent hitting limits
-    - Cooldown state
+    - Cooldown state (after the API answers 429)
+
+    With Redis the window is shared by all workers (SharedRateLimiter) and
+    this object holds the limits and the usage last read from Redis; without
+    Redis the same window is kept in-process.
     """
 
     def __init__(
@@ -97,20 +112,27 @@ class ModelUsageTracker:
             rpm_limit: Maximum requests per minute for this model
             tpm_limit: Maximum tokens per minute for this model
             buffer_percent: Switch at this % of capacity (default 80%)
-            provider_name: Name for logging (e.g., "account_1_gpt4o")
+            provider_name: Name for logging and the Redis key (e.g., "account_1_gpt4o")
         """
         self.model_name = model_name
         self.rpm_limit = rpm_limit
         self.tpm_limit = tpm_limit
         self.buffer_percent = buffer_percent
         self.provider_name = provider_name
+        self.key = provider_name
+
+        self.rpm_threshold = rpm_limit * (buffer_percent / 100)
+        self.tpm_threshold = tpm_limit * (buffer_percent / 100)
 
-        # Sliding window: (timestamp, token_count)
+        # Local sliding window: [timestamp, token_count, request_id]
         self.requests: deque = deque()
+        self.window_tokens = 0
 
-        # Cooldown state
-        self.cooldown_state = CooldownState.AVAILABLE
-        self.cooldown_until: Optional[datetime] = None
+        # Cooldown (epoch seconds)
+        self.cooldown_until: Optional[float] = None
+
+        # (requests, tokens, cooldown_until) last read from the shared window
+        self.shared_usage: Optional[Tuple[int, int, Optional[float]]] = None
 
         logger.info(
             "model_tracker_initialized",
@@ -121,145 +143,79 @@ class ModelUsageTracker:
             buffer_percent=buffer_percent
         )
 
-    def _clean_old_requests(self):
-        """Remove requests older than 1 minute"""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-
-        while self.requests and self.requests[0][0] < one_minute_ago:
-            self.requests.popleft()
-
-    def _check_cooldown_expired(self):
-        """Check if cooldown period has expired and update state"""
-        if self.cooldown_state == CooldownState.COOLING_DOWN and self.cooldown_until:
-            if datetime.now() >= self.cooldown_until:
-                # Check if usage has dropped below buffer
-                self._clean_old_requests()
-                current_rpm = len(self.requests)
-                current_tpm = sum(tokens for _, tokens in self.requests)
-
-                rpm_utilization = (current_rpm / self.rpm_limit) * 100
-                tpm_utilization = (current_tpm / self.tpm_limit) * 100
-
-                if rpm_utilization < self.buffer_percent and tpm_utilization < self.buffer_percent:
-                    self.cooldown_state = CooldownState.AVAILABLE
-                    self.cooldown_until = None
-                    logger.info(
-                        "cooldown_expired_released",
-                        provider=self.provider_name,
-                        rpm_utilization=round(rpm_utilization, 2),
-                        tpm_utilization=round(tpm_utilization, 2)
-                    )
-                else:
-                    # Still at capacity - extend cooldown
-                    self.cooldown_until = datetime.now() + timedelta(seconds=30)
-                    logger.warning(
-                        "cooldown_extended_still_at_capacity",
-                        provider=self.provider_name,
-                        rpm_utilization=round(rpm_utilization, 2),
-                        tpm_utilization=round(tpm_utilization, 2),
-                        extended_until=self.cooldown_until.isoformat()
-                    )
-
-    def can_handle_request(self, estimated_tokens: int) -> Tuple[bool, Dict[str, Any]]:
-        """
-        Check if we can handle request without exceeding limits.
-
-        Args:
-            estimated_tokens: Estimated tokens for this request
-
-        Returns:
-            Tuple of (can_handle: bool, usage_stats: dict)
-        """
-        # Check if in cooldown
-        self._check_cooldown_expired()
-
-        if self.cooldown_state == CooldownState.COOLING_DOWN:
-            return False, {
-                "provider": self.provider_name,
-                "model": self.model_name,
-                "can_handle": False,
-                "reason": "cooling_down",
-                "cooldown_until": self.cooldown_until.isoformat() if self.cooldown_until else None
-            }
-
-        self._clean_old_requests()
-
-        # Calculate current usage
-        current_rpm = len(self.requests)
-        current_tpm = sum(tokens for _, tokens in self.requests)
-
-        # Calculate thresholds
-        rpm_threshold = self.rpm_limit * (self.buffer_percent / 100)
-        tpm_threshold = self.tpm_limit * (self.buffer_percent / 100)
-
-        # Check if adding this request would exceed thresholds
-        would_exceed_rpm = (current_rpm + 1) > rpm_threshold
-        would_exceed_tpm = (current_tpm + estimated_tokens) > tpm_threshold
+    def _clean_old_requests(self, now: float):
+        """Remove requests older than the window"""
+        window_start = now - RATE_WINDOW_MS / 1000
+        while self.requests and self.requests[0][0] <= window_start:
+            self.window_tokens -= self.requests.popleft()[1]
 
-        can_handle = not (would_exceed_rpm or would_exceed_tpm)
-
-        usage_stats = {
-            "provider": self.provider_name,
-            "model": self.model_name,
-            "current_rpm": current_rpm,
-            "rpm_limit": self.rpm_limit,
-            "rpm_threshold": int(rpm_threshold),
-            "rpm_utilization_percent": round((current_rpm / self.rpm_limit * 100), 2),
-            "current_tpm": current_tpm,
-            "tpm_limit": self.tpm_limit,
-            "tpm_threshold": int(tpm_threshold),
-            "tpm_utilization_percent": round((current_tpm / self.tpm_limit * 100), 2),
-            "estimated_request_tokens": estimated_tokens,
-            "can_handle": can_handle,
-            "would_exceed_rpm": would_exceed_rpm,
-            "would_exceed_tpm": would_exceed_tpm,
-            "cooldown_state": self.cooldown_state.value
-        }
-
-        return can_handle, usage_stats
+    @property
+    def cooldown_state(self) -> CooldownState:
+        if self.shared_usage is not None:
+            cooldown_until = self.shared_usage[2]
+        else:
+            cooldown_until = self.cooldown_until
+        if cooldown_until and cooldown_until > time.time():
+            return CooldownState.COOLING_DOWN
+        return CooldownState.AVAILABLE
 
-    def record_request(self, token_count: int, cooldown_seconds: int = 60):
+    def check(self, estimated_tokens: int) -> Tuple[Optional[float], float]:
         """
-        Record a successful request and check if cooldown should be triggered.
+        Headroom left in the local window after this request.
 
-        Args:
-            token_count: Actual tokens used in the request
-            cooldown_seconds: Cooldown duration if buffer exceeded
+        Returns:
+            (headroom fraction or None if it doesn't fit, seconds until it would fit)
         """
-        self.requests.append((datetime.now(), token_count))
-
-        # Check if we should enter cooldown
-        self._clean_old_requests()
-        current_rpm = len(self.requests)
-        current_tpm = sum(tokens for _, tokens in self.requests)
-
-        rpm_utilization = (current_rpm / self.rpm_limit) * 100
-        tpm_utilization = (current_tpm / self.tpm_limit) * 100
-
-        # If we've hit or exceeded buffer, enter cooldown
-        if rpm_utilization >= self.buffer_percent or tpm_utilization >= self.buffer_percent:
-            self.cooldown_state = CooldownState.COOLING_DOWN
-            self.cooldown_until = datetime.now() + timedelta(seconds=cooldown_seconds)
-
-            logger.warning(
-                "cooldown_triggered",
-                provider=self.provider_name,
-                model=self.model_name,
-                rpm_utilization=round(rpm_utilization, 2),
-                tpm_utilization=round(tpm_utilization, 2),
-                cooldown_until=self.cooldown_until.isoformat(),
-                cooldown_seconds=cooldown_seconds
-            )
-        else:
-            logger.debug(
-                "request_recorded",
-                provider=self.provider_name,
-                model=self.model_name,
-                tokens=token_count,
-                rpm_utilization=round(rpm_utilization, 2),
-                tpm_utilization=round(tpm_utilization, 2)
-            )
+        now = time.time()
+        if self.cooldown_until and self.cooldown_until > now:
+            return None, self.cooldown_until - now
+
+        self._clean_old_requests(now)
+        free_rpm = self.rpm_threshold - len(self.requests) - 1
+        free_tpm = self.tpm_threshold - self.window_tokens - estimated_tokens
+        if free_rpm >= 0 and free_tpm >= 0:
+            return min(free_rpm / self.rpm_threshold, free_tpm / self.tpm_threshold), 0.0
+
+        window = RATE_WINDOW_MS / 1000
+        ready_in = 0.0
+        if free_rpm < 0:
+            # The (-free_rpm)th oldest request has to leave the window
+            ready_in = self.requests[int(-free_rpm) - 1][0] + window - now
+        if free_tpm < 0:
+            if estimated_tokens > self.tpm_threshold:
+                ready_in = max(ready_in, window)
+            else:
+                freed = 0
+                for timestamp, tokens, _ in self.requests:
+                    freed += tokens
+                    if freed >= -free_tpm:
+                        ready_in = max(ready_in, timestamp + window - now)
+                        break
+        return None, ready_in
+
+    def reserve(self, request_id: str, tokens: int):
+        """Count a request against the local window."""
+        self.requests.append([time.time(), tokens, request_id])
+        self.window_tokens += tokens
+
+    def settle(self, request_id: str, tokens: int) -> bool:
+        """Replace a reservation's estimate with the actual tokens."""
+        for entry in self.requests:
+            if entry[2] == request_id:
+                self.window_tokens += tokens - entry[1]
+                entry[1] = tokens
+                return True
+        return False
+
+    def start_cooldown(self, cooldown_seconds: int):
+        """Take this account/model out of rotation (local window)."""
+        self.cooldown_until = time.time() + cooldown_seconds
+        logger.warning(
+            "cooldown_triggered",
+            provider=self.provider_name,
+            model=self.model_name,
+            cooldown_seconds=cooldown_seconds
+        )
 
     def get_current_usage(self) -> Dict[str, Any]:
         """
@@ -268,12 +224,13 @@ class ModelUsageTracker:
         Returns:
             Dictionary with current usage metrics
         """
-        self._clean_old_requests()
-        self._check_cooldown_expired()
-
-        current_rpm = len(self.requests)
-        current_tpm = sum(tokens for _, tokens in self.requests)
+        if self.shared_usage is not None:
+            current_rpm, current_tpm, cooldown_until = self.shared_usage
+        else:
+            self._clean_old_requests(time.time())
+            current_rpm, current_tpm, cooldown_until = len(self.requests), self.window_tokens, self.cooldown_until
 
+        cooldown_state = self.cooldown_state
         return {
             "provider": self.provider_name,
             "model": self.model_name,
@@ -283,17 +240,54 @@ class ModelUsageTracker:
             "current_tpm": current_tpm,
             "tpm_limit": self.tpm_limit,
             "tpm_utilization_percent": round((current_tpm / self.tpm_limit * 100), 2),
-            "cooldown_state": self.cooldown_state.value,
-            "cooldown_until": self.cooldown_until.isoformat() if self.cooldown_until else None
+            "cooldown_state": cooldown_state.value,
+            "cooldown_until": (
+                datetime.fromtimestamp(cooldown_until).isoformat()
+                if cooldown_state == CooldownState.COOLING_DOWN else None
+            ),
+            "window": "redis" if self.shared_usage is not None else "local"
         }
 
 
+class LLMLease:
+    """
+    An account picked for one request, holding its slot in the RPM/TPM window.
+
+    The slot is reserved with the estimated tokens; record_usage() replaces
+    the estimate with the tokens the API reports (and counts any further
+    calls made through the same structured LLM).
+    """
+
+    __slots__ = ("manager", "account", "model", "tracker", "request_id", "tokens", "settled", "shared")
+
+    def __init__(self, manager, account, model: str, tracker: ModelUsageTracker,
+                 request_id: str, tokens: int, shared: bool):
+        self.manager = manager
+        self.account = account
+        self.model = model
+        self.tracker = tracker
+        self.request_id = request_id
+        self.tokens = tokens
+        self.settled = False
+        self.shared = shared
+
+    async def record_usage(self, total_tokens: int):
+        await self.manager._record_usage(self, total_tokens)
+
+    async def rate_limited(self):
+        """The API answered 429 for this account - cool it down on every worker."""
+        await self.manager._start_cooldown(self)
+
+
 class LLMAccountProvider:
     """
     Single OpenAI account with dual-model tracking (gpt-4o and gpt-4o-mini).
 
     Each account has separate usage trackers for each model, allowing the same
     account to serve both models simultaneously without confusion.
+
+    All OpenAI calls made with the account's key share one keep-alive
+    connection pool; chat models are cached per model and settings.
     """
 
     def __init__(
@@ -322,6 +316,9 @@ class LLMAccountProvider:
         self.api_key = api_key
         self.buffer_percent = buffer_percent
 
+        # Created on first use; clients are per event loop (see PooledHTTPClient)
+        self._http_pool: Optional[PooledHTTPClient] = None
+
         # Create separate trackers for each model
         self.gpt4o_tracker = ModelUsageTracker(
             model_name="gpt-4o",
@@ -347,38 +344,55 @@ class LLMAccountProvider:
             gpt4o_mini_limits=f"{gpt4o_mini_rpm}RPM/{gpt4o_mini_tpm}TPM"
         )
 
-    def get_tracker_for_model(self, model: str) -> ModelUsageTracker:
-        """Get the appropriate tracker for the specified model"""
-        if "gpt-4o-mini" in model.lower() or "gpt4o-mini" in model.lower():
-            return self.gpt4o_mini_tracker
-        else:  # gpt-4o or gpt4o
-            return self.gpt4o_tracker
+    @property
+    def http_pool(self) -> PooledHTTPClient:
+        if self._http_pool is None:
+            self._http_pool = PooledHTTPClient(f"account_{self.account_number}")
+        return self._http_pool
 
-    def can_handle_request(self, model: str, estimated_tokens: int) -> Tuple[bool, Dict[str, Any]]:
+    def get_openai_client(self) -> AsyncOpenAI:
         """
-        Check if this account can handle a request for the specified model.
-
-        Args:
-            model: Model name (gpt-4o or gpt-4o-mini)
-            estimated_tokens: Estimated tokens for this request
+        Long-lived AsyncOpenAI client for this account (one per event loop).
 
-        Returns:
-            Tuple of (can_handle: bool, usage_stats: dict)
+        Use client.with_options(timeout=...) for per-call settings; the copy
+        shares the same connection pool.
         """
-        tracker = self.get_tracker_for_model(model)
-        return tracker.can_handle_request(estimated_tokens)
+        return self.http_pool.cached(
+            "openai",
+            lambda http_client: AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+        )
 
-    def record_request(self, model: str, token_count: int, cooldown_seconds: int = 60):
-        """
-        Record a successful request for the specified model.
+    def get_chat_model(self, model: str, temperature: float, **kwargs) -> ChatOpenAI:
+        """Cached ChatOpenAI for a model and settings, on the account's connection pool for this loop."""
+        key = ("chat", model, temperature, tuple(sorted(kwargs.items())))
+        return self.http_pool.cached(
+            key,
+            lambda http_client: ChatOpenAI(
+                model=model,
+                api_key=self.api_key,
+                temperature=temperature,
+                http_async_client=http_client,
+                **kwargs
+            )
+        )
 
-        Args:
-            model: Model name
-            token_count: Actual tokens used
-            cooldown_seconds: Cooldown duration if buffer exceeded
-        """
-        tracker = self.get_tracker_for_model(model)
-        tracker.record_request(token_count, cooldown_seconds)
+    def get_connection_stats(self) -> Dict[str, Any]:
+        if self._http_pool is None:
+            return {"label": f"account_{self.account_number}", "requests": 0}
+        return self._http_pool.get_stats()
+
+    async def aclose(self):
+        """Close the account's connection pool."""
+        if self._http_pool is not None:
+            await self._http_pool.aclose()
+        self._http_pool = None
+
+    def get_tracker_for_model(self, model: str) -> ModelUsageTracker:
+        """Get the appropriate tracker for the specified model"""
+        if "gpt-4o-mini" in model.lower() or "gpt4o-mini" in model.lower():
+            return self.gpt4o_mini_tracker
+        else:  # gpt-4o or gpt4o
+            return self.gpt4o_tracker
 
     def get_usage_stats(self, model: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -408,9 +422,10 @@ class UnifiedLLMManager:
     Features:
     - Manages 20 OpenAI accounts
     - Separate tracking for gpt-4o and gpt-4o-mini per account
-    - Cooldown mechanism when accounts hit capacity
-    - Retry queue for when all accounts busy
-    - Round-robin distribution within available accounts
+    - RPM/TPM windows shared across workers (Redis), fed with actual usage
+    - Requests go to the account with the most headroom
+    - Waits for the first free slot when all accounts are busy
+    - Cooldown when an account gets rate limited (429)
     """
 
     def __init__(self):
@@ -419,7 +434,9 @@ class UnifiedLLMManager:
         self._current_index: int = 0  # For round-robin
         self._cooldown_seconds: int = int(os.getenv("LLM_COOLDOWN_SECONDS", "60"))
         self._retry_timeout: int = int(os.getenv("LLM_RETRY_TIMEOUT_SECONDS", "30"))
+        # Upper bound on a single wait for capacity
         self._retry_poll_interval: int = int(os.getenv("LLM_RETRY_POLL_SECONDS", "5"))
+        self._capacity_freed: Optional[asyncio.Event] = None
 
         self._initialize_accounts()
 
@@ -557,14 +574,18 @@ class UnifiedLLMManager:
 
         return max(estimated_tokens, 100)  # Minimum 100 tokens
 
-    async def _find_available_account(
+    async def acquire_account(
         self,
         model: str,
         estimated_tokens: int,
         timeout_seconds: Optional[int] = None
-    ) -> Optional[LLMAccountProvider]:
+    ) -> Optional[LLMLease]:
         """
-        Find an available account for the specified model with retry logic.
+        Reserve a slot on the account with the most headroom for this model.
+
+        When every account is full (or cooling down), waits until the first
+        one frees up - the time the window reports, or earlier when a request
+        on this worker settles below its estimate.
 
         Args:
             model: Model name (gpt-4o or gpt-4o-mini)
@@ -572,47 +593,59 @@ class UnifiedLLMManager:
             timeout_seconds: Max time to wait for account (None = use default)
 
         Returns:
-            Available account or None if timeout
+            Lease on the selected account or None if timeout
+
+        Raises:
+            ValueError: If no accounts are configured
         """
-        timeout = timeout_seconds if timeout_seconds is not None else self._retry_timeout
-        start_time = datetime.now()
         num_accounts = len(self.accounts)
+        if not num_accounts:
+            raise ValueError(
+                "No LLM accounts configured. Please set ACCOUNT_1_API_KEY through ACCOUNT_20_API_KEY "
+                "or OPENAI_API_KEY in your .env file"
+            )
 
-        while (datetime.now() - start_time).total_seconds() < timeout:
-            # Try round-robin through all accounts
-            for i in range(num_accounts):
-                # Calculate account index with wraparound
-                account_index = (self._current_index + i) % num_accounts
-                account = self.accounts[account_index]
-
-                # Check if this account can handle the request
-                can_handle, stats = account.can_handle_request(model, estimated_tokens)
-
-                if can_handle:
-                    # Found available account - update index for next request
-                    self._current_index = (account_index + 1) % num_accounts
-
-                    # Remove 'model' from stats to avoid conflict (we have llm_model)
-                    stats_for_log = {k: v for k, v in stats.items() if k != 'model'}
-
-                    logger.info(
-                        "account_selected",
-                        account_number=account.account_number,
-                        llm_model=model,
-                        **stats_for_log
-                    )
+        timeout = timeout_seconds if timeout_seconds is not None else self._retry_timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            # Rotate the candidate order so ties don't always go to account 1
+            start = self._current_index
+            self._current_index = (start + 1) % num_accounts
+            accounts = self.accounts[start:] + self.accounts[:start]
+            trackers = [account.get_tracker_for_model(model) for account in accounts]
+
+            request_id = uuid.uuid4().hex
+            index, wait_seconds, shared = await self._select_tracker(trackers, estimated_tokens, request_id)
+
+            if index is not None:
+                account = accounts[index]
+                usage = trackers[index].get_current_usage()
+                logger.info(
+                    "account_selected",
+                    account_number=account.account_number,
+                    llm_model=model,
+                    estimated_tokens=estimated_tokens,
+                    current_rpm=usage["current_rpm"],
+                    current_tpm=usage["current_tpm"],
+                    window=usage["window"]
+                )
+                return LLMLease(self, account, model, trackers[index], request_id, estimated_tokens, shared)
 
-                    return account
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
 
-            # All accounts busy - wait and retry
+            # Waits never exceed LLM_RETRY_POLL_SECONDS so usage settled by
+            # other workers is picked up too
+            wait_seconds = min(wait_seconds or self._retry_poll_interval, self._retry_poll_interval, remaining)
             logger.warning(
-                "all_accounts_busy_retrying",
+                "all_accounts_busy_waiting",
                 llm_model=model,
                 total_accounts=num_accounts,
-                retry_in_seconds=self._retry_poll_interval
+                retry_in_seconds=round(wait_seconds, 3)
             )
-
-            await asyncio.sleep(self._retry_poll_interval)
+            await self._wait_for_capacity(wait_seconds)
 
         # Timeout - no account available
         logger.error(
@@ -624,6 +657,135 @@ class UnifiedLLMManager:
 
         return None
 
+    async def _select_tracker(
+        self,
+        trackers: List[ModelUsageTracker],
+        estimated_tokens: int,
+        request_id: str
+    ) -> Tuple[Optional[int], float, bool]:
+        """
+        Pick and reserve the tracker with the most headroom.
+
+        Returns:
+            (index or None, seconds until one would fit (0 = unknown), shared window used)
+        """
+        limiter = get_shared_rate_limiter()
+        if limiter is not None:
+            try:
+                index, wait_ms, usage = await limiter.acquire(
+                    trackers, estimated_tokens, window_member(request_id, estimated_tokens)
+                )
+                for tracker, (requests, tokens, cooldown_until) in zip(trackers, usage):
+                    tracker.shared_usage = (requests, tokens, cooldown_until / 1000 if cooldown_until else None)
+                return index, max(wait_ms, 0) / 1000, True
+            except Exception as e:
+                logger.warning("llm_shared_rate_limit_unavailable", error=str(e))
+
+        best_index, best_headroom, wait_seconds = None, -1.0, 0.0
+        for index, tracker in enumerate(trackers):
+            tracker.shared_usage = None
+            headroom, ready_in = tracker.check(estimated_tokens)
+            if headroom is None:
+                if ready_in > 0 and (not wait_seconds or ready_in < wait_seconds):
+                    wait_seconds = ready_in
+            elif headroom > best_headroom:
+                best_index, best_headroom = index, headroom
+
+        if best_index is not None:
+            trackers[best_index].reserve(request_id, estimated_tokens)
+        return best_index, wait_seconds, False
+
+    async def _wait_for_capacity(self, timeout: float):
+        """Sleep until timeout or until a request on this worker frees capacity."""
+        if self._capacity_freed is None:
+            self._capacity_freed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._capacity_freed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _notify_capacity_freed(self):
+        if self._capacity_freed is not None:
+            # Wake current waiters; later waiters get a fresh event
+            self._capacity_freed.set()
+            self._capacity_freed = None
+
+    async def _record_usage(self, lease: LLMLease, total_tokens: int):
+        """Settle a lease's reservation with the actual tokens (or count a further call)."""
+        if total_tokens <= 0:
+            return
+
+        if lease.settled:
+            # Another call through the same structured LLM
+            request_id, old_tokens = uuid.uuid4().hex, 0
+        else:
+            request_id, old_tokens = lease.request_id, lease.tokens
+            lease.settled = True
+            lease.tokens = total_tokens
+
+        if lease.shared:
+            limiter = get_shared_rate_limiter()
+            try:
+                await limiter.settle(
+                    lease.tracker,
+                    window_member(request_id, old_tokens) if old_tokens else "",
+                    window_member(request_id, total_tokens),
+                    total_tokens
+                )
+            except Exception as e:
+                logger.warning("llm_usage_settle_failed", provider=lease.tracker.provider_name, error=str(e))
+        elif not old_tokens or not lease.tracker.settle(request_id, total_tokens):
+            lease.tracker.reserve(request_id, total_tokens)
+
+        logger.debug(
+            "llm_usage_recorded",
+            provider=lease.tracker.provider_name,
+            estimated_tokens=old_tokens or None,
+            total_tokens=total_tokens
+        )
+
+        if old_tokens > total_tokens:
+            self._notify_capacity_freed()
+
+    async def _start_cooldown(self, lease: LLMLease):
+        """Cool the lease's account/model down after a 429 (on every worker if shared)."""
+        if lease.shared:
+            try:
+                cooldown_until = await get_shared_rate_limiter().cooldown(lease.tracker, self._cooldown_seconds)
+                usage = lease.tracker.shared_usage or (0, 0, None)
+                lease.tracker.shared_usage = (usage[0], usage[1], cooldown_until / 1000)
+                logger.warning(
+                    "cooldown_triggered",
+                    provider=lease.tracker.provider_name,
+                    model=lease.model,
+                    cooldown_seconds=self._cooldown_seconds,
+                    shared=True
+                )
+                return
+            except Exception as e:
+                logger.warning("llm_shared_cooldown_failed", provider=lease.tracker.provider_name, error=str(e))
+        lease.tracker.start_cooldown(self._cooldown_seconds)
+
+    async def refresh_usage(self):
+        """Read the shared windows of every account (for the monitoring endpoints)."""
+        limiter = get_shared_rate_limiter()
+        if limiter is None:
+            return
+        trackers = [tracker for account in self.accounts
+                    for tracker in (account.gpt4o_tracker, account.gpt4o_mini_tracker)]
+        try:
+            _, _, usage = await limiter.acquire(trackers, 0, "", reserve=False)
+        except Exception as e:
+            logger.warning("llm_shared_rate_limit_unavailable", error=str(e))
+            return
+        for tracker, (requests, tokens, cooldown_until) in zip(trackers, usage):
+            tracker.shared_usage = (requests, tokens, cooldown_until / 1000 if cooldown_until else None)
+
+    @staticmethod
+    def is_rate_limit_error(error: Exception) -> bool:
+        error_str = str(error)
+        return isinstance(error, RateLimitError) or "429" in error_str or "rate_limit" in error_str.lower()
+
     async def ainvoke(
         self,
         messages: List[BaseMessage],
@@ -660,10 +822,10 @@ class UnifiedLLMManager:
         # Estimate tokens
         estimated_tokens = self._estimate_tokens(messages)
 
-        # Find available account with retry
-        account = await self._find_available_account(model, estimated_tokens)
+        # Reserve a slot on the account with the most headroom
+        lease = await self.acquire_account(model, estimated_tokens)
 
-        if not account:
+        if not lease:
             # Log usage stats for all accounts
             usage_stats = [acc.get_usage_stats() for acc in self.accounts]
             logger.error(
@@ -678,30 +840,32 @@ class UnifiedLLMManager:
                 "Please try again in a moment."
             )
 
-        # Create LLM instance for this account
+        account = lease.account
+
+        # Reuse the account's pooled LLM instance
         try:
-            llm = ChatOpenAI(
-                model=model,
-                api_key=account.api_key,
-                temperature=temperature
-            )
+            llm = account.get_chat_model(model, temperature)
 
             # Invoke LLM
             response = await llm.ainvoke(messages, **kwargs)
 
-            # Record usage
-            account.record_request(model, estimated_tokens, self._cooldown_seconds)
+            # Replace the estimate with the usage the API reported
+            total_tokens = get_total_tokens(response)
+            await lease.record_usage(total_tokens)
 
             logger.info(
                 "llm_request_success",
                 account_number=account.account_number,
                 llm_model=model,
-                estimated_tokens=estimated_tokens
+                estimated_tokens=estimated_tokens,
+                total_tokens=total_tokens
             )
 
             return response
 
         except Exception as e:
+            if self.is_rate_limit_error(e):
+                await lease.rate_limited()
             logger.error(
                 "llm_request_failed",
                 account_number=account.account_number,
@@ -744,32 +908,28 @@ class UnifiedLLMManager:
         # Estimate tokens (conservative estimate for structured output)
         estimated_tokens = 1000  # Reasonable estimate for structured responses
 
-        # Find available account with retry
-        account = await self._find_available_account(model, estimated_tokens)
+        # Reserve a slot on the account with the most headroom
+        lease = await self.acquire_account(model, estimated_tokens)
 
-        if not account:
+        if not lease:
             raise Exception(
                 f"All {len(self.accounts)} accounts are at capacity or cooling down for {model}. "
                 "Please try again in a moment."
             )
 
-        # Create LLM instance with structured output
-        llm = ChatOpenAI(
-            model=model,
-            api_key=account.api_key,
-            temperature=temperature
-        )
+        # Pooled LLM instance with structured output
+        llm = lease.account.get_chat_model(model, temperature)
 
         # Apply structured output using function calling method
         # (works with Dict[str, Any] fields, unlike default strict schema mode)
-        structured_llm = llm.with_structured_output(schema, method="function_calling")
-
-        # Record that we're using this account (will record actual tokens after call)
-        account.record_request(model, estimated_tokens, self._cooldown_seconds)
+        # The callback settles the reservation with the actual tokens once called
+        structured_llm = llm.with_structured_output(schema, method="function_calling").with_config(
+            callbacks=[TokenTrackingCallback(lease.tracker.provider_name, lease, schema.__name__)]
+        )
 
         logger.info(
             "structured_llm_created",
-            account_number=account.account_number,
+            account_number=lease.account.account_number,
             llm_model=model,
             schema=schema.__name__
         )
@@ -797,6 +957,21 @@ class UnifiedLLMManager:
         """
         return [account.get_usage_stats(model) for account in self.accounts]
 
+    def get_next_account(self) -> LLMAccountProvider:
+        """
+        Get the next account using round-robin distribution.
+
+        Raises:
+            Exception: If no accounts available
+        """
+        if not self.accounts:
+            raise Exception("No LLM accounts configured")
+
+        # Simple round-robin - get next account
+        account = self.accounts[self._current_index]
+        self._current_index = (self._current_index + 1) % len(self.accounts)
+        return account
+
     def get_next_api_key(self) -> str:
         """
         Get the next available API key using round-robin distribution.
@@ -810,12 +985,7 @@ class UnifiedLLMManager:
         Raises:
             Exception: If no accounts available
         """
-        if not self.accounts:
-            raise Exception("No LLM accounts configured")
-
-        # Simple round-robin - get next account
-        account = self.accounts[self._current_index]
-        self._current_index = (self._current_index + 1) % len(self.accounts)
+        account = self.get_next_account()
 
         logger.info(
             "api_key_distributed",
@@ -825,6 +995,24 @@ class UnifiedLLMManager:
 
         return account.api_key
 
+    def get_openai_client(self) -> AsyncOpenAI:
+        """
+        Pooled AsyncOpenAI client of the next account (round-robin).
+
+        For direct SDK calls (translation, Whisper, TTS) that don't go
+        through ainvoke.
+        """
+        return self.get_next_account().get_openai_client()
+
+    def get_connection_stats(self) -> List[Dict[str, Any]]:
+        """Connection reuse and time-to-first-byte per account."""
+        return [account.get_connection_stats() for account in self.accounts]
+
+    async def aclose(self):
+        """Close every account's connection pool (application shutdown)."""
+        for account in self.accounts:
+            await account.aclose()
+
     def get_account_count(self) -> int:
         """Get the number of validated accounts in the pool."""
         return len(self.accounts)
@@ -847,3 +1035,12 @@ def get_llm_manager() -> UnifiedLLMManager:
         _llm_manager_instance = UnifiedLLMManager()
 
     return _llm_manager_instance
+
+
+async def close_llm_clients():
+    """Close pooled OpenAI connections (application shutdown)."""
+    from app.ai_services.openai_http import close_pooled_http_clients
+
+    if _llm_manager_instance is not None:
+        await _llm_manager_instance.aclose()
+    await close_pooled_http_clients()
@@ -0,0 +1,246 @@
+"""
+Shared LLM Rate Limiter
+=======================
+
+RPM/TPM sliding windows per account+model kept in Redis, so every uvicorn
+worker sees the same usage instead of each assuming it has the full quota.
+
+One Lua call looks at the windows of all candidate accounts for a model,
+reserves a slot (the estimated tokens) on the account with the most headroom
+and, when none fits, returns how long until the first one will. After the
+response the reservation is settled with the actual usage tokens.
+
+Keys (per tracker, e.g. account_1_gpt4o_mini):
+- llm:rate:{tracker}:window   sorted set "{request_id}:{tokens}" -> timestamp (ms)
+- llm:rate:{tracker}:state    hash: tokens (sum over the window), cooldown_until (ms)
+
+Timestamps come from the Redis clock (TIME), so workers on different hosts
+agree on the window.
+
+Usage:
+    limiter = get_shared_rate_limiter()
+    if limiter:
+        index, wait_ms, usage = await limiter.acquire(trackers, 1200, "req-1:1200")
+"""
+
+import os
+from typing import Any, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+LLM_SHARED_RATE_LIMIT = os.getenv("LLM_SHARED_RATE_LIMIT", "true").lower() == "true"
+RATE_WINDOW_MS = 60_000
+RATE_KEY_PREFIX = "llm:rate:"
+
+# Drops entries older than the window from every candidate and picks the
+# account with the most headroom (min of free RPM / free TPM fractions).
+# KEYS: per tracker: window, state
+# ARGV: window_ms, member ("{id}:{tokens}"), tokens, reserve (1/0),
+#       then per tracker: rpm_threshold, tpm_threshold
+# Returns {chosen (1-based, 0 = none), wait_ms (-1 = unknown),
+#          then per tracker: requests, tokens, cooldown_until_ms}
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local member = ARGV[2]
+local tokens = tonumber(ARGV[3])
+local best, best_headroom, wait = 0, -1, -1
+local usage = {}
+
+for i = 1, #KEYS / 2 do
+  local log, state = KEYS[2 * i - 1], KEYS[2 * i]
+  local rpm, tpm = tonumber(ARGV[3 + 2 * i]), tonumber(ARGV[4 + 2 * i])
+
+  local total = tonumber(redis.call('HGET', state, 'tokens') or '0')
+  local expired = redis.call('ZRANGEBYSCORE', log, '-inf', now - window)
+  if #expired > 0 then
+    for _, m in ipairs(expired) do
+      total = total - tonumber(string.match(m, ':(%d+)$'))
+    end
+    if total < 0 then total = 0 end
+    redis.call('ZREMRANGEBYSCORE', log, '-inf', now - window)
+    redis.call('HSET', state, 'tokens', total)
+  end
+
+  local count = redis.call('ZCARD', log)
+  local cooldown = tonumber(redis.call('HGET', state, 'cooldown_until') or '0')
+  usage[#usage + 1] = count
+  usage[#usage + 1] = total
+  usage[#usage + 1] = cooldown
+
+  local free_rpm = rpm - count - 1
+  local free_tpm = tpm - total - tokens
+  local ready_in = 0
+  if cooldown > now then
+    ready_in = cooldown - now
+  elseif free_rpm >= 0 and free_tpm >= 0 then
+    local headroom = math.min(free_rpm / rpm, free_tpm / tpm)
+    if headroom > best_headroom then
+      best, best_headroom = i, headroom
+    end
+  else
+    if free_rpm < 0 then
+      -- the (-free_rpm)th oldest request has to leave the window
+      local entry = redis.call('ZRANGE', log, -free_rpm - 1, -free_rpm - 1, 'WITHSCORES')
+      if entry[2] then ready_in = tonumber(entry[2]) + window - now end
+    end
+    if free_tpm < 0 then
+      if tokens > tpm then
+        ready_in = math.max(ready_in, window)
+      else
+        local freed = 0
+        local entries = redis.call('ZRANGE', log, 0, -1, 'WITHSCORES')
+        for j = 1, #entries, 2 do
+          freed = freed + tonumber(string.match(entries[j], ':(%d+)$'))
+          if freed >= -free_tpm then
+            ready_in = math.max(ready_in, tonumber(entries[j + 1]) + window - now)
+            break
+          end
+        end
+      end
+    end
+  end
+  if ready_in > 0 and (wait < 0 or ready_in < wait) then
+    wait = ready_in
+  end
+end
+
+if best > 0 and ARGV[4] == '1' then
+  local log, state = KEYS[2 * best - 1], KEYS[2 * best]
+  redis.call('ZADD', log, now, member)
+  redis.call('HINCRBY', state, 'tokens', tokens)
+  usage[3 * best - 2] = usage[3 * best - 2] + 1
+  usage[3 * best - 1] = usage[3 * best - 1] + tokens
+  redis.call('PEXPIRE', log, window + 1000)
+  if redis.call('PTTL', state) < window + 1000 then
+    redis.call('PEXPIRE', state, window + 1000)
+  end
+end
+
+local result = {best, wait}
+for _, v in ipairs(usage) do result[#result + 1] = v end
+return result
+"""
+
+# Replaces a reservation's estimate with the actual tokens (same timestamp),
+# or adds a new entry when old_member is empty.
+# KEYS: window, state
+# ARGV: window_ms, old_member, member, tokens
+# Returns 1, or 0 when the reservation already left the window
+_SETTLE_SCRIPT = """
+local window = tonumber(ARGV[1])
+local tokens = tonumber(ARGV[4])
+if ARGV[2] ~= '' then
+  local score = redis.call('ZSCORE', KEYS[1], ARGV[2])
+  if not score then return 0 end
+  redis.call('ZREM', KEYS[1], ARGV[2])
+  redis.call('ZADD', KEYS[1], score, ARGV[3])
+  redis.call('HINCRBY', KEYS[2], 'tokens', tokens - tonumber(string.match(ARGV[2], ':(%d+)$')))
+  return 1
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('HINCRBY', KEYS[2], 'tokens', tokens)
+redis.call('PEXPIRE', KEYS[1], window + 1000)
+if redis.call('PTTL', KEYS[2]) < window + 1000 then
+  redis.call('PEXPIRE', KEYS[2], window + 1000)
+end
+return 1
+"""
+
+# KEYS: state
+# ARGV: cooldown_ms
+# Returns cooldown_until (ms)
+_COOLDOWN_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local ms = tonumber(ARGV[1])
+local until_ms = now + ms
+local current = tonumber(redis.call('HGET', KEYS[1], 'cooldown_until') or '0')
+if current > until_ms then return current end
+redis.call('HSET', KEYS[1], 'cooldown_until', until_ms)
+if redis.call('PTTL', KEYS[1]) < ms + 1000 then
+  redis.call('PEXPIRE', KEYS[1], ms + 1000)
+end
+return until_ms
+"""
+
+
+def window_member(request_id: str, tokens: int) -> str:
+    """Sorted-set member for one request (tokens are parsed back by the scripts)."""
+    return f"{request_id}:{int(tokens)}"
+
+
+class SharedRateLimiter:
+    """Redis-backed RPM/TPM windows; trackers need .key, .rpm_threshold and .tpm_threshold."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self._acquire_script = redis_client.register_script(_ACQUIRE_SCRIPT)
+        self._settle_script = redis_client.register_script(_SETTLE_SCRIPT)
+        self._cooldown_script = redis_client.register_script(_COOLDOWN_SCRIPT)
+
+    @staticmethod
+    def _keys(tracker: Any) -> List[str]:
+        return [f"{RATE_KEY_PREFIX}{tracker.key}:window", f"{RATE_KEY_PREFIX}{tracker.key}:state"]
+
+    async def acquire(
+        self,
+        trackers: Sequence[Any],
+        tokens: int,
+        member: str,
+        reserve: bool = True
+    ) -> Tuple[Optional[int], int, List[Tuple[int, int, int]]]:
+        """
+        Reserve a slot on the tracker with the most headroom.
+
+        Returns:
+            (index into trackers or None, wait_ms until one fits (-1 = unknown),
+             [(requests, tokens, cooldown_until_ms) per tracker])
+        """
+        keys: List[str] = []
+        args: List[Any] = [RATE_WINDOW_MS, member, int(tokens), 1 if reserve else 0]
+        for tracker in trackers:
+            keys.extend(self._keys(tracker))
+            args.extend((int(tracker.rpm_threshold), int(tracker.tpm_threshold)))
+
+        result = await self._acquire_script(keys=keys, args=args)
+        chosen, wait_ms = int(result[0]), int(result[1])
+        values = [int(v) for v in result[2:]]
+        usage = [tuple(values[i:i + 3]) for i in range(0, len(values), 3)]
+        return (chosen - 1 if chosen else None), wait_ms, usage
+
+    async def settle(self, tracker: Any, old_member: str, member: str, tokens: int) -> bool:
+        """Swap a reservation for the actual usage (old_member='' records new usage)."""
+        result = await self._settle_script(
+            keys=self._keys(tracker),
+            args=[RATE_WINDOW_MS, old_member, member, int(tokens)]
+        )
+        return bool(int(result))
+
+    async def cooldown(self, tracker: Any, seconds: float) -> int:
+        """Take the tracker out of rotation on every worker; returns cooldown_until (ms)."""
+        return int(await self._cooldown_script(keys=self._keys(tracker)[1:], args=[int(seconds * 1000)]))
+
+
+_limiter: Optional[SharedRateLimiter] = None
+
+
+def get_shared_rate_limiter() -> Optional[SharedRateLimiter]:
+    """Shared limiter on the app Redis pool, or None (disabled / Redis not initialized)."""
+    global _limiter
+
+    if not LLM_SHARED_RATE_LIMIT:
+        return None
+    if _limiter is None:
+        from app.core.redis import get_redis_client
+        try:
+            _limiter = SharedRateLimiter(get_redis_client())
+        except RuntimeError:
+            return None
+        logger.info("llm_shared_rate_limiter_enabled", window_ms=RATE_WINDOW_MS)
+    return _limiter
@@ -5,10 +5,12 @@ Combines LLM Manager (multi-provider fallback) with Response Caching.
 Provides a simple interface for agents to use.
 """
 
+import time
 from typing import List, Dict, Any, Optional
 from langchain_core.messages import BaseMessage, AIMessage
 import structlog
 
+from app.ai_services.llm_callbacks import get_total_tokens
 from app.ai_services.llm_manager import get_llm_manager
 from app.services.cache_service import get_cache_service
 
@@ -27,7 +29,8 @@ async def invoke_llm_with_cache(
     Invoke LLM with automatic caching and multi-provider fallback.
 
     Workflow:
-    1. Check cache for existing response
+    1. Check cache for existing response (exact query, then similar queries
+       when the semantic tier is enabled)
     2. If cache hit, return cached response
     3. If cache miss, invoke LLM Manager (with auto-fallback)
     4. Cache the response for future use
@@ -99,7 +102,9 @@ async def invoke_llm_with_cache(
         query_preview=query[:50] if query else "N/A"
     )
 
+    started = time.perf_counter()
     response = await llm_manager.ainvoke(messages, **kwargs)
+    llm_latency_ms = (time.perf_counter() - started) * 1000
 
     # Cache the response
     if cache_enabled and query and isinstance(response, AIMessage):
@@ -111,7 +116,9 @@ async def invoke_llm_with_cache(
             },
             category=cache_category,
             user_id=user_id,
-            intent=intent
+            intent=intent,
+            llm_latency_ms=round(llm_latency_ms, 1),
+            llm_tokens=get_total_tokens(response)
         )
 
     return response
@@ -164,6 +171,7 @@ async def get_llm_usage_stats() -> Dict[str, Any]:
     llm_manager = get_llm_manager()
     cache_service = get_cache_service()
 
+    await llm_manager.refresh_usage()
     llm_stats = llm_manager.get_all_usage_stats()
     cache_stats = cache_service.get_cache_stats()
 
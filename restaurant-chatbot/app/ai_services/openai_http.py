@@ -0,0 +1,197 @@
+"""
+Pooled HTTP Clients for OpenAI
+==============================
+
+Long-lived httpx clients shared by every OpenAI call made with one API key,
+so requests reuse warm keep-alive (HTTP/2 when h2 is installed) connections
+instead of paying TCP + TLS setup per call.
+
+Each client records per request:
+- whether the request opened a new connection or reused a pooled one
+- time to first byte (request sent -> response headers received)
+
+as Prometheus metrics (llm_http_requests_total, llm_http_ttfb_seconds) and
+in-process counters (get_stats()).
+
+An httpx.AsyncClient's connections belong to the event loop that opened them,
+so a pool keeps one client per running loop: the main loop, plus the loops of
+thread-pool crews and of sync LLM calls. Objects wrapping the client (OpenAI
+SDK clients, ChatOpenAI) are cached per loop the same way via cached().
+
+Usage:
+    from app.ai_services.openai_http import PooledHTTPClient
+
+    pool = PooledHTTPClient("account_1")
+    client = pool.cached("openai", lambda http: AsyncOpenAI(api_key=key, http_client=http))
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+import httpx
+import structlog
+
+from app.core.metrics import record_llm_http_request
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", "120"))
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "true").lower() == "true"
+
+# Same defaults as the OpenAI SDK (10 min read, 5s connect)
+DEFAULT_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+try:
+    import h2  # noqa: F401  (httpx only needs it importable)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class _LoopClient:
+    """A pool's httpx client for one event loop, plus objects built on it."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.cache: Dict[Hashable, Any] = {}
+
+
+class PooledHTTPClient:
+    """Keep-alive connection pools (one httpx.AsyncClient per event loop) with reuse/TTFB tracking."""
+
+    def __init__(self, label: str, timeout: httpx.Timeout = DEFAULT_TIMEOUT):
+        self.label = label
+        self.timeout = timeout
+        self.http2 = OPENAI_HTTP2 and _HTTP2_AVAILABLE
+        self._stats = {"requests": 0, "new_connections": 0, "reused_connections": 0, "ttfb_total_seconds": 0.0}
+        # Entries go away with their loop
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClient]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        if OPENAI_HTTP2 and not _HTTP2_AVAILABLE:
+            logger.info("openai_http2_unavailable", label=label, reason="h2 not installed, using HTTP/1.1 keep-alive")
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    def _for_loop(self) -> _LoopClient:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside a loop: for the thread's loop the caller is about to run
+            try:
+                loop = asyncio.get_event_loop_policy().get_event_loop()
+            except RuntimeError:
+                return _LoopClient(self._new_client())
+        with self._lock:
+            entry = self._loops.get(loop)
+            if entry is None:
+                entry = self._loops[loop] = _LoopClient(self._new_client())
+                if len(self._loops) > 1:
+                    logger.debug("openai_http_client_for_loop", label=self.label, loops=len(self._loops))
+            return entry
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The httpx client for the calling thread's event loop."""
+        return self._for_loop().client
+
+    def cached(self, key: Hashable, factory: Callable[[httpx.AsyncClient], T]) -> T:
+        """factory(client), built once per event loop and key."""
+        entry = self._for_loop()
+        value = entry.cache.get(key)
+        if value is None:
+            value = entry.cache[key] = factory(entry.client)
+        return value
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        state = {"new_connection": False}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # httpcore only connects when no pooled connection is free
+            if event_name == "connection.connect_tcp.started":
+                state["new_connection"] = True
+
+        request.extensions["trace"] = trace
+        request.extensions["pool_state"] = state
+        request.extensions["pool_started"] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        # Response hooks run once headers arrive (before the body is streamed)
+        request = response.request
+        started = request.extensions.get("pool_started")
+        if started is None:
+            return
+        ttfb = time.perf_counter() - started
+        new_connection = request.extensions["pool_state"]["new_connection"]
+
+        self._stats["requests"] += 1
+        self._stats["new_connections" if new_connection else "reused_connections"] += 1
+        self._stats["ttfb_total_seconds"] += ttfb
+        record_llm_http_request(self.label, request.url.path, new_connection, ttfb)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self._stats
+        requests = stats["requests"]
+        return {
+            "label": self.label,
+            "http2": self.http2,
+            "event_loops": len(self._loops),
+            "requests": requests,
+            "new_connections": stats["new_connections"],
+            "reused_connections": stats["reused_connections"],
+            "reuse_ratio": round(stats["reused_connections"] / requests, 4) if requests else 0.0,
+            "avg_ttfb_ms": round(stats["ttfb_total_seconds"] / requests * 1000, 1) if requests else None,
+        }
+
+    async def aclose(self) -> None:
+        """Close every loop's client (each on its own loop) and forget them."""
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        with self._lock:
+            entries = list(self._loops.items())
+            self._loops.clear()
+        for loop, entry in entries:
+            if loop is current:
+                await entry.client.aclose()
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(entry.client.aclose(), loop)
+
+
+_pools: Dict[str, PooledHTTPClient] = {}
+
+
+def get_pooled_http_client(label: str, timeout: Optional[httpx.Timeout] = None) -> PooledHTTPClient:
+    """Shared pool for a label (e.g. 'voice') outside the LLM account pool."""
+    pool = _pools.get(label)
+    if pool is None:
+        pool = _pools[label] = PooledHTTPClient(label, timeout or DEFAULT_TIMEOUT)
+    return pool
+
+
+def get_pooled_http_stats() -> Dict[str, Dict[str, Any]]:
+    return {label: pool.get_stats() for label, pool in list(_pools.items())}
+
+
+async def close_pooled_http_clients() -> None:
+    for pool in list(_pools.values()):
+        await pool.aclose()
+    _pools.clear()
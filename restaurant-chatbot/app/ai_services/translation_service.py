@@ -0,0 +1,426 @@
+"""
+Translation Service
+===================
+
+Translates the agent's English replies to casual Hinglish/Tanglish.
+
+Most replies are templated (cart summaries, confirmations, quick-reply
+prompts), so each line/sentence is normalized before lookup:
+
+    "Added 2 Masala Dosa to your cart. Total: ₹240 (ORD-8F2A)"
+    -> "Added [[1]] [[2]] to your cart. Total: [[3]] ([[4]])"
+
+Order IDs, prices, menu item names and numbers become placeholders, the
+template's translation is cached (two-tier cache: in-process + Redis) and the
+values are put back afterwards, so one cached translation serves every
+variant.
+
+Templates that miss the cache are translated together in one LLM call
+(numbered lines in, numbered lines out). The response is streamed, so voice
+sessions can start TTS on the first translated sentence.
+
+Styles:
+- chat  Roman script Hinglish/Tanglish (chat UI)
+- tts   native script mixed with English words (text-to-speech)
+
+Usage:
+    from app.ai_services.translation_service import translate_text, stream_translated_sentences
+
+    text = await translate_text(reply, "Hindi")
+    async for sentence in stream_translated_sentences(reply, "Tamil", style="tts"):
+        ...
+"""
+
+import hashlib
+import os
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+TRANSLATION_LANGUAGES = ("Hindi", "Tamil")
+TRANSLATION_MODEL = os.getenv("TRANSLATION_MODEL", "gpt-4o-mini")
+TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", str(7 * 86400)))
+# Bump when the prompts change so old translations aren't reused
+TRANSLATION_PROMPT_VERSION = "1"
+
+_PLACEHOLDER_RE = re.compile(r"\[\[(\d+)\]\]")
+_ORDER_ID_RE = re.compile(r"\bORD-[A-Za-z0-9-]+")
+_PRICE_RE = re.compile(r"(?:₹|Rs\.?|INR)\s?\d[\d,]*(?:\.\d+)?", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"\d+(?:[.,:]\d+)*")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_NUMBERED_LINE_RE = re.compile(r"^\s*(\d+)[.)]\s?(.*)$")
+# Same sentence enders as voice.split_into_sentences
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?।॥|])\s+")
+
+_BATCH_RULES = """
+Input format: numbered lines that belong to one message ("1. ...", "2. ...").
+- Translate every line on its own and output exactly one line per input line,
+  in the same order, with the same number ("2. ...")
+- Keep placeholders like [[1]] exactly as written — they stand for item names, numbers, prices and order IDs"""
+
+_PROMPTS: Dict[Tuple[str, str], str] = {
+    ("chat", "Hindi"): """Translate to casual Hinglish (Hindi-English mix in ROMAN script). Rules:
+- If the text is ALREADY in Hinglish (Roman script Hindi-English mix), return it UNCHANGED
+- Write like a young Indian texts friends — casual, short, natural. NOT formal/literary Hindi.
+- ROMAN script ONLY — NO Devanagari (अ,ब,क). Write Hindi words phonetically: "chahiye", "dikha do", "karo"
+- Use SIMPLE common Hindi words. Prefer "chahiye/chahte ho" over formal "chahenge", "karo" over "karenge",
+  "dikha do" over "dikhana chahenge"
+- Keep lots of English mixed in — "check karo", "add kar do", "menu dekh lo", "items available hain"
+- Phonetic spelling for TTS: double vowels for long sounds (aa, ee, oo). Example: "aap", "nahi", "theek hai"
+- Keep UNCHANGED: food names, numbers, prices (₹), order IDs (ORD-...), emojis, markdown (**bold**)
+- Preserve ALL details (items, prices, totals) — do NOT shorten or drop information
+- Output ONLY the translation, no explanations
+Examples:
+  English: "Would you like to dine in or take away?" → "Aap dine in chahte ho ya take away?"
+  English: "Your cart has 2 items totaling ₹450" → "Aapke cart mein 2 items hain, total ₹450"
+  English: "No items found for dosa" → "Dosa ke liye koi item nahi mila"
+  BAD: "Kya aap kuch popular options dekhna chahenge" (too formal, TTS can't pronounce chahenge)
+  GOOD: "Kya aap popular options check karna chahte ho?"  """,
+
+    ("chat", "Tamil"): """Translate to casual Tanglish (Tamil-English mix in ROMAN script). Rules:
+- If the text is ALREADY in Tanglish (Roman script Tamil-English mix), return it UNCHANGED
+- Write like a young South Indian texts friends — casual, short, natural. NOT formal/literary Tamil.
+- ROMAN script ONLY — NO Tamil script (அ,ஆ,இ). Write Tamil words phonetically as they sound.
+- Use SIMPLE common Tamil words mixed with English. Keep English technical/food words as-is.
+- Phonetic spelling for TTS: spell as spoken. "irukku", "pannunga", "paarunga", "sollunga"
+- Keep UNCHANGED: food names, numbers, prices (₹), order IDs (ORD-...), emojis, markdown (**bold**)
+- Preserve ALL details (items, prices, totals) — do NOT shorten or drop information
+- Output ONLY the translation, no explanations
+Examples:
+  English: "Would you like to dine in or take away?" → "Dine in ah illa take away ah?"
+  English: "Your cart has 2 items totaling ₹450" → "Unga cart la 2 items irukku, total ₹450"
+  English: "No items found for dosa" → "Dosa ku onnum kedaikala"  """,
+
+    ("tts", "Hindi"): """Translate to Hindi-English mix for TTS (text-to-speech) audio output. Rules:
+- Write Hindi words in DEVANAGARI script (आपके, में, हो गये) — TTS pronounces native script correctly
+- Keep English words in ENGLISH script: food names, "cart", "order", "add", "checkout", numbers, prices (₹)
+- Mix both scripts naturally: "आपके cart में 2 Masala Dosa add हो गये, total ₹250"
+- Use casual conversational Hindi — NOT formal/literary
+- Keep it SHORT — this will be spoken aloud
+- Output ONLY the translation
+
+Example:
+English: "I found 3 items matching your search. Would you like to add Masala Dosa to your cart?"
+TTS: "आपकी search में 3 items मिले। Masala Dosa cart में add करना चाहते हो?"  """,
+
+    ("tts", "Tamil"): """Translate to Tamil-English mix for TTS (text-to-speech) audio output. Rules:
+- Write Tamil words in TAMIL script (உங்க, இருக்கு, பண்ணுங்க) — TTS pronounces native script correctly
+- Keep English words in ENGLISH script: food names, "cart", "order", "add", "checkout", numbers, prices (₹)
+- Mix both scripts naturally: "உங்க cart ல 2 Masala Dosa add ஆயிடுச்சு, total ₹250"
+- Use casual conversational Tamil — NOT formal/literary
+- Keep it SHORT — this will be spoken aloud
+- Output ONLY the translation
+
+Example:
+English: "I found 3 items matching your search. Would you like to add Masala Dosa to your cart?"
+TTS: "உங்க search ல 3 items கிடைச்சுச்சு. Masala Dosa cart ல add பண்ணுமா?"  """,
+}
+
+_stats = {
+    "segments": 0,
+    "cache_hits": 0,
+    "passthrough": 0,
+    "llm_calls": 0,
+    "llm_segments": 0,
+    "fallbacks": 0,
+}
+
+# (menu key, compiled item-name pattern)
+_item_pattern: Tuple[Optional[tuple], Optional["re.Pattern"]] = (None, None)
+
+
+class _Segment:
+    """One line/sentence: its normalized template, masked values and result."""
+
+    __slots__ = ("text", "template", "values", "translation")
+
+    def __init__(self, text: str, template: str, values: List[str]):
+        self.text = text
+        self.template = template
+        self.values = values
+        self.translation: Optional[str] = None
+
+    def unmask(self, translated_template: str) -> Optional[str]:
+        """Put the values back; None if the translation lost or invented placeholders."""
+        found = [int(n) for n in _PLACEHOLDER_RE.findall(translated_template)]
+        if sorted(found) != list(range(1, len(self.values) + 1)):
+            return None
+        return _PLACEHOLDER_RE.sub(lambda m: self.values[int(m.group(1)) - 1], translated_template)
+
+
+def _menu_item_pattern() -> Optional["re.Pattern"]:
+    """Regex matching the current branch's menu item names (longest first), rebuilt per menu version."""
+    global _item_pattern
+
+    from app.core.preloader import get_menu_preloader
+
+    preloader = get_menu_preloader()
+    menu = preloader.menu
+    key = (preloader.restaurant_id, preloader.version, len(menu))
+    if _item_pattern[0] != key:
+        names = sorted({item["name"] for item in menu if item.get("name")}, key=len, reverse=True)
+        pattern = None
+        if names:
+            alternatives = "|".join(re.escape(name) for name in names)
+            pattern = re.compile(r"(?<!\w)(?:" + alternatives + r")(?!\w)", re.IGNORECASE)
+        _item_pattern = (key, pattern)
+    return _item_pattern[1]
+
+
+def mask_segment(text: str) -> _Segment:
+    """Replace order IDs, prices, item names and numbers with numbered placeholders."""
+    spans: List[Tuple[int, int]] = []
+
+    def claim(pattern: Optional["re.Pattern"]):
+        if pattern is None:
+            return
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if start < end and all(end <= s or start >= e for s, e in spans):
+                spans.append((start, end))
+
+    claim(_ORDER_ID_RE)
+    claim(_PRICE_RE)
+    try:
+        claim(_menu_item_pattern())
+    except Exception as e:
+        logger.debug("translation_item_mask_skipped", error=str(e))
+    claim(_NUMBER_RE)
+
+    spans.sort()
+    parts: List[str] = []
+    values: List[str] = []
+    position = 0
+    for start, end in spans:
+        values.append(text[start:end])
+        parts.append(text[position:start])
+        parts.append(f"[[{len(values)}]]")
+        position = end
+    parts.append(text[position:])
+    return _Segment(text, "".join(parts), values)
+
+
+def _cache_key(template: str, target_language: str, style: str) -> str:
+    digest = hashlib.md5(template.encode()).hexdigest()
+    return f"translation:v{TRANSLATION_PROMPT_VERSION}:{style}:{target_language}:{digest}"
+
+
+def _needs_translation(segment: _Segment) -> bool:
+    """Blank lines and lines with no words left after masking (prices, emojis) pass through."""
+    return bool(_LETTER_RE.search(_PLACEHOLDER_RE.sub("", segment.template)))
+
+
+async def _prepare(texts: List[str], target_language: str, style: str) -> List[_Segment]:
+    """Mask every segment and fill translations from the cache."""
+    from app.core.two_tier_cache import get_two_tier_cache
+
+    segments = [mask_segment(text) for text in texts]
+    _stats["segments"] += len(segments)
+
+    lookup = []
+    for segment in segments:
+        if _needs_translation(segment):
+            lookup.append(segment)
+        else:
+            segment.translation = segment.text
+            _stats["passthrough"] += 1
+
+    if lookup:
+        try:
+            cached = await get_two_tier_cache("translation").mget(
+                [_cache_key(segment.template, target_language, style) for segment in lookup]
+            )
+        except Exception as e:
+            logger.warning("translation_cache_read_failed", error=str(e))
+            cached = [None] * len(lookup)
+        for segment, translated_template in zip(lookup, cached):
+            if translated_template is not None:
+                segment.translation = segment.unmask(translated_template)
+                if segment.translation is not None:
+                    _stats["cache_hits"] += 1
+    return segments
+
+
+async def _store(segments: List[Tuple[_Segment, str]], target_language: str, style: str):
+    """Cache translated templates (immutable, so no cross-worker invalidation needed)."""
+    if not segments:
+        return
+    from app.core.redis import get_redis_client
+    from app.core.two_tier_cache import get_two_tier_cache
+
+    try:
+        cache = get_two_tier_cache("translation")
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            for segment, translated_template in segments:
+                key = _cache_key(segment.template, target_language, style)
+                pipe.setex(key, TRANSLATION_CACHE_TTL_SECONDS, translated_template)
+                cache.local.set(key, translated_template)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("translation_cache_write_failed", error=str(e))
+
+
+async def _stream_llm_translations(
+    templates: List[str],
+    target_language: str,
+    style: str,
+    client=None
+) -> AsyncIterator[Tuple[int, str]]:
+    """Translate templates in one streamed call; yields (position, translated template) as lines complete."""
+    if client is None:
+        from app.ai_services.llm_manager import get_llm_manager
+        # Pooled client (keep-alive connections shared with the LLM manager)
+        client = get_llm_manager().get_openai_client()
+
+    numbered = "\n".join(f"{n}. {' '.join(template.split())}" for n, template in enumerate(templates, 1))
+    _stats["llm_calls"] += 1
+    _stats["llm_segments"] += len(templates)
+
+    stream = await client.chat.completions.create(
+        model=TRANSLATION_MODEL,
+        messages=[
+            {"role": "system", "content": _PROMPTS[(style, target_language)] + _BATCH_RULES},
+            {"role": "user", "content": numbered}
+        ],
+        temperature=0.3,
+        max_tokens=min(4096, 300 + len(numbered)),
+        stream=True
+    )
+
+    def parse(line: str) -> Optional[Tuple[int, str]]:
+        match = _NUMBERED_LINE_RE.match(line)
+        if not match:
+            return None
+        number = int(match.group(1))
+        if not 1 <= number <= len(templates):
+            return None
+        return number - 1, match.group(2).strip()
+
+    buffer = ""
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        buffer += delta
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            parsed = parse(line)
+            if parsed:
+                yield parsed
+    parsed = parse(buffer)
+    if parsed:
+        yield parsed
+
+
+async def stream_translated_segments(
+    texts: List[str],
+    target_language: str,
+    style: str = "chat",
+    client=None
+) -> AsyncIterator[str]:
+    """
+    Translate segments in order, yielding each as soon as it (and every
+    segment before it) is ready. Cached segments cost no LLM call; the rest
+    share one streamed call. Never raises: untranslatable segments are
+    yielded unchanged.
+    """
+    if target_language not in TRANSLATION_LANGUAGES or (style, target_language) not in _PROMPTS:
+        for text in texts:
+            yield text
+        return
+
+    segments = await _prepare(texts, target_language, style)
+    # Template -> positions still to translate (repeated lines share one LLM line)
+    waiting: Dict[str, List[int]] = {}
+    for position, segment in enumerate(segments):
+        if segment.translation is None:
+            waiting.setdefault(segment.template, []).append(position)
+
+    next_position = 0
+    while next_position < len(segments) and segments[next_position].translation is not None:
+        yield segments[next_position].translation
+        next_position += 1
+
+    if waiting:
+        templates = list(waiting)
+        translated: List[Tuple[_Segment, str]] = []
+        try:
+            async for index, translated_template in _stream_llm_translations(templates, target_language, style, client):
+                positions = waiting.pop(templates[index], None)
+                if not positions:
+                    continue
+                for position in positions:
+                    segments[position].translation = segments[position].unmask(translated_template)
+                if segments[positions[0]].translation is None:
+                    # Lost/invented placeholders: keep English rather than stall the stream
+                    logger.debug("translation_placeholders_mismatch", template=templates[index][:80])
+                    for position in positions:
+                        segments[position].translation = segments[position].text
+                    _stats["fallbacks"] += len(positions)
+                else:
+                    translated.append((segments[positions[0]], translated_template))
+                while next_position < len(segments) and segments[next_position].translation is not None:
+                    yield segments[next_position].translation
+                    next_position += 1
+        except Exception as e:
+            logger.warning("translation_failed", error=str(e), language=target_language, style=style)
+
+        await _store(translated, target_language, style)
+
+    # Anything the LLM skipped or garbled stays in English
+    for segment in segments[next_position:]:
+        if segment.translation is None:
+            _stats["fallbacks"] += 1
+            segment.translation = segment.text
+        yield segment.translation
+
+
+async def translate_segments(
+    texts: List[str],
+    target_language: str,
+    style: str = "chat",
+    client=None
+) -> List[str]:
+    """Translate several segments (one LLM call for all cache misses)."""
+    return [text async for text in stream_translated_segments(texts, target_language, style, client)]
+
+
+async def translate_text(text: str, target_language: str, style: str = "chat", client=None) -> str:
+    """
+    Translate an English reply line by line (markdown layout is kept).
+
+    Returns the original text if the language isn't supported or the
+    translation fails.
+    """
+    if not text or target_language not in TRANSLATION_LANGUAGES:
+        return text
+    lines = text.split("\n")
+    translated = await translate_segments(lines, target_language, style, client)
+    return "\n".join(translated)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences for TTS (same rules as voice.split_into_sentences)."""
+    sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT_RE.split(text) if sentence.strip()]
+    return sentences or [text]
+
+
+async def stream_translated_sentences(
+    text: str,
+    target_language: str,
+    style: str = "tts",
+    client=None
+) -> AsyncIterator[str]:
+    """Translated sentences in order, each yielded as soon as it's ready (for TTS)."""
+    async for sentence in stream_translated_segments(split_sentences(text), target_language, style, client):
+        yield sentence
+
+
+def get_translation_stats() -> Dict[str, int]:
+    stats = dict(_stats)
+    translated = stats["segments"] - stats["passthrough"]
+    stats["cache_hit_rate_percent"] = round(stats["cache_hits"] / translated * 100, 2) if translated else 0
+    return stats
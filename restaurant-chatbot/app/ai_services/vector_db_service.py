@@ -10,7 +10,8 @@ Provides semantic search for menu items with spelling tolerance and synonym unde
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 import structlog
 from pathlib import Path
 
@@ -48,6 +49,8 @@ class VectorDBService:
             }
         )
 
+        self._query_embedder = None
+
         logger.info(
             "VectorDBService initialized",
             collection_count=self.menu_collection.count(),
@@ -55,26 +58,32 @@ class VectorDBService:
             embedding_model="chromadb-default (ONNX all-MiniLM-L6-v2)"
         )
 
+    @staticmethod
+    def _index_entries(items: List[Dict[str, Any]]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """(ids, documents, metadatas) stored for menu items."""
+        ids = []
+        documents = []
+        metadatas = []
+
+        for item in items:
+            ids.append(str(item['id']))
+            documents.append(
+                f"{item['name']}. {item.get('description', '')}. Category: {item['category']}"
+            )
+            metadatas.append({
+                "name": item['name'],
+                "description": item.get('description', ''),
+                "category": item['category'],
+                "price": item['price'],
+            })
+        return ids, documents, metadatas
+
     async def bulk_index_menu_items(self, items: List[Dict[str, Any]]):
         """
         Index multiple menu items. ChromaDB generates embeddings from documents.
         """
         try:
-            ids = []
-            documents = []
-            metadatas = []
-
-            for item in items:
-                ids.append(str(item['id']))
-                documents.append(
-                    f"{item['name']}. {item.get('description', '')}. Category: {item['category']}"
-                )
-                metadatas.append({
-                    "name": item['name'],
-                    "description": item.get('description', ''),
-                    "category": item['category'],
-                    "price": item['price'],
-                })
+            ids, documents, metadatas = self._index_entries(items)
 
             # ChromaDB auto-generates embeddings from documents
             self.menu_collection.add(
@@ -93,6 +102,36 @@ class VectorDBService:
             logger.error("Failed to bulk index menu items", error=str(e), exc_info=True)
             raise
 
+    async def upsert_menu_items(self, items: List[Dict[str, Any]]):
+        """
+        Add or re-embed some menu items (menu deltas), leaving the rest of the
+        collection as is.
+        """
+        if not items:
+            return
+        try:
+            ids, documents, metadatas = self._index_entries(items)
+            self.menu_collection.upsert(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas,
+            )
+            logger.info("Upserted menu items", count=len(items))
+        except Exception as e:
+            logger.error("Failed to upsert menu items", error=str(e), exc_info=True)
+            raise
+
+    def delete_menu_items(self, item_ids: List[str]):
+        """Remove menu items from the collection (ids not indexed are ignored)."""
+        if not item_ids:
+            return
+        try:
+            self.menu_collection.delete(ids=[str(item_id) for item_id in item_ids])
+            logger.info("Deleted menu items", count=len(item_ids))
+        except Exception as e:
+            logger.error("Failed to delete menu items", error=str(e), exc_info=True)
+            raise
+
     async def semantic_search(
         self,
         query: str,
@@ -148,6 +187,36 @@ class VectorDBService:
             logger.error("Semantic search failed", query=query, error=str(e), exc_info=True)
             return []
 
+    def get_embedding_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Load every stored menu embedding as an L2-normalized float32 matrix.
+
+        Returns:
+            (ids, matrix) where matrix[i] is the unit vector for ids[i]
+        """
+        data = self.menu_collection.get(include=["embeddings"])
+        ids = list(data.get("ids") or [])
+        embeddings = data.get("embeddings")
+        if not ids or embeddings is None or len(embeddings) == 0:
+            return [], np.zeros((0, 0), dtype=np.float32)
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-12)
+        return ids, matrix
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """
+        Embed a query with the collection's embedding model (same space as
+        stored documents) and return it as an L2-normalized float32 vector.
+        """
+        if self._query_embedder is None:
+            from chromadb.utils import embedding_functions
+            self._query_embedder = embedding_functions.DefaultEmbeddingFunction()
+
+        vector = np.asarray(self._query_embedder([text])[0], dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
     def clear_collection(self):
         """Clear all items from collection (use for fresh re-indexing)."""
         try:
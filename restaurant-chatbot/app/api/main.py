@@ -25,7 +25,7 @@ from fastapi.responses import FileResponse
 
 from app.core.config import config
 from app.api.middleware.logging import setup_logging
-from app.api.routes import health, config as config_routes, chat, payment, llm_manager, stream, voice
+from app.api.routes import health, config as config_routes, chat, payment, llm_manager, stream, voice, crew_pool
 
 # Setup structured logging
 setup_logging()
@@ -113,6 +113,18 @@ async def lifespan(app: FastAPI):
         redis_service = RedisService()
         logger.info("Redis service initialized (using shared connection pool)")
 
+        # Drop process-local cache entries when other workers change them
+        from app.core.two_tier_cache import start_cache_invalidation_listener
+        await start_cache_invalidation_listener()
+
+        # Route chat WebSocket sends to whichever worker holds the socket
+        from app.core.ws_session_registry import get_ws_session_registry
+        ws_registry = get_ws_session_registry()
+        if ws_registry:
+            from app.api.routes.chat import websocket_manager
+            ws_registry.attach(websocket_manager)
+            await ws_registry.start()
+
         # Load restaurant config into Redis cache (for phone validation)
         from app.services.restaurant_cache_service import load_restaurant_config_to_redis
         restaurant_cache_success = await load_restaurant_config_to_redis()
@@ -141,6 +153,10 @@ async def lifespan(app: FastAPI):
         inventory_sync.start_sync_timer()
         logger.info("Inventory sync service initialized with 5-minute periodic sync")
 
+        # Return abandoned cart holds to stock once their TTL passes
+        from app.services.inventory_cache_service import get_inventory_cache_service
+        get_inventory_cache_service().start_reservation_reaper()
+
         # Initialize menu cache service and load full menu data to Redis
         try:
             from app.services.menu_cache_service import get_menu_cache_service
@@ -204,6 +220,28 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Menu preloader failed (tools will fallback to DB): {str(e)}")
 
+        # Open the asyncpg pool on this loop - threaded tools submit their
+        # queries here (db_pool.run_sync), so it must not be created elsewhere
+        try:
+            from app.core.db_pool import get_async_pool
+            await get_async_pool()
+        except Exception as e:
+            logger.warning(f"asyncpg pool failed to open (will retry on first query): {str(e)}")
+
+        # Apply PetPooja menu change sets (pg_notify) to the snapshots and Redis menu cache
+        try:
+            from app.core.menu_changes import start_menu_change_listener
+            await start_menu_change_listener()
+        except Exception as e:
+            logger.warning(f"Menu change listener failed to start (menus refresh on version check): {str(e)}")
+
+        # Start batched session event writes (flushes every few hundred ms)
+        try:
+            from app.core.session_events import start_session_event_writer
+            await start_session_event_writer()
+        except Exception as e:
+            logger.warning(f"Session event writer failed to start (events will be written inline): {str(e)}")
+
         # Pre-warm LLM connections for instant first message response
         # This eliminates the ~2-3 second delay on first user message
         try:
@@ -239,6 +277,10 @@ async def lifespan(app: FastAPI):
                         logger.info(
                             f"Cleaned up {result['sessions_cleaned']} inactive sessions: {result['removed_sessions']}"
                         )
+                    from app.orchestration.restaurant_crew import sweep_crew_cache
+                    idle_crews = sweep_crew_cache()
+                    if idle_crews > 0:
+                        logger.info(f"Dropped {idle_crews} idle session crews")
                 except Exception as e:
                     logger.error(f"Session cleanup task error: {str(e)}")
 
@@ -278,6 +320,54 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    try:
+        from app.core.menu_changes import stop_menu_change_listener
+        await stop_menu_change_listener()
+    except Exception:
+        pass
+
+    try:
+        from app.core.two_tier_cache import stop_cache_invalidation_listener
+        await stop_cache_invalidation_listener()
+    except Exception:
+        pass
+
+    try:
+        from app.core.ws_session_registry import get_ws_session_registry
+        ws_registry = get_ws_session_registry()
+        if ws_registry:
+            await ws_registry.stop()
+    except Exception:
+        pass
+
+    # Stop audio DSP worker processes
+    try:
+        from app.services.audio_dsp import shutdown_dsp_executor
+        shutdown_dsp_executor()
+    except Exception:
+        pass
+
+    # Close pooled OpenAI connections
+    try:
+        from app.ai_services.llm_manager import close_llm_clients
+        await close_llm_clients()
+    except Exception:
+        pass
+
+    # Flush buffered session events
+    try:
+        from app.core.session_events import stop_session_event_writer
+        await stop_session_event_writer()
+        logger.info("Session event writer stopped")
+    except Exception:
+        pass
+
+    try:
+        from app.core.db_pool import close_async_pool
+        await close_async_pool()
+    except Exception:
+        pass
+
     # Stop inventory sync timer
     try:
         from app.services.inventory_sync_service import get_inventory_sync_service
@@ -287,6 +377,13 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    # Stop inventory reservation reaper
+    try:
+        from app.services.inventory_cache_service import get_inventory_cache_service
+        await get_inventory_cache_service().stop_reservation_reaper()
+    except Exception:
+        pass
+
     # Cancel background tasks
     try:
         if 'cleanup_task_handle' in locals() and cleanup_task_handle is not None:
@@ -363,6 +460,11 @@ class DatabaseReadinessMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(DatabaseReadinessMiddleware)
 
+# Per-restaurant / per-client request limits (shared sliding window in Redis)
+from app.api.middleware.rate_limit import API_RATE_LIMIT_ENABLED, RateLimitMiddleware
+if API_RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # Include routers
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(config_routes.router, prefix="/api/v1", tags=["config"])
@@ -370,6 +472,7 @@ app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
 app.include_router(payment.router, prefix="/api/v1", tags=["payment"])
 # Debug router removed
 app.include_router(llm_manager.router, prefix="/api/v1", tags=["llm-manager"])  # LLM Manager monitoring
+app.include_router(crew_pool.router, prefix="/api/v1", tags=["crew-pool"])  # Crew pool stats & runtime resizing
 app.include_router(stream.router, prefix="/api/v1", tags=["ag-ui-streaming"])  # AG-UI SSE streaming
 app.include_router(voice.router, prefix="/api/v1", tags=["voice"])  # Voice chat WebSocket
 
@@ -0,0 +1,76 @@
+"""
+HTTP Rate Limiting Middleware
+=============================
+Applies the shared sliding-window limiter (app.services.rate_limiter) to REST
+requests, one atomic Redis call per request.
+
+Subject per request:
+- restaurant:{id}   when the request names a restaurant (X-Restaurant-ID
+                    header or restaurant_id query parameter); custom limits
+                    set with RateLimiter.set_custom_limits apply
+- client:{ip}       otherwise (first X-Forwarded-For hop behind nginx)
+
+Rejected requests get 429 with Retry-After; every limited response carries
+X-RateLimit-Limit / X-RateLimit-Remaining. WebSockets are not affected (the
+chat socket limits per session itself).
+"""
+
+import os
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+import structlog
+
+from app.services.rate_limiter import get_rate_limiter
+
+logger = structlog.get_logger(__name__)
+
+API_RATE_LIMIT_ENABLED = os.getenv("API_RATE_LIMIT_ENABLED", "false").lower() == "true"
+
+# Never limited (load balancer health checks)
+EXEMPT_PATHS = frozenset({"/", "/api/v1/health", "/api/v1/health/"})
+
+
+def _rate_limit_subject(request: Request) -> tuple:
+    """(subject, restaurant_id or None) for a request."""
+    restaurant_id = request.headers.get("X-Restaurant-ID") or request.query_params.get("restaurant_id")
+    if restaurant_id:
+        return f"restaurant:{restaurant_id}", restaurant_id
+
+    forwarded = request.headers.get("X-Forwarded-For")
+    client_ip = forwarded.split(",")[0].strip() if forwarded else (request.client.host if request.client else "unknown")
+    return f"client:{client_ip}", None
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Rejects requests over the per-restaurant / per-client limits with 429"""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in EXEMPT_PATHS or request.method == "OPTIONS":
+            return await call_next(request)
+
+        limiter = get_rate_limiter()
+        subject, restaurant_id = _rate_limit_subject(request)
+        limits = limiter.get_limits(restaurant_id) if restaurant_id else limiter.default_limits
+        result = await limiter.check_subject(subject, limiter.windows_for(limits))
+
+        headers = {
+            "X-RateLimit-Limit": str(result["limit"]),
+            "X-RateLimit-Remaining": str(result["remaining"]),
+        }
+        if not result["allowed"]:
+            headers["Retry-After"] = str(result["retry_after"])
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "error": "Too many requests",
+                    "message": f"Rate limit exceeded ({result['limit']} requests per {result['window']}), "
+                               f"retry in {result['retry_after']} seconds"
+                },
+                headers=headers
+            )
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
@@ -4,6 +4,7 @@ WebSocket Chat Endpoints
 Pure agentic AI chat interface for customer interactions
 """
 
+import asyncio
 import json
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
@@ -14,6 +15,7 @@ from sqlalchemy import text
 import structlog
 
 from app.api.middleware.logging import log_chat_message, log_system_event
+from app.core.ws_session_registry import get_ws_session_registry
 
 router = APIRouter()
 logger = structlog.get_logger("api.chat")
@@ -52,7 +54,8 @@ class ChatResponse(BaseModel):
 async def translate_response(text: str, target_language: str) -> str:
     """
     Translate English response to target language (Hinglish/Tanglish).
-    Only translates if response appears to be in English.
+    Templated lines are served from the translation cache; the rest are
+    translated in one LLM call (see translation_service).
 
     Args:
         text: Response text (may be English or already translated)
@@ -61,73 +64,26 @@ async def translate_response(text: str, target_language: str) -> str:
     Returns:
         Translated text, or original if translation not needed/fails
     """
-    if target_language == "English" or target_language not in ["Hindi", "Tamil"]:
-        return text
+    from app.ai_services.translation_service import translate_text
 
-    try:
-        from openai import AsyncOpenAI
-        import os
-
-        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-        if target_language == "Hindi":
-            system_prompt = """Translate to casual Hinglish (Hindi-English mix in ROMAN script). Rules:
-- If the text is ALREADY in Hinglish (Roman script Hindi-English mix), return it UNCHANGED
-- Write like a young Indian texts friends — casual, short, natural. NOT formal/literary Hindi.
-- ROMAN script ONLY — NO Devanagari (अ,ब,क). Write Hindi words phonetically: "chahiye", "dikha do", "karo"
-- Use SIMPLE common Hindi words. Prefer "chahiye/chahte ho" over formal "chahenge", "karo" over "karenge", "dikha do" over "dikhana chahenge"
-- Keep lots of English mixed in — "check karo", "add kar do", "menu dekh lo", "items available hain"
-- Phonetic spelling for TTS: double vowels for long sounds (aa, ee, oo). Example: "aap", "nahi", "theek hai"
-- Keep UNCHANGED: food names, numbers, prices (₹), order IDs (ORD-...), emojis, markdown (**bold**)
-- Preserve ALL details (items, prices, totals) — do NOT shorten or drop information
-- Output ONLY the translation, no explanations
-Examples:
-  English: "Would you like to dine in or take away?" → "Aap dine in chahte ho ya take away?"
-  English: "Your cart has 2 items totaling ₹450" → "Aapke cart mein 2 items hain, total ₹450"
-  English: "No items found for dosa" → "Dosa ke liye koi item nahi mila"
-  BAD: "Kya aap kuch popular options dekhna chahenge" (too formal, TTS can't pronounce chahenge)
-  GOOD: "Kya aap popular options check karna chahte ho?"  """
-        else:  # Tamil
-            system_prompt = """Translate to casual Tanglish (Tamil-English mix in ROMAN script). Rules:
-- If the text is ALREADY in Tanglish (Roman script Tamil-English mix), return it UNCHANGED
-- Write like a young South Indian texts friends — casual, short, natural. NOT formal/literary Tamil.
-- ROMAN script ONLY — NO Tamil script (அ,ஆ,இ). Write Tamil words phonetically as they sound.
-- Use SIMPLE common Tamil words mixed with English. Keep English technical/food words as-is.
-- Phonetic spelling for TTS: spell as spoken. "irukku", "pannunga", "paarunga", "sollunga"
-- Keep UNCHANGED: food names, numbers, prices (₹), order IDs (ORD-...), emojis, markdown (**bold**)
-- Preserve ALL details (items, prices, totals) — do NOT shorten or drop information
-- Output ONLY the translation, no explanations
-Examples:
-  English: "Would you like to dine in or take away?" → "Dine in ah illa take away ah?"
-  English: "Your cart has 2 items totaling ₹450" → "Unga cart la 2 items irukku, total ₹450"
-  English: "No items found for dosa" → "Dosa ku onnum kedaikala"  """
-
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
+    return await translate_text(text, target_language, style="chat")
 
-        translated = response.choices[0].message.content.strip()
-        logger.debug("chat_translation_applied",
-                    original_len=len(text),
-                    translated_len=len(translated),
-                    language=target_language)
-        return translated
 
-    except Exception as e:
-        logger.warning("chat_translation_failed", error=str(e), language=target_language)
-        return text
+# Connection metadata carried over when a session reconnects (on any worker)
+PRESERVED_SESSION_KEYS = (
+    "welcome_sent", "auth_state", "user_id", "user_name", "phone_number",
+    "auth_phone", "auth_form_id", "otp_form_id", "name_form_id", "welcome_msg"
+)
 
 
 class WebSocketManager:
     """
     Manages WebSocket connections for real-time chat
     Admin-ready: Tracks all active connections for monitoring
+
+    Sockets live on the worker that accepted them; with the session registry
+    (app.core.ws_session_registry) sends for sessions held by other workers
+    are routed to them, so no sticky routing is needed.
     """
 
     def __init__(self):
@@ -135,10 +91,10 @@ class WebSocketManager:
         self.active_connections: Dict[str, WebSocket] = {}
         # Track connection metadata for admin analytics
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
-        # Rate limiting: track message timestamps per session
-        self.message_history: Dict[str, list] = {}  # session_id -> [timestamps]
-        self.rate_limit_messages = 10  # Max messages per minute
-        self.rate_limit_window = 60  # Time window in seconds
+        # Rate limiting: per-session sliding window in Redis (shared by all workers)
+        from app.services.rate_limiter import WS_RATE_LIMIT_MESSAGES, WS_RATE_LIMIT_WINDOW_SECONDS
+        self.rate_limit_messages = WS_RATE_LIMIT_MESSAGES  # Max messages per window
+        self.rate_limit_window = WS_RATE_LIMIT_WINDOW_SECONDS  # Time window in seconds
 
     async def connect(self, websocket: WebSocket, session_id: str, tester_id: str = None, restaurant: Dict[str, Any] = None):
         """Accept WebSocket connection and track it"""
@@ -160,20 +116,38 @@ class WebSocketManager:
             raise
 
         self.active_connections[session_id] = websocket
+        connected_at = get_ist_timestamp()
+        client_host = websocket.client.host if websocket.client else "unknown"
+
+        # Take the session over first: a previous owner on another worker
+        # saves its reconnect state before the claim returns
+        registry = get_ws_session_registry()
+        if registry:
+            try:
+                await registry.claim(session_id, {
+                    "connected_at": connected_at,
+                    "restaurant_id": restaurant.get("restaurant_id") if restaurant else None,
+                    "client_host": client_host,
+                })
+            except Exception as e:
+                logger.warning("ws_registry_claim_failed", session_id=session_id, error=str(e))
 
         # Preserve important state from previous connection (for reconnects)
-        existing_metadata = self.connection_metadata.get(session_id, {})
-        preserved_keys = [
-            "welcome_sent", "auth_state", "user_id", "user_name", "phone_number",
-            "auth_phone", "auth_form_id", "otp_form_id", "name_form_id", "welcome_msg"
-        ]
-        preserved_state = {k: existing_metadata[k] for k in preserved_keys if k in existing_metadata}
+        existing_metadata = self.connection_metadata.get(session_id)
+        if existing_metadata is None and registry:
+            # Previous connection may have been on another worker
+            try:
+                existing_metadata = await registry.load_state(session_id)
+            except Exception as e:
+                logger.warning("ws_registry_load_state_failed", session_id=session_id, error=str(e))
+        existing_metadata = existing_metadata or {}
+        preserved_state = {k: existing_metadata[k] for k in PRESERVED_SESSION_KEYS if k in existing_metadata}
 
         metadata = {
-            "connected_at": get_ist_timestamp(),
+            "connected_at": connected_at,
             "last_activity": datetime.now(timezone.utc),  # Track last activity for cleanup
             "client_info": {
-                "host": websocket.client.host if websocket.client else "unknown",
+                "host": client_host,
                 "port": websocket.client.port if websocket.client else "unknown"
             },
             "messages_sent": 0,
@@ -294,6 +268,13 @@ class WebSocketManager:
             # DON'T delete connection_metadata on disconnect!
             # Keep it for reconnects so auth_state, user_id, etc. are preserved
             # Metadata will be overwritten/merged on next connect() call
+            # (the registry keeps a copy for reconnects that land on another worker)
+            registry = get_ws_session_registry()
+            if registry:
+                try:
+                    await registry.release(session_id, self.preserved_state(session_id))
+                except Exception as e:
+                    logger.warning("ws_registry_release_failed", session_id=session_id, error=str(e))
 
     async def send_message(self, session_id: str, message: str, message_type: str = "ai_response"):
         """Send message to specific WebSocket connection"""
@@ -335,6 +316,13 @@ class WebSocketManager:
         This prevents transient send errors from permanently destroying the session.
         """
         if session_id not in self.active_connections:
+            # The socket may be held by another worker
+            registry = get_ws_session_registry()
+            if registry:
+                try:
+                    return await registry.route(session_id, message, message_type, self._sanitize_metadata(metadata))
+                except Exception as e:
+                    logger.warning("ws_registry_route_failed", session_id=session_id, error=str(e))
             logger.debug(f"Cannot send message - session {session_id} not in active connections")
             return False
 
@@ -406,6 +394,45 @@ class WebSocketManager:
                     return (datetime.now(timezone.utc) - start_time).total_seconds()
         return 0.0
 
+    # ==================== SESSION REGISTRY HOOKS ====================
+
+    async def deliver_local(self, session_id: str, message: str, message_type: str, metadata: dict) -> bool:
+        """Send a message routed from another worker (never routed again)."""
+        if session_id not in self.active_connections:
+            return False
+        return await self.send_message_with_metadata(session_id, message, message_type, metadata)
+
+    async def close_local(self, session_id: str, reason: str):
+        """
+        Close this worker's socket for a session that reconnected on another
+        worker. The session lives on there, so disconnect() cleanup (queue
+        clear, inventory release) is skipped, as for a same-worker reconnect.
+        """
+        websocket = self.active_connections.pop(session_id, None)
+        if websocket is None:
+            return
+        # Reconnect state now comes from the registry, not this worker's copy
+        self.connection_metadata.pop(session_id, None)
+        try:
+            await websocket.close(code=1000, reason=reason)
+        except Exception as e:
+            logger.debug(f"Failed to close moved WebSocket (already closed): {str(e)}")
+        logger.info("websocket_session_moved", session_id=session_id)
+
+    def local_session_ids(self):
+        return list(self.active_connections.keys())
+
+    def local_counters(self) -> Dict[str, int]:
+        return {
+            "messages_sent": sum(m.get("messages_sent", 0) for m in self.connection_metadata.values()),
+            "messages_received": sum(m.get("messages_received", 0) for m in self.connection_metadata.values()),
+            "known_sessions": len(self.connection_metadata),
+        }
+
+    def preserved_state(self, session_id: str) -> Dict[str, Any]:
+        metadata = self.connection_metadata.get(session_id, {})
+        return {k: metadata[k] for k in PRESERVED_SESSION_KEYS if k in metadata}
+
     def get_connection_stats(self) -> Dict[str, Any]:
         """Get connection statistics for admin dashboard"""
         return {
@@ -443,33 +470,17 @@ class WebSocketManager:
             "removed_sessions": sessions_to_remove
         }
 
-    def check_rate_limit(self, session_id: str) -> tuple[bool, int]:
+    async def check_rate_limit(self, session_id: str) -> tuple[bool, int]:
         """
         Check if session has exceeded rate limit
         Returns: (is_allowed, messages_remaining)
         """
-        now = datetime.now(timezone.utc).timestamp()
-
-        # Initialize message history for new sessions
-        if session_id not in self.message_history:
-            self.message_history[session_id] = []
-
-        # Remove timestamps outside the time window
-        self.message_history[session_id] = [
-            ts for ts in self.message_history[session_id]
-            if now - ts < self.rate_limit_window
-        ]
+        from app.services.rate_limiter import get_rate_limiter
 
-        # Check if limit exceeded
-        current_count = len(self.message_history[session_id])
-        is_allowed = current_count < self.rate_limit_messages
-        messages_remaining = max(0, self.rate_limit_messages - current_count)
-
-        if is_allowed:
-            # Add current timestamp
-            self.message_history[session_id].append(now)
-
-        return is_allowed, messages_remaining
+        result = await get_rate_limiter().check_session_rate_limit(
+            session_id, self.rate_limit_messages, self.rate_limit_window
+        )
+        return result["allowed"], result["remaining"]
 
 
 # Global WebSocket manager instance
@@ -503,10 +514,8 @@ async def manage_cart_ownership(session_id: str, user_id: str):
                     old_user=existing_owner,
                     new_user=user_id
                 )
-                await db.execute(
-                    text("UPDATE session_cart SET is_active = FALSE, updated_at = NOW() WHERE session_id = :sid AND is_active = TRUE"),
-                    {"sid": session_id}
-                )
+                from app.core.session_events import get_session_tracker
+                await get_session_tracker(session_id).clear_cart()
 
             # Upsert session_state with current user_id
             await db.execute(
@@ -591,6 +600,10 @@ async def chat_endpoint(
     # Connect to WebSocket (with tester_id for testing sessions)
     await websocket_manager.connect(websocket, session_id, tester_id, restaurant)
 
+    # Serve this connection's menu lookups from the restaurant's branch snapshot
+    from app.core.preloader import use_menu_branch
+    await use_menu_branch(restaurant["restaurant_id"])
+
     try:
         # Initialize session with existing services
         from app.services.session_manager import SessionManager
@@ -1170,9 +1183,9 @@ async def chat_endpoint(
                 # Check for existing cart items (from PostgreSQL session_cart)
                 has_cart_items = False
                 try:
-                    from app.core.session_events import get_sync_session_tracker
-                    tracker = get_sync_session_tracker(session_id)
-                    cart_data = tracker.get_cart_summary()
+                    from app.core.session_events import get_session_tracker
+                    tracker = get_session_tracker(session_id)
+                    cart_data = await tracker.get_cart_summary()
                     has_cart_items = bool(cart_data.get("items"))
                     if has_cart_items:
                         logger.info("welcome_generating_with_cart_items", session_id=session_id)
@@ -1262,7 +1275,6 @@ async def chat_endpoint(
                 and not payment_state.get("ws_delivered")
             ):
                 from app.core.agui_events import PaymentSuccessEvent
-                import json as _json
 
                 event = PaymentSuccessEvent(
                     order_id=payment_state.get("order_id", ""),
@@ -1276,7 +1288,7 @@ async def chat_endpoint(
                     ]
                 )
 
-                event_data = _json.loads(event.to_json())
+                event_data = event.to_dict()
                 sent = await websocket_manager.send_message_with_metadata(
                     session_id=session_id,
                     message="",
@@ -1374,7 +1386,10 @@ async def chat_endpoint(
 
                             if pairs:
                                 try:
-                                    result = batch_add_tool.run(items_with_quantities=", ".join(pairs))
+                                    # Tools are sync and block on DB calls: keep them off the loop
+                                    result = await asyncio.to_thread(
+                                        batch_add_tool.run, items_with_quantities=", ".join(pairs)
+                                    )
                                 except Exception as e:
                                     logger.error("direct_add_to_cart_failed", error=str(e))
                                     result = "Failed to add items to cart"
@@ -1403,29 +1418,17 @@ async def chat_endpoint(
                         item_name = form_data.get("item_name", "")
                         new_quantity = int(form_data.get("quantity", 1))
                         if item_name and new_quantity > 0:
-                            from app.core.db_pool import SyncDBConnection
+                            from app.core.session_events import get_session_tracker
                             from app.core.agui_events import emit_cart_data
 
-                            with SyncDBConnection() as conn:
-                                with conn.cursor() as cur:
-                                    cur.execute(
-                                        """UPDATE session_cart
-                                           SET quantity = %s, updated_at = NOW()
-                                           WHERE session_id = %s AND LOWER(item_name) = LOWER(%s) AND is_active = TRUE""",
-                                        (new_quantity, session_id, item_name)
-                                    )
-                                    conn.commit()
-
-                                    # Get updated cart
-                                    cur.execute("SELECT * FROM get_session_cart(%s)", (session_id,))
-                                    columns = [desc[0] for desc in cur.description] if cur.description else []
-                                    items_list = [dict(zip(columns, row)) for row in cur.fetchall()]
-
-                                    cur.execute("SELECT get_cart_total(%s)", (session_id,))
-                                    total_row = cur.fetchone()
-                                    new_total = float(total_row[0]) if total_row and total_row[0] else 0.0
+                            tracker = get_session_tracker(session_id)
+                            cart_item = await tracker.find_cart_item(item_name)
+                            if cart_item:
+                                cart_data = await tracker.update_quantity(cart_item["item_id"], new_quantity)
+                            else:
+                                cart_data = await tracker.get_cart_summary()
 
-                            emit_cart_data(session_id, items_list, new_total)
+                            emit_cart_data(session_id, cart_data.get("items", []), cart_data.get("total", 0.0))
                             from app.core.agui_events import flush_pending_events
                             flush_pending_events(session_id)
                             await stream_agui_events_to_websocket(session_id, websocket_manager, timeout=1.0)
@@ -1436,29 +1439,17 @@ async def chat_endpoint(
                         # Uses SQL session_cart (same store as AI agent tools)
                         item_name = form_data.get("item_name", "")
                         if item_name:
-                            from app.core.db_pool import SyncDBConnection
+                            from app.core.session_events import get_session_tracker
                             from app.core.agui_events import emit_cart_data
 
-                            with SyncDBConnection() as conn:
-                                with conn.cursor() as cur:
-                                    cur.execute(
-                                        """UPDATE session_cart
-                                           SET is_active = FALSE, updated_at = NOW()
-                                           WHERE session_id = %s AND LOWER(item_name) = LOWER(%s) AND is_active = TRUE""",
-                                        (session_id, item_name)
-                                    )
-                                    conn.commit()
-
-                                    # Get updated cart
-                                    cur.execute("SELECT * FROM get_session_cart(%s)", (session_id,))
-                                    columns = [desc[0] for desc in cur.description] if cur.description else []
-                                    items_list = [dict(zip(columns, row)) for row in cur.fetchall()]
-
-                                    cur.execute("SELECT get_cart_total(%s)", (session_id,))
-                                    total_row = cur.fetchone()
-                                    new_total = float(total_row[0]) if total_row and total_row[0] else 0.0
+                            tracker = get_session_tracker(session_id)
+                            cart_item = await tracker.find_cart_item(item_name)
+                            if cart_item:
+                                cart_data = await tracker.remove_from_cart(cart_item["item_id"])
+                            else:
+                                cart_data = await tracker.get_cart_summary()
 
-                            emit_cart_data(session_id, items_list, new_total)
+                            emit_cart_data(session_id, cart_data.get("items", []), cart_data.get("total", 0.0))
                             from app.core.agui_events import flush_pending_events
                             flush_pending_events(session_id)
                             await stream_agui_events_to_websocket(session_id, websocket_manager, timeout=1.0)
@@ -1466,7 +1457,7 @@ async def chat_endpoint(
                 # ========================================================================
 
                 # Check rate limit before processing
-                is_allowed, messages_remaining = websocket_manager.check_rate_limit(session_id)
+                is_allowed, messages_remaining = await websocket_manager.check_rate_limit(session_id)
 
                 if not is_allowed:
                     # Rate limit exceeded - send warning message
@@ -1543,7 +1534,6 @@ async def chat_endpoint(
                                 metadata={"direct_action": "payment_cancelled"}
                             )
                             # Show helpful quick replies after cancellation
-                            import json as _json
                             from app.core.agui_events import QuickRepliesEvent
                             _cancel_qr = QuickRepliesEvent(replies=[
                                 {"label": "🛒 View Cart", "action": "view cart"},
@@ -1554,7 +1544,7 @@ async def chat_endpoint(
                                 session_id=session_id,
                                 message="",
                                 message_type="agui_event",
-                                metadata={"agui": _json.loads(_cancel_qr.to_json())}
+                                metadata={"agui": _cancel_qr.to_dict()}
                             )
                             logger.info("payment_cancelled_by_user", session_id=session_id, order_id=_pay_order_id)
                             continue
@@ -1588,7 +1578,6 @@ async def chat_endpoint(
                             metadata={"direct_action": "payment_pending_confirm_cancel"}
                         )
                         # Show quick reply buttons for cancel / complete payment
-                        import json as _json
                         from app.core.agui_events import QuickRepliesEvent
                         _confirm_qr = QuickRepliesEvent(replies=[
                             {"label": "Yes, cancel payment", "action": "yes cancel"},
@@ -1598,7 +1587,7 @@ async def chat_endpoint(
                             session_id=session_id,
                             message="",
                             message_type="agui_event",
-                            metadata={"agui": _json.loads(_confirm_qr.to_json())}
+                            metadata={"agui": _confirm_qr.to_dict()}
                         )
                         logger.info("payment_pending_cancel_prompt", session_id=session_id, order_id=_pay_order_id)
                         continue
@@ -1803,9 +1792,8 @@ async def stream_agui_events_to_websocket(
                 if session_id not in websocket_mgr.active_connections:
                     break
 
-                # Convert event to JSON and send via WebSocket
-                event_json = event.to_json()
-                event_data = json.loads(event_json)
+                # Event fields as a dict (serialized once by the WebSocket send)
+                event_data = event.to_dict()
 
                 # Send as special message type for AG-UI events
                 # Include session_id in metadata for frontend validation
@@ -2033,9 +2021,20 @@ async def get_chat_stats():
     try:
         stats = websocket_manager.get_connection_stats()
 
+        # Connections on every worker (this worker's are listed above)
+        registry = get_ws_session_registry()
+        if registry:
+            try:
+                stats["cluster"] = await registry.get_cluster_stats()
+            except Exception as e:
+                logger.warning("ws_registry_stats_failed", error=str(e))
+
         log_system_event(
             "chat_stats_requested",
-            {"active_connections": stats["total_active_connections"]}
+            {
+                "active_connections": stats["total_active_connections"],
+                "cluster_connections": stats.get("cluster", {}).get("total_connections")
+            }
         )
 
         return {
@@ -2066,9 +2065,22 @@ async def get_monitoring_status():
     try:
         # Get WebSocket stats
         ws_stats = websocket_manager.get_connection_stats()
+        cluster_stats = None
+        registry = get_ws_session_registry()
+        if registry:
+            try:
+                cluster_stats = await registry.get_cluster_stats()
+            except Exception as e:
+                logger.warning("ws_registry_stats_failed", error=str(e))
 
         # Get database pool stats
         from app.core.database import db_manager
+        from app.core.two_tier_cache import get_two_tier_cache_stats
+        from app.core.preloader import get_menu_snapshot_stats
+        from app.core.menu_changes import get_menu_change_listener_stats
+        from app.ai_services.translation_service import get_translation_stats
+        from app.orchestration.restaurant_crew import get_crew_cache_stats
+        from app.core.agui_event_bus import get_event_bus_stats
 
         db_stats = {}
         if db_manager.engine:
@@ -2102,9 +2114,16 @@ async def get_monitoring_status():
                     "total_connections": ws_stats["total_active_connections"],
                     "active_sessions": active_count,
                     "idle_sessions": idle_count,
-                    "session_ids": ws_stats["active_sessions"]
+                    "session_ids": ws_stats["active_sessions"],
+                    "cluster": cluster_stats
                 },
                 "database": db_stats,
+                "cache_tiers": get_two_tier_cache_stats(),
+                "menu_snapshots": get_menu_snapshot_stats(),
+                "menu_changes": get_menu_change_listener_stats(),
+                "translation": get_translation_stats(),
+                "crew_cache": get_crew_cache_stats(),
+                "agui_events": get_event_bus_stats(),
                 "health": "healthy" if db_stats.get("total_available", 0) > 5 else "degraded"
             }
         }
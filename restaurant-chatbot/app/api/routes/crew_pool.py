@@ -0,0 +1,57 @@
+"""
+Crew Pool Admin API
+===================
+Runtime inspection and resizing of the pre-warmed CrewAI pool
+"""
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+from app.services.crew_pool import get_crew_pool
+
+router = APIRouter()
+
+
+class CrewPoolResizeRequest(BaseModel):
+    """Request model for resizing the crew pool"""
+    size: int = Field(..., ge=1, le=200, description="Target number of crews")
+    low_water_mark: Optional[int] = Field(None, ge=0, description="Replenish when idle crews drop below this")
+
+
+@router.get("/crew-pool/status")
+async def get_crew_pool_status() -> Dict[str, Any]:
+    """
+    Get crew pool statistics.
+
+    Returns idle/active counts, checkout wait times, timeouts and evictions.
+    """
+    try:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "stats": get_crew_pool().get_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get crew pool status: {str(e)}")
+
+
+@router.post("/crew-pool/resize")
+async def resize_crew_pool(request: CrewPoolResizeRequest) -> Dict[str, Any]:
+    """
+    Grow or shrink the crew pool at runtime.
+
+    Growing builds new crews in the background; shrinking drops idle crews
+    immediately and checked-out crews when they are returned.
+    """
+    try:
+        stats = await get_crew_pool().resize(request.size, low_water_mark=request.low_water_mark)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "message": f"Crew pool resized to {request.size}",
+            "stats": stats
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to resize crew pool: {str(e)}")
@@ -27,6 +27,7 @@ async def get_llm_manager_status() -> Dict[str, Any]:
     """
     try:
         manager = get_llm_manager()
+        await manager.refresh_usage()
 
         # Get all account statistics
         all_stats = manager.get_all_usage_stats()
@@ -98,7 +99,8 @@ async def get_llm_manager_status() -> Dict[str, Any]:
                     "health_status": "healthy" if gpt4o_mini_available > 0 else "critical"
                 }
             },
-            "accounts": all_stats
+            "accounts": all_stats,
+            "connections": manager.get_connection_stats()
         }
 
     except Exception as e:
@@ -118,6 +120,7 @@ async def get_account_details(account_number: int) -> Dict[str, Any]:
     """
     try:
         manager = get_llm_manager()
+        await manager.refresh_usage()
 
         if account_number < 1 or account_number > len(manager.accounts):
             raise HTTPException(
@@ -165,6 +168,7 @@ async def get_model_stats(model_name: str) -> Dict[str, Any]:
         normalized_model = "gpt-4o" if "mini" not in model_name.lower() else "gpt-4o-mini"
 
         manager = get_llm_manager()
+        await manager.refresh_usage()
         model_stats = manager.get_model_usage_stats(normalized_model)
 
         # Calculate aggregates
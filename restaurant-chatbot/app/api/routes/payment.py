@@ -370,7 +370,6 @@ async def payment_callback(
                         try:
                             from app.core.agui_events import PaymentSuccessEvent
                             from app.api.routes.chat import websocket_manager
-                            import json as _json
 
                             order_number = str(order.order_invoice_number) if order and order.order_invoice_number else str(payment_order.order_id)
                             amount = float(payment_order.order_amount) if payment_order.order_amount else 0
@@ -389,7 +388,7 @@ async def payment_callback(
                             )
 
                             # Send directly via WebSocket (same format as agui_task)
-                            event_data = _json.loads(event.to_json())
+                            event_data = event.to_dict()
                             ws_sent = await websocket_manager.send_message_with_metadata(
                                 session_id=session_id,
                                 message="",
@@ -547,6 +546,10 @@ async def payment_callback(
             payment_link_id=razorpay_payment_link_id,
             source=source
         )
+        if session_id:
+            # Return the stock held for the order
+            from app.services.inventory_cache_service import settle_checkout_hold
+            settle_checkout_hold(session_id, sold=False)
 
         return HTMLResponse(content="""
             <!DOCTYPE html>
@@ -625,6 +628,9 @@ async def payment_callback(
             status=razorpay_payment_link_status,
             source=source
         )
+        if session_id:
+            from app.services.inventory_cache_service import settle_checkout_hold
+            settle_checkout_hold(session_id, sold=False)
 
         return HTMLResponse(content="""
             <!DOCTYPE html>
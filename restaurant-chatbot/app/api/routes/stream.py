@@ -10,7 +10,7 @@ Provides real-time visibility into agent processing:
 - State updates
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
@@ -123,17 +123,19 @@ async def stream_chat(request: StreamChatRequest):
 
 
 @router.get("/chat/stream/{session_id}")
-async def stream_events_endpoint(session_id: str):
+async def stream_events_endpoint(session_id: str, last_event_id: Optional[str] = Header(None)):
     """
     SSE endpoint for connecting to existing session stream.
 
     Use this when processing is initiated elsewhere (e.g., WebSocket)
-    and you want to receive AG-UI events via SSE.
+    and you want to receive AG-UI events via SSE. On reconnect the browser
+    sends Last-Event-ID and the missed events are replayed first; with
+    AGUI_EVENT_BUS=redis this works on any worker.
     """
-    logger.info("stream_events_connect", session_id=session_id)
+    logger.info("stream_events_connect", session_id=session_id, last_event_id=last_event_id)
 
     return StreamingResponse(
-        stream_events(session_id, timeout=120.0),
+        stream_events(session_id, timeout=120.0, last_event_id=last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
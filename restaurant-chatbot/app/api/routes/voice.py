@@ -12,39 +12,54 @@ from typing import Optional
 import structlog
 import asyncio
 import base64
-import collections
 import io
+from contextlib import aclosing
 import json
 import os
 import numpy as np
+from httpx import Timeout
 from openai import AsyncOpenAI
 
 # Import VAD abstraction layer
-from app.services.vad import get_vad, detect_speech, VAD_ENGINE
+from app.services.vad import VAD_ENGINE
+from app.services.audio_dsp import PCMBuffer, PCMRingBuffer, get_vad_batcher, run_preprocess
+from app.services.tts_pipeline import SentenceTTSPipeline, get_phrase_cache, synthesize_phrase
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
 # OpenAI client for Whisper (STT) and TTS
+# Longer timeout for voice operations (transcription can be slow on poor networks)
+_VOICE_TIMEOUT = Timeout(60.0, connect=30.0)  # 60s total, 30s to connect
+_voice_client: Optional[AsyncOpenAI] = None
+
+
 async def get_openai_client():
-    import os
-    # Try to use dedicated voice API key first
-    voice_api_key = os.getenv("OPENAI_VOICE_API_KEY")
+    """
+    Pooled AsyncOpenAI client for voice calls.
 
-    # Use longer timeout for voice operations (transcription can be slow on poor networks)
-    from httpx import Timeout
-    voice_timeout = Timeout(60.0, connect=30.0)  # 60s total, 30s to connect
+    Clients are long-lived (keep-alive connections are reused across
+    transcriptions and TTS chunks); with_options() only copies settings.
+    """
+    global _voice_client
 
+    # Try to use dedicated voice API key first
+    voice_api_key = os.getenv("OPENAI_VOICE_API_KEY")
     if voice_api_key:
-        logger.debug("Using dedicated voice API key")
-        return AsyncOpenAI(api_key=voice_api_key, timeout=voice_timeout)
+        if _voice_client is None:
+            from app.ai_services.openai_http import get_pooled_http_client
+            logger.debug("Using dedicated voice API key")
+            _voice_client = AsyncOpenAI(
+                api_key=voice_api_key,
+                http_client=get_pooled_http_client("voice").client,
+                timeout=_VOICE_TIMEOUT
+            )
+        return _voice_client
 
-    # Fallback to regular API key rotation
+    # Fallback to regular API key rotation (account connection pools)
     from app.ai_services.llm_manager import get_llm_manager
-    llm_manager = get_llm_manager()
-    api_key = llm_manager.get_next_api_key()
-    return AsyncOpenAI(api_key=api_key, timeout=voice_timeout)
+    return get_llm_manager().get_openai_client().with_options(timeout=_VOICE_TIMEOUT)
 
 
 @router.websocket("/ws/voice/{session_id}")
@@ -88,25 +103,27 @@ async def voice_chat_websocket(
     from app.core.agui_events import set_voice_mode
     # set_voice_mode(session_id, websocket)  # DISABLED - was breaking chat cards
 
-    # Load VAD model (configurable via VAD_ENGINE env var)
-    vad = get_vad()
+    # VAD runs batched across sessions on its own thread (configurable via VAD_ENGINE env var);
+    # this call's stream state stays separate from other callers'
+    vad_batcher = get_vad_batcher()
+    vad_session = vad_batcher.create_session()
     logger.info(f"Using VAD engine: {VAD_ENGINE}", session_id=session_id)
 
-    # Audio buffer for VAD processing
-    audio_buffer = []  # List of PCM chunks
-    speech_buffer = []  # Buffer for detected speech
-    # Pre-buffer: rolling window of recent chunks (10 × 32ms = 320ms lookback)
+    VAD_CHUNK_SIZE = 512  # Chunk size (32ms at 16kHz)
+
+    # Preallocated sample buffers (no per-chunk bytes objects)
+    speech_buffer = PCMBuffer()  # Buffer for detected speech
+    # Pre-buffer: rolling window of recent audio (10 × 32ms = 320ms lookback)
     # Captures soft speech onsets (e.g., "I" in "I like") that fall below
     # SPEECH_THRESHOLD and would otherwise be clipped by the VAD.
-    pre_buffer = collections.deque(maxlen=10)
+    pre_buffer = PCMRingBuffer(10 * VAD_CHUNK_SIZE)
     is_speaking = False
     silence_frames = 0  # Counter for consecutive silent frames (hangover mechanism)
     # Mutable state container for sharing between main loop and background tasks
     # stop_requested: set by client control message to cancel TTS mid-stream
+    # tts_pipeline: the reply currently being spoken (stopped on stop_speech)
     # consecutive_hallucinations: prevents TTS echo feedback loops
-    state = {"is_processing": False, "stop_requested": False, "consecutive_hallucinations": 0}
-    SAMPLE_RATE = 16000  # All VAD engines work at 16kHz
-    VAD_CHUNK_SIZE = 512  # Chunk size (32ms at 16kHz)
+    state = {"is_processing": False, "stop_requested": False, "tts_pipeline": None, "consecutive_hallucinations": 0}
 
     # VAD Sensitivity Settings (configurable via env vars)
     # SPEECH_THRESHOLD: Probability above which speech is detected (default 0.6)
@@ -141,21 +158,19 @@ async def voice_chat_websocket(
                     if action == "stop_speech":
                         # Client requested to stop AI speech (user clicked Stop button)
                         state["stop_requested"] = True
+                        if state["tts_pipeline"] is not None:
+                            state["tts_pipeline"].stop()
                         logger.info("voice_stop_requested", session_id=session_id)
                     continue
 
                 if message["type"] == "audio_chunk":
                     # Decode base64 audio (PCM 16-bit)
                     audio_data = base64.b64decode(message["audio"])
-                    audio_buffer.append(audio_data)
                     # Note: Removed per-chunk logging to reduce log spam
-
-                    # Convert to float32 for VAD (all engines use float32 input)
                     audio_int16 = np.frombuffer(audio_data, dtype=np.int16)
-                    audio_float32 = audio_int16.astype(np.float32) / 32768.0
 
-                    # Run VAD on chunk (uses configured engine)
-                    speech_prob = vad.detect_speech(audio_float32, SAMPLE_RATE)
+                    # Run VAD on chunk (float32 conversion + configured engine, off the loop)
+                    speech_prob = await vad_batcher.detect(vad_session, audio_int16)
 
                     # Speech detection with hangover mechanism
                     # Prevents premature cutoff during brief pauses in speech
@@ -167,51 +182,51 @@ async def voice_chat_websocket(
                             # Speech started — seed with pre-buffer to recover
                             # soft onsets (e.g. "I" in "I like to take away")
                             is_speaking = True
-                            speech_buffer = list(pre_buffer)
+                            speech_buffer.clear()
+                            pre_buffer.drain_into(speech_buffer)
                             await websocket.send_json({"type": "speech_started"})
-                            logger.info("voice_speech_started", session_id=session_id, language=language, pre_buffer_chunks=len(speech_buffer))
+                            logger.info("voice_speech_started", session_id=session_id, language=language, pre_buffer_samples=len(speech_buffer))
 
                         # Add to speech buffer
-                        speech_buffer.append(audio_data)
+                        speech_buffer.append(audio_int16)
 
                     elif speech_prob < SILENCE_THRESHOLD:
                         # Clear silence detected
                         if is_speaking:
                             # Still collecting speech, but counting silence frames
                             silence_frames += 1
-                            speech_buffer.append(audio_data)  # Keep buffering during hangover
+                            speech_buffer.append(audio_int16)  # Keep buffering during hangover
 
                             if silence_frames >= SILENCE_FRAMES_REQUIRED:
                                 # Enough silence - speech truly ended
                                 is_speaking = False
                                 silence_frames = 0
                                 await websocket.send_json({"type": "speech_ended"})
-                                logger.info("voice_speech_ended", session_id=session_id, buffer_chunks=len(speech_buffer))
+                                logger.info("voice_speech_ended", session_id=session_id, buffer_samples=len(speech_buffer))
 
                                 # Process speech segment in background task
-                                if speech_buffer and not state["is_processing"]:
+                                if len(speech_buffer) and not state["is_processing"]:
                                     state["is_processing"] = True
                                     asyncio.create_task(
                                         process_speech_segment(
                                             websocket,
-                                            speech_buffer.copy(),
+                                            speech_buffer.take(),
                                             session_id,
                                             language,
                                             state
                                         )
                                     )
-                                    speech_buffer = []
                                 elif state["is_processing"]:
                                     logger.debug("Accumulating speech while processing", session_id=session_id)
                     else:
                         # Ambiguous zone (between SILENCE_THRESHOLD and SPEECH_THRESHOLD)
                         # Keep buffering if speaking, don't increment silence counter
                         if is_speaking:
-                            speech_buffer.append(audio_data)
+                            speech_buffer.append(audio_int16)
 
                     # Update pre-buffer AFTER VAD decision so it contains prior
                     # chunks (not the current one) when speech onset is detected.
-                    pre_buffer.append(audio_data)
+                    pre_buffer.append(audio_int16)
 
             except WebSocketDisconnect:
                 logger.info("voice_websocket_disconnected", session_id=session_id)
@@ -261,31 +276,32 @@ async def _safe_send(websocket: WebSocket, data: dict) -> bool:
 
 async def process_speech_segment(
     websocket: WebSocket,
-    speech_buffer: list,
+    speech_samples: np.ndarray,
     session_id: str,
     language: str,
     state: dict = None
 ):
     """
     Process detected speech segment:
-    1. Combine chunks
+    1. Preprocess (denoise/trim/normalize in the DSP process pool)
     2. Transcribe with Whisper
     3. Process with chat agent
     4. Synthesize response
     5. Stream back to client
+
+    Args:
+        speech_samples: PCM16 samples of the utterance (int16 array)
     """
     try:
-        # Combine audio chunks
-        combined_audio = b''.join(speech_buffer)
-
         # Minimum 0.5 second of audio to allow short confirmations ("yes", "no", "okay")
         # At 16kHz mono 16-bit: 16000 Hz * 0.5 sec * 2 bytes = 16000 bytes
         MIN_AUDIO_BYTES = 16000
-        if len(combined_audio) < MIN_AUDIO_BYTES:
+        audio_bytes = speech_samples.nbytes
+        if audio_bytes < MIN_AUDIO_BYTES:
             logger.debug(
                 "voice_segment_too_short",
                 session_id=session_id,
-                length=len(combined_audio),
+                length=audio_bytes,
                 threshold=MIN_AUDIO_BYTES
             )
             # Reset state before returning
@@ -294,53 +310,15 @@ async def process_speech_segment(
             return  # Too short, probably noise
 
         # ----- Audio preprocessing pipeline -----
-        # 1. Spectral noise reduction  2. Silence trimming  3. Normalization
-        import noisereduce as nr
-
-        samples = np.frombuffer(combined_audio, dtype=np.int16).astype(np.float32)
-
-        # Step 1: Spectral noise reduction — remove stationary background noise
-        # (fan, AC, laptop hum) while preserving speech frequencies
-        cleaned = nr.reduce_noise(
-            y=samples,
-            sr=16000,
-            stationary=True,
-            prop_decrease=0.75,
-        )
-
-        # Step 2: Silence trimming — strip leading/trailing silence
-        # Prevents Whisper hallucinations on quiet sections at start/end
-        silence_threshold = 500  # amplitude threshold for "silence"
-        abs_signal = np.abs(cleaned)
-        voiced = np.where(abs_signal > silence_threshold)[0]
-        if len(voiced) > 0:
-            # Keep a small margin (800 samples = 50ms) around speech
-            margin = 800
-            start = max(0, voiced[0] - margin)
-            end = min(len(cleaned), voiced[-1] + margin)
-            cleaned = cleaned[start:end]
-        else:
-            # All silence after denoising — skip
-            logger.debug("voice_segment_all_silence_after_denoise", session_id=session_id)
-            if state is not None:
-                state["is_processing"] = False
-            return
-
-        # Skip if trimmed audio is too short (< 0.25s at 16kHz)
-        # Allows short confirmations while filtering very brief noise
-        if len(cleaned) < 4000:
-            logger.debug("voice_segment_too_short_after_trim", session_id=session_id, samples=len(cleaned))
+        # Denoise, trim silence, normalize — CPU heavy, so it runs in the DSP
+        # process pool instead of stalling every session on this event loop
+        preprocessed_audio, reason = await run_preprocess(speech_samples)
+        if preprocessed_audio is None:
+            logger.debug(f"voice_segment_{reason}", session_id=session_id)
             if state is not None:
                 state["is_processing"] = False
             return
 
-        # Step 3: Normalize to consistent volume for Whisper
-        peak = np.max(np.abs(cleaned))
-        if peak > 0:
-            cleaned = cleaned * (32000.0 / peak)
-
-        preprocessed_audio = cleaned.astype(np.int16).tobytes()
-
         # Convert PCM to WAV format for Whisper (16kHz is fine for Whisper)
         wav_data = pcm_to_wav(preprocessed_audio, sample_rate=16000)
 
@@ -358,7 +336,7 @@ async def process_speech_segment(
         logger.info(
             "voice_transcribing",
             session_id=session_id,
-            audio_bytes=len(combined_audio),
+            audio_bytes=audio_bytes,
             language=language
         )
 
@@ -543,16 +521,12 @@ async def process_speech_segment(
                 try:
                     client = await get_openai_client()
                     await _safe_send(websocket, {"type": "audio_start"})
-                    async with client.audio.speech.with_streaming_response.create(
-                        model="tts-1", voice="nova", input=_repeat_msg,
-                        response_format="pcm", speed=1.0
-                    ) as tts_response:
-                        async for chunk in tts_response.iter_bytes(chunk_size=4096):
-                            if chunk:
-                                await _safe_send(websocket, {
-                                    "type": "audio_chunk",
-                                    "audio": base64.b64encode(chunk).decode('utf-8')
-                                })
+                    # Same prompt every time: played from the phrase cache after the first
+                    async for chunk in synthesize_phrase(client, _repeat_msg, language, get_phrase_cache()):
+                        await _safe_send(websocket, {
+                            "type": "audio_chunk",
+                            "audio": base64.b64encode(chunk).decode('utf-8')
+                        })
                     await _safe_send(websocket, {"type": "audio_end"})
                 except Exception as _tts_err:
                     logger.debug("hallucination_tts_failed", error=str(_tts_err))
@@ -645,71 +619,94 @@ async def process_speech_segment(
             response_preview=response_text[:100] if len(response_text) > 100 else response_text
         )
 
-        # Translate to target language (agent responds in English)
-        display_text = await translate_for_tts(response_text, language, client)
-        if display_text != response_text:
-            logger.info(
-                "voice_translation_applied",
-                session_id=session_id,
-                language=language,
-                original_preview=response_text[:50] if len(response_text) > 50 else response_text,
-                translated_preview=display_text[:50] if len(display_text) > 50 else display_text
-            )
+        # Translate to target language (agent responds in English).
+        # Hindi/Tamil are translated sentence by sentence and fed straight into
+        # TTS, so audio starts after the first sentence instead of the whole reply.
+        from app.ai_services.translation_service import TRANSLATION_LANGUAGES, stream_translated_sentences
 
-        # Send translated text response to client (for display)
-        await websocket.send_json({
-            "type": "response_text",
-            "text": display_text
-        })
+        translation_task = None
+        translated_sentences: list = []
+        sentence_queue: asyncio.Queue = asyncio.Queue()
+
+        if language in TRANSLATION_LANGUAGES:
+            async def _translate_sentences():
+                try:
+                    async for translated in stream_translated_sentences(response_text, language, "tts", client):
+                        translated_sentences.append(translated)
+                        await sentence_queue.put(translated)
+                finally:
+                    await sentence_queue.put(None)
+
+            translation_task = asyncio.create_task(_translate_sentences())
+        else:
+            # Send text response to client (for display)
+            await websocket.send_json({
+                "type": "response_text",
+                "text": response_text
+            })
+            for sentence in split_into_sentences(response_text):
+                sentence_queue.put_nowait(sentence)
+            sentence_queue.put_nowait(None)
+
+        async def _send_translated_text():
+            """Send the translated text for display once every sentence is in."""
+            display_text = " ".join(translated_sentences)
+            if display_text != response_text:
+                logger.info(
+                    "voice_translation_applied",
+                    session_id=session_id,
+                    language=language,
+                    original_preview=response_text[:50] if len(response_text) > 50 else response_text,
+                    translated_preview=display_text[:50] if len(display_text) > 50 else display_text
+                )
+            await websocket.send_json({
+                "type": "response_text",
+                "text": display_text
+            })
 
         # Clear stop flag before starting TTS (fresh for this response)
         state["stop_requested"] = False
 
-        # Stream TTS audio sentence-by-sentence for real-time playback
-        logger.info("voice_tts_started", session_id=session_id, text_length=len(display_text), language=language)
+        # Stream TTS audio sentence-by-sentence for real-time playback; the
+        # next sentences are synthesized while the current one streams
+        tts_pipeline = SentenceTTSPipeline(client, language=language)
+        state["tts_pipeline"] = tts_pipeline
+        logger.info("voice_tts_started", session_id=session_id, text_length=len(response_text), language=language)
         await websocket.send_json({"type": "audio_start"})
 
-        # Split into sentences for faster streaming (audio starts before full text is processed)
-        sentences = split_into_sentences(display_text)
-        CHUNK_SIZE = 4096
         _tts_stopped = False
+        _text_sent = translation_task is None
 
-        for sentence in sentences:
-            if not sentence.strip():
-                continue
-
-            # Check if client requested stop before starting next sentence
-            if state.get("stop_requested"):
-                logger.info("voice_tts_stopped_by_user", session_id=session_id)
-                _tts_stopped = True
-                break
+        try:
+            async with aclosing(tts_pipeline.stream(sentence_queue)) as audio_chunks:
+                async for chunk in audio_chunks:
+                    # Translation finished while an earlier sentence was playing
+                    if not _text_sent and translation_task.done():
+                        await _send_translated_text()
+                        _text_sent = True
 
-            # Stream TTS for each sentence immediately
-            async with client.audio.speech.with_streaming_response.create(
-                model="tts-1",  # Use faster model for real-time streaming
-                voice="nova",
-                input=sentence,
-                response_format="pcm",
-                speed=1.0
-            ) as tts_response:
-                async for chunk in tts_response.iter_bytes(chunk_size=CHUNK_SIZE):
                     # Check stop flag between chunks
                     if state.get("stop_requested"):
-                        logger.info("voice_tts_stopped_mid_sentence", session_id=session_id)
-                        _tts_stopped = True
                         break
-                    if chunk:
-                        base64_chunk = base64.b64encode(chunk).decode('utf-8')
-                        await websocket.send_json({
-                            "type": "audio_chunk",
-                            "audio": base64_chunk
-                        })
-            if _tts_stopped:
-                break
+                    await websocket.send_json({
+                        "type": "audio_chunk",
+                        "audio": base64.b64encode(chunk).decode('utf-8')
+                    })
+        finally:
+            state["tts_pipeline"] = None
+
+        if state.get("stop_requested") or tts_pipeline.stopped:
+            logger.info("voice_tts_stopped_by_user", session_id=session_id)
+            _tts_stopped = True
+
+        # The display text still goes out when TTS was stopped early
+        if not _text_sent:
+            await translation_task
+            await _send_translated_text()
 
         await websocket.send_json({"type": "audio_end"})
         state["stop_requested"] = False  # Reset for next interaction
-        logger.info("voice_tts_complete", session_id=session_id, stopped=_tts_stopped)
+        logger.info("voice_tts_complete", session_id=session_id, stopped=_tts_stopped, **tts_pipeline.timings())
 
         # Send deferred quick replies AFTER response_text and audio are done.
         # This ensures they arrive after TEXT_MESSAGE_START has cleared stale ones.
@@ -856,7 +853,6 @@ async def process_with_chat_agent(text: str, session_id: str, websocket: WebSock
         # contexts where asyncio.get_event_loop() doesn't get the main loop, so the
         # direct voice_mode routing may fail silently. This background task catches any
         # events that end up in the queue instead.
-        import json as _json
 
         async def _stream_agui_events_to_voice_ws():
             from app.core.agui_events import _RUN_FINISHED_SESSIONS
@@ -865,8 +861,7 @@ async def process_with_chat_agent(text: str, session_id: str, websocket: WebSock
                 while True:
                     try:
                         event = await asyncio.wait_for(queue.get(), timeout=0.5)
-                        event_json = event.to_json() if hasattr(event, 'to_json') else _json.dumps({"type": getattr(event, 'type', 'UNKNOWN')})
-                        event_data = _json.loads(event_json)
+                        event_data = event.to_dict() if hasattr(event, 'to_dict') else {"type": getattr(event, 'type', 'UNKNOWN')}
                         # Drop late ACTIVITY_START events after RUN_FINISHED
                         # (RUN_FINISHED is sent directly via WebSocket, but queued
                         # tool events arrive later — this filters the stale ones)
@@ -937,8 +932,7 @@ async def process_with_chat_agent(text: str, session_id: str, websocket: WebSock
             while not queue.empty():
                 try:
                     event = queue.get_nowait()
-                    event_json = event.to_json() if hasattr(event, 'to_json') else _json.dumps({"type": getattr(event, 'type', 'UNKNOWN')})
-                    event_data = _json.loads(event_json)
+                    event_data = event.to_dict() if hasattr(event, 'to_dict') else {"type": getattr(event, 'type', 'UNKNOWN')}
                     # Drop late ACTIVITY_START events after RUN_FINISHED
                     if event_data.get("type") == "ACTIVITY_START" and session_id in _RUN_FINISHED_SESSIONS:
                         continue
@@ -1063,6 +1057,8 @@ async def translate_for_tts(text: str, target_language: str, client: AsyncOpenAI
     """
     Translate English text to target language for TTS output.
     Uses Hinglish/Tanglish style (native script mixed with English for food terms).
+    Sentences are cached as templates and translated in one batched call
+    (see translation_service).
 
     Args:
         text: English text from agent
@@ -1072,63 +1068,6 @@ async def translate_for_tts(text: str, target_language: str, client: AsyncOpenAI
     Returns:
         Translated text for TTS, or original if translation fails/not needed
     """
-    # Only translate for non-English languages
-    if target_language == "English" or target_language not in ["Hindi", "Tamil"]:
-        return text
+    from app.ai_services.translation_service import translate_text
 
-    try:
-        # Language-specific translation prompts
-        if target_language == "Hindi":
-            system_prompt = """Translate to Hindi-English mix for TTS (text-to-speech) audio output. Rules:
-- Write Hindi words in DEVANAGARI script (आपके, में, हो गये) — TTS pronounces native script correctly
-- Keep English words in ENGLISH script: food names, "cart", "order", "add", "checkout", numbers, prices (₹)
-- Mix both scripts naturally: "आपके cart में 2 Masala Dosa add हो गये, total ₹250"
-- Use casual conversational Hindi — NOT formal/literary
-- Keep it SHORT — this will be spoken aloud
-- Output ONLY the translation
-
-Example:
-English: "I found 3 items matching your search. Would you like to add Masala Dosa to your cart?"
-TTS: "आपकी search में 3 items मिले। Masala Dosa cart में add करना चाहते हो?"  """
-        elif target_language == "Tamil":
-            system_prompt = """Translate to Tamil-English mix for TTS (text-to-speech) audio output. Rules:
-- Write Tamil words in TAMIL script (உங்க, இருக்கு, பண்ணுங்க) — TTS pronounces native script correctly
-- Keep English words in ENGLISH script: food names, "cart", "order", "add", "checkout", numbers, prices (₹)
-- Mix both scripts naturally: "உங்க cart ல 2 Masala Dosa add ஆயிடுச்சு, total ₹250"
-- Use casual conversational Tamil — NOT formal/literary
-- Keep it SHORT — this will be spoken aloud
-- Output ONLY the translation
-
-Example:
-English: "I found 3 items matching your search. Would you like to add Masala Dosa to your cart?"
-TTS: "உங்க search ல 3 items கிடைச்சுச்சு. Masala Dosa cart ல add பண்ணுமா?"  """
-        else:
-            return text
-
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",  # Fast and cheap for translation
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.3,  # Low temperature for consistent translations
-            max_tokens=500
-        )
-
-        translated = response.choices[0].message.content.strip()
-        logger.debug(
-            "voice_translation_complete",
-            original_length=len(text),
-            translated_length=len(translated),
-            target_language=target_language
-        )
-        return translated
-
-    except Exception as e:
-        logger.warning(
-            "voice_translation_failed",
-            error=str(e),
-            target_language=target_language
-        )
-        # Fall back to English if translation fails
-        return text
+    return await translate_text(text, target_language, style="tts", client=client)
@@ -0,0 +1,603 @@
+"""
+AG-UI Event Bus
+===============
+Per-session delivery of AG-UI events to WebSocket/SSE consumers.
+
+Each session gets a bounded SessionEventQueue (drop-in for the asyncio.Queue
+it replaces):
+- coalescing: a CART_DATA, activity or state event replaces the previous one
+  of its kind that hasn't been delivered yet
+- backpressure: past AGUI_QUEUE_MAX_EVENTS the oldest droppable event
+  (activity / tool-call / state) is dropped, else the oldest event
+- every event gets an id; the last AGUI_REPLAY_EVENTS are kept so a client
+  reconnecting with Last-Event-ID gets what it missed
+- queues outlive their consumers: one idle for AGUI_QUEUE_IDLE_SECONDS
+  (nothing published or read) is dropped, replay buffer included
+
+Backends (AGUI_EVENT_BUS):
+- memory  events reach consumers on the same worker only
+- redis   events are also appended to a Redis Stream per session
+          (agui:events:{session_id}), so an SSE client connected to any
+          worker can subscribe; stream ids double as event ids
+
+Usage:
+    bus = get_event_bus()
+    bus.queue(session_id).put_nowait(event)         # publish (thread-safe)
+    subscription = bus.subscribe(session_id, last_event_id)
+    entries = await subscription.next_batch(timeout=1.0)
+"""
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.core.metrics import record_agui_event
+
+logger = structlog.get_logger(__name__)
+
+AGUI_EVENT_BUS = os.getenv("AGUI_EVENT_BUS", "memory").lower()
+AGUI_QUEUE_MAX_EVENTS = int(os.getenv("AGUI_QUEUE_MAX_EVENTS", "256"))
+AGUI_REPLAY_EVENTS = int(os.getenv("AGUI_REPLAY_EVENTS", "200"))
+AGUI_STREAM_MAXLEN = int(os.getenv("AGUI_STREAM_MAXLEN", "500"))
+AGUI_STREAM_TTL_SECONDS = int(os.getenv("AGUI_STREAM_TTL_SECONDS", "600"))
+AGUI_QUEUE_IDLE_SECONDS = float(os.getenv("AGUI_QUEUE_IDLE_SECONDS", str(AGUI_STREAM_TTL_SECONDS)))
+AGUI_QUEUE_SWEEP_SECONDS = 60
+# XREAD block; must stay well under the pool's socket_timeout (5s, app.core.redis)
+# or an idle read times out on the socket instead of returning empty
+AGUI_STREAM_BLOCK_MS = 2000
+AGUI_STREAM_PREFIX = "agui:events:"
+
+# Event type -> coalescing group; a newer event replaces an undelivered one of the same group
+COALESCE_GROUPS = {
+    "CART_DATA": "cart",
+    "ACTIVITY_START": "activity",
+    "ACTIVITY_END": "activity",
+    "STATE_SNAPSHOT": "state",
+}
+
+# Dropped first when a queue is full (progress indicators, not content)
+DROPPABLE_TYPES = frozenset({
+    "ACTIVITY_START", "ACTIVITY_END",
+    "TOOL_CALL_START", "TOOL_CALL_ARGS", "TOOL_CALL_RESULT", "TOOL_CALL_END",
+    "STATE_SNAPSHOT", "STATE_DELTA",
+})
+
+
+def event_type_name(event: Any) -> str:
+    event_type = getattr(event, "type", "UNKNOWN")
+    return getattr(event_type, "value", event_type)
+
+
+class EventEntry:
+    """A queued event with its id. ``event`` is an AGUIEvent, or its JSON when read from Redis."""
+
+    __slots__ = ("event_id", "event_type", "event", "superseded", "_json")
+
+    def __init__(self, event_id: str, event_type: str, event: Any):
+        self.event_id = event_id
+        self.event_type = event_type
+        self.event = event
+        self.superseded = False
+        self._json = event if isinstance(event, str) else None
+
+    def to_json(self) -> str:
+        """Serialized once, however many subscribers or replays read it."""
+        if self._json is None:
+            self._json = self.event.to_json()
+        return self._json
+
+
+def _id_position(event_id: str) -> Tuple[int, int]:
+    """Order of an id "<a>-<b>" (Redis stream ids and local "<token>-<seq>" ids)."""
+    head, _, tail = event_id.rpartition("-")
+    try:
+        return int(head or 0), int(tail)
+    except ValueError:
+        return -1, int(tail) if tail.isdigit() else -1
+
+
+class SessionEventQueue:
+    """
+    Bounded, coalescing event queue for one session.
+
+    put_nowait() may be called from any thread (CrewAI tools run in a thread
+    pool); get()/get_batch() run on the event loop. Supports the parts of the
+    asyncio.Queue API the consumers use (put_nowait, get, get_nowait, empty,
+    qsize).
+    """
+
+    def __init__(self, session_id: str, max_events: int = AGUI_QUEUE_MAX_EVENTS, replay_events: int = AGUI_REPLAY_EVENTS):
+        self.session_id = session_id
+        self.max_events = max_events
+        # Ids are unique per queue, so a Last-Event-ID from an older queue replays everything
+        self.token = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._entries: Deque[EventEntry] = deque()
+        self._live = 0
+        self._groups: Dict[str, EventEntry] = {}
+        self._replay: Deque[EventEntry] = deque(maxlen=replay_events)
+        self._waiters: List[asyncio.Future] = []
+        self._interrupted = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.last_active = time.monotonic()
+        self.on_put = None  # callback(entry) set by the Redis backend
+        self.stats = {"published": 0, "delivered": 0, "coalesced": 0, "dropped": 0, "max_depth": 0}
+
+    # ------------------------------------------------------------ publishing
+
+    def put_nowait(self, event: Any) -> None:
+        with self._lock:
+            self._seq += 1
+            entry = EventEntry(f"{self.token}-{self._seq}", event_type_name(event), event)
+        self.put_entry(entry)
+
+    def put_entry(self, entry: EventEntry) -> None:
+        dropped: List[EventEntry] = []
+        with self._lock:
+            group = COALESCE_GROUPS.get(entry.event_type)
+            if group is not None:
+                previous = self._groups.get(group)
+                if previous is not None and not previous.superseded:
+                    previous.superseded = True
+                    self._live -= 1
+                    self.stats["coalesced"] += 1
+                    record_agui_event(previous.event_type, "coalesced")
+                self._groups[group] = entry
+
+            self._entries.append(entry)
+            self._live += 1
+            if self._live > self.max_events:
+                dropped.append(self._drop_one())
+            if len(self._entries) > 2 * self.max_events:
+                self._entries = deque(e for e in self._entries if not e.superseded)
+
+            self._replay.append(entry)
+            self.last_active = time.monotonic()
+            self.stats["published"] += 1
+            depth = self._live
+            self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+            waiters, self._waiters = self._waiters, []
+
+        record_agui_event(entry.event_type, "published", depth)
+        for entry_dropped in dropped:
+            record_agui_event(entry_dropped.event_type, "dropped")
+            logger.debug("agui_event_dropped", session_id=self.session_id, event_type=entry_dropped.event_type)
+        if self.on_put is not None:
+            self.on_put(entry)
+        self._wake(waiters)
+
+    def _drop_one(self) -> EventEntry:
+        """Drop the oldest droppable event (else the oldest event); lock held."""
+        victim = next(
+            (e for e in self._entries if not e.superseded and e.event_type in DROPPABLE_TYPES),
+            None
+        ) or next(e for e in self._entries if not e.superseded)
+        victim.superseded = True
+        self._live -= 1
+        self.stats["dropped"] += 1
+        return victim
+
+    def _wake(self, waiters: List[asyncio.Future]) -> None:
+        if not waiters or self._loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        for waiter in waiters:
+            if on_loop:
+                if not waiter.done():
+                    waiter.set_result(None)
+            else:
+                self._loop.call_soon_threadsafe(lambda w=waiter: w.done() or w.set_result(None))
+
+    # ------------------------------------------------------------- consuming
+
+    def _pop_ready(self, limit: int) -> List[EventEntry]:
+        """Up to limit undelivered entries, oldest first; lock held."""
+        ready: List[EventEntry] = []
+        while self._entries and len(ready) < limit:
+            entry = self._entries.popleft()
+            if entry.superseded:
+                continue
+            group = COALESCE_GROUPS.get(entry.event_type)
+            if group is not None and self._groups.get(group) is entry:
+                del self._groups[group]
+            self._live -= 1
+            ready.append(entry)
+        self.stats["delivered"] += len(ready)
+        self.last_active = time.monotonic()
+        return ready
+
+    def interrupt(self) -> None:
+        """Make a pending (or the next) get_batch() return [] (keepalive/timeout timers)."""
+        with self._lock:
+            self._interrupted = True
+            waiters, self._waiters = self._waiters, []
+        self._wake(waiters)
+
+    async def get_batch(self, timeout: Optional[float] = None, limit: int = 100) -> List[EventEntry]:
+        """
+        All ready entries (up to limit), waiting for the first; [] on timeout
+        or interrupt(). Without a timeout no timer is created.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._lock:
+                ready = self._pop_ready(limit)
+                if ready:
+                    return ready
+                if self._interrupted:
+                    self._interrupted = False
+                    return []
+                self._loop = loop
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+            try:
+                if deadline is None:
+                    await waiter
+                else:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return []
+                    await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return []
+            finally:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    async def get_entry(self) -> EventEntry:
+        return (await self.get_batch(limit=1))[0]
+
+    async def get(self) -> Any:
+        return (await self.get_entry()).event
+
+    def get_nowait(self) -> Any:
+        with self._lock:
+            ready = self._pop_ready(1)
+        if not ready:
+            raise asyncio.QueueEmpty()
+        return ready[0].event
+
+    def qsize(self) -> int:
+        return self._live
+
+    def empty(self) -> bool:
+        return self._live == 0
+
+    def idle_since(self, cutoff: float) -> bool:
+        """True if nothing was published or read since cutoff and no reader is waiting."""
+        with self._lock:
+            return not self._waiters and self.last_active < cutoff
+
+    def replay_after(self, last_event_id: Optional[str]) -> List[EventEntry]:
+        """Delivered events after last_event_id (all kept ones if the id is unknown)."""
+        with self._lock:
+            pending = {id(e) for e in self._entries}
+            delivered = [e for e in self._replay if not e.superseded and id(e) not in pending]
+        if last_event_id and last_event_id.startswith(f"{self.token}-"):
+            last_seq = _id_position(last_event_id)[1]
+            delivered = [e for e in delivered if _id_position(e.event_id)[1] > last_seq]
+        for entry in delivered:
+            record_agui_event(entry.event_type, "replayed")
+        return delivered
+
+
+class _QueueSubscription:
+    """Reads a session's local queue, after replaying what a reconnecting client missed."""
+
+    def __init__(self, queue: SessionEventQueue, replay: List[EventEntry]):
+        self.queue = queue
+        self._replay = replay
+
+    async def next_batch(self, timeout: Optional[float] = None) -> List[EventEntry]:
+        if self._replay:
+            batch, self._replay = self._replay, []
+            return batch
+        return await self.queue.get_batch(timeout)
+
+    def interrupt(self) -> None:
+        self.queue.interrupt()
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryEventBus:
+    """Per-session queues on this worker."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._queues: Dict[str, SessionEventQueue] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + AGUI_QUEUE_SWEEP_SECONDS
+        self.expired = 0
+
+    def queue(self, session_id: str) -> SessionEventQueue:
+        queue = self._queues.get(session_id)
+        if queue is None:
+            if time.monotonic() >= self._next_sweep:
+                self.expire_idle()
+            with self._lock:
+                queue = self._queues.get(session_id)
+                if queue is None:
+                    queue = self._queues[session_id] = self._new_queue(session_id)
+        return queue
+
+    def expire_idle(self, idle_seconds: float = AGUI_QUEUE_IDLE_SECONDS) -> int:
+        """
+        Drop queues idle for idle_seconds. Disconnects don't clear a session's
+        queue, so a reconnecting client can still replay; this bounds the rest.
+        """
+        now = time.monotonic()
+        cutoff = now - idle_seconds
+        with self._lock:
+            self._next_sweep = now + AGUI_QUEUE_SWEEP_SECONDS
+            idle = [sid for sid, queue in self._queues.items() if queue.idle_since(cutoff)]
+            for session_id in idle:
+                self._queues.pop(session_id).on_put = None
+            self.expired += len(idle)
+        if idle:
+            logger.debug("agui_queues_expired", sessions=len(idle))
+        return len(idle)
+
+    def _new_queue(self, session_id: str) -> SessionEventQueue:
+        return SessionEventQueue(session_id)
+
+    def clear(self, session_id: str) -> None:
+        """Forget the session's queue; emitters holding it keep writing to a detached queue."""
+        with self._lock:
+            queue = self._queues.pop(session_id, None)
+        if queue is not None:
+            queue.on_put = None
+
+    def subscribe(self, session_id: str, last_event_id: Optional[str] = None):
+        queue = self.queue(session_id)
+        replay = queue.replay_after(last_event_id) if last_event_id else []
+        return _QueueSubscription(queue, replay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        queues = list(self._queues.values())
+        totals = {"published": 0, "delivered": 0, "coalesced": 0, "dropped": 0}
+        for queue in queues:
+            for key in totals:
+                totals[key] += queue.stats[key]
+        return {
+            "backend": self.backend,
+            "sessions": len(queues),
+            "queued_events": sum(queue.qsize() for queue in queues),
+            "max_queue_depth": max((queue.stats["max_depth"] for queue in queues), default=0),
+            "max_events_per_session": AGUI_QUEUE_MAX_EVENTS,
+            "expired_sessions": self.expired,
+            **totals,
+        }
+
+
+class _StreamSubscription:
+    """A Redis Stream reader for one client; fed by the bus's shared XREAD loop."""
+
+    def __init__(self, bus: "RedisStreamEventBus", session_id: str, cursor: Optional[str]):
+        self.bus = bus
+        self.session_id = session_id
+        self.cursor = cursor  # None until the reader pins it to the stream's tail
+        self.queue = SessionEventQueue(session_id, replay_events=0)
+
+    async def next_batch(self, timeout: Optional[float] = None) -> List[EventEntry]:
+        return await self.queue.get_batch(timeout)
+
+    def interrupt(self) -> None:
+        self.queue.interrupt()
+
+    def close(self) -> None:
+        self.bus._unsubscribe(self)
+
+
+class RedisStreamEventBus(InMemoryEventBus):
+    """
+    Local queues plus a Redis Stream per session for consumers on other workers.
+
+    Publishing stays synchronous: entries are buffered and appended with one
+    pipelined XADD batch per event-loop tick. Subscribers on this worker share
+    one blocking XREAD over all their streams plus a wake stream, which is
+    written to when the set of streams changes.
+    """
+
+    backend = "redis"
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Deque[Tuple[str, Optional[EventEntry]]] = deque()  # (session_id, entry | None = delete)
+        self._flush_scheduled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscriptions: List[_StreamSubscription] = []
+        self._reader: Optional[asyncio.Task] = None
+        self._wake_key = f"{AGUI_STREAM_PREFIX}wake:{uuid.uuid4().hex[:8]}"
+        self.stream_stats = {"appended": 0, "append_failures": 0, "read": 0}
+
+    @staticmethod
+    def stream_key(session_id: str) -> str:
+        return f"{AGUI_STREAM_PREFIX}{session_id}"
+
+    def _new_queue(self, session_id: str) -> SessionEventQueue:
+        queue = super()._new_queue(session_id)
+        queue.on_put = lambda entry: self._append(session_id, entry)
+        return queue
+
+    def clear(self, session_id: str) -> None:
+        super().clear(session_id)
+        self._append(session_id, None)
+
+    # ------------------------------------------------------------ publishing
+
+    def _append(self, session_id: str, entry: Optional[EventEntry]) -> None:
+        self._pending.append((session_id, entry))
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._loop = loop
+            self._flush_scheduled = True
+            loop.call_soon(self._start_flush)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._flush_scheduled = True
+            self._loop.call_soon_threadsafe(self._start_flush)
+
+    def _start_flush(self) -> None:
+        asyncio.ensure_future(self._flush())
+
+    async def _flush(self) -> None:
+        from app.core.redis import get_redis_client
+
+        self._flush_scheduled = False
+        batch = []
+        while self._pending:
+            batch.append(self._pending.popleft())
+        if not batch:
+            return
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                touched = set()
+                for session_id, entry in batch:
+                    key = self.stream_key(session_id)
+                    if entry is None:
+                        pipe.delete(key)
+                        touched.discard(key)
+                        continue
+                    pipe.xadd(
+                        key,
+                        {"type": entry.event_type, "data": entry.to_json()},
+                        maxlen=AGUI_STREAM_MAXLEN,
+                        approximate=True
+                    )
+                    touched.add(key)
+                for key in touched:
+                    pipe.expire(key, AGUI_STREAM_TTL_SECONDS)
+                await pipe.execute()
+            self.stream_stats["appended"] += len(batch)
+        except Exception as e:
+            self.stream_stats["append_failures"] += len(batch)
+            logger.warning("agui_stream_append_failed", events=len(batch), error=str(e))
+
+    # ------------------------------------------------------------- consuming
+
+    def subscribe(self, session_id: str, last_event_id: Optional[str] = None):
+        """
+        Read the session's stream from any worker: after last_event_id, else
+        only events appended from now on (the stream may hold earlier runs).
+        """
+        cursor = last_event_id if last_event_id and _id_position(last_event_id)[0] >= 0 else None
+        subscription = _StreamSubscription(self, session_id, cursor)
+        self._subscriptions.append(subscription)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_streams())
+        else:
+            self._wake_reader()
+        return subscription
+
+    def _unsubscribe(self, subscription: _StreamSubscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _wake_reader(self) -> None:
+        from app.core.redis import get_redis_client
+
+        async def wake():
+            try:
+                await get_redis_client().xadd(self._wake_key, {"w": "1"}, maxlen=10, approximate=True)
+            except Exception as e:
+                logger.debug("agui_stream_wake_failed", error=str(e))
+
+        asyncio.ensure_future(wake())
+
+    async def _read_streams(self) -> None:
+        from app.core.redis import get_redis_client
+
+        client = get_redis_client()
+        wake_cursor = "$"
+        try:
+            while self._subscriptions:
+                await self._pin_new_cursors(client)
+                # One cursor per stream: the oldest among its subscribers
+                streams: Dict[str, str] = {self._wake_key: wake_cursor}
+                for subscription in self._subscriptions:
+                    key = self.stream_key(subscription.session_id)
+                    current = streams.get(key)
+                    if current is None or _id_position(subscription.cursor) < _id_position(current):
+                        streams[key] = subscription.cursor
+                try:
+                    result = await client.xread(streams, count=100, block=AGUI_STREAM_BLOCK_MS)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("agui_stream_read_failed", error=str(e))
+                    await asyncio.sleep(1)
+                    continue
+
+                # RESP3 connections return a dict, RESP2 a list of [key, entries]
+                for key, entries in (result.items() if isinstance(result, dict) else result or []):
+                    if key == self._wake_key:
+                        wake_cursor = entries[-1][0]
+                        continue
+                    self.stream_stats["read"] += len(entries)
+                    for subscription in list(self._subscriptions):
+                        if self.stream_key(subscription.session_id) != key:
+                            continue
+                        for stream_id, fields in entries:
+                            if _id_position(stream_id) <= _id_position(subscription.cursor):
+                                continue
+                            subscription.cursor = stream_id
+                            subscription.queue.put_entry(
+                                EventEntry(stream_id, fields.get("type", "UNKNOWN"), fields.get("data", "{}"))
+                            )
+        finally:
+            self._reader = None
+
+    async def _pin_new_cursors(self, client) -> None:
+        """Start subscriptions without a Last-Event-ID at their stream's current tail."""
+        for subscription in [s for s in self._subscriptions if s.cursor is None]:
+            try:
+                tail = await client.xrevrange(self.stream_key(subscription.session_id), count=1)
+            except Exception as e:
+                logger.warning("agui_stream_tail_failed", session_id=subscription.session_id, error=str(e))
+                tail = []
+            if subscription.cursor is None:
+                subscription.cursor = tail[0][0] if tail else "0-0"
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **super().get_stats(),
+            "stream_subscribers": len(self._subscriptions),
+            "stream_pending_appends": len(self._pending),
+            **{f"stream_{key}": value for key, value in self.stream_stats.items()},
+        }
+
+
+_bus: Optional[InMemoryEventBus] = None
+
+
+def get_event_bus() -> InMemoryEventBus:
+    """Process-wide AG-UI event bus (backend from AGUI_EVENT_BUS)."""
+    global _bus
+
+    if _bus is None:
+        _bus = RedisStreamEventBus() if AGUI_EVENT_BUS == "redis" else InMemoryEventBus()
+        logger.info("agui_event_bus_initialized", backend=_bus.backend, max_events=AGUI_QUEUE_MAX_EVENTS)
+    return _bus
+
+
+def get_event_bus_stats() -> Dict[str, Any]:
+    return get_event_bus().get_stats()
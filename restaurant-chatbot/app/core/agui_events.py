@@ -16,16 +16,26 @@ Usage:
 """
 
 import json
+import os
 import uuid
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, Optional, AsyncGenerator, List
-from dataclasses import dataclass, field, asdict
+from decimal import Decimal
+from typing import Dict, Any, Optional, AsyncGenerator, List, Tuple
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
 from enum import Enum
 import structlog
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 logger = structlog.get_logger(__name__)
 
+# Idle time before an SSE comment line is sent to keep proxies from closing the stream
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
 
 # ============================================================================
 # VOICE MODE ISOLATION
@@ -160,16 +170,49 @@ class EventType(str, Enum):
     RECEIPT_LINK = "RECEIPT_LINK"
 
 
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if is_dataclass(value):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_event(data: Dict[str, Any]) -> str:
+        return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS).decode()
+else:
+    def dumps_event(data: Dict[str, Any]) -> str:
+        return json.dumps(data, default=_json_default)
+
+
+# Event class -> field names, so serializing doesn't walk dataclass metadata per event
+_EVENT_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
 @dataclass
 class AGUIEvent:
     """Base AG-UI Event"""
     type: EventType
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
-    def to_json(self) -> str:
-        data = asdict(self)
+    def to_dict(self) -> Dict[str, Any]:
+        """Top-level fields (nested values are shared, not copied like asdict)."""
+        names = _EVENT_FIELDS.get(type(self))
+        if names is None:
+            names = _EVENT_FIELDS[type(self)] = tuple(f.name for f in fields(self))
+        data = {name: getattr(self, name) for name in names}
         data['type'] = self.type.value
-        return json.dumps(data)
+        return data
+
+    def to_json(self) -> str:
+        return dumps_event(self.to_dict())
 
 
 @dataclass
@@ -484,10 +527,8 @@ class FormDismissEvent(AGUIEvent):
     form_types: List[str] = field(default_factory=list)
 
 
-# Global event queues per session
-_EVENT_QUEUES: Dict[str, asyncio.Queue] = {}
-# Store event loops for thread-safe operations
-_EVENT_LOOPS: Dict[str, asyncio.AbstractEventLoop] = {}
+# Per-session event queues live on the event bus (bounded, coalescing; see agui_event_bus)
+from app.core.agui_event_bus import get_event_bus
 
 # ============================================================================
 # THREAD-SAFE STAGING AREA FOR TOOL EVENTS
@@ -500,24 +541,14 @@ _PENDING_EVENTS: Dict[str, List["AGUIEvent"]] = {}  # session_id -> list of even
 _PENDING_LOCK = threading.Lock()
 
 
-def get_event_queue(session_id: str) -> asyncio.Queue:
-    """Get or create event queue for session."""
-    if session_id not in _EVENT_QUEUES:
-        _EVENT_QUEUES[session_id] = asyncio.Queue()
-        # Store the event loop that created this queue for thread-safe puts
-        try:
-            _EVENT_LOOPS[session_id] = asyncio.get_running_loop()
-        except RuntimeError:
-            pass  # No running loop - will be set later
-    return _EVENT_QUEUES[session_id]
+def get_event_queue(session_id: str):
+    """Get or create event queue for session (a bounded SessionEventQueue)."""
+    return get_event_bus().queue(session_id)
 
 
 def clear_event_queue(session_id: str):
     """Clear event queue for session."""
-    if session_id in _EVENT_QUEUES:
-        del _EVENT_QUEUES[session_id]
-    if session_id in _EVENT_LOOPS:
-        del _EVENT_LOOPS[session_id]
+    get_event_bus().clear(session_id)
 
 
 def _put_event_threadsafe(session_id: str, event: "AGUIEvent"):
@@ -543,7 +574,7 @@ def flush_pending_events(session_id: str) -> int:
     Flush all pending tool events to the queue. MUST be called before RUN_FINISHED.
 
     This function is called from async context (process_with_agui_streaming)
-    and synchronously moves all staged events into the asyncio.Queue.
+    and synchronously moves all staged events into the session queue.
 
     Returns:
         Number of events flushed
@@ -1159,10 +1190,35 @@ class AGUIEventEmitter:
 # STREAMING GENERATOR
 # ============================================================================
 
-async def stream_events(session_id: str, timeout: float = 60.0) -> AsyncGenerator[str, None]:
+_TERMINAL_EVENT_TYPES = frozenset({EventType.RUN_FINISHED.value, EventType.RUN_ERROR.value})
+
+
+def _format_sse_batch(entries) -> Tuple[str, bool]:
+    """One SSE write for a batch of entries; stops after a terminal event."""
+    parts = []
+    for entry in entries:
+        parts.append(f"id: {entry.event_id}\ndata: {entry.to_json()}\n\n")
+        if entry.event_type in _TERMINAL_EVENT_TYPES:
+            return "".join(parts), True
+    return "".join(parts), False
+
+
+async def stream_events(
+    session_id: str,
+    timeout: float = 60.0,
+    last_event_id: Optional[str] = None
+) -> AsyncGenerator[str, None]:
     """
     Async generator that yields SSE-formatted events.
 
+    Waits on the session queue without polling: every event that is ready
+    when the stream wakes goes out in one write. A single timer (re-armed
+    once per SSE_KEEPALIVE_SECONDS, not per event) sends keepalives while
+    idle and ends the stream after timeout.
+
+    Each event carries an SSE id; pass the client's Last-Event-ID header as
+    last_event_id to resend the events it missed before reconnecting.
+
     Usage in FastAPI:
         @app.get("/api/chat/stream/{session_id}")
         async def stream(session_id: str):
@@ -1171,32 +1227,44 @@ async def stream_events(session_id: str, timeout: float = 60.0) -> AsyncGenerato
                 media_type="text/event-stream"
             )
     """
-    queue = get_event_queue(session_id)
-    start_time = asyncio.get_event_loop().time()
+    subscription = get_event_bus().subscribe(session_id, last_event_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    last_write = loop.time()
+    timer: Optional[asyncio.TimerHandle] = None
+
+    def on_timer():
+        nonlocal timer
+        timer = None
+        subscription.interrupt()
 
+    def arm():
+        nonlocal timer
+        timer = loop.call_at(min(last_write + SSE_KEEPALIVE_SECONDS, deadline), on_timer)
+
+    arm()
     try:
         while True:
-            # Check timeout
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > timeout:
+            entries = await subscription.next_batch()
+            now = loop.time()
+
+            if entries:
+                chunk, finished = _format_sse_batch(entries)
+                yield chunk
+                last_write = now
+                if finished:
+                    break
+
+            if now >= deadline:
                 logger.debug("agui_stream_timeout", session_id=session_id)
                 break
 
-            try:
-                # Wait for event with timeout
-                event = await asyncio.wait_for(queue.get(), timeout=1.0)
-
-                # Format as SSE
-                yield f"data: {event.to_json()}\n\n"
-
-                # Check if run finished
-                if event.type in (EventType.RUN_FINISHED, EventType.RUN_ERROR):
-                    break
-
-            except asyncio.TimeoutError:
-                # Send keepalive
-                yield ": keepalive\n\n"
-                continue
+            if timer is None:
+                if now - last_write >= SSE_KEEPALIVE_SECONDS:
+                    # Send keepalive
+                    yield ": keepalive\n\n"
+                    last_write = now
+                arm()
 
     except Exception as e:
         logger.error("agui_stream_error", session_id=session_id, error=str(e))
@@ -1204,7 +1272,9 @@ async def stream_events(session_id: str, timeout: float = 60.0) -> AsyncGenerato
         yield f"data: {error_event.to_json()}\n\n"
     finally:
         # Cleanup
-        clear_event_queue(session_id)
+        if timer is not None:
+            timer.cancel()
+        subscription.close()
 
 
 # ============================================================================
@@ -7,17 +7,22 @@ Namespaced caching service to prevent key collisions between features.
 Features:
 - Automatic key namespacing by feature
 - JSON serialization/deserialization
-- Pattern-based invalidation
+- Batch get/set/delete in one round trip (MGET / pipelines)
+- Tag-based and pattern-based invalidation (chunked, non-blocking UNLINK)
 - TTL management
+- Optional process-local tier in front of Redis (local_tier=True)
 """
 
 import json
-from typing import Any, Optional, List
+from typing import Any, Dict, Iterable, Optional, List
 import redis.asyncio as redis
 
 from app.core.redis import get_redis_client
 from app.core.logging_config import get_logger
 
+# Keys removed per UNLINK call during invalidation (keeps each command short)
+INVALIDATE_CHUNK_SIZE = 500
+
 
 class CacheService:
     """
@@ -30,18 +35,31 @@ class CacheService:
         - food_ordering:menu:categories:all
         - food_ordering:cart:session_abc123
         - booking:availability:2024-01-15
+
+    Tags: keys written with ``tags=[...]`` are also recorded in a set per tag
+    ({feature}:tag:{tag}), so ``invalidate_tag('branch:42')`` removes them
+    without scanning the keyspace.
+
+    With local_tier=True, reads are served from a process-local LRU first
+    (see app.core.two_tier_cache) and every write/delete invalidates that
+    tier on all workers.
     """
 
-    def __init__(self, feature_name: str):
+    def __init__(self, feature_name: str, local_tier: bool = False):
         """
         Initialize cache service for a specific feature.
 
         Args:
             feature_name: Name of the feature (e.g., 'food_ordering', 'booking')
+            local_tier: Serve reads from a process-local tier in front of Redis
         """
         self.feature_name = feature_name
         self.redis_client: Optional[redis.Redis] = None
         self._logger = get_logger(f"{__name__}.{feature_name}")
+        self._local = None
+        if local_tier:
+            from app.core.two_tier_cache import get_two_tier_cache
+            self._local = get_two_tier_cache(feature_name)
 
     def _get_client(self) -> redis.Redis:
         """Get Redis client lazily"""
@@ -62,6 +80,33 @@ class CacheService:
         """
         return f"{self.feature_name}:{entity}:{identifier}"
 
+    def _tag_key(self, tag: str) -> str:
+        """Redis set holding the keys written under a tag."""
+        return f"{self.feature_name}:tag:{tag}"
+
+    def _add_tags(self, pipe, key: str, tags: Iterable[str], ttl: int) -> None:
+        """Queue tag membership for a key; tag sets live as long as their longest member."""
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+
+    @staticmethod
+    def _local_scope(full_pattern: str) -> dict:
+        """Local-tier invalidation for a glob: a prefix when it is 'prefix*', else everything."""
+        head = full_pattern[:-1]
+        if full_pattern.endswith("*") and not any(ch in head for ch in "*?[\\"):
+            return {"prefixes": [head]}
+        return {"everything": True}
+
+    async def _unlink_chunked(self, client: redis.Redis, keys: List[str]) -> int:
+        """UNLINK keys in chunks (memory is reclaimed off the Redis main thread)."""
+        removed = 0
+        for start in range(0, len(keys), INVALIDATE_CHUNK_SIZE):
+            removed += await client.unlink(*keys[start:start + INVALIDATE_CHUNK_SIZE])
+        return removed
+
     async def get(self, entity: str, identifier: str) -> Optional[Any]:
         """
         Get value from cache.
@@ -77,7 +122,7 @@ class CacheService:
             client = self._get_client()
             key = self._build_key(entity, identifier)
 
-            value = await client.get(key)
+            value = await (self._local.get(key) if self._local else client.get(key))
             if value:
                 # Deserialize JSON
                 return json.loads(value)
@@ -96,7 +141,8 @@ class CacheService:
         entity: str,
         identifier: str,
         value: Any,
-        ttl: int = 3600
+        ttl: int = 3600,
+        tags: Optional[List[str]] = None
     ) -> bool:
         """
         Set value in cache with TTL.
@@ -106,6 +152,7 @@ class CacheService:
             identifier: Unique identifier
             value: Value to cache (will be JSON serialized)
             ttl: Time-to-live in seconds (default: 1 hour)
+            tags: Optional tags for invalidate_tag() (e.g. ['menu', 'branch:42'])
 
         Returns:
             bool: True if successful
@@ -118,7 +165,15 @@ class CacheService:
             serialized = json.dumps(value, default=str)
 
             # Set with TTL
-            await client.setex(key, ttl, serialized)
+            if tags:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, ttl, serialized)
+                    self._add_tags(pipe, key, tags, ttl)
+                    await pipe.execute()
+            else:
+                await client.setex(key, ttl, serialized)
+            if self._local:
+                await self._local.invalidate(keys=[key])
 
             self._logger.debug(
                 f"Cache set: {entity}:{identifier}",
@@ -149,6 +204,8 @@ class CacheService:
             key = self._build_key(entity, identifier)
 
             result = await client.delete(key)
+            if self._local:
+                await self._local.invalidate(keys=[key])
 
             self._logger.debug(f"Cache delete: {entity}:{identifier}")
             return result > 0
@@ -160,10 +217,173 @@ class CacheService:
             )
             return False
 
+    async def get_many(self, entity: str, identifiers: List[str]) -> Dict[str, Any]:
+        """
+        Get several values of one entity type in a single MGET.
+
+        Args:
+            entity: Entity type
+            identifiers: Unique identifiers
+
+        Returns:
+            Dict of identifier -> cached value (misses are omitted)
+        """
+        if not identifiers:
+            return {}
+
+        try:
+            client = self._get_client()
+            keys = [self._build_key(entity, identifier) for identifier in identifiers]
+            values = await (self._local.mget(keys) if self._local else client.mget(keys))
+
+            return {
+                identifier: json.loads(value)
+                for identifier, value in zip(identifiers, values)
+                if value
+            }
+
+        except Exception as e:
+            self._logger.error(
+                f"Cache get_many error for {entity}",
+                count=len(identifiers),
+                error=str(e)
+            )
+            return {}
+
+    async def set_many(
+        self,
+        entity: str,
+        items: Dict[str, Any],
+        ttl: int = 3600,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """
+        Set several values of one entity type in one pipelined round trip.
+
+        Args:
+            entity: Entity type
+            items: Dict of identifier -> value (values are JSON serialized)
+            ttl: Time-to-live in seconds (default: 1 hour)
+            tags: Optional tags applied to every key
+
+        Returns:
+            bool: True if successful
+        """
+        if not items:
+            return True
+
+        try:
+            client = self._get_client()
+
+            keys = [self._build_key(entity, identifier) for identifier in items]
+
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in zip(keys, items.values()):
+                    pipe.setex(key, ttl, json.dumps(value, default=str))
+                    if tags:
+                        self._add_tags(pipe, key, tags, ttl)
+                await pipe.execute()
+            if self._local:
+                await self._local.invalidate(keys=keys)
+
+            self._logger.debug(
+                f"Cache set_many: {entity}",
+                count=len(items),
+                ttl=ttl
+            )
+            return True
+
+        except Exception as e:
+            self._logger.error(
+                f"Cache set_many error for {entity}",
+                count=len(items),
+                error=str(e)
+            )
+            return False
+
+    async def delete_many(self, entity: str, identifiers: List[str]) -> int:
+        """
+        Delete several values of one entity type.
+
+        Args:
+            entity: Entity type
+            identifiers: Unique identifiers
+
+        Returns:
+            int: Number of keys that existed and were removed
+        """
+        if not identifiers:
+            return 0
+
+        try:
+            client = self._get_client()
+            keys = [self._build_key(entity, identifier) for identifier in identifiers]
+
+            deleted = await self._unlink_chunked(client, keys)
+            if self._local:
+                await self._local.invalidate(keys=keys)
+
+            self._logger.debug(f"Cache delete_many: {entity}", deleted_count=deleted)
+            return deleted
+
+        except Exception as e:
+            self._logger.error(
+                f"Cache delete_many error for {entity}",
+                count=len(identifiers),
+                error=str(e)
+            )
+            return 0
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Invalidate every key written with a tag.
+
+        Args:
+            tag: Tag passed to set()/set_many() (e.g. 'menu', 'branch:42')
+
+        Returns:
+            int: Number of keys deleted
+        """
+        try:
+            client = self._get_client()
+            tag_key = self._tag_key(tag)
+
+            deleted = 0
+            batch = []
+            tagged = []
+            async for key in client.sscan_iter(tag_key, count=INVALIDATE_CHUNK_SIZE):
+                batch.append(key)
+                if len(batch) >= INVALIDATE_CHUNK_SIZE:
+                    deleted += await client.unlink(*batch)
+                    tagged.extend(batch)
+                    batch = []
+            if batch:
+                deleted += await client.unlink(*batch)
+                tagged.extend(batch)
+            await client.unlink(tag_key)
+            if self._local and tagged:
+                await self._local.invalidate(keys=tagged)
+
+            self._logger.info(
+                f"Cache invalidated tag: {tag}",
+                deleted_count=deleted
+            )
+            return deleted
+
+        except Exception as e:
+            self._logger.error(
+                f"Cache invalidate tag error for {tag}",
+                error=str(e)
+            )
+            return 0
+
     async def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all keys matching a pattern.
 
+        Prefer invalidate_tag() for hot paths - this still walks the keyspace,
+        but deletes as it scans in chunks instead of collecting every key first.
+
         Args:
             pattern: Pattern to match (e.g., 'menu:*' to clear all menu cache)
 
@@ -174,16 +394,21 @@ class CacheService:
             client = self._get_client()
             full_pattern = f"{self.feature_name}:{pattern}"
 
-            # Find matching keys
-            keys = []
-            async for key in client.scan_iter(match=full_pattern):
-                keys.append(key)
+            deleted = 0
+            batch = []
+            async for key in client.scan_iter(match=full_pattern, count=INVALIDATE_CHUNK_SIZE):
+                batch.append(key)
+                if len(batch) >= INVALIDATE_CHUNK_SIZE:
+                    deleted += await client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await client.unlink(*batch)
 
-            if not keys:
-                return 0
+            if self._local and deleted:
+                await self._local.invalidate(**self._local_scope(full_pattern))
 
-            # Delete all matching keys
-            deleted = await client.delete(*keys)
+            if not deleted:
+                return 0
 
             self._logger.info(
                 f"Cache invalidated pattern: {pattern}",
@@ -318,7 +543,7 @@ class CacheService:
 
 
 # Feature-specific cache instances
-def get_feature_cache(feature_name: str) -> CacheService:
+def get_feature_cache(feature_name: str, local_tier: bool = False) -> CacheService:
     """
     Get cache service for a specific feature.
 
@@ -327,5 +552,8 @@ def get_feature_cache(feature_name: str) -> CacheService:
 
         cache = get_feature_cache('food_ordering')
         await cache.set('menu', 'categories', data, ttl=3600)
+
+        # Read-heavy data: process-local tier in front of Redis
+        cache = get_feature_cache('food_ordering', local_tier=True)
     """
-    return CacheService(feature_name)
+    return CacheService(feature_name, local_tier=local_tier)
@@ -7,71 +7,195 @@ Before: ~50ms per connection (TCP handshake + auth + SSL)
 After:  ~0.1ms (grab from pool)
 
 This is a 500x speedup for database access!
+
+One asyncpg pool per worker serves both async code and threaded code
+(CrewAI tools): sync callers submit coroutines to the loop that owns the
+pool via run_sync() / fetch_sync() and block on the result. Size it with
+DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE.
 """
+import asyncio
+import threading
 import asyncpg
-import psycopg2
-from psycopg2 import pool
-from typing import Optional
+from typing import Awaitable, List, Optional, TypeVar
 import structlog
 import os
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+SYNC_CALL_TIMEOUT = float(os.getenv("DB_SYNC_CALL_TIMEOUT", "30"))
+APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "restaurant-chatbot")
+
 # ============================================================================
 # ASYNC POOL (for asyncpg - used in async contexts)
 # ============================================================================
 
 _async_pool: Optional[asyncpg.Pool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _connect_kwargs() -> dict:
+    return dict(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 5432)),
+        user=os.getenv('DB_USER', 'postgres'),
+        password=os.getenv('DB_PASSWORD', '123456'),
+        database=os.getenv('DB_NAME', 'restaurant_ai_dev'),
+        server_settings={'application_name': APPLICATION_NAME},
+    )
 
 
 async def get_async_pool() -> asyncpg.Pool:
     """
     Get or create async connection pool.
 
-    Pool maintains 5-20 connections ready to use.
+    Pool maintains DB_POOL_MIN_SIZE-DB_POOL_MAX_SIZE connections ready to use.
     Connections are returned to pool after use, not closed.
     """
-    global _async_pool
+    global _async_pool, _pool_loop
 
     if _async_pool is None:
+        # Bind sync callers to this loop even if pool creation below fails,
+        # so a retry from a worker thread does not open the pool elsewhere
+        if _pool_loop is None:
+            _pool_loop = asyncio.get_running_loop()
         _async_pool = await asyncpg.create_pool(
-            host=os.getenv('DB_HOST', 'localhost'),
-            port=int(os.getenv('DB_PORT', 5432)),
-            user=os.getenv('DB_USER', 'postgres'),
-            password=os.getenv('DB_PASSWORD', '123456'),
-            database=os.getenv('DB_NAME', 'restaurant_ai_dev'),
-            min_size=5,      # Always keep 5 connections ready
-            max_size=20,     # Scale up to 20 under load
+            **_connect_kwargs(),
+            min_size=POOL_MIN_SIZE,
+            max_size=POOL_MAX_SIZE,
             command_timeout=30,
         )
-        logger.info("async_db_pool_created", min_size=5, max_size=20)
+        logger.info("async_db_pool_created", min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE)
 
     return _async_pool
 
 
+async def connect_dedicated() -> asyncpg.Connection:
+    """
+    Open a connection outside the pool (LISTEN sessions hold theirs for the
+    worker's lifetime). The caller closes it.
+    """
+    return await asyncpg.connect(**_connect_kwargs(), command_timeout=30)
+
+
 async def close_async_pool():
     """Close pool on shutdown."""
-    global _async_pool
+    global _async_pool, _pool_loop
     if _async_pool:
         await _async_pool.close()
         _async_pool = None
+        _pool_loop = None
         logger.info("async_db_pool_closed")
 
 
+def get_pool_stats() -> dict:
+    """Current pool size and idle connections (for monitoring)."""
+    if _async_pool is None:
+        return {"initialized": False, "min_size": POOL_MIN_SIZE, "max_size": POOL_MAX_SIZE}
+    return {
+        "initialized": True,
+        "min_size": POOL_MIN_SIZE,
+        "max_size": POOL_MAX_SIZE,
+        "size": _async_pool.get_size(),
+        "idle": _async_pool.get_idle_size(),
+    }
+
+
 # ============================================================================
-# SYNC POOL (for psycopg2 - used in CrewAI tools which run in threads)
+# SYNC BRIDGE (threaded callers run queries on the pool's event loop)
 # ============================================================================
 
-_sync_pool: Optional[pool.ThreadedConnectionPool] = None
+_fallback_loop: Optional[asyncio.AbstractEventLoop] = None
+_fallback_lock = threading.Lock()
+
+
+def _get_fallback_loop() -> asyncio.AbstractEventLoop:
+    """Private loop thread for processes that never started one (scripts, CLI)."""
+    global _fallback_loop
+    with _fallback_lock:
+        if _fallback_loop is None:
+            _fallback_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_fallback_loop.run_forever,
+                name="db-pool-loop",
+                daemon=True
+            ).start()
+    return _fallback_loop
 
 
-def get_sync_pool() -> pool.ThreadedConnectionPool:
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the loop that owns the asyncpg pool and wait for it.
+
+    For threaded code (CrewAI tools). Sync code running on the pool's own loop
+    thread (tools invoked under akickoff) cannot block on that loop, so the
+    coroutine is run re-entrantly there, as crew_agent.run_async() does.
+    Async code should await the coroutine instead.
     """
-    Get or create sync connection pool for threaded contexts.
+    loop = _pool_loop if _pool_loop is not None and _pool_loop.is_running() else _get_fallback_loop()
+    timeout = timeout if timeout is not None else SYNC_CALL_TIMEOUT
 
-    CrewAI runs tools in threads, so we need thread-safe pooling.
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        import nest_asyncio
+        nest_asyncio.apply(loop)
+        return loop.run_until_complete(asyncio.wait_for(coro, timeout))
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
+
+
+async def _fetch(query: str, *args) -> List[asyncpg.Record]:
+    async with AsyncDBConnection() as conn:
+        return await conn.fetch(query, *args)
+
+
+async def _fetchrow(query: str, *args) -> Optional[asyncpg.Record]:
+    async with AsyncDBConnection() as conn:
+        return await conn.fetchrow(query, *args)
+
+
+async def _execute(query: str, *args) -> str:
+    async with AsyncDBConnection() as conn:
+        return await conn.execute(query, *args)
+
+
+def fetch_sync(query: str, *args) -> List[asyncpg.Record]:
+    """Blocking conn.fetch() on the shared pool."""
+    return run_sync(_fetch(query, *args))
+
+
+def fetchrow_sync(query: str, *args) -> Optional[asyncpg.Record]:
+    """Blocking conn.fetchrow() on the shared pool."""
+    return run_sync(_fetchrow(query, *args))
+
+
+def execute_sync(query: str, *args) -> str:
+    """Blocking conn.execute() on the shared pool."""
+    return run_sync(_execute(query, *args))
+
+
+# ============================================================================
+# SYNC POOL (psycopg2 - standalone setup scripts only)
+# ============================================================================
+# The application itself never opens this pool; threaded code goes through
+# run_sync() so each worker holds a single pool.
+
+_sync_pool = None
+
+
+def get_sync_pool():
+    """
+    Get or create psycopg2 connection pool for standalone scripts.
     """
     global _sync_pool
+    from psycopg2 import pool
 
     if _sync_pool is None:
         _sync_pool = pool.ThreadedConnectionPool(
@@ -125,7 +249,8 @@ class AsyncDBConnection:
 
 class SyncDBConnection:
     """
-    Sync context manager for pooled connections.
+    Sync context manager for psycopg2 connections (standalone scripts only;
+    application code uses fetch_sync()/run_sync() on the asyncpg pool).
 
     Usage:
         with SyncDBConnection() as conn:
@@ -8,13 +8,21 @@ Provides:
 - Entity tracking (user preferences, history)
 
 Architecture:
-- NetworkX: Fast in-memory graph operations
-- Redis: Persistent storage (JSON serialization)
-- Auto-sync: Saves graph to Redis after modifications
+- NetworkX: Fast in-memory graph operations, one subgraph per user
+- Redis: One hash per user (``entity_graph:user:{user_id}``), one field per
+  node/edge, so a mutation only writes the nodes and edges it touched
+- Lazy loading: a user's subgraph is read from Redis on first access and kept
+  in a bounded LRU; cold users are evicted from process memory
+- Versioning: every write bumps a per-user ``_v`` field, so other workers
+  detect the change and reload that user instead of serving a stale copy
+- Migration: the legacy whole-graph ``entity_graph:global`` key is split into
+  per-user hashes on startup
 """
 
 import json
-from typing import Any, Dict, List, Optional, Set
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import structlog
 import networkx as nx
@@ -23,10 +31,41 @@ import os
 
 logger = structlog.get_logger("core.entity_graph")
 
+LEGACY_GRAPH_KEY = "entity_graph:global"
+USER_GRAPH_KEY_PREFIX = "entity_graph:user:"
+MIGRATION_LOCK_KEY = "entity_graph:migration_lock"
+VERSION_FIELD = "_v"
+DEFAULT_MAX_CACHED_USERS = 1000
+
+EdgeRef = Tuple[str, str, int]
+
+
+class _GraphDelta:
+    """Nodes and edges touched by a single mutation of a user subgraph."""
+
+    __slots__ = ("nodes", "edges", "removed_nodes", "removed_edges")
+
+    def __init__(self):
+        self.nodes: Set[str] = set()
+        self.edges: Set[EdgeRef] = set()
+        self.removed_nodes: Set[str] = set()
+        self.removed_edges: Set[EdgeRef] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes or self.edges or self.removed_nodes or self.removed_edges)
+
+
+def _node_field(node_id: str) -> str:
+    return f"n:{node_id}"
+
+
+def _edge_field(edge: EdgeRef) -> str:
+    return "e:" + json.dumps(list(edge))
+
 
 class EntityGraphService:
     """
-    In-memory entity graph with Redis persistence.
+    In-memory entity graph with per-user Redis persistence.
 
     Node types:
     - USER: User entity (user_id, name, phone)
@@ -41,9 +80,16 @@ class EntityGraphService:
     - PREFERS: User -> Preference (dietary, spice level, etc.)
     - ORDERED: User -> Order (order history)
     - FAVORITE: User -> MenuItem (favorite items)
+
+    Every node reachable from a user lives in that user's subgraph, so MENU_ITEM
+    nodes are duplicated per user rather than shared.
     """
 
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        max_cached_users: Optional[int] = None
+    ):
         """Initialize graph service with Redis persistence."""
         # Use provided client or create synchronous Redis client
         if redis_client is None:
@@ -52,83 +98,288 @@ class EntityGraphService:
         else:
             self.redis = redis_client
 
-        self.graph = nx.MultiDiGraph()  # Directed graph with multiple edges
-        self._graph_key = "entity_graph:global"
+        if max_cached_users is None:
+            max_cached_users = int(os.getenv("ENTITY_GRAPH_MAX_CACHED_USERS", DEFAULT_MAX_CACHED_USERS))
+        self.max_cached_users = max(1, max_cached_users)
+
+        # user_id -> (subgraph, version of the Redis hash it was loaded from)
+        self._subgraphs: "OrderedDict[str, Tuple[nx.MultiDiGraph, Optional[int]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._evictions = 0
+
+        # Split the legacy whole-graph key into per-user hashes
+        self.migrate_legacy_graph()
+
+        logger.info("Entity graph service initialized", max_cached_users=self.max_cached_users)
 
-        # Load existing graph from Redis
-        self._load_from_redis()
+    # ==================== PERSISTENCE ====================
 
-        logger.info("Entity graph service initialized", nodes=self.graph.number_of_nodes())
+    @staticmethod
+    def _user_key(user_id: str) -> str:
+        return f"{USER_GRAPH_KEY_PREFIX}{user_id}"
 
-    def _load_from_redis(self) -> None:
-        """Load graph from Redis persistence."""
+    def _load_user_from_redis(self, user_id: str) -> Tuple[nx.MultiDiGraph, Optional[int]]:
+        """Load one user's subgraph from its Redis hash."""
+        graph = nx.MultiDiGraph()
         try:
-            graph_data = self.redis.get(self._graph_key)
-            if graph_data:
-                data = json.loads(graph_data)
-                self.graph = nx.node_link_graph(data, directed=True, multigraph=True)
-                logger.info("Graph loaded from Redis", nodes=self.graph.number_of_nodes())
-            else:
-                logger.info("No existing graph in Redis, starting fresh")
+            fields = self.redis.hgetall(self._user_key(user_id))
         except Exception as e:
-            logger.error("Failed to load graph from Redis", error=str(e))
-            self.graph = nx.MultiDiGraph()
+            logger.error("Failed to load user graph from Redis", user_id=user_id, error=str(e))
+            return graph, None
+
+        edges = []
+        for field, raw in fields.items():
+            if field.startswith("n:"):
+                graph.add_node(field[2:], **json.loads(raw))
+            elif field.startswith("e:"):
+                edges.append((json.loads(field[2:]), json.loads(raw)))
+
+        for (source, target, key), data in edges:
+            graph.add_edge(source, target, key=key, **data)
+
+        version = fields.get(VERSION_FIELD)
+        return graph, int(version) if version is not None else None
+
+    def _get_subgraph(self, user_id: str) -> nx.MultiDiGraph:
+        """
+        Get a user's subgraph, loading it lazily from Redis.
 
-    def _save_to_redis(self) -> None:
-        """Save graph to Redis persistence."""
+        The cached copy is revalidated against the Redis version field so that
+        writes made by other workers are picked up.
+        """
         try:
-            data = nx.node_link_data(self.graph)
-            self.redis.set(self._graph_key, json.dumps(data))
-            logger.debug("Graph saved to Redis", nodes=self.graph.number_of_nodes())
+            remote_version = self.redis.hget(self._user_key(user_id), VERSION_FIELD)
+            remote_version = int(remote_version) if remote_version is not None else None
+            validated = True
         except Exception as e:
-            logger.error("Failed to save graph to Redis", error=str(e))
+            logger.warning("Failed to validate user graph version", user_id=user_id, error=str(e))
+            remote_version, validated = None, False
+
+        with self._lock:
+            cached = self._subgraphs.get(user_id)
+            if cached is not None and (not validated or cached[1] == remote_version):
+                self._subgraphs.move_to_end(user_id)
+                return cached[0]
+
+        graph, version = self._load_user_from_redis(user_id)
+
+        with self._lock:
+            self._subgraphs[user_id] = (graph, version)
+            self._subgraphs.move_to_end(user_id)
+            while len(self._subgraphs) > self.max_cached_users:
+                evicted_user, _ = self._subgraphs.popitem(last=False)
+                self._evictions += 1
+                logger.debug("User graph evicted from memory", user_id=evicted_user)
+
+        return graph
+
+    def _persist(self, user_id: str, graph: nx.MultiDiGraph, delta: _GraphDelta) -> None:
+        """Write only the nodes and edges touched by a mutation to Redis."""
+        if not delta:
+            return
 
-    # ==================== USER OPERATIONS ====================
+        mapping: Dict[str, str] = {}
+        removed: List[str] = []
+
+        for node_id in delta.nodes:
+            if graph.has_node(node_id):
+                mapping[_node_field(node_id)] = json.dumps(graph.nodes[node_id], default=str)
+        for edge in delta.edges:
+            source, target, key = edge
+            if graph.has_edge(source, target, key):
+                mapping[_edge_field(edge)] = json.dumps(graph.edges[source, target, key], default=str)
+        for node_id in delta.removed_nodes:
+            if not graph.has_node(node_id):
+                removed.append(_node_field(node_id))
+        for edge in delta.removed_edges:
+            if not graph.has_edge(*edge):
+                removed.append(_edge_field(edge))
+
+        key = self._user_key(user_id)
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            if removed:
+                pipe.hdel(key, *removed)
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+            pipe.hincrby(key, VERSION_FIELD, 1)
+            new_version = pipe.execute()[-1]
+        except Exception as e:
+            logger.error("Failed to save user graph to Redis", user_id=user_id, error=str(e))
+            return
 
-    def get_or_create_user(self, user_id: str, **attributes) -> Dict[str, Any]:
-        """Get or create user node."""
-        node_id = f"user:{user_id}"
+        with self._lock:
+            cached = self._subgraphs.get(user_id)
+            if cached is not None and cached[0] is graph:
+                previous = cached[1] or 0
+                # Another worker wrote in between: drop our copy so the next
+                # access reloads the merged state from Redis.
+                if new_version == previous + 1:
+                    self._subgraphs[user_id] = (graph, new_version)
+                else:
+                    del self._subgraphs[user_id]
+
+        logger.debug(
+            "User graph delta saved to Redis",
+            user_id=user_id,
+            written=len(mapping),
+            removed=len(removed)
+        )
+
+    def migrate_legacy_graph(self) -> int:
+        """
+        Split the legacy ``entity_graph:global`` key into per-user hashes.
+
+        Each user gets every node reachable from its USER node. Users that
+        already have a per-user hash are left untouched. The legacy key is
+        renamed (not deleted) once migrated.
+
+        Returns:
+            Number of users migrated
+        """
+        try:
+            graph_data = self.redis.get(LEGACY_GRAPH_KEY)
+            if not graph_data:
+                return 0
+            if not self.redis.set(MIGRATION_LOCK_KEY, "1", nx=True, ex=300):
+                logger.info("Entity graph migration already running in another worker")
+                return 0
+        except Exception as e:
+            logger.error("Failed to check legacy entity graph", error=str(e))
+            return 0
+
+        migrated = 0
+        try:
+            legacy = nx.node_link_graph(json.loads(graph_data), directed=True, multigraph=True)
+
+            for node_id, data in legacy.nodes(data=True):
+                if data.get("type") != "USER":
+                    continue
+
+                user_id = str(data.get("user_id") or node_id.split(":", 1)[-1])
+                key = self._user_key(user_id)
+                if self.redis.exists(key):
+                    continue
+
+                nodes = {node_id} | nx.descendants(legacy, node_id)
+                mapping = {
+                    _node_field(n): json.dumps(legacy.nodes[n], default=str)
+                    for n in nodes
+                }
+                for source, target, edge_key, edge_data in legacy.out_edges(nodes, keys=True, data=True):
+                    mapping[_edge_field((source, target, edge_key))] = json.dumps(edge_data, default=str)
+                mapping[VERSION_FIELD] = "1"
+
+                self.redis.hset(key, mapping=mapping)
+                migrated += 1
 
-        if not self.graph.has_node(node_id):
-            self.graph.add_node(
+            self.redis.rename(LEGACY_GRAPH_KEY, f"{LEGACY_GRAPH_KEY}:migrated")
+            logger.info("Legacy entity graph migrated to per-user hashes", users=migrated)
+        except Exception as e:
+            logger.error("Failed to migrate legacy entity graph", error=str(e), migrated=migrated)
+        finally:
+            try:
+                self.redis.delete(MIGRATION_LOCK_KEY)
+            except Exception:
+                pass
+
+        return migrated
+
+    # ==================== GRAPH MUTATION HELPERS ====================
+
+    @staticmethod
+    def _add_node(graph: nx.MultiDiGraph, delta: _GraphDelta, node_id: str, **attributes) -> None:
+        graph.add_node(node_id, **attributes)
+        delta.nodes.add(node_id)
+
+    @staticmethod
+    def _add_edge(graph: nx.MultiDiGraph, delta: _GraphDelta, source: str, target: str, **attributes) -> None:
+        for node_id in (source, target):
+            if not graph.has_node(node_id):
+                delta.nodes.add(node_id)
+        key = graph.add_edge(source, target, **attributes)
+        delta.edges.add((source, target, key))
+
+    @staticmethod
+    def _remove_edge(graph: nx.MultiDiGraph, delta: _GraphDelta, source: str, target: str, key: int) -> None:
+        graph.remove_edge(source, target, key)
+        delta.removed_edges.add((source, target, key))
+
+    @staticmethod
+    def _remove_node(graph: nx.MultiDiGraph, delta: _GraphDelta, node_id: str) -> None:
+        for source, target, key in list(graph.in_edges(node_id, keys=True)) + list(graph.out_edges(node_id, keys=True)):
+            delta.removed_edges.add((source, target, key))
+        graph.remove_node(node_id)
+        delta.removed_nodes.add(node_id)
+
+    def _ensure_user(self, graph: nx.MultiDiGraph, delta: _GraphDelta, user_id: str, **attributes) -> str:
+        """Create the USER node in a subgraph if missing and return its id."""
+        node_id = f"user:{user_id}"
+        if not graph.has_node(node_id):
+            self._add_node(
+                graph,
+                delta,
                 node_id,
                 type="USER",
                 user_id=user_id,
                 created_at=datetime.now().isoformat(),
                 **attributes
             )
-            self._save_to_redis()
             logger.info("User node created", user_id=user_id)
+        return node_id
 
-        return dict(self.graph.nodes[node_id])
+    def _ensure_menu_item(
+        self,
+        graph: nx.MultiDiGraph,
+        delta: _GraphDelta,
+        node_id: str,
+        **attributes
+    ) -> None:
+        if not graph.has_node(node_id):
+            self._add_node(graph, delta, node_id, type="MENU_ITEM", **attributes)
+
+    # ==================== USER OPERATIONS ====================
+
+    def get_or_create_user(self, user_id: str, **attributes) -> Dict[str, Any]:
+        """Get or create user node."""
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        node_id = self._ensure_user(graph, delta, user_id, **attributes)
+        self._persist(user_id, graph, delta)
+
+        return dict(graph.nodes[node_id])
 
     def update_user(self, user_id: str, **attributes) -> None:
         """Update user attributes."""
+        graph = self._get_subgraph(user_id)
         node_id = f"user:{user_id}"
-        if self.graph.has_node(node_id):
-            self.graph.nodes[node_id].update(attributes)
-            self._save_to_redis()
+        if graph.has_node(node_id):
+            graph.nodes[node_id].update(attributes)
+            delta = _GraphDelta()
+            delta.nodes.add(node_id)
+            self._persist(user_id, graph, delta)
 
     # ==================== CART OPERATIONS ====================
 
     def get_user_cart(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user's active cart (persistent across sessions)."""
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return None
 
         # Find HAS_CART edge
-        for _, target, key, edge_data in self.graph.out_edges(user_node, keys=True, data=True):
+        for _, target, key, edge_data in graph.out_edges(user_node, keys=True, data=True):
             if edge_data.get("type") == "HAS_CART":
                 cart_node = target
-                cart_data = dict(self.graph.nodes[cart_node])
+                cart_data = dict(graph.nodes[cart_node])
 
                 # Get cart items
                 items = []
-                for _, item_node, key, item_edge in self.graph.out_edges(cart_node, keys=True, data=True):
+                for _, item_node, key, item_edge in graph.out_edges(cart_node, keys=True, data=True):
                     if item_edge.get("type") == "CONTAINS":
-                        item_data = dict(self.graph.nodes[item_node])
+                        item_data = dict(graph.nodes[item_node])
                         items.append({
                             **item_data,
                             "quantity": item_edge.get("quantity", 1)
@@ -153,19 +404,21 @@ class EntityGraphService:
         Returns:
             Updated cart data
         """
-        user_node = f"user:{user_id}"
-        self.get_or_create_user(user_id)
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        user_node = self._ensure_user(graph, delta, user_id)
 
         # Remove old cart if exists
-        for _, target, key, edge_data in list(self.graph.out_edges(user_node, keys=True, data=True)):
+        for _, target, key, edge_data in list(graph.out_edges(user_node, keys=True, data=True)):
             if edge_data.get("type") == "HAS_CART":
-                old_cart = target
                 # Remove old cart and its items
-                self.graph.remove_node(old_cart)
+                self._remove_node(graph, delta, target)
 
         # Create new cart
         cart_id = f"cart:{user_id}:{datetime.now().timestamp()}"
-        self.graph.add_node(
+        self._add_node(
+            graph,
+            delta,
             cart_id,
             type="CART",
             user_id=user_id,
@@ -175,7 +428,7 @@ class EntityGraphService:
         )
 
         # Link user -> cart
-        self.graph.add_edge(user_node, cart_id, type="HAS_CART")
+        self._add_edge(graph, delta, user_node, cart_id, type="HAS_CART")
 
         # Add cart items
         for item in items:
@@ -183,38 +436,43 @@ class EntityGraphService:
             menu_item_node = f"menu_item:{item_id}"
 
             # Create menu item node if not exists
-            if not self.graph.has_node(menu_item_node):
-                self.graph.add_node(
-                    menu_item_node,
-                    type="MENU_ITEM",
-                    menu_item_id=item.get("menu_item_id"),
-                    item_name=item.get("item_name"),
-                    price=item.get("price", 0.0)
-                )
+            self._ensure_menu_item(
+                graph,
+                delta,
+                menu_item_node,
+                menu_item_id=item.get("menu_item_id"),
+                item_name=item.get("item_name"),
+                price=item.get("price", 0.0)
+            )
 
             # Link cart -> menu item (with quantity)
-            self.graph.add_edge(
+            self._add_edge(
+                graph,
+                delta,
                 cart_id,
                 menu_item_node,
                 type="CONTAINS",
                 quantity=item.get("quantity", 1)
             )
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info("Cart updated", user_id=user_id, items=len(items), subtotal=subtotal)
 
         return self.get_user_cart(user_id)
 
     def clear_cart(self, user_id: str) -> None:
         """Clear user's cart."""
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
         user_node = f"user:{user_id}"
 
         # Remove cart node
-        for _, target, key, edge_data in list(self.graph.out_edges(user_node, keys=True, data=True)):
-            if edge_data.get("type") == "HAS_CART":
-                self.graph.remove_node(target)
+        if graph.has_node(user_node):
+            for _, target, key, edge_data in list(graph.out_edges(user_node, keys=True, data=True)):
+                if edge_data.get("type") == "HAS_CART":
+                    self._remove_node(graph, delta, target)
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info("Cart cleared", user_id=user_id)
 
     # ==================== ITEM TRACKING ====================
@@ -225,47 +483,51 @@ class EntityGraphService:
 
         When user says "I want that" or "add it", we know what "that"/"it" refers to.
         """
-        user_node = f"user:{user_id}"
-        self.get_or_create_user(user_id)
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        user_node = self._ensure_user(graph, delta, user_id)
 
         # Remove old LAST_MENTIONED edges
-        for _, target, key, edge_data in list(self.graph.out_edges(user_node, keys=True, data=True)):
+        for _, target, key, edge_data in list(graph.out_edges(user_node, keys=True, data=True)):
             if edge_data.get("type") == "LAST_MENTIONED":
-                self.graph.remove_edge(user_node, target, key)
+                self._remove_edge(graph, delta, user_node, target, key)
 
         # Create or get menu item node
         item_id = menu_item_id or item_name
         menu_item_node = f"menu_item:{item_id}"
 
-        if not self.graph.has_node(menu_item_node):
-            self.graph.add_node(
-                menu_item_node,
-                type="MENU_ITEM",
-                menu_item_id=menu_item_id,
-                item_name=item_name
-            )
+        self._ensure_menu_item(
+            graph,
+            delta,
+            menu_item_node,
+            menu_item_id=menu_item_id,
+            item_name=item_name
+        )
 
         # Add LAST_MENTIONED edge
-        self.graph.add_edge(
+        self._add_edge(
+            graph,
+            delta,
             user_node,
             menu_item_node,
             type="LAST_MENTIONED",
             timestamp=datetime.now().isoformat()
         )
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info("Last mentioned item set", user_id=user_id, item=item_name)
 
     def get_last_mentioned_item(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get last mentioned item (for context resolution)."""
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return None
 
-        for _, target, key, edge_data in self.graph.out_edges(user_node, keys=True, data=True):
+        for _, target, key, edge_data in graph.out_edges(user_node, keys=True, data=True):
             if edge_data.get("type") == "LAST_MENTIONED":
-                return dict(self.graph.nodes[target])
+                return dict(graph.nodes[target])
 
         return None
 
@@ -280,36 +542,41 @@ class EntityGraphService:
         - add_preference("user123", "dietary", "vegetarian")
         - add_preference("user123", "allergic_to", "nuts")
         """
-        user_node = f"user:{user_id}"
-        self.get_or_create_user(user_id)
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        user_node = self._ensure_user(graph, delta, user_id)
 
         pref_id = f"pref:{user_id}:{preference_type}"
 
-        if not self.graph.has_node(pref_id):
-            self.graph.add_node(
+        if not graph.has_node(pref_id):
+            self._add_node(
+                graph,
+                delta,
                 pref_id,
                 type="PREFERENCE",
                 preference_type=preference_type,
                 value=value
             )
-            self.graph.add_edge(user_node, pref_id, type="PREFERS")
+            self._add_edge(graph, delta, user_node, pref_id, type="PREFERS")
         else:
-            self.graph.nodes[pref_id]["value"] = value
+            graph.nodes[pref_id]["value"] = value
+            delta.nodes.add(pref_id)
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info("Preference added", user_id=user_id, type=preference_type, value=value)
 
     def get_preferences(self, user_id: str) -> Dict[str, Any]:
         """Get all user preferences."""
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return {}
 
         preferences = {}
-        for _, target, key, edge_data in self.graph.out_edges(user_node, keys=True, data=True):
+        for _, target, key, edge_data in graph.out_edges(user_node, keys=True, data=True):
             if edge_data.get("type") == "PREFERS":
-                pref_data = self.graph.nodes[target]
+                pref_data = graph.nodes[target]
                 preferences[pref_data["preference_type"]] = pref_data["value"]
 
         return preferences
@@ -318,11 +585,14 @@ class EntityGraphService:
 
     def add_order(self, user_id: str, order_id: str, order_number: str, items: List[Dict[str, Any]], total: float) -> None:
         """Add completed order to user's history."""
-        user_node = f"user:{user_id}"
-        self.get_or_create_user(user_id)
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        user_node = self._ensure_user(graph, delta, user_id)
 
         order_node = f"order:{order_id}"
-        self.graph.add_node(
+        self._add_node(
+            graph,
+            delta,
             order_node,
             type="ORDER",
             order_id=order_id,
@@ -332,44 +602,45 @@ class EntityGraphService:
         )
 
         # Link user -> order
-        self.graph.add_edge(user_node, order_node, type="ORDERED")
+        self._add_edge(graph, delta, user_node, order_node, type="ORDERED")
 
         # Link order -> menu items
         for item in items:
             item_id = item.get("menu_item_id") or item.get("item_name")
             menu_item_node = f"menu_item:{item_id}"
 
-            if not self.graph.has_node(menu_item_node):
-                self.graph.add_node(
-                    menu_item_node,
-                    type="MENU_ITEM",
-                    menu_item_id=item.get("menu_item_id"),
-                    item_name=item.get("item_name")
-                )
+            self._ensure_menu_item(
+                graph,
+                delta,
+                menu_item_node,
+                menu_item_id=item.get("menu_item_id"),
+                item_name=item.get("item_name")
+            )
 
-            self.graph.add_edge(order_node, menu_item_node, type="CONTAINS", quantity=item.get("quantity", 1))
+            self._add_edge(graph, delta, order_node, menu_item_node, type="CONTAINS", quantity=item.get("quantity", 1))
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info("Order added to history", user_id=user_id, order_number=order_number)
 
     def get_last_order(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user's most recent order (for "same as last time")."""
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return None
 
         # Find all ORDERED edges
         orders = []
-        for _, target, key, edge_data in self.graph.out_edges(user_node, keys=True, data=True):
+        for _, target, key, edge_data in graph.out_edges(user_node, keys=True, data=True):
             if edge_data.get("type") == "ORDERED":
-                order_data = dict(self.graph.nodes[target])
+                order_data = dict(graph.nodes[target])
 
                 # Get order items
                 items = []
-                for _, item_node, key, item_edge in self.graph.out_edges(target, keys=True, data=True):
+                for _, item_node, key, item_edge in graph.out_edges(target, keys=True, data=True):
                     if item_edge.get("type") == "CONTAINS":
-                        item_data = dict(self.graph.nodes[item_node])
+                        item_data = dict(graph.nodes[item_node])
                         items.append({
                             **item_data,
                             "quantity": item_edge.get("quantity", 1)
@@ -391,35 +662,37 @@ class EntityGraphService:
 
     def add_favorite(self, user_id: str, item_name: str, menu_item_id: Optional[str] = None) -> None:
         """Mark item as favorite."""
-        user_node = f"user:{user_id}"
-        self.get_or_create_user(user_id)
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        user_node = self._ensure_user(graph, delta, user_id)
 
         item_id = menu_item_id or item_name
         menu_item_node = f"menu_item:{item_id}"
 
-        if not self.graph.has_node(menu_item_node):
-            self.graph.add_node(
-                menu_item_node,
-                type="MENU_ITEM",
-                menu_item_id=menu_item_id,
-                item_name=item_name
-            )
+        self._ensure_menu_item(
+            graph,
+            delta,
+            menu_item_node,
+            menu_item_id=menu_item_id,
+            item_name=item_name
+        )
 
-        self.graph.add_edge(user_node, menu_item_node, type="FAVORITE")
-        self._save_to_redis()
+        self._add_edge(graph, delta, user_node, menu_item_node, type="FAVORITE")
+        self._persist(user_id, graph, delta)
         logger.info("Favorite added", user_id=user_id, item=item_name)
 
     def get_favorites(self, user_id: str) -> List[Dict[str, Any]]:
         """Get user's favorite items."""
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return []
 
         favorites = []
-        for _, target, key, edge_data in self.graph.out_edges(user_node, keys=True, data=True):
+        for _, target, key, edge_data in graph.out_edges(user_node, keys=True, data=True):
             if edge_data.get("type") == "FAVORITE":
-                favorites.append(dict(self.graph.nodes[target]))
+                favorites.append(dict(graph.nodes[target]))
 
         return favorites
 
@@ -446,20 +719,23 @@ class EntityGraphService:
             entities: Collected entities so far
             entity_collection_step: If collecting entities, which one we're waiting for
         """
-        user_node = f"user:{user_id}"
-        self.get_or_create_user(user_id)
+        graph = self._get_subgraph(user_id)
+        delta = _GraphDelta()
+        user_node = self._ensure_user(graph, delta, user_id)
 
         # Remove old active intent edges for this session
-        for _, target, key, edge_data in list(self.graph.out_edges(user_node, keys=True, data=True)):
+        for _, target, key, edge_data in list(graph.out_edges(user_node, keys=True, data=True)):
             if edge_data.get("type") == "HAS_ACTIVE_INTENT" and edge_data.get("session_id") == session_id:
-                self.graph.remove_edge(user_node, target, key)
+                self._remove_edge(graph, delta, user_node, target, key)
                 # Also remove the conversation turn node if no other edges point to it
-                if self.graph.in_degree(target) == 0:
-                    self.graph.remove_node(target)
+                if graph.in_degree(target) == 0:
+                    self._remove_node(graph, delta, target)
 
         # Create new conversation turn node
         turn_id = f"conv_turn:{session_id}:{datetime.now().timestamp()}"
-        self.graph.add_node(
+        self._add_node(
+            graph,
+            delta,
             turn_id,
             type="CONVERSATION_TURN",
             session_id=session_id,
@@ -471,7 +747,9 @@ class EntityGraphService:
         )
 
         # Link user -> conversation turn
-        self.graph.add_edge(
+        self._add_edge(
+            graph,
+            delta,
             user_node,
             turn_id,
             type="HAS_ACTIVE_INTENT",
@@ -479,7 +757,7 @@ class EntityGraphService:
             timestamp=datetime.now().isoformat()
         )
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info(
             "Active intent set in graph",
             user_id=user_id,
@@ -501,15 +779,16 @@ class EntityGraphService:
         Returns:
             Dict with {sub_intent, entities, entity_collection_step, timestamp} or None
         """
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return None
 
         # Find HAS_ACTIVE_INTENT edge for this session
-        for _, target, key, edge_data in self.graph.out_edges(user_node, keys=True, data=True):
+        for _, target, key, edge_data in graph.out_edges(user_node, keys=True, data=True):
             if edge_data.get("type") == "HAS_ACTIVE_INTENT" and edge_data.get("session_id") == session_id:
-                turn_data = dict(self.graph.nodes[target])
+                turn_data = dict(graph.nodes[target])
                 turn_data["timestamp"] = edge_data.get("timestamp")
                 return turn_data
 
@@ -517,33 +796,54 @@ class EntityGraphService:
 
     def clear_active_intent(self, user_id: str, session_id: str) -> None:
         """Clear active conversation state for session."""
+        graph = self._get_subgraph(user_id)
         user_node = f"user:{user_id}"
 
-        if not self.graph.has_node(user_node):
+        if not graph.has_node(user_node):
             return
 
+        delta = _GraphDelta()
+
         # Remove active intent edges for this session
-        for _, target, key, edge_data in list(self.graph.out_edges(user_node, keys=True, data=True)):
+        for _, target, key, edge_data in list(graph.out_edges(user_node, keys=True, data=True)):
             if edge_data.get("type") == "HAS_ACTIVE_INTENT" and edge_data.get("session_id") == session_id:
-                self.graph.remove_edge(user_node, target, key)
+                self._remove_edge(graph, delta, user_node, target, key)
                 # Remove the conversation turn node
-                if self.graph.in_degree(target) == 0:
-                    self.graph.remove_node(target)
+                if graph.in_degree(target) == 0:
+                    self._remove_node(graph, delta, target)
 
-        self._save_to_redis()
+        self._persist(user_id, graph, delta)
         logger.info("Active intent cleared from graph", user_id=user_id, session_id=session_id)
 
 
     # ==================== UTILITY METHODS ====================
 
+    def evict_user(self, user_id: str) -> None:
+        """Drop a user's subgraph from process memory (Redis copy is kept)."""
+        with self._lock:
+            self._subgraphs.pop(user_id, None)
+
     def get_graph_stats(self) -> Dict[str, Any]:
-        """Get graph statistics."""
+        """Get statistics for the subgraphs currently held in memory."""
+        with self._lock:
+            graphs = [graph for graph, _ in self._subgraphs.values()]
+            evictions = self._evictions
+
+        node_types = ["USER", "CART", "MENU_ITEM", "ORDER", "PREFERENCE"]
         return {
-            "total_nodes": self.graph.number_of_nodes(),
-            "total_edges": self.graph.number_of_edges(),
+            "cached_users": len(graphs),
+            "max_cached_users": self.max_cached_users,
+            "evictions": evictions,
+            "total_nodes": sum(graph.number_of_nodes() for graph in graphs),
+            "total_edges": sum(graph.number_of_edges() for graph in graphs),
             "node_types": {
-                node_type: sum(1 for _, data in self.graph.nodes(data=True) if data.get("type") == node_type)
-                for node_type in ["USER", "CART", "MENU_ITEM", "ORDER", "PREFERENCE"]
+                node_type: sum(
+                    1
+                    for graph in graphs
+                    for _, data in graph.nodes(data=True)
+                    if data.get("type") == node_type
+                )
+                for node_type in node_types
             }
         }
 
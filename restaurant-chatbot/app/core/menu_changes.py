@@ -0,0 +1,182 @@
+"""
+Menu Change Listener
+====================
+Applies menu change sets published by the petpooja-service (pg_notify on
+MENU_CHANGES_CHANNEL after each menu sync or stock update) instead of
+reloading whole menus:
+
+- Menu snapshots (preloader.apply_menu_changes): only the changed items are
+  re-read and merged; the vector index re-embeds only items whose indexed
+  text or price changed
+- Redis menu cache (MenuCacheService.apply_menu_changes): changed items are
+  refreshed with one query and one pipeline, by a single worker
+- Cached LLM menu answers (ResponseCacheService.invalidate_category): the
+  branch's answers are dropped through their tag sets
+
+Change set (JSON):
+    {"change_id", "source", "restaurant_id", "menusharingcode",
+     "items": {"added": [...], "updated": [...], "removed": [...]},
+     "stock": {"in": [...], "out": [...]},
+     "categories_changed": bool, "full": bool, "counts": {...}}
+
+Every worker LISTENs on its own connection. Notifications sent while it was
+disconnected are lost, so a reconnect is followed by a version check of the
+snapshots and a reload of the Redis menu cache.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+MENU_CHANGES_CHANNEL = os.getenv("MENU_CHANGES_CHANNEL", "menu_changes")
+MENU_CHANGES_LISTENER_ENABLED = os.getenv("MENU_CHANGES_LISTENER_ENABLED", "true").lower() == "true"
+# Idle time after which the LISTEN connection is pinged
+MENU_CHANGES_PING_SECONDS = float(os.getenv("MENU_CHANGES_PING_SECONDS", "30"))
+
+
+async def apply_menu_change_set(change: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply one change set to this worker's snapshots and the shared Redis cache.
+
+    Returns:
+        Downstream invalidations: snapshot actions, vectors, cache items,
+        cached responses
+    """
+    from app.core.preloader import apply_menu_changes
+    from app.services.cache_service import get_cache_service
+    from app.services.menu_cache_service import get_menu_cache_service
+
+    started = time.perf_counter()
+    snapshots = await apply_menu_changes(change)
+    cache = await get_menu_cache_service().apply_menu_changes(change)
+    responses = await get_cache_service().invalidate_category("menu", restaurant_id=change.get("restaurant_id"))
+
+    items = change.get("items") or {}
+    stock = change.get("stock") or {}
+    logger.info(
+        "menu_changes_applied",
+        change_id=change.get("change_id"),
+        source=change.get("source"),
+        restaurant_id=change.get("restaurant_id"),
+        full=change.get("full", False),
+        categories_changed=change.get("categories_changed", False),
+        added=len(items.get("added") or []),
+        updated=len(items.get("updated") or []),
+        removed=len(items.get("removed") or []),
+        stock_in=len(stock.get("in") or []),
+        stock_out=len(stock.get("out") or []),
+        sync_counts=change.get("counts"),
+        snapshots=snapshots,
+        cache=cache,
+        responses=responses,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1)
+    )
+    return {"snapshots": snapshots, "cache": cache, "responses": responses}
+
+
+class MenuChangeListener:
+    """Background task receiving change sets and applying them in order."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.stats = {"received": 0, "applied": 0, "failed": 0, "reconnects": 0}
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._queue.put_nowait(payload)
+
+    async def _apply(self, payload: str) -> None:
+        self.stats["received"] += 1
+        try:
+            await apply_menu_change_set(json.loads(payload))
+            self.stats["applied"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning("menu_changes_apply_failed", error=str(e), payload_bytes=len(payload))
+
+    async def _resync(self) -> None:
+        """Catch up on change sets missed while disconnected."""
+        from app.core.preloader import get_menu_preloader, refresh_branch_menus
+        from app.services.menu_cache_service import get_menu_cache_service
+
+        await get_menu_preloader().load()
+        await refresh_branch_menus()
+        await get_menu_cache_service().load_menu_from_db()
+
+    async def _run(self) -> None:
+        from app.core.db_pool import connect_dedicated
+
+        backoff = 1.0
+        connected_before = False
+        while not self._stopping:
+            conn = None
+            try:
+                conn = await connect_dedicated()
+                await conn.add_listener(MENU_CHANGES_CHANNEL, self._on_notify)
+                logger.info("menu_change_listener_subscribed", channel=MENU_CHANGES_CHANNEL)
+                if connected_before:
+                    self.stats["reconnects"] += 1
+                    await self._resync()
+                connected_before = True
+                backoff = 1.0
+
+                while not self._stopping:
+                    try:
+                        payload = await asyncio.wait_for(self._queue.get(), timeout=MENU_CHANGES_PING_SECONDS)
+                    except asyncio.TimeoutError:
+                        # A dropped connection is otherwise only noticed on use
+                        await conn.fetchval("SELECT 1")
+                        continue
+                    await self._apply(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("menu_change_listener_error", error=str(e), retry_in=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        await conn.close(timeout=5)
+                    except Exception:
+                        pass
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="menu-change-listener")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._task.cancel()
+        try:
+            await asyncio.wait_for(self._task, timeout=5.0)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            pass
+        self._task = None
+
+
+_listener = MenuChangeListener()
+
+
+async def start_menu_change_listener() -> None:
+    if MENU_CHANGES_LISTENER_ENABLED:
+        _listener.start()
+
+
+async def stop_menu_change_listener() -> None:
+    await _listener.stop()
+
+
+def get_menu_change_listener_stats() -> Dict[str, Any]:
+    """Change sets received / applied (for monitoring)."""
+    return {"enabled": MENU_CHANGES_LISTENER_ENABLED, "channel": MENU_CHANGES_CHANNEL, **_listener.stats}
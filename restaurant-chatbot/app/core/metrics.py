@@ -9,12 +9,14 @@ Metrics:
 - Latency histograms
 - Error counters
 - Tool execution tracking
+- Cache hit ratios per tier (process-local / Redis)
+- OpenAI HTTP connection reuse and time to first byte
 """
 
 from prometheus_client import Counter, Histogram, Gauge, Info
 from functools import wraps
 from time import time
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 import asyncio
 
 
@@ -103,6 +105,80 @@ cache_operations_total = Counter(
     ['feature', 'operation', 'result']  # operation: get/set/delete, result: hit/miss/success/error
 )
 
+# Two-tier cache lookups (hit ratio per tier = hit / (hit + miss))
+cache_tier_requests_total = Counter(
+    'cache_tier_requests_total',
+    'Two-tier cache lookups by tier',
+    ['cache', 'tier', 'result']  # tier: local/redis, result: hit/miss
+)
+
+# Two-tier cache invalidations applied to the local tier
+cache_invalidations_total = Counter(
+    'cache_invalidations_total',
+    'Local tier invalidations',
+    ['cache', 'source']  # source: local/remote/resubscribe
+)
+
+# Entries currently held in the local tier
+cache_local_entries = Gauge(
+    'cache_local_entries',
+    'Entries in the process-local cache tier',
+    ['cache']
+)
+
+# LLM work avoided by response cache hits (cost recorded when the answer was cached)
+llm_cache_saved_tokens_total = Counter(
+    'llm_cache_saved_tokens_total',
+    'LLM tokens saved by response cache hits',
+    ['tier']  # tier: exact/semantic
+)
+
+llm_cache_saved_seconds_total = Counter(
+    'llm_cache_saved_seconds_total',
+    'LLM latency saved by response cache hits',
+    ['tier']
+)
+
+
+# ============================================================================
+# LLM HTTP METRICS
+# ============================================================================
+
+# OpenAI API requests by pooled client and connection (new/reused)
+llm_http_requests_total = Counter(
+    'llm_http_requests_total',
+    'OpenAI HTTP requests by connection reuse',
+    ['client', 'connection']  # client: account_N/voice, connection: new/reused
+)
+
+# Time from sending the request to receiving response headers
+llm_http_ttfb_seconds = Histogram(
+    'llm_http_ttfb_seconds',
+    'OpenAI time to first byte in seconds',
+    ['client', 'endpoint'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+)
+
+
+# ============================================================================
+# AG-UI EVENT BUS METRICS
+# ============================================================================
+
+# Events by outcome: published, coalesced (superseded before delivery),
+# dropped (queue full), replayed (resent after reconnect)
+agui_events_total = Counter(
+    'agui_events_total',
+    'AG-UI events by type and outcome',
+    ['event_type', 'outcome']
+)
+
+# Per-session queue depth right after each publish
+agui_queue_depth = Histogram(
+    'agui_queue_depth',
+    'Undelivered AG-UI events in a session queue',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+)
+
 
 # ============================================================================
 # DECORATORS
@@ -298,6 +374,70 @@ def record_cache_operation(feature: str, operation: str, result: str):
     ).inc()
 
 
+def record_cache_tier_lookup(cache: str, tier: str, result: str):
+    """
+    Record a two-tier cache lookup.
+
+    Args:
+        cache: Two-tier cache name
+        tier: Tier consulted (local, redis)
+        result: Result (hit, miss)
+    """
+    cache_tier_requests_total.labels(
+        cache=cache,
+        tier=tier,
+        result=result
+    ).inc()
+
+
+def record_llm_cache_savings(tier: str, tokens: int, seconds: float):
+    """
+    Record the LLM cost saved by a response cache hit.
+
+    Args:
+        tier: Cache tier that answered (exact, semantic)
+        tokens: Tokens the cached answer cost originally
+        seconds: LLM latency the cached answer cost originally
+    """
+    llm_cache_saved_tokens_total.labels(tier=tier).inc(tokens)
+    llm_cache_saved_seconds_total.labels(tier=tier).inc(seconds)
+
+
+def record_llm_http_request(client: str, endpoint: str, new_connection: bool, ttfb: float):
+    """
+    Record an OpenAI HTTP request.
+
+    Args:
+        client: Pooled client label (account_N, voice)
+        endpoint: API path (e.g. /v1/chat/completions)
+        new_connection: True if the request had to open a connection
+        ttfb: Time to first byte in seconds
+    """
+    llm_http_requests_total.labels(
+        client=client,
+        connection="new" if new_connection else "reused"
+    ).inc()
+
+    llm_http_ttfb_seconds.labels(
+        client=client,
+        endpoint=endpoint
+    ).observe(ttfb)
+
+
+def record_agui_event(event_type: str, outcome: str, depth: Optional[int] = None):
+    """
+    Record an AG-UI event bus outcome.
+
+    Args:
+        event_type: AG-UI event type (CART_DATA, ACTIVITY_START, ...)
+        outcome: published, coalesced, dropped, replayed
+        depth: Session queue depth after a publish
+    """
+    agui_events_total.labels(event_type=event_type, outcome=outcome).inc()
+    if depth is not None:
+        agui_queue_depth.observe(depth)
+
+
 def record_db_query(feature: str, operation: str, table: str, latency: float):
     """
     Record database query metric.
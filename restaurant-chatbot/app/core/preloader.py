@@ -9,14 +9,51 @@ After:  First request = instant (~50ms)
 This eliminates cold start latency!
 
 v2: Added meal_type support for time-aware menu filtering
+v3: Per-branch menu snapshots, rebuilt only when the DB menu version changes
+v4: Menu change sets (PetPooja syncs) patch snapshots and the vector index in place
 """
 import asyncio
-from typing import Dict, List, Optional, Any
+import bisect
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+_MEAL_PERIODS = ("Breakfast", "Lunch", "Dinner", "All Day")
+
+# Max candidates scored with SequenceMatcher in the fuzzy stages
+FUZZY_SHORTLIST_SIZE = 48
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Similar-item search: rescaled similarity (1 + cos) / 2, same scale as Chroma's
+# cosine distance d via 1 - d / 2. 0.85 here = cosine similarity > 0.7
+SIMILARITY_THRESHOLD = 0.85
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("MENU_QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+
+# Menu version check interval; the menu itself is only reloaded when the version changes
+MENU_VERSION_CHECK_SECONDS = int(os.getenv("MENU_VERSION_CHECK_SECONDS", "60"))
+# Branch snapshots kept in memory (least recently used evicted first)
+MENU_MAX_BRANCHES = int(os.getenv("MENU_MAX_BRANCHES", "32"))
+# Branch snapshots unused for this long are dropped on the next refresh
+MENU_BRANCH_IDLE_SECONDS = float(os.getenv("MENU_BRANCH_IDLE_SECONDS", "3600"))
+# Change sets touching more items than this reload the snapshot instead of patching it
+MENU_DELTA_MAX_ITEMS = int(os.getenv("MENU_DELTA_MAX_ITEMS", "500"))
+
+# Branch (restaurant id) the current request is served from; None = all branches
+_current_branch: ContextVar[Optional[str]] = ContextVar("menu_branch", default=None)
+
 
 def get_current_meal_period() -> str:
     """
@@ -42,114 +79,516 @@ def get_current_meal_period() -> str:
         return "All Day"  # Late night - show all day items
 
 
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _MenuIndex:
+    """
+    Precomputed lookup structures over one menu list.
+
+    Built once per load so searches never lowercase or rescan the full menu.
+    Positions refer to the index of an item in the menu list, so results can
+    be returned in menu order (recommended first, then by name).
+    """
+
+    def __init__(self, items: List[Dict]):
+        self.items = items
+        self.names = [item.get("name", "").lower() for item in items]
+        self.descriptions = [item.get("description", "").lower() for item in items]
+
+        # find_item considers every priced item; search only available ones
+        self.priced = [item.get("price", 0) > 0 for item in items]
+        self.available = [
+            priced and item.get("is_available", True)
+            for priced, item in zip(self.priced, items)
+        ]
+        self.available_positions = [pos for pos, ok in enumerate(self.available) if ok]
+        self.available_items = [items[pos] for pos in self.available_positions]
+
+        self.by_id: Dict[str, Dict] = {item["id"]: item for item in items}
+        self.available_by_id: Dict[str, Dict] = {item["id"]: item for item in self.available_items}
+
+        # Exact name -> positions (priced items, menu order)
+        self.name_positions: Dict[str, List[int]] = {}
+        self.max_name_len = max((len(name) for name in self.names), default=0)
+        # Inverted token index over name + description
+        self.token_index: Dict[str, Set[int]] = {}
+        # Trigram indexes: names of priced items, name + description of available items
+        self.name_trigrams: Dict[str, Set[int]] = {}
+        self.text_trigrams: Dict[str, Set[int]] = {}
+
+        for pos, name in enumerate(self.names):
+            if not self.priced[pos]:
+                continue
+            self.name_positions.setdefault(name, []).append(pos)
+            for gram in _trigrams(name):
+                self.name_trigrams.setdefault(gram, set()).add(pos)
+            for token in _TOKEN_RE.findall(name):
+                self.token_index.setdefault(token, set()).add(pos)
+            if self.available[pos]:
+                description = self.descriptions[pos]
+                for gram in _trigrams(name) | _trigrams(description):
+                    self.text_trigrams.setdefault(gram, set()).add(pos)
+                for token in _TOKEN_RE.findall(description):
+                    self.token_index.setdefault(token, set()).add(pos)
+
+        # Per-meal-period buckets: available items tagged for the period or All Day
+        self._meal_positions: Dict[str, List[int]] = {}
+        self._meal_sets: Dict[str, Set[int]] = {}
+        for period in _MEAL_PERIODS:
+            self._build_meal_bucket(period)
+
+        # Per-category buckets of available items, categories in first-seen order
+        self.category_items: Dict[str, List[Dict]] = {}
+        for item in self.available_items:
+            self.category_items.setdefault(item.get("category"), []).append(item)
+        self.categories_lower = [
+            (category, (category or "Other").lower()) for category in self.category_items
+        ]
+
+        self.recommended_items = [item for item in self.available_items if item.get("is_recommended", False)]
+
+    def _build_meal_bucket(self, period: str) -> None:
+        positions = [
+            pos for pos in self.available_positions
+            if period in self.items[pos].get("meal_types", ["All Day"])
+            or "All Day" in self.items[pos].get("meal_types", [])
+        ]
+        self._meal_positions[period] = positions
+        self._meal_sets[period] = set(positions)
+
+    def meal_positions(self, period: str) -> List[int]:
+        if period not in self._meal_positions:
+            self._build_meal_bucket(period)
+        return self._meal_positions[period]
+
+    def meal_set(self, period: str) -> Set[int]:
+        if period not in self._meal_sets:
+            self._build_meal_bucket(period)
+        return self._meal_sets[period]
+
+    def substring_positions(self, query: str, trigram_index: Dict[str, Set[int]], scope: List[int]) -> Set[int]:
+        """
+        Candidate positions whose indexed text may contain ``query``.
+
+        Queries shorter than a trigram cannot use the index and return the
+        whole scope; callers always verify candidates with ``in``.
+        """
+        grams = _trigrams(query)
+        if not grams:
+            return set(scope)
+
+        postings = sorted((trigram_index.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def fuzzy_shortlist(self, query: str, allowed: List[bool]) -> List[int]:
+        """
+        Positions most likely to fuzzy-match ``query``, in menu order.
+
+        Items are ranked by shared name trigrams and shared tokens, and only
+        the top ``FUZZY_SHORTLIST_SIZE`` are scored with SequenceMatcher.
+        """
+        overlap: Counter = Counter()
+        for gram in _trigrams(query):
+            for pos in self.name_trigrams.get(gram, ()):
+                overlap[pos] += 1
+        for token in _TOKEN_RE.findall(query):
+            for pos in self.token_index.get(token, ()):
+                overlap[pos] += 2
+
+        ranked = [pos for pos, _ in overlap.most_common() if allowed[pos]]
+        return sorted(ranked[:FUZZY_SHORTLIST_SIZE])
+
+    def fuzzy_ratios(self, query: str, allowed: List[bool], threshold: float):
+        """Yield (position, ratio) for shortlisted items at or above threshold."""
+        for pos in self.fuzzy_shortlist(query, allowed):
+            matcher = SequenceMatcher(None, query, self.names[pos])
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                yield pos, ratio
+
+
+# Menu rows for one branch ($1 = restaurant id) or for every branch ($1 = NULL),
+# optionally only some items ($2 = menu item ids, for change sets)
+_MENU_QUERY = """
+    SELECT
+        mi.menu_item_id as id,
+        mi.menu_item_name as name,
+        mi.menu_item_price as price,
+        mi.menu_item_description as description,
+        mi.menu_item_in_stock as is_available,
+        mi.menu_item_is_recommended as is_recommended,
+        ARRAY_AGG(DISTINCT mt.meal_type_name)
+            FILTER (WHERE mt.meal_type_name IS NOT NULL) as meal_types,
+        msc.sub_category_name as category
+    FROM menu_item mi
+    LEFT JOIN menu_item_availability_schedule mas
+        ON mi.menu_item_id = mas.menu_item_id
+        AND mas.is_deleted = FALSE
+        AND mas.is_available = TRUE
+    LEFT JOIN meal_type mt
+        ON mas.meal_type_id = mt.meal_type_id
+        AND mt.is_deleted = FALSE
+    LEFT JOIN menu_sub_categories msc
+        ON mi.menu_sub_category_id = msc.menu_sub_category_id
+        AND msc.is_deleted = FALSE
+    WHERE mi.is_deleted = FALSE
+    AND mi.menu_item_status = 'active'
+    AND ($1::uuid IS NULL OR mi.restaurant_id = $1::uuid)
+    AND ($2::uuid[] IS NULL OR mi.menu_item_id = ANY($2::uuid[]))
+    GROUP BY mi.menu_item_id, mi.menu_item_name, mi.menu_item_price,
+             mi.menu_item_description, mi.menu_item_in_stock,
+             mi.menu_item_is_recommended, msc.sub_category_name
+    ORDER BY mi.menu_item_is_recommended DESC, mi.menu_item_name
+"""
+
+# Menu version (etag): row counts and last update of every table the menu
+# query reads. Soft deletes bump updated_at, hard deletes change the count.
+_MENU_VERSION_QUERY = """
+    SELECT
+        (SELECT count(*) || '@' || coalesce(max(updated_at)::text, '')
+            FROM menu_item
+            WHERE $1::uuid IS NULL OR restaurant_id = $1::uuid) AS items,
+        (SELECT count(*) || '@' || coalesce(max(updated_at)::text, '')
+            FROM menu_item_availability_schedule) AS schedules,
+        (SELECT count(*) || '@' || coalesce(max(updated_at)::text, '')
+            FROM menu_sub_categories
+            WHERE $1::uuid IS NULL OR restaurant_id = $1::uuid) AS categories,
+        (SELECT count(*) || '@' || coalesce(max(updated_at)::text, '')
+            FROM meal_type) AS meal_types
+"""
+
+
+class _MenuSnapshot:
+    """
+    One menu version: items, their index and the version they were built from.
+
+    Never mutated after construction; a refresh builds a new snapshot and
+    swaps the reference, so readers holding the old one stay consistent.
+    """
+
+    __slots__ = ("items", "index", "version", "loaded_at", "embeddings")
+
+    def __init__(self, items: List[Dict], version: Optional[str]):
+        self.items = items
+        self.index = _MenuIndex(items)
+        self.version = version
+        self.loaded_at = datetime.now()
+        # (source matrix, branch sub-matrix) cached by branch preloaders
+        self.embeddings = None
+
+
+def _build_menu_items(rows) -> List[Dict]:
+    """
+    Menu item dicts from DB rows.
+
+    Categories and meal-type tuples are shared between items (interned), so
+    a branch snapshot costs little more than its names and descriptions.
+    """
+    meal_type_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+    all_periods = tuple(sys.intern(period) for period in _MEAL_PERIODS)
+
+    menu_items = []
+    for row in rows:
+        meal_types = row['meal_types']
+        # Normalize: items with "All Day" or no tags get all meal periods
+        # so they pass any meal period filter without special-casing
+        if not meal_types or "All Day" in meal_types:
+            meal_types = all_periods
+        else:
+            key = tuple(sorted(meal_types))
+            meal_types = meal_type_sets.get(key)
+            if meal_types is None:
+                meal_types = meal_type_sets[key] = tuple(sys.intern(name) for name in key)
+
+        menu_items.append({
+            "id": str(row['id']),
+            "name": row['name'],
+            "price": float(row['price']),
+            "description": row['description'] or "",
+            "is_available": row['is_available'],
+            "is_recommended": row['is_recommended'],
+            "meal_types": meal_types,
+            "category": sys.intern(row['category'] or "Other")
+        })
+    return menu_items
+
+
+def _menu_order(item: Dict) -> Tuple[bool, str]:
+    """Sort key matching _MENU_QUERY's ORDER BY (recommended first, then name)."""
+    return (not item["is_recommended"], item["name"].lower())
+
+
+def _merge_menu_items(current: List[Dict], fresh: List[Dict], drop: Set[str]) -> List[Dict]:
+    """
+    current without the dropped ids, with fresh items in menu order.
+
+    Items keeping their sort key stay where they were; new and re-keyed
+    items are inserted by _menu_order.
+    """
+    fresh_by_id = {item["id"]: item for item in fresh}
+    items = []
+    moved = []
+    for item in current:
+        item_id = item["id"]
+        if item_id in fresh_by_id:
+            new = fresh_by_id.pop(item_id)
+            if _menu_order(new) == _menu_order(item):
+                items.append(new)
+            else:
+                moved.append(new)
+        elif item_id not in drop:
+            items.append(item)
+    for item in moved + list(fresh_by_id.values()):
+        items.insert(bisect.bisect_left(items, _menu_order(item), key=_menu_order), item)
+    return items
+
+
+def _index_fields(item: Dict) -> Tuple:
+    """What the vector index stores for an item (changes here need a re-embed)."""
+    return (item["name"], item.get("description", ""), item.get("category", "Other"), item.get("price", 0))
+
+
 class MenuPreloader:
     """
-    Pre-loads and caches menu data.
+    Pre-loads and caches menu data for one branch (or for all branches).
 
-    Menu rarely changes, so we cache it aggressively.
-    Auto-refreshes every 5 minutes in background.
+    Menu rarely changes, so we cache it aggressively. A cheap version query
+    runs every refresh interval and the menu is only reloaded (and the vector
+    DB only re-synced) when that version changes.
     """
 
-    def __init__(self, refresh_interval: int = 300):  # 5 minutes
+    def __init__(self, refresh_interval: int = MENU_VERSION_CHECK_SECONDS, restaurant_id: Optional[str] = None):
         self.refresh_interval = refresh_interval
-        self._menu_cache: Optional[List[Dict]] = None
+        # None = every branch (single-restaurant deployments, unknown branch)
+        self.restaurant_id = restaurant_id
+        self._snapshot: Optional[_MenuSnapshot] = None
         self._last_refresh: Optional[datetime] = None
         self._refresh_task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        # (item ids, unit-norm embedding matrix) mirrored from ChromaDB
+        self._embeddings: Optional[Tuple[List[str], np.ndarray]] = None
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
 
     @property
     def menu(self) -> List[Dict]:
         """Get cached menu (returns empty if not loaded)."""
-        return self._menu_cache or []
+        snapshot = self._snapshot
+        return snapshot.items if snapshot is not None else []
 
     @property
     def is_loaded(self) -> bool:
         """Check if menu is loaded."""
-        return self._menu_cache is not None
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        """DB menu version the current snapshot was built from."""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
 
-    async def load(self):
-        """Load menu from database into cache with meal_type info."""
+    def _set_menu(self, items: List[Dict], version: Optional[str] = None) -> None:
+        """Build a snapshot for a freshly loaded menu and swap it in."""
+        self._snapshot = _MenuSnapshot(items, version)
+
+    async def load(self, force: bool = False) -> bool:
+        """
+        Load menu from database into cache with meal_type info.
+
+        Skips the reload when the DB menu version matches the current
+        snapshot (unless force). Returns True if a new snapshot was swapped in.
+        """
         from app.core.db_pool import get_async_pool
 
-        try:
-            pool = await get_async_pool()
-            async with pool.acquire() as conn:
-                # Load menu items with meal types, cuisines, and categories
-                rows = await conn.fetch("""
-                    SELECT
-                        mi.menu_item_id as id,
-                        mi.menu_item_name as name,
-                        mi.menu_item_price as price,
-                        mi.menu_item_description as description,
-                        mi.menu_item_in_stock as is_available,
-                        mi.menu_item_is_recommended as is_recommended,
-                        ARRAY_AGG(DISTINCT mt.meal_type_name)
-                            FILTER (WHERE mt.meal_type_name IS NOT NULL) as meal_types,
-                        msc.sub_category_name as category
-                    FROM menu_item mi
-                    LEFT JOIN menu_item_availability_schedule mas
-                        ON mi.menu_item_id = mas.menu_item_id
-                        AND mas.is_deleted = FALSE
-                        AND mas.is_available = TRUE
-                    LEFT JOIN meal_type mt
-                        ON mas.meal_type_id = mt.meal_type_id
-                        AND mt.is_deleted = FALSE
-                    LEFT JOIN menu_sub_categories msc
-                        ON mi.menu_sub_category_id = msc.menu_sub_category_id
-                        AND msc.is_deleted = FALSE
-                    WHERE mi.is_deleted = FALSE
-                    AND mi.menu_item_status = 'active'
-                    GROUP BY mi.menu_item_id, mi.menu_item_name, mi.menu_item_price,
-                             mi.menu_item_description, mi.menu_item_in_stock,
-                             mi.menu_item_is_recommended, msc.sub_category_name
-                    ORDER BY mi.menu_item_is_recommended DESC, mi.menu_item_name
-                """)
-
-                _ALL_MEAL_PERIODS = {"Breakfast", "Lunch", "Dinner", "All Day"}
-
-                self._menu_cache = []
-                for row in rows:
-                    meal_types = list(row['meal_types']) if row['meal_types'] else []
-                    # Normalize: items with "All Day" or no tags get all meal periods
-                    # so they pass any meal period filter without special-casing
-                    if not meal_types or "All Day" in meal_types:
-                        meal_types = list(_ALL_MEAL_PERIODS)
-
-                    self._menu_cache.append({
-                        "id": str(row['id']),
-                        "name": row['name'],
-                        "price": float(row['price']),
-                        "description": row['description'] or "",
-                        "is_available": row['is_available'],
-                        "is_recommended": row['is_recommended'],
-                        "meal_types": meal_types,
-                        "category": row['category'] or "Other"
-                    })
+        async with self._load_lock:
+            try:
+                pool = await get_async_pool()
+                async with pool.acquire() as conn:
+                    row = await conn.fetchrow(_MENU_VERSION_QUERY, self.restaurant_id)
+                    version = "|".join(row[column] for column in ("items", "schedules", "categories", "meal_types"))
+
+                    current = self._snapshot
+                    if not force and current is not None and current.version == version:
+                        self._last_refresh = datetime.now()
+                        logger.debug("menu_version_unchanged", restaurant_id=self.restaurant_id)
+                        return False
+
+                    # Load menu items with meal types, cuisines, and categories
+                    rows = await conn.fetch(_MENU_QUERY, self.restaurant_id, None)
+
+                # Build off the event loop, then swap the whole snapshot at once
+                snapshot = await asyncio.to_thread(lambda: _MenuSnapshot(_build_menu_items(rows), version))
+                self._snapshot = snapshot
                 self._last_refresh = datetime.now()
 
                 logger.info(
                     "menu_preloaded",
-                    item_count=len(self._menu_cache),
+                    restaurant_id=self.restaurant_id,
+                    item_count=len(snapshot.items),
+                    version=version,
+                    previous_version=current.version if current is not None else None,
                     refresh_interval=self.refresh_interval
                 )
 
-                # Auto-index into ChromaDB for semantic search
-                await self._sync_vector_db()
+                # Auto-index into ChromaDB for semantic search (one collection for all branches)
+                if self.restaurant_id is None:
+                    await self._sync_vector_db(previous=current, reindex=force)
+                return True
 
-        except Exception as e:
-            logger.error("menu_preload_failed", error=str(e))
-            # Keep old cache if refresh fails
-            if self._menu_cache is None:
-                self._menu_cache = []
+            except Exception as e:
+                logger.error("menu_preload_failed", restaurant_id=self.restaurant_id, error=str(e))
+                # Keep old cache if refresh fails
+                if self._snapshot is None and self.restaurant_id is None:
+                    self._set_menu([])
+                return False
+
+    async def apply_changes(self, change: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a menu change set (see app.core.menu_changes) to this snapshot.
+
+        Only the changed items are read back and merged into a new snapshot;
+        the all-branch preloader also re-embeds only the items whose indexed
+        fields changed. Full or category-wide changes, and change sets over
+        MENU_DELTA_MAX_ITEMS items, reload the snapshot instead.
+
+        Returns:
+            {"action": "patched" | "reloaded" | "skipped", "items": n, "vectors": n}
+        """
+        if self._snapshot is None:
+            return {"action": "skipped", "items": 0, "vectors": 0}
+
+        items = change.get("items") or {}
+        stock = change.get("stock") or {}
+        removed = set(items.get("removed") or [])
+        changed = set()
+        for ids in (items.get("added"), items.get("updated"), stock.get("in"), stock.get("out")):
+            changed.update(ids or [])
+        changed -= removed
+
+        if change.get("full") or change.get("categories_changed") or len(changed) + len(removed) > MENU_DELTA_MAX_ITEMS:
+            reloaded = await self.load(force=True)
+            return {"action": "reloaded" if reloaded else "skipped", "items": len(self.menu), "vectors": 0}
+        if not changed and not removed:
+            return {"action": "skipped", "items": 0, "vectors": 0}
+
+        from app.core.db_pool import get_async_pool
 
-    async def _sync_vector_db(self):
-        """Index menu items into ChromaDB if out of sync."""
+        async with self._load_lock:
+            try:
+                pool = await get_async_pool()
+                async with pool.acquire() as conn:
+                    # Version before rows: a change landing in between shows up as
+                    # a new version on the next check instead of being skipped
+                    row = await conn.fetchrow(_MENU_VERSION_QUERY, self.restaurant_id)
+                    version = "|".join(row[column] for column in ("items", "schedules", "categories", "meal_types"))
+                    rows = await conn.fetch(_MENU_QUERY, self.restaurant_id, list(changed)) if changed else []
+
+                current = self._snapshot
+                fresh = _build_menu_items(rows)
+                # Changed ids not returned (inactive, other branch) leave the menu too
+                drop = removed | changed
+                snapshot = await asyncio.to_thread(
+                    lambda: _MenuSnapshot(_merge_menu_items(current.items, fresh, drop), version)
+                )
+                self._snapshot = snapshot
+                self._last_refresh = datetime.now()
+            except Exception as e:
+                logger.error("menu_delta_failed", restaurant_id=self.restaurant_id, error=str(e))
+                return {"action": "skipped", "items": 0, "vectors": 0}
+
+        vectors = 0
+        if self.restaurant_id is None:
+            vectors = await self._apply_vector_changes(current, fresh, drop)
+
+        logger.info(
+            "menu_delta_applied",
+            restaurant_id=self.restaurant_id,
+            changed=len(changed),
+            removed=len(removed),
+            item_count=len(snapshot.items),
+            vectors=vectors,
+            version=version
+        )
+        return {"action": "patched", "items": len(changed) + len(removed), "vectors": vectors}
+
+    async def _apply_vector_changes(self, previous: _MenuSnapshot, fresh: List[Dict], drop: Set[str]) -> int:
+        """
+        Re-embed fresh items whose indexed fields changed and delete dropped
+        ones; stock-only changes leave the index alone.
+
+        Returns:
+            Number of vectors written or deleted
+        """
         try:
             from app.ai_services.vector_db_service import get_vector_db_service
             vdb = get_vector_db_service()
 
-            # Skip if counts match (menu hasn't changed)
-            if vdb.menu_collection.count() == len(self._menu_cache):
-                return
+            fresh_ids = {item["id"] for item in fresh}
+            deleted = [item_id for item_id in drop if item_id not in fresh_ids]
+            upserts = []
+            for item in fresh:
+                old = previous.index.by_id.get(item["id"])
+                if item.get("price", 0) <= 0:
+                    if old is None or old.get("price", 0) > 0:
+                        deleted.append(item["id"])
+                elif old is None or _index_fields(old) != _index_fields(item):
+                    upserts.append({
+                        "id": item["id"],
+                        "name": item["name"],
+                        "description": item.get("description", ""),
+                        "category": item.get("category", "Other"),
+                        "price": item.get("price", 0),
+                    })
+
+            if deleted:
+                vdb.delete_menu_items(deleted)
+            if upserts:
+                await vdb.upsert_menu_items(upserts)
+            if deleted or upserts:
+                self._load_embedding_matrix(vdb)
+            return len(deleted) + len(upserts)
+        except Exception as e:
+            # Non-critical — the next full sync re-indexes everything
+            logger.debug("vector_db_delta_skipped", error=str(e))
+            return 0
+
+    async def _sync_vector_db(self, previous: Optional[_MenuSnapshot] = None, reindex: bool = False):
+        """
+        Index menu items into ChromaDB, then mirror embeddings in memory.
+
+        After a version change (previous snapshot given) only items whose
+        indexed fields changed are re-embedded and vanished ones deleted. On
+        the first load an index whose count matches the menu is reused as is.
+        The collection is cleared and rebuilt on reindex, or when its count
+        still doesn't match the menu.
+        """
+        try:
+            from app.ai_services.vector_db_service import get_vector_db_service
+            vdb = get_vector_db_service()
+            menu = self.menu
+
+            if not reindex:
+                changed = 0
+                if previous is not None:
+                    menu_ids = {item["id"] for item in menu}
+                    gone = {item_id for item_id in previous.index.by_id if item_id not in menu_ids}
+                    changed = await self._apply_vector_changes(previous, menu, gone)
+                if vdb.menu_collection.count() == sum(1 for item in menu if item.get("price", 0) > 0):
+                    if previous is None or (not changed and self._embeddings is None):
+                        self._load_embedding_matrix(vdb)
+                    if changed:
+                        logger.info("vector_db_synced_incrementally", vectors=changed)
+                    return
 
             # Clear and re-index
             vdb.clear_collection()
@@ -161,22 +600,112 @@ class MenuPreloader:
                     "category": item.get("category", "Other"),
                     "price": item.get("price", 0),
                 }
-                for item in self._menu_cache
+                for item in menu
                 if item.get("price", 0) > 0
             ]
             if items_for_index:
                 await vdb.bulk_index_menu_items(items_for_index)
                 logger.info("vector_db_synced", item_count=len(items_for_index))
+            self._load_embedding_matrix(vdb)
         except Exception as e:
             # Non-critical — semantic search degrades to category fallback
             logger.debug("vector_db_sync_skipped", error=str(e))
 
+    def _load_embedding_matrix(self, vdb) -> None:
+        """Pull stored embeddings once so similar-item lookups skip the vector DB."""
+        ids, matrix = vdb.get_embedding_matrix()
+        self._embeddings = (ids, matrix) if ids else None
+        logger.info("menu_embeddings_loaded", count=len(ids), dim=int(matrix.shape[1]) if ids else 0)
+
+    def _embedding_matrix(self, snapshot: _MenuSnapshot) -> Optional[Tuple[List[str], np.ndarray]]:
+        """
+        Embeddings to search for this preloader.
+
+        Branch preloaders slice the rows of their own items out of the
+        all-branch matrix (once per snapshot and matrix version).
+        """
+        if self.restaurant_id is None:
+            return self._embeddings
+
+        source = _default_preloader()._embeddings
+        if source is None:
+            return None
+        cached = snapshot.embeddings
+        if cached is not None and cached[0] is source:
+            return cached[1]
+
+        ids, matrix = source
+        rows = [pos for pos, item_id in enumerate(ids) if item_id in snapshot.index.by_id]
+        embeddings = ([ids[pos] for pos in rows], matrix[rows]) if rows else None
+        snapshot.embeddings = (source, embeddings)
+        return embeddings
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Query embedding with a small LRU (same search terms recur constantly)."""
+        if self.restaurant_id is not None:
+            # One query cache per worker, shared with every branch
+            return _default_preloader()._embed_query(query)
+
+        key = query.strip().lower()
+        with self._query_embeddings_lock:
+            vector = self._query_embeddings.get(key)
+            if vector is not None:
+                self._query_embeddings.move_to_end(key)
+                return vector
+
+        from app.ai_services.vector_db_service import get_vector_db_service
+        vector = get_vector_db_service().embed_query(key)
+
+        with self._query_embeddings_lock:
+            self._query_embeddings[key] = vector
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return vector
+
+    def _semantic_candidates(self, snapshot: _MenuSnapshot, query: str, n_results: int) -> List[Tuple[str, float]]:
+        """
+        Nearest menu items as (item_id, similarity), best first.
+
+        Uses the in-memory embedding matrix (one matrix-vector product);
+        falls back to querying ChromaDB when the matrix isn't loaded.
+        """
+        embeddings = self._embedding_matrix(snapshot)
+        if embeddings is not None:
+            ids, matrix = embeddings
+            query_vector = self._embed_query(query)
+            if query_vector.shape[0] == matrix.shape[1]:
+                cosine = matrix @ query_vector
+                k = min(n_results, len(ids))
+                top = np.argpartition(-cosine, k - 1)[:k]
+                top = top[np.argsort(-cosine[top])]
+                return [(ids[i], (1.0 + float(cosine[i])) / 2) for i in top]
+            logger.warning("menu_embedding_dim_mismatch", query_dim=query_vector.shape[0], menu_dim=matrix.shape[1])
+
+        from app.ai_services.vector_db_service import get_vector_db_service
+        vdb = get_vector_db_service()
+        if vdb.menu_collection.count() == 0:
+            return []
+
+        results = vdb.menu_collection.query(
+            query_texts=[query],
+            n_results=n_results,
+            include=["distances"]
+        )
+        if not results or not results['ids'] or not results['ids'][0]:
+            return []
+        return [
+            (item_id, 1 - float(distance) / 2)
+            for item_id, distance in zip(results['ids'][0], results['distances'][0])
+        ]
+
     async def start_background_refresh(self):
-        """Start background refresh task."""
+        """Start background refresh task (version check for this and every loaded branch)."""
         async def refresh_loop():
             while True:
                 await asyncio.sleep(self.refresh_interval)
                 await self.load()
+                if self.restaurant_id is None:
+                    await refresh_branch_menus()
                 logger.debug("menu_background_refresh_complete")
 
         self._refresh_task = asyncio.create_task(refresh_loop())
@@ -207,66 +736,52 @@ class MenuPreloader:
         Returns:
             List of menu items, optionally filtered/prioritized by meal period
         """
-        if not self._menu_cache:
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
             return []
 
-        # Get available items with valid prices (exclude zero-price items)
-        available_items = [
-            item for item in self._menu_cache
-            if item.get("is_available", True) and item.get("price", 0) > 0
-        ]
+        index = snapshot.index
+
+        # Available items with valid prices (zero-price items excluded at index time)
+        positions = index.available_positions
 
         # Apply search filter if query provided
         if query and query.lower() not in ["", "all", "show all", "everything"]:
             query_lower = query.lower()
 
-            # Expand drink-related search terms to include common synonyms
-            drink_keywords = ["drink", "drinks", "beverage", "beverages", "cold drink", "cool drink"]
-            is_drink_search = any(keyword in query_lower for keyword in drink_keywords)
-
-            # Stage 1: Substring match (fast, precise)
-            matched_items = [
-                item for item in available_items
-                if (query_lower in item.get("name", "").lower() or
-                    query_lower in item.get("description", "").lower() or
-                    query_lower in item.get("subcategory", "").lower() or
-                    (is_drink_search and item.get("subcategory", "").lower() == "beverages"))
+            # Stage 1: Substring match on name/description via the trigram index
+            candidates = index.substring_positions(query_lower, index.text_trigrams, positions)
+            matched = [
+                pos for pos in sorted(candidates)
+                if index.available[pos]
+                and (query_lower in index.names[pos] or query_lower in index.descriptions[pos])
             ]
 
             # Stage 2: Fuzzy match fallback for spelling variations
             # (e.g. "paratha" vs "parota", "biriyani" vs "biryani")
-            if not matched_items and len(query_lower) >= 4:
-                from difflib import SequenceMatcher
-                matched_items = [
-                    item for item in available_items
-                    if SequenceMatcher(None, query_lower, item.get("name", "").lower()).ratio() >= 0.65
-                ]
-                if matched_items:
-                    logger.info("search_fuzzy_fallback", query=query, matches=len(matched_items))
+            if not matched and len(query_lower) >= 4:
+                matched = [pos for pos, _ in index.fuzzy_ratios(query_lower, index.available, 0.65)]
+                if matched:
+                    logger.info("search_fuzzy_fallback", query=query, matches=len(matched))
 
-            available_items = matched_items
+            positions = matched
 
         # Apply meal period filtering/prioritization
         if meal_period:
+            meal_set = index.meal_set(meal_period)
             if strict_meal_filter:
                 # Strict filter - show items for current meal period + "All Day" items
-                def is_for_meal_strict(item):
-                    meal_types = item.get("meal_types", [])
-                    return meal_period in meal_types or "All Day" in meal_types
-
-                available_items = [item for item in available_items if is_for_meal_strict(item)]
+                positions = [pos for pos in positions if pos in meal_set]
             elif prioritize_meal:
                 # Show meal-appropriate items first, then others (for search results)
                 # In this mode, "All Day" items ARE included
-                def is_for_meal(item):
-                    meal_types = item.get("meal_types", ["All Day"])
-                    return meal_period in meal_types or "All Day" in meal_types
-
-                meal_items = [item for item in available_items if is_for_meal(item)]
-                other_items = [item for item in available_items if not is_for_meal(item)]
-                available_items = meal_items + other_items
+                positions = (
+                    [pos for pos in positions if pos in meal_set]
+                    + [pos for pos in positions if pos not in meal_set]
+                )
 
-        return available_items
+        items = index.items
+        return [items[pos] for pos in positions]
 
     def get_meal_suggestions(self, meal_period: str, limit: int = 5) -> List[Dict]:
         """
@@ -279,21 +794,13 @@ class MenuPreloader:
         Returns:
             List of suggested menu items for the meal period
         """
-        if not self._menu_cache:
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
             return []
 
-        # Filter items appropriate for this meal period (exclude zero-price items)
-        suggestions = [
-            item for item in self._menu_cache
-            if item.get("is_available", True) and
-               item.get("price", 0) > 0 and (
-                meal_period in item.get("meal_types", ["All Day"]) or
-                "All Day" in item.get("meal_types", [])
-            )
-        ]
-
-        # Return top items (could add popularity sorting later)
-        return suggestions[:limit]
+        # Precomputed bucket of available, priced items for this meal period
+        index = snapshot.index
+        return [index.items[pos] for pos in index.meal_positions(meal_period)[:limit]]
 
     def find_item(self, name: str) -> Optional[Dict]:
         """
@@ -305,57 +812,56 @@ class MenuPreloader:
 
         Returns best match, or None if not found.
         """
-        if not self._menu_cache:
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
             return None
 
+        index = snapshot.index
         name_lower = name.lower().strip()
         name_singular = name_lower.rstrip('s') if name_lower.endswith('s') else name_lower
 
         # Stage 1a: Exact match (highest priority)
-        for item in self._menu_cache:
-            if item.get("price", 0) <= 0:
-                continue
-            item_name = item.get("name", "").lower()
-            if item_name == name_lower or item_name == name_singular:
-                return item
+        exact = index.name_positions.get(name_lower, []) + index.name_positions.get(name_singular, [])
+        if exact:
+            return index.items[min(exact)]
 
         # Stage 1b: Substring match — prefer the longest (most specific) match
         # Without this, "amla juice" (substring of "aswins amla juice") would
         # incorrectly match before the exact "Aswins Amla Juice" item.
+        # name_singular is a prefix of name_lower, so its candidates cover both.
+        candidates = index.substring_positions(name_singular, index.name_trigrams, range(len(index.names)))
+        # Item names contained in the query are found by looking up its substrings
+        for start in range(len(name_lower)):
+            for end in range(start + 1, min(len(name_lower), start + index.max_name_len) + 1):
+                candidates.update(index.name_positions.get(name_lower[start:end], ()))
+
         best_substring = None
         best_len = 0
-        for item in self._menu_cache:
-            if item.get("price", 0) <= 0:
+        for pos in sorted(candidates):
+            if not index.priced[pos]:
                 continue
-            item_name = item.get("name", "").lower()
+            item_name = index.names[pos]
             if (name_lower in item_name or
                 name_singular in item_name or
                 item_name in name_lower):
                 if len(item_name) > best_len:
                     best_len = len(item_name)
-                    best_substring = item
+                    best_substring = index.items[pos]
         if best_substring:
             return best_substring
 
         # Stage 2: Fuzzy match (handles LLM "correcting" spellings)
         # e.g. "aloo paratha" matches "Aloo Parota", "biriyani" matches "Biryani"
-        from difflib import SequenceMatcher
-
+        # Require at least 75% similarity to avoid false positives
         best_match = None
         best_ratio = 0.0
 
-        for item in self._menu_cache:
-            if item.get("price", 0) <= 0:
-                continue
-
-            item_name = item.get("name", "").lower()
-            ratio = SequenceMatcher(None, name_lower, item_name).ratio()
+        for pos, ratio in index.fuzzy_ratios(name_lower, index.priced, 0.75):
             if ratio > best_ratio:
                 best_ratio = ratio
-                best_match = item
+                best_match = index.items[pos]
 
-        # Require at least 75% similarity to avoid false positives
-        if best_ratio >= 0.75 and best_match:
+        if best_match:
             logger.info(
                 "find_item_fuzzy_match",
                 query=name,
@@ -366,6 +872,21 @@ class MenuPreloader:
 
         return None
 
+    def get_item_by_id(self, item_id: str) -> Optional[Dict]:
+        """Look up a cached menu item by id."""
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
+            return None
+        return snapshot.index.by_id.get(str(item_id))
+
+    def get_recommended_items(self, limit: Optional[int] = None) -> List[Dict]:
+        """Get available, priced items flagged as recommended (menu order)."""
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
+            return []
+        items = snapshot.index.recommended_items
+        return list(items[:limit] if limit is not None else items)
+
     def get_similar_items(self, query: str, limit: int = 10, exclude_ids: Optional[set] = None) -> tuple[List[Dict], str]:
         """
         Find individually similar menu items using semantic search.
@@ -381,105 +902,79 @@ class MenuPreloader:
         Returns:
             (items, label) — list of similar items and a display label
         """
-        if not self._menu_cache:
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
             return [], ""
 
         exclude_ids = exclude_ids or set()
+        index = snapshot.index
 
-        # Build ID→item lookup from cache for fast matching
-        item_by_id = {
-            item["id"]: item
-            for item in self._menu_cache
-            if item.get("price", 0) > 0 and item.get("is_available", True)
-        }
+        # Precomputed ID→item lookup of available, priced items
+        item_by_id = index.available_by_id
 
-        # Step 1: Semantic search via VectorDB (item-level results)
+        # Step 1: Semantic search over menu embeddings (item-level results)
         try:
-            from app.ai_services.vector_db_service import get_vector_db_service
-            vdb = get_vector_db_service()
+            candidates = self._semantic_candidates(snapshot, query, min(limit + len(exclude_ids), 20))
 
-            if vdb.menu_collection.count() > 0:
-                results = vdb.menu_collection.query(
-                    query_texts=[query],
-                    n_results=min(limit + len(exclude_ids), 20),
-                    include=["metadatas", "distances"]
-                )
+            if candidates:
+                # Log top 3 scores for debugging
+                top_scores = [
+                    (index.by_id.get(item_id, {}).get('name', ''), round(similarity, 3))
+                    for item_id, similarity in candidates[:3]
+                ]
+                logger.info("semantic_search_scores", query=query, top_scores=top_scores)
 
-                if results and results['ids'] and results['ids'][0]:
-                    # Log top 3 scores for debugging
-                    top_scores = [
-                        (results['metadatas'][0][i].get('name', ''), round(1 - float(results['distances'][0][i]) / 2, 3))
-                        for i in range(min(3, len(results['ids'][0])))
-                    ]
-                    logger.info("semantic_search_scores", query=query, top_scores=top_scores)
-
-                    similar = []
-                    for idx, item_id in enumerate(results['ids'][0]):
-                        if item_id in exclude_ids:
-                            continue
-
-                        distance = float(results['distances'][0][idx])
-                        similarity = 1 - (distance / 2)
-
-                        # Only include genuinely similar items (>0.85)
-                        # 0.85 in rescaled space = cosine_similarity > 0.7
-                        if similarity < 0.85:
-                            break  # distances are sorted, rest will be worse
-
-                        # Look up full item data from preloader cache
-                        cached_item = item_by_id.get(item_id)
-                        if cached_item:
-                            similar.append(cached_item)
-
-                        if len(similar) >= limit:
-                            break
-
-                    if similar:
-                        label = "similar items"
-                        logger.info(
-                            "similar_items_semantic",
-                            query=query,
-                            count=len(similar),
-                            items=[i["name"] for i in similar[:5]],
-                        )
-                        return similar, label
-                    else:
-                        top_sim = 1 - (float(results['distances'][0][0]) / 2)
-                        logger.info("similar_items_too_weak", query=query, top_similarity=round(top_sim, 3), top_item=results['metadatas'][0][0].get('name', ''))
+                similar = []
+                for item_id, similarity in candidates:
+                    if item_id in exclude_ids:
+                        continue
+
+                    # Only include genuinely similar items
+                    if similarity < SIMILARITY_THRESHOLD:
+                        break  # sorted by similarity, rest will be worse
+
+                    # Look up full item data from preloader cache
+                    cached_item = item_by_id.get(item_id)
+                    if cached_item:
+                        similar.append(cached_item)
+
+                    if len(similar) >= limit:
+                        break
+
+                if similar:
+                    label = "similar items"
+                    logger.info(
+                        "similar_items_semantic",
+                        query=query,
+                        count=len(similar),
+                        items=[i["name"] for i in similar[:5]],
+                    )
+                    return similar, label
+                else:
+                    logger.info("similar_items_too_weak", query=query, top_similarity=top_scores[0][1], top_item=top_scores[0][0])
         except Exception as e:
             logger.debug("semantic_similar_items_fallback", error=str(e))
 
         # Step 2: Fallback — match query against category names
         query_lower = query.lower().strip()
-        for item in self._menu_cache:
-            if item.get("price", 0) <= 0 or not item.get("is_available", True):
-                continue
-            cat = item.get("category", "Other")
-            if query_lower in cat.lower() or cat.lower() in query_lower:
+        for cat, cat_lower in index.categories_lower:
+            if query_lower in cat_lower or cat_lower in query_lower:
                 cat_items = [
-                    i for i in self._menu_cache
-                    if i.get("category") == cat
-                    and i.get("price", 0) > 0
-                    and i.get("is_available", True)
-                    and i["id"] not in exclude_ids
+                    i for i in index.category_items[cat]
+                    if i["id"] not in exclude_ids
                 ]
                 return cat_items[:limit], cat
 
         # Step 3: No similar items at all — suggest popular alternatives
         alternatives = [
-            item for item in self._menu_cache
-            if item.get("price", 0) > 0
-            and item.get("is_available", True)
-            and item.get("is_recommended", False)
-            and item["id"] not in exclude_ids
+            item for item in index.recommended_items
+            if item["id"] not in exclude_ids
         ]
         # If not enough recommended items, pad with other available items
         if len(alternatives) < limit:
             alt_ids = {a["id"] for a in alternatives}
-            for item in self._menu_cache:
-                if (item.get("price", 0) > 0
-                    and item.get("is_available", True)
-                    and item["id"] not in exclude_ids
+            for item in index.available_items:
+                if (item["id"] not in exclude_ids
                     and item["id"] not in alt_ids):
                     alternatives.append(item)
                     if len(alternatives) >= limit:
@@ -493,15 +988,13 @@ class MenuPreloader:
 
     def get_category_items(self, category: str, limit: int = 10, exclude_ids: Optional[set] = None) -> List[Dict]:
         """Get available items from a specific category."""
-        if not self._menu_cache:
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.items:
             return []
         exclude_ids = exclude_ids or set()
         return [
-            i for i in self._menu_cache
-            if i.get("category") == category
-            and i.get("price", 0) > 0
-            and i.get("is_available", True)
-            and i["id"] not in exclude_ids
+            i for i in snapshot.index.category_items.get(category, [])
+            if i["id"] not in exclude_ids
         ][:limit]
 
 
@@ -554,15 +1047,170 @@ class ModelPreloader:
 
 _menu_preloader: Optional[MenuPreloader] = None
 
+# Branch snapshots by restaurant id, least recently used first
+_branch_preloaders: "OrderedDict[str, MenuPreloader]" = OrderedDict()
+_branch_preloaders_lock = threading.Lock()
+_branch_stats = {"loads": 0, "evictions": 0}
+# Change sets applied to snapshots (see apply_menu_changes)
+_delta_stats = {"patched": 0, "reloaded": 0, "skipped": 0, "vectors": 0}
+
 
-def get_menu_preloader() -> MenuPreloader:
-    """Get global menu preloader instance."""
+def _default_preloader() -> MenuPreloader:
     global _menu_preloader
     if _menu_preloader is None:
         _menu_preloader = MenuPreloader()
     return _menu_preloader
 
 
+def get_menu_preloader(restaurant_id: Optional[str] = None) -> MenuPreloader:
+    """
+    Get the menu preloader for a branch.
+
+    Defaults to the branch of the current request (see use_menu_branch).
+    Never loads anything: a branch that isn't loaded yet, or has no menu
+    of its own, is served from the all-branch menu.
+    """
+    branch_id = restaurant_id or _current_branch.get()
+    if branch_id:
+        with _branch_preloaders_lock:
+            preloader = _branch_preloaders.get(branch_id)
+            if preloader is not None:
+                _branch_preloaders.move_to_end(branch_id)
+        if preloader is not None and preloader.menu:
+            preloader.last_used = time.monotonic()
+            return preloader
+    return _default_preloader()
+
+
+async def load_branch_menu(restaurant_id: str) -> MenuPreloader:
+    """
+    Load a branch snapshot on first use and return the preloader serving it.
+
+    Later calls return the cached snapshot; the background refresh keeps it
+    current. Falls back to the all-branch preloader for ids that aren't
+    branch UUIDs or when the load fails.
+    """
+    try:
+        uuid.UUID(str(restaurant_id))
+    except ValueError:
+        return _default_preloader()
+
+    with _branch_preloaders_lock:
+        preloader = _branch_preloaders.get(restaurant_id)
+        if preloader is None:
+            preloader = _branch_preloaders[restaurant_id] = MenuPreloader(restaurant_id=restaurant_id)
+        _branch_preloaders.move_to_end(restaurant_id)
+    preloader.last_used = time.monotonic()
+
+    if not preloader.is_loaded:
+        # Concurrent first requests wait on the same load
+        await preloader.load()
+        if not preloader.is_loaded:
+            with _branch_preloaders_lock:
+                if _branch_preloaders.get(restaurant_id) is preloader:
+                    del _branch_preloaders[restaurant_id]
+            return _default_preloader()
+        _branch_stats["loads"] += 1
+        _evict_branches()
+
+    return get_menu_preloader(restaurant_id)
+
+
+async def use_menu_branch(restaurant_id: Optional[str]) -> MenuPreloader:
+    """
+    Serve menu lookups in the current context (and tasks started from it)
+    from a branch snapshot, loading it if needed.
+    """
+    _current_branch.set(restaurant_id)
+    if not restaurant_id:
+        return _default_preloader()
+    return await load_branch_menu(restaurant_id)
+
+
+def _evict_branches() -> None:
+    """Drop idle branch snapshots and the least recently used beyond MENU_MAX_BRANCHES."""
+    idle_before = time.monotonic() - MENU_BRANCH_IDLE_SECONDS
+    evicted = []
+    with _branch_preloaders_lock:
+        for branch_id, preloader in list(_branch_preloaders.items()):
+            if preloader.last_used < idle_before or len(_branch_preloaders) > MENU_MAX_BRANCHES:
+                del _branch_preloaders[branch_id]
+                evicted.append(branch_id)
+    if evicted:
+        _branch_stats["evictions"] += len(evicted)
+        logger.info("menu_branches_evicted", restaurant_ids=evicted, remaining=len(_branch_preloaders))
+
+
+async def refresh_branch_menus(restaurant_id: Optional[str] = None, force: bool = False) -> int:
+    """
+    Version-check loaded branch snapshots (or one branch) and reload changed ones.
+
+    Also the hook for menu pushes without a change set: call with the
+    restaurant id, plus force=True if the push didn't touch updated_at
+    (PetPooja syncs go through apply_menu_changes instead).
+    Returns the number of snapshots swapped.
+    """
+    _evict_branches()
+    with _branch_preloaders_lock:
+        if restaurant_id:
+            preloaders = [_branch_preloaders[restaurant_id]] if restaurant_id in _branch_preloaders else []
+        else:
+            preloaders = list(_branch_preloaders.values())
+
+    swapped = 0
+    for preloader in preloaders:
+        if await preloader.load(force=force):
+            swapped += 1
+    return swapped
+
+
+async def apply_menu_changes(change: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a menu change set to the all-branch snapshot and, if loaded, the
+    snapshot of the branch it belongs to.
+
+    Returns:
+        Snapshot actions taken ({"patched": n, "reloaded": n, "skipped": n})
+        and vectors written / deleted
+    """
+    restaurant_id = change.get("restaurant_id")
+    preloaders = [_default_preloader()]
+    with _branch_preloaders_lock:
+        if restaurant_id in _branch_preloaders:
+            preloaders.append(_branch_preloaders[restaurant_id])
+
+    result = {"patched": 0, "reloaded": 0, "skipped": 0, "vectors": 0}
+    for preloader in preloaders:
+        applied = await preloader.apply_changes(change)
+        result[applied["action"]] += 1
+        result["vectors"] += applied["vectors"]
+    for key, value in result.items():
+        _delta_stats[key] += value
+    return result
+
+
+def get_menu_snapshot_stats() -> Dict[str, Any]:
+    """Loaded menu snapshots (versions, sizes, idle time) for monitoring."""
+    now = time.monotonic()
+    default = _default_preloader()
+    with _branch_preloaders_lock:
+        branches = list(_branch_preloaders.items())
+    return {
+        "all_branches": {"items": len(default.menu), "version": default.version},
+        "branches": {
+            branch_id: {
+                "items": len(preloader.menu),
+                "version": preloader.version,
+                "idle_seconds": round(now - preloader.last_used, 1),
+            }
+            for branch_id, preloader in branches
+        },
+        "max_branches": MENU_MAX_BRANCHES,
+        **_branch_stats,
+        "deltas": dict(_delta_stats),
+    }
+
+
 async def preload_all():
     """
     Preload all caches on application startup.
@@ -571,7 +1219,7 @@ async def preload_all():
     """
     logger.info("preloading_application_caches")
 
-    # Load menu
+    # Load menu (all branches; branch snapshots load on first request)
     preloader = get_menu_preloader()
     await preloader.load()
     await preloader.start_background_refresh()
@@ -584,5 +1232,7 @@ async def preload_all():
 
 async def cleanup_preloaders():
     """Clean up on shutdown."""
-    preloader = get_menu_preloader()
+    preloader = _default_preloader()
     await preloader.stop()
+    with _branch_preloaders_lock:
+        _branch_preloaders.clear()
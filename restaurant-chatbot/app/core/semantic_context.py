@@ -6,24 +6,39 @@ Deterministic entity tracking for conversation context.
 v20: No LLM preprocessing - graph updated by tool outputs.
 
 Features:
-- Entity graph per session (persisted to Redis)
+- Entity graph per session (persisted to Redis as a hash, one field per attribute)
 - Tracks displayed menu (for "the 2nd one" resolution)
 - Tracks last mentioned items (for "it", "that" resolution)
 - Cart read directly from Redis (single source of truth)
+
+Turn lifecycle:
+    graph = await begin_session_turn(session_id)  # 1 round trip: context hash + cart snapshot
+    ...                                            # tools mutate the same in-process object
+    await end_session_turn(session_id)            # 1 round trip: HSET of changed fields only
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+from dataclasses import dataclass, field
 import json
+import os
+import threading
+import time
 import structlog
 
 logger = structlog.get_logger(__name__)
 
-# Redis key prefix for entity graphs
-ENTITY_GRAPH_PREFIX = "entity_graph:"
+# Redis hash per session (fields below). Replaces the JSON blob under "entity_graph:".
+SESSION_CONTEXT_PREFIX = "session_context:"
+LEGACY_ENTITY_GRAPH_PREFIX = "entity_graph:"
 ENTITY_GRAPH_TTL = 3600 * 24  # 24 hours
 
+# A turn still open after this long lost its end_session_turn() (e.g. an exception
+# before the caller's try); the next turn adopts its context instead of nesting
+SESSION_TURN_MAX_SECONDS = float(os.getenv("SESSION_TURN_MAX_SECONDS", "600"))
+
+_SCALAR_FIELDS = ("last_mentioned_item", "last_action")
+_JSON_FIELDS = ("last_mentioned_items", "displayed_menu", "preferences")
+
 
 @dataclass
 class EntityGraph:
@@ -44,13 +59,22 @@ class EntityGraph:
     last_action: Optional[str] = None
     displayed_menu: List[str] = field(default_factory=list)  # Ordered list of menu items last shown
     preferences: Dict[str, Any] = field(default_factory=dict)
+    # Fields changed since load (written at turn end)
+    _dirty: Set[str] = field(default_factory=set, repr=False, compare=False)
+    # Cart snapshot rows read with the context at turn start (None = not loaded)
+    _cart_rows: Optional[List[Dict[str, Any]]] = field(default=None, repr=False, compare=False)
+
+    def _changed(self, *names: str):
+        self._dirty.update(names)
+        # Outside a turn there is no turn-end save: write through
+        if self.session_id not in _TURNS:
+            _save_fields_sync(self)
 
     def set_displayed_menu(self, items: List[str]):
         """Track the menu items displayed to user (in order)."""
         self.displayed_menu = items
         logger.debug("displayed_menu_tracked", session_id=self.session_id, items=items[:5])
-        # Persist to Redis
-        _save_entity_graph(self)
+        self._changed("displayed_menu")
 
     def update_last_mentioned(self, item_name: str):
         """Update last mentioned item for context resolution."""
@@ -59,8 +83,7 @@ class EntityGraph:
             self.last_mentioned_items.append(item_name)
         # Keep only last 5 items
         self.last_mentioned_items = self.last_mentioned_items[-5:]
-        # Persist to Redis
-        _save_entity_graph(self)
+        self._changed("last_mentioned_item", "last_mentioned_items")
 
     def get_item_by_position(self, position: int) -> Optional[str]:
         """Get menu item by position (1-indexed for natural language)."""
@@ -78,7 +101,7 @@ class EntityGraph:
             parts.append(f"Last item: {self.last_mentioned_item}")
         if self.displayed_menu:
             parts.append(f"Menu shown: {len(self.displayed_menu)} items")
-        cart_items = _get_cart_items_from_redis(self.session_id)
+        cart_items = self.get_cart_item_names()
         if cart_items:
             parts.append(f"Cart: {len(cart_items)} items")
         return " | ".join(parts) if parts else "New conversation"
@@ -108,7 +131,7 @@ class EntityGraph:
         # Include cart only if user asks about cart/order/checkout
         cart_keywords = ['cart', 'order', 'checkout', 'remove', 'view', 'show', 'what', 'bill', 'total']
         if any(keyword in query_lower for keyword in cart_keywords):
-            cart_items = _get_cart_items_from_redis(self.session_id)
+            cart_items = self.get_cart_item_names()
             if cart_items:
                 parts.append(f"Cart: {', '.join(cart_items[:5])}")  # Max 5 items
 
@@ -118,6 +141,35 @@ class EntityGraph:
 
         return " | ".join(parts) if parts else "No prior context"
 
+    def get_cart_item_names(self) -> List[str]:
+        """Cart item names - from the turn-start snapshot when loaded, else read now."""
+        if self._cart_rows is not None:
+            return _cart_item_names(self._cart_rows)
+        return _get_cart_items_from_redis(self.session_id)
+
+    def to_hash(self, names: Optional[Set[str]] = None) -> Dict[str, str]:
+        """Serialize fields (all, or just `names`) for HSET."""
+        data = self.to_dict()
+        return {
+            name: json.dumps(data[name]) if name in _JSON_FIELDS else (data[name] or "")
+            for name in (names if names is not None else _SCALAR_FIELDS + _JSON_FIELDS)
+        }
+
+    @classmethod
+    def from_hash(cls, session_id: str, data: Dict[str, str]) -> "EntityGraph":
+        """Create from a Redis hash (missing fields keep their defaults)."""
+        values: Dict[str, Any] = {"session_id": session_id}
+        for name in _SCALAR_FIELDS:
+            if data.get(name):
+                values[name] = data[name]
+        for name in _JSON_FIELDS:
+            if data.get(name):
+                try:
+                    values[name] = json.loads(data[name])
+                except ValueError:
+                    logger.debug("session_context_field_invalid", session_id=session_id, field=name)
+        return cls.from_dict(values)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Redis storage."""
         return {
@@ -146,8 +198,22 @@ class EntityGraph:
 # REDIS PERSISTENCE
 # ============================================================================
 
+def _context_key(session_id: str) -> str:
+    return f"{SESSION_CONTEXT_PREFIX}{session_id}"
+
+
+def _get_async_redis_client():
+    """Shared async Redis client (app.core.redis), or None if not initialized."""
+    try:
+        from app.core.redis import get_redis_client
+        return get_redis_client()
+    except Exception as e:
+        logger.debug("redis_client_unavailable", error=str(e))
+        return None
+
+
 def _get_redis_client():
-    """Get sync Redis client."""
+    """Sync Redis client - only for graphs used outside a turn (tool threads, scripts)."""
     try:
         from app.core.redis import get_sync_redis_client
         return get_sync_redis_client()
@@ -156,96 +222,232 @@ def _get_redis_client():
         return None
 
 
-def _save_entity_graph(graph: EntityGraph):
-    """Save entity graph to Redis."""
+def _save_fields_sync(graph: EntityGraph):
+    """Write changed fields immediately (graph is not part of a turn)."""
+    if not graph._dirty:
+        return
     try:
         client = _get_redis_client()
         if client:
-            key = f"{ENTITY_GRAPH_PREFIX}{graph.session_id}"
-            client.setex(key, ENTITY_GRAPH_TTL, json.dumps(graph.to_dict()))
+            key = _context_key(graph.session_id)
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(key, mapping=graph.to_hash(graph._dirty))
+            pipe.expire(key, ENTITY_GRAPH_TTL)
+            pipe.execute()
+            graph._dirty.clear()
             logger.debug("entity_graph_saved", session_id=graph.session_id)
     except Exception as e:
         logger.debug("entity_graph_save_failed", error=str(e))
 
 
 def _load_entity_graph(session_id: str) -> Optional[EntityGraph]:
-    """Load entity graph from Redis."""
+    """Load entity graph from Redis (sync, outside a turn)."""
     try:
         client = _get_redis_client()
         if client:
-            key = f"{ENTITY_GRAPH_PREFIX}{session_id}"
-            data = client.get(key)
+            data = client.hgetall(_context_key(session_id))
             if data:
-                return EntityGraph.from_dict(json.loads(data))
+                return EntityGraph.from_hash(session_id, data)
     except Exception as e:
         logger.debug("entity_graph_load_failed", error=str(e))
     return None
 
 
+def _cart_item_names(rows: List[Dict[str, Any]]) -> List[str]:
+    from app.core.session_events import cart_summary_from_rows
+    items = cart_summary_from_rows(rows)["items"]
+    return [item["item_name"] for item in items if item.get("item_name")]
+
+
 def _get_cart_items_from_redis(session_id: str) -> List[str]:
     """
-    Get cart item names from PostgreSQL session_cart (event-sourced).
-    This is the single source of truth for cart state.
+    Get cart item names from the session cart snapshot (event-sourced).
+
+    Called from the event loop thread, so it only reads the Redis snapshot
+    that every cart read/write keeps warm - never the database.
     """
     try:
-        from app.core.session_events import get_sync_session_tracker
-        tracker = get_sync_session_tracker(session_id)
-        cart_data = tracker.get_cart_summary()
-        items = cart_data.get("items", [])
-        # PostgreSQL returns item_name, fallback to name for compat
-        return [item.get("item_name") or item.get("name", "") for item in items if item.get("item_name") or item.get("name")]
+        from app.core.session_events import get_cart_snapshot_store
+        rows = get_cart_snapshot_store().peek_sync(session_id)
+        if not rows:
+            return []
+        return _cart_item_names(rows)
     except Exception as e:
         logger.debug("cart_read_failed", error=str(e))
         return []
 
 
 # ============================================================================
-# PUBLIC API
+# TURN-SCOPED CONTEXT
 # ============================================================================
 
-# In-memory cache (backed by Redis)
-_ENTITY_GRAPHS: Dict[str, EntityGraph] = {}
+class _Turn:
+    __slots__ = ("graph", "depth", "started", "commands", "round_trips")
+
+    def __init__(self, graph: EntityGraph):
+        self.graph = graph
+        self.depth = 1
+        self.started = time.monotonic()
+        self.commands = 0
+        self.round_trips = 0
 
 
+# Sessions with a turn in progress -> their context (shared with tool threads)
+_TURNS: Dict[str, _Turn] = {}
+_TURNS_LOCK = threading.Lock()
+
+# Totals across turns, for get_session_context_stats()
+_STATS = {"turns": 0, "redis_commands": 0, "redis_round_trips": 0, "saves": 0, "clean_turns": 0}
+
+
+async def begin_session_turn(session_id: str) -> EntityGraph:
+    """
+    Load the session context once for a chat turn.
+
+    Reads the context hash and the cart snapshot in one pipelined round trip.
+    Until end_session_turn(), get_entity_graph() returns this same object
+    (also from tool threads) and mutations stay in memory.
+    """
+    with _TURNS_LOCK:
+        turn = _TURNS.get(session_id)
+        if turn is not None:
+            if time.monotonic() - turn.started > SESSION_TURN_MAX_SECONDS:
+                logger.warning("session_context_turn_abandoned", session_id=session_id, depth=turn.depth)
+                turn.depth = 0
+                turn.started = time.monotonic()
+            # Overlapping turn for the same session: share the loaded context
+            turn.depth += 1
+            return turn.graph
+
+    graph = None
+    cart_rows: List[Dict[str, Any]] = []
+    commands = round_trips = 0
+    client = _get_async_redis_client()
+    if client:
+        try:
+            from app.core.session_events import get_cart_snapshot_store
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(_context_key(session_id))
+                pipe.hget(get_cart_snapshot_store().key(session_id), "cart")
+                data, cart_json = await pipe.execute()
+            commands, round_trips = 2, 1
+            if data:
+                graph = EntityGraph.from_hash(session_id, data)
+            if cart_json:
+                cart_rows = json.loads(cart_json)
+        except Exception as e:
+            logger.debug("session_context_load_failed", session_id=session_id, error=str(e))
+
+    graph = graph or EntityGraph(session_id=session_id)
+    graph._cart_rows = cart_rows
+
+    with _TURNS_LOCK:
+        turn = _TURNS.get(session_id)
+        if turn is not None:
+            # Another coroutine began the same turn while we were loading
+            turn.depth += 1
+            return turn.graph
+        turn = _TURNS[session_id] = _Turn(graph)
+        turn.commands, turn.round_trips = commands, round_trips
+    return graph
+
+
+async def end_session_turn(session_id: str):
+    """
+    Finish a chat turn: write changed fields (HSET + EXPIRE, one round trip)
+    if anything changed, then drop the in-process context.
+    """
+    with _TURNS_LOCK:
+        turn = _TURNS.get(session_id)
+        if turn is None:
+            return
+        turn.depth -= 1
+        if turn.depth > 0:
+            return
+        del _TURNS[session_id]
+
+    graph = turn.graph
+    dirty = set(graph._dirty)
+    if dirty:
+        client = _get_async_redis_client()
+        if client:
+            try:
+                key = _context_key(session_id)
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, mapping=graph.to_hash(dirty))
+                    pipe.expire(key, ENTITY_GRAPH_TTL)
+                    await pipe.execute()
+                graph._dirty.difference_update(dirty)
+                turn.commands += 2
+                turn.round_trips += 1
+                _STATS["saves"] += 1
+            except Exception as e:
+                logger.debug("session_context_save_failed", session_id=session_id, error=str(e))
+    else:
+        _STATS["clean_turns"] += 1
+
+    _STATS["turns"] += 1
+    _STATS["redis_commands"] += turn.commands
+    _STATS["redis_round_trips"] += turn.round_trips
+    logger.debug(
+        "session_context_turn_completed",
+        session_id=session_id,
+        redis_commands=turn.commands,
+        redis_round_trips=turn.round_trips,
+        changed_fields=sorted(dirty),
+        duration_ms=round((time.monotonic() - turn.started) * 1000, 1)
+    )
+
+
+def get_session_context_stats() -> Dict[str, Any]:
+    """Redis usage of the turn-scoped context (averages per turn)."""
+    turns = _STATS["turns"]
+    return {
+        **_STATS,
+        "active_turns": len(_TURNS),
+        "redis_commands_per_turn": round(_STATS["redis_commands"] / turns, 2) if turns else 0.0,
+        "redis_round_trips_per_turn": round(_STATS["redis_round_trips"] / turns, 2) if turns else 0.0,
+    }
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
 def get_entity_graph(session_id: str) -> EntityGraph:
     """
     Get entity graph for session.
-    Checks in-memory cache first, then Redis, then creates new.
+
+    During a turn this is the in-process context loaded by begin_session_turn()
+    (no Redis access). Outside a turn it is loaded from Redis and changes are
+    written through.
     """
-    # Check in-memory cache
-    if session_id in _ENTITY_GRAPHS:
-        return _ENTITY_GRAPHS[session_id]
-
-    # Try loading from Redis
-    graph = _load_entity_graph(session_id)
-    if graph:
-        _ENTITY_GRAPHS[session_id] = graph
-        return graph
-
-    # Create new graph
-    graph = EntityGraph(session_id=session_id)
-    _ENTITY_GRAPHS[session_id] = graph
-    return graph
+    turn = _TURNS.get(session_id)
+    if turn is not None:
+        return turn.graph
+
+    return _load_entity_graph(session_id) or EntityGraph(session_id=session_id)
 
 
 def clear_entity_graph(session_id: str):
     """Clear entity graph for session (from memory and Redis)."""
-    # Clear from memory
-    if session_id in _ENTITY_GRAPHS:
-        del _ENTITY_GRAPHS[session_id]
+    # Reset an in-progress turn so its turn-end save does not restore old fields
+    turn = _TURNS.get(session_id)
+    if turn is not None:
+        turn.graph = EntityGraph(session_id=session_id, _cart_rows=turn.graph._cart_rows)
 
     # Clear from Redis
     try:
         client = _get_redis_client()
         if client:
-            key = f"{ENTITY_GRAPH_PREFIX}{session_id}"
-            client.delete(key)
+            client.delete(_context_key(session_id), f"{LEGACY_ENTITY_GRAPH_PREFIX}{session_id}")
             logger.debug("entity_graph_cleared", session_id=session_id)
     except Exception as e:
         logger.debug("entity_graph_clear_failed", error=str(e))
 
 
 def save_entity_graph(session_id: str):
-    """Explicitly save current entity graph to Redis."""
-    if session_id in _ENTITY_GRAPHS:
-        _save_entity_graph(_ENTITY_GRAPHS[session_id])
+    """Explicitly save the in-progress turn's changes to Redis now."""
+    turn = _TURNS.get(session_id)
+    if turn is not None:
+        _save_fields_sync(turn.graph)
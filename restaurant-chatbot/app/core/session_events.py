@@ -5,8 +5,10 @@ Structured, SQL-based session state management.
 
 Architecture:
 - All user actions are discrete events (item_viewed, item_added, etc.)
-- Events are logged to session_events table
+- Events are buffered per process and written to session_events in batches
 - Current state is materialized in session_cart, session_state tables
+- A per-session cart snapshot in Redis is updated from the same events,
+  so cart reads cost zero database round trips
 - Context retrieval is via SQL queries (zero token cost!)
 - No text-based context in LLM prompts
 
@@ -18,10 +20,17 @@ Benefits vs Text-Based Approach:
 - Deterministic (same state + action = same result)
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Awaitable, Callable, Tuple
+from datetime import datetime, timezone
 from uuid import UUID
+import asyncio
 import json
+import os
+import threading
+import time
+import uuid
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -71,6 +80,581 @@ class EventType:
     BOOKING_CANCELLED = "booking_cancelled"
 
 
+# Events that must be durable before the caller continues (flushed synchronously)
+DURABLE_EVENT_TYPES = frozenset({
+    EventType.CHECKOUT_STARTED,
+    EventType.ORDER_TYPE_SELECTED,
+    EventType.ORDER_PLACED,
+    EventType.PAYMENT_METHOD_SELECTED,
+    EventType.PAYMENT_INITIATED,
+    EventType.PAYMENT_COMPLETED,
+    EventType.PAYMENT_FAILED,
+    EventType.ORDER_CANCELLED,
+})
+
+# Events that change the materialized cart
+CART_EVENT_TYPES = frozenset({
+    EventType.ITEM_ADDED,
+    EventType.ITEM_REMOVED,
+    EventType.ITEM_QUANTITY_UPDATED,
+    EventType.CART_CLEARED,
+})
+
+EVENT_FLUSH_INTERVAL_MS = int(os.getenv("SESSION_EVENT_FLUSH_INTERVAL_MS", "250"))
+EVENT_FLUSH_BATCH_SIZE = int(os.getenv("SESSION_EVENT_FLUSH_BATCH_SIZE", "100"))
+EVENT_MAX_BUFFER = int(os.getenv("SESSION_EVENT_MAX_BUFFER", "10000"))
+CART_SNAPSHOT_TTL = int(os.getenv("SESSION_CART_SNAPSHOT_TTL", "86400"))
+# A cart write that began longer ago than this (writer crashed) no longer holds off seeding
+CART_SNAPSHOT_WRITE_WINDOW = float(os.getenv("SESSION_CART_SNAPSHOT_WRITE_WINDOW", "30"))
+CART_SNAPSHOT_KEY_PREFIX = "session_cart_snapshot:"
+
+_INSERT_EVENTS = """
+    INSERT INTO session_events (event_id, session_id, user_id, event_type, event_data, timestamp)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+# Reactivating a soft-deleted row starts a fresh line item instead of
+# resurrecting the quantity/instructions it had before it was removed.
+_UPSERT_CART_ITEM_SET = """
+    quantity = CASE WHEN session_cart.is_active
+                    THEN session_cart.quantity + EXCLUDED.quantity
+                    ELSE EXCLUDED.quantity END,
+    special_instructions = CASE WHEN session_cart.is_active
+                                THEN COALESCE(EXCLUDED.special_instructions, session_cart.special_instructions)
+                                ELSE EXCLUDED.special_instructions END,
+    updated_at = NOW(),
+    is_active = TRUE
+"""
+
+_LOAD_CART_ROWS_SQL = """
+    SELECT item_id, item_name, quantity, price, special_instructions, is_active
+    FROM session_cart
+    WHERE session_id = $1
+    ORDER BY added_at
+"""
+
+
+# ============================================================================
+# EVENT WRITER - Per-process buffer, flushed in batches
+# ============================================================================
+
+EventRow = Tuple[UUID, str, Optional[str], str, str, datetime]
+
+# SQLSTATE classes worth retrying: connection, transaction rollback (deadlock,
+# serialization), insufficient resources, operator intervention, system error
+_TRANSIENT_SQLSTATE_CLASSES = frozenset({"08", "40", "53", "57", "58"})
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed batch write may succeed if retried unchanged."""
+    import asyncpg
+
+    # Includes asyncpg's client-side DataError (a row that cannot be encoded)
+    if isinstance(error, (ValueError, TypeError)):
+        return False
+    if isinstance(error, asyncpg.PostgresError):
+        return (error.sqlstate or "")[:2] in _TRANSIENT_SQLSTATE_CLASSES
+    # Pool closed, timeouts, dropped connections
+    return True
+
+
+class SessionEventWriter:
+    """
+    Buffers session events in process memory and writes them in batches.
+
+    Events get their event_id and timestamp at enqueue time, so ordering and
+    return values are identical to the old one-INSERT-per-event path. A
+    background task flushes every EVENT_FLUSH_INTERVAL_MS or as soon as
+    EVENT_FLUSH_BATCH_SIZE events are waiting. Checkout-critical events
+    (DURABLE_EVENT_TYPES) are flushed before the caller continues.
+
+    A batch failing with a transient error is retried on the next flush. A
+    batch failing otherwise is split until the offending rows are isolated;
+    those are dead-lettered (logged and counted) so they cannot block the
+    rest of the buffer.
+
+    Thread-safe: enqueue() may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int = EVENT_FLUSH_INTERVAL_MS,
+        batch_size: int = EVENT_FLUSH_BATCH_SIZE,
+        max_buffer: int = EVENT_MAX_BUFFER
+    ):
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self._buffer: List[EventRow] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "enqueued": 0,
+            "flushed": 0,
+            "batches": 0,
+            "flush_failures": 0,
+            "dropped": 0,
+            "dead_lettered": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def enqueue(
+        self,
+        session_id: str,
+        user_id: Optional[UUID],
+        event_type: str,
+        event_data: Dict[str, Any]
+    ) -> UUID:
+        """Buffer an event and return its (pre-generated) event_id."""
+        event_id = uuid.uuid4()
+        row = (
+            event_id,
+            session_id,
+            str(user_id) if user_id else None,
+            event_type,
+            json.dumps(event_data, default=str),
+            datetime.now(timezone.utc),
+        )
+        with self._lock:
+            self._buffer.append(row)
+            self._stats["enqueued"] += 1
+            pending = len(self._buffer)
+
+        if pending >= self.batch_size:
+            self._wake()
+        return event_id
+
+    def latest_pending(self, session_id: str, event_type: str) -> Optional[Dict[str, Any]]:
+        """Return event_data of the newest buffered event of this type, if any."""
+        with self._lock:
+            for row in reversed(self._buffer):
+                if row[1] == session_id and row[3] == event_type:
+                    return json.loads(row[4])
+        return None
+
+    def _wake(self):
+        if self._loop is None or self._wakeup is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    def _take(self) -> List[EventRow]:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        return batch
+
+    def _requeue(self, batch: List[EventRow]):
+        """Put a failed batch back in front of newer events, bounded by max_buffer."""
+        with self._lock:
+            merged = batch + self._buffer
+            overflow = len(merged) - self.max_buffer
+            if overflow > 0:
+                merged = merged[overflow:]
+                self._stats["dropped"] += overflow
+                logger.error("session_event_buffer_overflow", dropped=overflow)
+            self._buffer = merged
+            self._stats["flush_failures"] += 1
+
+    def _record_flush(self, count: int):
+        with self._lock:
+            self._stats["flushed"] += count
+            self._stats["batches"] += 1
+
+    def _dead_letter(self, row: EventRow, error: Exception):
+        with self._lock:
+            self._stats["dead_lettered"] += 1
+        logger.error(
+            "session_event_dead_lettered",
+            event_id=str(row[0]),
+            session_id=row[1],
+            event_type=row[3],
+            event_data=row[4],
+            error=str(error)
+        )
+
+    async def _write(self, rows: List[EventRow]):
+        from app.core.db_pool import AsyncDBConnection
+
+        # executemany is atomic: a failed chunk wrote nothing
+        async with AsyncDBConnection() as db:
+            await db.executemany(_INSERT_EVENTS, rows)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered events (one executemany per batch). Returns rows written.
+
+        Raises on a transient failure after putting the unwritten rows back.
+        """
+        batch = self._take()
+        if not batch:
+            return 0
+
+        written = 0
+        chunks = deque([batch])
+        try:
+            while chunks:
+                chunk = chunks[0]
+                try:
+                    await self._write(chunk)
+                    written += len(chunk)
+                except Exception as e:
+                    if _is_transient(e):
+                        raise
+                    chunks.popleft()
+                    if len(chunk) == 1:
+                        self._dead_letter(chunk[0], e)
+                    else:
+                        # Bisect until the rows that fail on their own are isolated
+                        mid = len(chunk) // 2
+                        chunks.appendleft(chunk[mid:])
+                        chunks.appendleft(chunk[:mid])
+                    continue
+                chunks.popleft()
+        except Exception:
+            self._requeue([row for chunk in chunks for row in chunk])
+            if written:
+                self._record_flush(written)
+            raise
+
+        self._record_flush(written)
+        logger.debug("session_events_flushed", count=written)
+        return written
+
+    async def start(self):
+        """Start the background flush task on the running loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "session_event_writer_started",
+            flush_interval_ms=int(self.flush_interval * 1000),
+            batch_size=self.batch_size
+        )
+
+    async def stop(self):
+        """Stop the background task and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("session_event_final_flush_failed", error=str(e), pending=len(self._buffer))
+        self._loop = None
+        self._wakeup = None
+        logger.info("session_event_writer_stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("session_event_flush_failed", error=str(e), pending=len(self._buffer))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._buffer)
+        stats["running"] = self.running
+        return stats
+
+
+_event_writer: Optional[SessionEventWriter] = None
+_event_writer_lock = threading.Lock()
+
+
+def get_session_event_writer() -> SessionEventWriter:
+    """Get the process-wide session event writer."""
+    global _event_writer
+    if _event_writer is None:
+        with _event_writer_lock:
+            if _event_writer is None:
+                _event_writer = SessionEventWriter()
+    return _event_writer
+
+
+# ============================================================================
+# CART SNAPSHOT - Materialized from cart events
+# ============================================================================
+
+def _find_row(rows: List[Dict[str, Any]], item_id: str) -> Optional[Dict[str, Any]]:
+    for row in rows:
+        if row["item_id"] == item_id:
+            return row
+    return None
+
+
+def apply_cart_event(rows: List[Dict[str, Any]], event_type: str, event_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Apply one cart event to snapshot rows (in place) and return them.
+
+    Rows mirror session_cart, including soft-deleted ones, so ordering by
+    first add matches get_session_cart()'s ORDER BY added_at. The same
+    reducer drives the live snapshot and the replay tool.
+    """
+    item_id = str(event_data.get("item_id") or "")
+
+    if event_type == EventType.ITEM_ADDED:
+        quantity = int(event_data.get("quantity", 1))
+        instructions = event_data.get("special_instructions")
+        row = _find_row(rows, item_id)
+        if row is None:
+            rows.append({
+                "item_id": item_id,
+                "item_name": event_data.get("item_name", ""),
+                "quantity": quantity,
+                "price": round(float(event_data.get("price", 0)), 2),
+                "special_instructions": instructions,
+                "is_active": True,
+            })
+        elif row["is_active"]:
+            row["quantity"] += quantity
+            if instructions is not None:
+                row["special_instructions"] = instructions
+        else:
+            row.update(quantity=quantity, special_instructions=instructions, is_active=True)
+
+    elif event_type == EventType.ITEM_REMOVED:
+        row = _find_row(rows, item_id)
+        if row is not None:
+            row["is_active"] = False
+
+    elif event_type == EventType.ITEM_QUANTITY_UPDATED:
+        row = _find_row(rows, item_id)
+        if row is not None and row["is_active"]:
+            row["quantity"] = int(event_data["new_quantity"])
+
+    elif event_type == EventType.CART_CLEARED:
+        for row in rows:
+            row["is_active"] = False
+
+    return rows
+
+
+def cart_summary_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the get_cart_summary() payload from snapshot rows."""
+    items = [
+        {
+            "item_id": row["item_id"],
+            "item_name": row["item_name"],
+            "quantity": row["quantity"],
+            "price": row["price"],
+            "total": round(row["price"] * row["quantity"], 2),
+            "special_instructions": row["special_instructions"],
+        }
+        for row in rows
+        if row["is_active"]
+    ]
+    return {
+        "success": True,
+        "items": items,
+        "total": round(sum(item["total"] for item in items), 2),
+        "item_count": len(items)
+    }
+
+
+def _rows_from_db(records) -> List[Dict[str, Any]]:
+    return [
+        {
+            "item_id": str(record["item_id"]),
+            "item_name": record["item_name"],
+            "quantity": int(record["quantity"]),
+            "price": float(record["price"]),
+            "special_instructions": record["special_instructions"],
+            "is_active": bool(record["is_active"]),
+        }
+        for record in records
+    ]
+
+
+class CartSnapshotStore:
+    """
+    Per-session cart snapshot kept in Redis (shared by all workers).
+
+    Layout: hash session_cart_snapshot:{session_id} with
+    - "cart": JSON list of rows (see apply_cart_event)
+    - "v":    write counter, bumped on every cart mutation
+    - "w":    session_cart writes in flight, "w_at" when the last one began
+
+    A cart mutation is bracketed by write(): begin() marks the write in flight
+    before session_cart is changed, apply() folds the event into the snapshot
+    and ends it afterwards. abort() ends a write that raised and drops the
+    cached rows, since the DB may hold part of it; the next read reseeds
+    them. Both run as Redis transactions, so concurrent updates never
+    interleave.
+
+    A missing snapshot is seeded from session_cart with one query. The seed
+    is not stored while a write is in flight (its query may already include
+    the write that apply() is about to add again), and is discarded if a write
+    began in between (the bumped "v" breaks the WATCH). If Redis is
+    unavailable, reads fall back to the database.
+    """
+
+    def __init__(self, ttl: int = CART_SNAPSHOT_TTL):
+        self.ttl = ttl
+        self._stats = {"hits": 0, "misses": 0, "seed_conflicts": 0, "seeds_deferred": 0, "applied": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def key(session_id: str) -> str:
+        return f"{CART_SNAPSHOT_KEY_PREFIX}{session_id}"
+
+    def _bump(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    async def get(self, session_id: str, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        from redis.exceptions import WatchError
+        from app.core.redis import get_redis_client
+
+        key = self.key(session_id)
+        rows = None
+        try:
+            client = get_redis_client()
+            async with client.pipeline() as pipe:
+                await pipe.watch(key)
+                cached, writes, write_at = await pipe.hmget(key, "cart", "w", "w_at")
+                if cached is not None:
+                    self._bump("hits")
+                    return json.loads(cached)
+
+                self._bump("misses")
+                rows = await loader()
+                if int(writes or 0) > 0 and time.time() - float(write_at or 0) < CART_SNAPSHOT_WRITE_WINDOW:
+                    self._bump("seeds_deferred")
+                    return rows
+                pipe.multi()
+                pipe.hset(key, "cart", json.dumps(rows))
+                pipe.expire(key, self.ttl)
+                try:
+                    await pipe.execute()
+                except WatchError:
+                    self._bump("seed_conflicts")
+                return rows
+        except Exception as e:
+            self._bump("errors")
+            logger.warning("cart_snapshot_read_failed", session_id=session_id, error=str(e))
+            return rows if rows is not None else await loader()
+
+    @asynccontextmanager
+    async def write(self, session_id: str, event_type: str, event_data: Dict[str, Any]):
+        """
+        Bracket a session_cart change: the event is applied to the snapshot
+        when the block completes; if it raises, the snapshot's rows are dropped.
+        """
+        await self.begin(session_id)
+        try:
+            yield
+        except BaseException:
+            await self.abort(session_id)
+            raise
+        await self.apply(session_id, event_type, event_data)
+
+    async def begin(self, session_id: str):
+        """Mark a session_cart write in flight (call before the DB write)."""
+        from app.core.redis import get_redis_client
+
+        key = self.key(session_id)
+        try:
+            async with get_redis_client().pipeline(transaction=True) as pipe:
+                pipe.hincrby(key, "w", 1)
+                pipe.hset(key, "w_at", time.time())
+                pipe.hincrby(key, "v", 1)
+                pipe.expire(key, self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._bump("errors")
+            logger.warning("cart_snapshot_begin_failed", session_id=session_id, error=str(e))
+
+    async def abort(self, session_id: str):
+        """End a write that raised: drop the rows, the DB change may have been partly applied."""
+        await self._end_write(session_id, None, None)
+
+    async def apply(self, session_id: str, event_type: str, event_data: Dict[str, Any]):
+        """Apply a written cart event to the snapshot and end its write."""
+        await self._end_write(session_id, event_type, event_data)
+
+    async def _end_write(self, session_id: str, event_type: Optional[str], event_data: Optional[Dict[str, Any]]):
+        from app.core.redis import get_redis_client
+
+        key = self.key(session_id)
+
+        async def _update(pipe):
+            cached, writes = await pipe.hmget(key, "cart", "w")
+            pipe.multi()
+            pipe.hincrby(key, "v", 1)
+            if int(writes or 0) > 0:
+                pipe.hincrby(key, "w", -1)
+            if event_type is None:
+                pipe.hdel(key, "cart")
+            elif cached is not None:
+                rows = apply_cart_event(json.loads(cached), event_type, event_data)
+                pipe.hset(key, "cart", json.dumps(rows))
+            pipe.expire(key, self.ttl)
+
+        try:
+            await get_redis_client().transaction(_update, key)
+            if event_type is not None:
+                self._bump("applied")
+        except Exception as e:
+            self._bump("errors")
+            logger.warning("cart_snapshot_update_failed", session_id=session_id, error=str(e))
+            await self.invalidate(session_id)
+
+    async def invalidate(self, session_id: str):
+        from app.core.redis import get_redis_client
+        try:
+            await get_redis_client().delete(self.key(session_id))
+        except Exception as e:
+            logger.error("cart_snapshot_invalidate_failed", session_id=session_id, error=str(e))
+
+    def peek_sync(self, session_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached rows without seeding (for sync callers that only need a hint)."""
+        from app.core.redis import get_sync_redis_client
+        try:
+            cached = get_sync_redis_client().hget(self.key(session_id), "cart")
+        except Exception as e:
+            logger.debug("cart_snapshot_peek_failed", session_id=session_id, error=str(e))
+            return None
+        return json.loads(cached) if cached is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        reads = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / reads, 3) if reads else 0.0
+        return stats
+
+
+_cart_snapshots = CartSnapshotStore()
+
+
+def get_cart_snapshot_store() -> CartSnapshotStore:
+    """Get the process-wide cart snapshot store."""
+    return _cart_snapshots
+
+
 # ============================================================================
 # SESSION EVENT TRACKER
 # ============================================================================
@@ -91,6 +675,10 @@ class SessionEventTracker:
         """
         Log an event to the session event log.
 
+        The event is buffered and written in the next batch; checkout-critical
+        events (and any event when the background writer is not running) are
+        written before this returns.
+
         Args:
             event_type: Type of event (from EventType constants)
             event_data: Event-specific data (flexible JSONB)
@@ -98,32 +686,47 @@ class SessionEventTracker:
         Returns:
             UUID of created event
         """
+        writer = get_session_event_writer()
+        event_id = writer.enqueue(self.session_id, self.user_id, event_type, event_data)
+
+        if event_type in DURABLE_EVENT_TYPES or not writer.running:
+            await writer.flush()
+
+        logger.info(
+            "session_event_logged",
+            session_id=self.session_id,
+            event_type=event_type,
+            event_id=str(event_id),
+            data_keys=list(event_data.keys())
+        )
+
+        return event_id
+
+    def _cart_write(self, event_type: str, event_data: Dict[str, Any]):
+        """Context for a session_cart change; the snapshot gets the event once it succeeds."""
+        return get_cart_snapshot_store().write(self.session_id, event_type, event_data)
+
+    async def _load_cart_rows(self) -> List[Dict[str, Any]]:
         from app.core.db_pool import AsyncDBConnection
 
         async with AsyncDBConnection() as db:
-            result = await db.fetchrow(
-                """
-                INSERT INTO session_events (session_id, user_id, event_type, event_data)
-                VALUES ($1, $2, $3, $4)
-                RETURNING event_id
-                """,
-                self.session_id,
-                str(self.user_id) if self.user_id else None,
-                event_type,
-                json.dumps(event_data)
-            )
+            records = await db.fetch(_LOAD_CART_ROWS_SQL, self.session_id)
+        return _rows_from_db(records)
 
-            event_id = result['event_id']
+    async def _get_rows(self) -> List[Dict[str, Any]]:
+        return await get_cart_snapshot_store().get(self.session_id, self._load_cart_rows)
 
-            logger.info(
-                "session_event_logged",
-                session_id=self.session_id,
-                event_type=event_type,
-                event_id=str(event_id),
-                data_keys=list(event_data.keys())
-            )
+    async def _get_active_row(self, item_id: UUID) -> Optional[Dict[str, Any]]:
+        row = _find_row(await self._get_rows(), str(item_id))
+        return row if row and row["is_active"] else None
 
-            return event_id
+    async def find_cart_item(self, item_name: str) -> Optional[Dict[str, Any]]:
+        """Find an active cart row by case-insensitive item name."""
+        name = item_name.strip().lower()
+        for row in await self._get_rows():
+            if row["is_active"] and row["item_name"].lower() == name:
+                return row
+        return None
 
     # ========================================================================
     # CART OPERATIONS - Update materialized cart state
@@ -143,103 +746,92 @@ class SessionEventTracker:
         Process:
         1. Log event to session_events
         2. Update session_cart (materialized state)
-        3. Update session_state (last mentioned item)
-        4. Return cart summary
+        3. Update session state (last mentioned item)
+        4. Apply the event to the cart snapshot and return it
         """
         from app.core.db_pool import AsyncDBConnection
 
-        # 1. Log event
-        await self.log_event(EventType.ITEM_ADDED, {
+        event_data = {
             'item_id': str(item_id),
             'item_name': item_name,
             'quantity': quantity,
             'price': price,
             'special_instructions': special_instructions
-        })
+        }
 
-        # 2. Update cart (upsert)
-        async with AsyncDBConnection() as db:
-            await db.execute(
-                """
-                INSERT INTO session_cart (
-                    session_id, item_id, item_name, quantity, price, special_instructions
+        # 1. Log event
+        await self.log_event(EventType.ITEM_ADDED, event_data)
+
+        # 2. Update cart (upsert); the snapshot gets the event once it is written
+        async with self._cart_write(EventType.ITEM_ADDED, event_data), AsyncDBConnection() as db:
+            # Both upserts commit together: an abort never leaves half of them
+            async with db.transaction():
+                await db.execute(
+                    f"""
+                    INSERT INTO session_cart (
+                        session_id, item_id, item_name, quantity, price, special_instructions
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    ON CONFLICT (session_id, item_id)
+                    DO UPDATE SET {_UPSERT_CART_ITEM_SET}
+                    """,
+                    self.session_id,
+                    str(item_id),
+                    item_name,
+                    quantity,
+                    price,
+                    special_instructions
                 )
-                VALUES ($1, $2, $3, $4, $5, $6)
-                ON CONFLICT (session_id, item_id)
-                DO UPDATE SET
-                    quantity = session_cart.quantity + EXCLUDED.quantity,
-                    special_instructions = COALESCE(EXCLUDED.special_instructions, session_cart.special_instructions),
-                    updated_at = NOW(),
-                    is_active = TRUE
-                """,
-                self.session_id,
-                str(item_id),
-                item_name,
-                quantity,
-                price,
-                special_instructions
-            )
 
-            # 3. Update session state (last mentioned item)
-            # Use subquery to validate user_id exists in customer_profile_table (FK constraint)
-            await db.execute(
-                """
-                INSERT INTO session_state (
-                    session_id, user_id, last_mentioned_item_id, last_mentioned_item_name
-                )
-                VALUES (
-                    $1,
-                    (SELECT customer_id FROM customer_profile_table WHERE customer_id = $2::uuid),
-                    $3, $4
+                # 3. Update session state (last mentioned item)
+                # Use subquery to validate user_id exists in customer_profile_table (FK constraint)
+                await db.execute(
+                    """
+                    INSERT INTO session_state (
+                        session_id, user_id, last_mentioned_item_id, last_mentioned_item_name
+                    )
+                    VALUES (
+                        $1,
+                        (SELECT customer_id FROM customer_profile_table WHERE customer_id = $2::uuid),
+                        $3, $4
+                    )
+                    ON CONFLICT (session_id)
+                    DO UPDATE SET
+                        last_mentioned_item_id = EXCLUDED.last_mentioned_item_id,
+                        last_mentioned_item_name = EXCLUDED.last_mentioned_item_name,
+                        updated_at = NOW(),
+                        last_activity_at = NOW()
+                    """,
+                    self.session_id,
+                    str(self.user_id) if self.user_id else None,
+                    str(item_id),
+                    item_name
                 )
-                ON CONFLICT (session_id)
-                DO UPDATE SET
-                    last_mentioned_item_id = EXCLUDED.last_mentioned_item_id,
-                    last_mentioned_item_name = EXCLUDED.last_mentioned_item_name,
-                    updated_at = NOW(),
-                    last_activity_at = NOW()
-                """,
-                self.session_id,
-                str(self.user_id) if self.user_id else None,
-                str(item_id),
-                item_name
-            )
 
-            # 4. Return cart summary
-            return await self.get_cart_summary()
+        # 4. Return cart summary
+        return await self.get_cart_summary()
 
     async def remove_from_cart(self, item_id: UUID) -> Dict[str, Any]:
         """Remove item from cart (soft delete for audit trail)."""
         from app.core.db_pool import AsyncDBConnection
 
-        async with AsyncDBConnection() as db:
-            # Get item name for event log
-            result = await db.fetchrow(
-                """
-                SELECT item_name, quantity, price
-                FROM session_cart
-                WHERE session_id = $1 AND item_id = $2 AND is_active = TRUE
-                """,
-                self.session_id,
-                str(item_id)
-            )
-
-            if not result:
-                return {"success": False, "message": "Item not in cart"}
+        # Get item details for event log (from snapshot, no DB round trip)
+        row = await self._get_active_row(item_id)
+        if not row:
+            return {"success": False, "message": "Item not in cart"}
 
-            item_name = result['item_name']
-            quantity = result['quantity']
-            price = result['price']
+        event_data = {
+            'item_id': str(item_id),
+            'item_name': row['item_name'],
+            'quantity': row['quantity'],
+            'price': row['price']
+        }
 
-            # Log event
-            await self.log_event(EventType.ITEM_REMOVED, {
-                'item_id': str(item_id),
-                'item_name': item_name,
-                'quantity': quantity,
-                'price': price
-            })
+        # Log event
+        await self.log_event(EventType.ITEM_REMOVED, event_data)
 
-            # Soft delete from cart
+        # Soft delete from cart
+        async with self._cart_write(EventType.ITEM_REMOVED, event_data), AsyncDBConnection() as db:
             await db.execute(
                 """
                 UPDATE session_cart
@@ -250,39 +842,30 @@ class SessionEventTracker:
                 str(item_id)
             )
 
-            return await self.get_cart_summary()
+        return await self.get_cart_summary()
 
     async def update_quantity(self, item_id: UUID, new_quantity: int) -> Dict[str, Any]:
         """Update item quantity in cart."""
         from app.core.db_pool import AsyncDBConnection
 
-        async with AsyncDBConnection() as db:
-            # Get current state for event log
-            result = await db.fetchrow(
-                """
-                SELECT item_name, quantity, price
-                FROM session_cart
-                WHERE session_id = $1 AND item_id = $2 AND is_active = TRUE
-                """,
-                self.session_id,
-                str(item_id)
-            )
-
-            if not result:
-                return {"success": False, "message": "Item not in cart"}
+        # Get current state for event log (from snapshot, no DB round trip)
+        row = await self._get_active_row(item_id)
+        if not row:
+            return {"success": False, "message": "Item not in cart"}
 
-            old_quantity = result['quantity']
+        event_data = {
+            'item_id': str(item_id),
+            'item_name': row['item_name'],
+            'old_quantity': row['quantity'],
+            'new_quantity': new_quantity,
+            'price': row['price']
+        }
 
-            # Log event
-            await self.log_event(EventType.ITEM_QUANTITY_UPDATED, {
-                'item_id': str(item_id),
-                'item_name': result['item_name'],
-                'old_quantity': old_quantity,
-                'new_quantity': new_quantity,
-                'price': result['price']
-            })
+        # Log event
+        await self.log_event(EventType.ITEM_QUANTITY_UPDATED, event_data)
 
-            # Update quantity
+        # Update quantity
+        async with self._cart_write(EventType.ITEM_QUANTITY_UPDATED, event_data), AsyncDBConnection() as db:
             await db.execute(
                 """
                 UPDATE session_cart
@@ -294,7 +877,7 @@ class SessionEventTracker:
                 new_quantity
             )
 
-            return await self.get_cart_summary()
+        return await self.get_cart_summary()
 
     async def clear_cart(self) -> Dict[str, Any]:
         """Clear all items from cart."""
@@ -303,7 +886,7 @@ class SessionEventTracker:
         # Log event
         await self.log_event(EventType.CART_CLEARED, {})
 
-        async with AsyncDBConnection() as db:
+        async with self._cart_write(EventType.CART_CLEARED, {}), AsyncDBConnection() as db:
             # Soft delete all cart items
             await db.execute(
                 """
@@ -314,37 +897,52 @@ class SessionEventTracker:
                 self.session_id
             )
 
-            return {"success": True, "items": [], "total": 0.0, "item_count": 0}
+        return {"success": True, "items": [], "total": 0.0, "item_count": 0}
 
     # ========================================================================
     # CONTEXT QUERIES - SQL-based state retrieval (zero token cost!)
     # ========================================================================
 
     async def get_cart_summary(self) -> Dict[str, Any]:
-        """Get current cart state via SQL query."""
+        """Get current cart state from the snapshot (seeded from SQL on first read)."""
+        return cart_summary_from_rows(await self._get_rows())
+
+    async def get_last_search_results(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the items from the last MENU_VIEWED event.
+
+        Used to resolve ordinal references like "option 1", "first one", etc.
+        Returns the items list from the most recent search/menu view.
+        """
         from app.core.db_pool import AsyncDBConnection
 
+        # The latest view may still be waiting in the write buffer
+        pending = get_session_event_writer().latest_pending(self.session_id, EventType.MENU_VIEWED)
+        if pending is not None:
+            return pending.get('items', None)
+
         async with AsyncDBConnection() as db:
-            items = await db.fetch(
+            result = await db.fetchrow(
                 """
-                SELECT * FROM get_session_cart($1)
+                SELECT event_data
+                FROM session_events
+                WHERE session_id = $1 AND event_type = $2
+                ORDER BY timestamp DESC
+                LIMIT 1
                 """,
-                self.session_id
+                self.session_id,
+                EventType.MENU_VIEWED
             )
 
-            total = await db.fetchrow(
-                """
-                SELECT get_cart_total($1) as total
-                """,
-                self.session_id
-            )
+        if not result:
+            return None
+
+        event_data = result['event_data']
+        if isinstance(event_data, str):
+            event_data = json.loads(event_data)
 
-            return {
-                "success": True,
-                "items": [dict(item) for item in items],
-                "total": float(total['total']) if total else 0.0,
-                "item_count": len(items)
-            }
+        # Return items list if stored in event
+        return event_data.get('items', None)
 
     async def get_last_mentioned_item(self) -> Optional[Dict[str, Any]]:
         """Get last mentioned item from session state."""
@@ -371,6 +969,9 @@ class SessionEventTracker:
         """Get recent session events (for debugging/analytics)."""
         from app.core.db_pool import AsyncDBConnection
 
+        # Make buffered events visible to the query
+        await get_session_event_writer().flush()
+
         async with AsyncDBConnection() as db:
             events = await db.fetch(
                 """
@@ -426,46 +1027,22 @@ class SessionEventTracker:
 
 class SyncSessionEventTracker:
     """
-    Synchronous version of session tracker for use in CrewAI tools.
+    Blocking facade over SessionEventTracker for CrewAI tools.
 
-    CrewAI tools run in threads and cannot use asyncpg (which is event-loop bound).
-    This uses psycopg2 which is thread-safe.
+    CrewAI tools run in worker threads. Each call is submitted to the event
+    loop that owns the asyncpg pool (db_pool.run_sync), so sync and async
+    callers share one implementation and one connection pool. Do not call
+    it from the event loop thread itself - await SessionEventTracker there.
     """
 
     def __init__(self, session_id: str, user_id: Optional[UUID] = None):
         self.session_id = session_id
         self.user_id = user_id
+        self._tracker = SessionEventTracker(session_id, user_id)
 
     def log_event(self, event_type: str, event_data: Dict[str, Any]) -> UUID:
-        """Log an event using sync connection."""
-        from app.core.db_pool import SyncDBConnection
-        import uuid
-
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO session_events (session_id, user_id, event_type, event_data)
-                    VALUES (%s, %s, %s, %s)
-                    RETURNING event_id
-                    """,
-                    (
-                        self.session_id,
-                        str(self.user_id) if self.user_id else None,
-                        event_type,
-                        json.dumps(event_data)
-                    )
-                )
-                event_id = cur.fetchone()[0]
-                conn.commit()
-
-        logger.info(
-            "session_event_logged_sync",
-            session_id=self.session_id,
-            event_type=event_type,
-            event_id=str(event_id)
-        )
-        return event_id
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.log_event(event_type, event_data))
 
     def add_to_cart(
         self,
@@ -475,205 +1052,32 @@ class SyncSessionEventTracker:
         price: float,
         special_instructions: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Add item to cart using sync connection."""
-        from app.core.db_pool import SyncDBConnection
-
-        # Log event
-        self.log_event(EventType.ITEM_ADDED, {
-            'item_id': str(item_id),
-            'item_name': item_name,
-            'quantity': quantity,
-            'price': price,
-            'special_instructions': special_instructions
-        })
-
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                # Upsert cart item
-                cur.execute(
-                    """
-                    INSERT INTO session_cart (
-                        session_id, item_id, item_name, quantity, price, special_instructions
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (session_id, item_id)
-                    DO UPDATE SET
-                        quantity = session_cart.quantity + EXCLUDED.quantity,
-                        special_instructions = COALESCE(EXCLUDED.special_instructions, session_cart.special_instructions),
-                        updated_at = NOW(),
-                        is_active = TRUE
-                    """,
-                    (
-                        self.session_id,
-                        str(item_id),
-                        item_name,
-                        quantity,
-                        price,
-                        special_instructions
-                    )
-                )
-
-                # Update session state
-                # Use subquery to validate user_id exists in customer_profile_table
-                # (FK constraint requires it; auth users may not be in that table yet)
-                valid_user_id = str(self.user_id) if self.user_id else None
-                cur.execute(
-                    """
-                    INSERT INTO session_state (
-                        session_id, user_id, last_mentioned_item_id, last_mentioned_item_name
-                    )
-                    VALUES (
-                        %s,
-                        (SELECT customer_id FROM customer_profile_table WHERE customer_id = %s::uuid),
-                        %s, %s
-                    )
-                    ON CONFLICT (session_id)
-                    DO UPDATE SET
-                        last_mentioned_item_id = EXCLUDED.last_mentioned_item_id,
-                        last_mentioned_item_name = EXCLUDED.last_mentioned_item_name,
-                        updated_at = NOW(),
-                        last_activity_at = NOW()
-                    """,
-                    (
-                        self.session_id,
-                        valid_user_id,
-                        str(item_id),
-                        item_name
-                    )
-                )
-                conn.commit()
-
-        return self.get_cart_summary()
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.add_to_cart(item_id, item_name, quantity, price, special_instructions))
 
     def remove_from_cart(self, item_id: UUID) -> Dict[str, Any]:
-        """Remove item from cart using sync connection."""
-        from app.core.db_pool import SyncDBConnection
-
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                # Get item info for event log
-                cur.execute(
-                    """
-                    SELECT item_name, quantity, price
-                    FROM session_cart
-                    WHERE session_id = %s AND item_id = %s AND is_active = TRUE
-                    """,
-                    (self.session_id, str(item_id))
-                )
-                result = cur.fetchone()
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.remove_from_cart(item_id))
 
-                if not result:
-                    return {"success": False, "message": "Item not in cart"}
-
-                item_name, quantity, price = result
-
-                # Log event
-                self.log_event(EventType.ITEM_REMOVED, {
-                    'item_id': str(item_id),
-                    'item_name': item_name,
-                    'quantity': quantity,
-                    'price': float(price)
-                })
-
-                # Soft delete
-                cur.execute(
-                    """
-                    UPDATE session_cart
-                    SET is_active = FALSE, updated_at = NOW()
-                    WHERE session_id = %s AND item_id = %s
-                    """,
-                    (self.session_id, str(item_id))
-                )
-                conn.commit()
-
-        return self.get_cart_summary()
-
-    def get_cart_summary(self) -> Dict[str, Any]:
-        """Get cart summary using sync connection."""
-        from app.core.db_pool import SyncDBConnection
-
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                # Get cart items
-                cur.execute(
-                    """
-                    SELECT * FROM get_session_cart(%s)
-                    """,
-                    (self.session_id,)
-                )
-                columns = [desc[0] for desc in cur.description] if cur.description else []
-                items = [dict(zip(columns, row)) for row in cur.fetchall()]
-
-                # Get total
-                cur.execute(
-                    """
-                    SELECT get_cart_total(%s) as total
-                    """,
-                    (self.session_id,)
-                )
-                total_row = cur.fetchone()
-                total = float(total_row[0]) if total_row and total_row[0] else 0.0
-
-        return {
-            "success": True,
-            "items": items,
-            "total": total,
-            "item_count": len(items)
-        }
+    def update_quantity(self, item_id: UUID, new_quantity: int) -> Dict[str, Any]:
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.update_quantity(item_id, new_quantity))
 
     def clear_cart(self) -> Dict[str, Any]:
-        """Clear all items from cart using sync connection."""
-        from app.core.db_pool import SyncDBConnection
-
-        # Log event
-        self.log_event(EventType.CART_CLEARED, {})
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.clear_cart())
 
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE session_cart
-                    SET is_active = FALSE, updated_at = NOW()
-                    WHERE session_id = %s AND is_active = TRUE
-                    """,
-                    (self.session_id,)
-                )
-                conn.commit()
+    def get_cart_summary(self) -> Dict[str, Any]:
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.get_cart_summary())
 
-        return self.get_cart_summary()
+    def find_cart_item(self, item_name: str) -> Optional[Dict[str, Any]]:
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.find_cart_item(item_name))
 
     def get_last_search_results(self) -> Optional[List[Dict[str, Any]]]:
-        """
-        Get the items from the last MENU_VIEWED event.
-
-        Used to resolve ordinal references like "option 1", "first one", etc.
-        Returns the items list from the most recent search/menu view.
-        """
-        from app.core.db_pool import SyncDBConnection
-
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT event_data
-                    FROM session_events
-                    WHERE session_id = %s AND event_type = %s
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                    """,
-                    (self.session_id, EventType.MENU_VIEWED)
-                )
-                result = cur.fetchone()
-
-                if not result:
-                    return None
-
-                event_data = result[0]
-                if isinstance(event_data, str):
-                    event_data = json.loads(event_data)
-
-                # Return items list if stored in event
-                return event_data.get('items', None)
+        from app.core.db_pool import run_sync
+        return run_sync(self._tracker.get_last_search_results())
 
 
 # ============================================================================
@@ -688,3 +1092,13 @@ def get_session_tracker(session_id: str, user_id: Optional[UUID] = None) -> Sess
 def get_sync_session_tracker(session_id: str, user_id: Optional[UUID] = None) -> SyncSessionEventTracker:
     """Get sync session event tracker for use in CrewAI tools (threaded context)."""
     return SyncSessionEventTracker(session_id, user_id)
+
+
+async def start_session_event_writer():
+    """Start batched event writes (call from app startup)."""
+    await get_session_event_writer().start()
+
+
+async def stop_session_event_writer():
+    """Flush remaining events and stop the writer (call from app shutdown)."""
+    await get_session_event_writer().stop()
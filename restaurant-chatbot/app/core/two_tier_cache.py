@@ -0,0 +1,366 @@
+"""
+Two-Tier Cache
+==============
+
+Process-local LRU/TTL tier in front of Redis for read-heavy, rarely
+changing data (menu items, categories, restaurant config).
+
+Tiers:
+- L1: bounded in-process LRU, entries expire after LOCAL_CACHE_TTL seconds
+  (or the Redis TTL, whichever is shorter)
+- L2: the shared Redis pool
+
+Invalidation:
+- Writes and deletes go to Redis first, then drop the L1 copy and publish
+  on CACHE_INVALIDATION_CHANNEL so every other worker drops its copy too
+- The listener clears all L1 tiers after a reconnect (messages may have been
+  missed while disconnected)
+
+Usage:
+    from app.core.two_tier_cache import get_two_tier_cache
+
+    cache = get_two_tier_cache("menu")
+    value = await cache.get("menu:item:123")       # L1, then Redis
+    await cache.invalidate(keys=["menu:item:123"])  # after writing Redis directly
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from app.core.metrics import (
+    cache_invalidations_total,
+    cache_local_entries,
+    record_cache_tier_lookup,
+)
+from app.core.redis import get_redis_client
+
+logger = structlog.get_logger(__name__)
+
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "5000"))
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL_SECONDS", "300"))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+# Identifies this worker's own invalidation messages
+_INSTANCE_ID = uuid.uuid4().hex
+
+
+class LocalCache:
+    """Bounded LRU with per-entry expiry. Values are stored as returned by Redis."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def delete_prefixes(self, prefixes: Iterable[str]) -> int:
+        prefixes = tuple(prefixes)
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefixes)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TwoTierCache:
+    """
+    Named L1 + Redis cache. Get one via get_two_tier_cache(name) so every
+    service using the same name shares the L1 tier and invalidations.
+    """
+
+    def __init__(self, name: str, max_entries: int = LOCAL_CACHE_MAX_ENTRIES, ttl: float = LOCAL_CACHE_TTL):
+        self.name = name
+        self.local = LocalCache(max_entries, ttl)
+        self._counts = {"local_hits": 0, "local_misses": 0, "redis_hits": 0, "redis_misses": 0}
+        # Bumped on every invalidation; a Redis read that raced one is not kept in L1
+        self._generation = 0
+
+    def _backfill(self, key: str, value: Any, pttl: int) -> None:
+        """Keep a Redis value in L1, never past its Redis expiry (PTTL in ms; -1: none)."""
+        if pttl == -1:
+            self.local.set(key, value)
+        elif pttl > 0:
+            self.local.set(key, value, pttl / 1000)
+
+    def _count(self, tier: str, hit: bool) -> None:
+        self._counts[f"{tier}_hits" if hit else f"{tier}_misses"] += 1
+        record_cache_tier_lookup(self.name, tier, "hit" if hit else "miss")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Value for key from L1, else Redis (populating L1). None if missing."""
+        found, value = self.local.get(key)
+        self._count("local", found)
+        if found:
+            return value
+
+        generation = self._generation
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            value, pttl = await pipe.execute()
+        self._count("redis", value is not None)
+        if value is not None and generation == self._generation:
+            self._backfill(key, value, pttl)
+        return value
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Values for keys in order; only L1 misses are fetched (one pipelined MGET)."""
+        values: List[Optional[Any]] = [None] * len(keys)
+        missing: List[int] = []
+        for position, key in enumerate(keys):
+            found, value = self.local.get(key)
+            self._count("local", found)
+            if found:
+                values[position] = value
+            else:
+                missing.append(position)
+
+        if missing:
+            generation = self._generation
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.mget([keys[position] for position in missing])
+                for position in missing:
+                    pipe.pttl(keys[position])
+                fetched, *pttls = await pipe.execute()
+            keep = generation == self._generation
+            for position, value, pttl in zip(missing, fetched, pttls):
+                self._count("redis", value is not None)
+                if value is not None:
+                    values[position] = value
+                    if keep:
+                        self._backfill(keys[position], value, pttl)
+        return values
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Write through to Redis, then invalidate other workers' copies."""
+        client = get_redis_client()
+        if ttl:
+            await client.setex(key, ttl, value)
+        else:
+            await client.set(key, value)
+        await self.invalidate(keys=[key])
+        self.local.set(key, value, ttl)
+
+    async def invalidate(
+        self,
+        keys: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        everything: bool = False
+    ) -> None:
+        """
+        Drop L1 entries here and on every other worker.
+
+        Call after changing the underlying Redis keys (the Redis data itself
+        is not touched).
+        """
+        keys, prefixes = list(keys), list(prefixes)
+        self.invalidate_local(keys, prefixes, everything, source="local")
+        await publish_invalidation(self.name, keys, prefixes, everything)
+
+    def invalidate_local(
+        self,
+        keys: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        everything: bool = False,
+        source: str = "local"
+    ) -> int:
+        self._generation += 1
+        if everything:
+            removed = self.local.clear()
+        else:
+            removed = self.local.delete(keys)
+            if prefixes:
+                removed += self.local.delete_prefixes(prefixes)
+        cache_invalidations_total.labels(cache=self.name, source=source).inc()
+        cache_local_entries.labels(cache=self.name).set(len(self.local))
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        counts = self._counts
+        local_total = counts["local_hits"] + counts["local_misses"]
+        redis_total = counts["redis_hits"] + counts["redis_misses"]
+        cache_local_entries.labels(cache=self.name).set(len(self.local))
+        return {
+            **counts,
+            "local_entries": len(self.local),
+            "local_evictions": self.local.evictions,
+            "local_hit_ratio": round(counts["local_hits"] / local_total, 4) if local_total else 0.0,
+            "redis_hit_ratio": round(counts["redis_hits"] / redis_total, 4) if redis_total else 0.0,
+        }
+
+
+# ============================================================================
+# REGISTRY + CROSS-WORKER INVALIDATION
+# ============================================================================
+
+_caches: Dict[str, TwoTierCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_two_tier_cache(name: str) -> TwoTierCache:
+    """Shared two-tier cache for a name (e.g. 'menu', 'restaurant', 'food_ordering')."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = TwoTierCache(name)
+        return cache
+
+
+def get_two_tier_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.get_stats() for name, cache in list(_caches.items())}
+
+
+async def publish_invalidation(
+    cache_name: str,
+    keys: Iterable[str] = (),
+    prefixes: Iterable[str] = (),
+    everything: bool = False
+) -> None:
+    """Tell other workers to drop L1 entries for a cache. Best effort."""
+    message = json.dumps({
+        "origin": _INSTANCE_ID,
+        "cache": cache_name,
+        "keys": list(keys),
+        "prefixes": list(prefixes),
+        "all": everything,
+    })
+    try:
+        await get_redis_client().publish(CACHE_INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        # Other workers fall back to LOCAL_CACHE_TTL expiry
+        logger.warning("cache_invalidation_publish_failed", cache=cache_name, error=str(e))
+
+
+def _apply_invalidation(raw: Any) -> None:
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        logger.warning("cache_invalidation_message_invalid", message=str(raw)[:200])
+        return
+
+    if message.get("origin") == _INSTANCE_ID:
+        return
+
+    name = message.get("cache")
+    targets = list(_caches.values()) if name == "*" else [_caches[name]] if name in _caches else []
+    for cache in targets:
+        cache.invalidate_local(
+            message.get("keys") or (),
+            message.get("prefixes") or (),
+            bool(message.get("all")),
+            source="remote"
+        )
+
+
+class CacheInvalidationListener:
+    """Background task applying invalidations published by other workers."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while not self._stopping:
+            pubsub = None
+            try:
+                pubsub = get_redis_client().pubsub()
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Anything cached before (re)subscribing may have missed a message
+                for cache in list(_caches.values()):
+                    cache.invalidate_local(everything=True, source="resubscribe")
+                logger.info("cache_invalidation_listener_subscribed", channel=CACHE_INVALIDATION_CHANNEL)
+                backoff = 1.0
+
+                # redis-py can swallow a cancel inside get_message(timeout=...),
+                # so stop() also sets a flag checked between reads
+                while not self._stopping:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        _apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("cache_invalidation_listener_error", error=str(e), retry_in=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose() if hasattr(pubsub, "aclose") else await pubsub.close()
+                    except Exception:
+                        pass
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._task.cancel()
+        try:
+            await asyncio.wait_for(self._task, timeout=5.0)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            pass
+        self._task = None
+
+
+_listener = CacheInvalidationListener()
+
+
+async def start_cache_invalidation_listener() -> None:
+    _listener.start()
+
+
+async def stop_cache_invalidation_listener() -> None:
+    await _listener.stop()
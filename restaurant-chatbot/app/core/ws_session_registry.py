@@ -0,0 +1,416 @@
+"""
+WebSocket Session Registry
+==========================
+Cluster-wide view of chat WebSocket connections, so the chat service can run
+behind a load balancer without sticky sessions.
+
+- ownership: the worker holding a session's socket records itself in Redis;
+  a reconnect landing on another worker takes the session over and tells
+  the old owner to close its socket; the old owner saves the session's
+  reconnect state first and confirms, so the new owner loads current state
+- routing: any worker (payment webhooks, PetPooja callbacks, staff actions)
+  can send to a session; messages for sockets on other workers go over the
+  owner's pub/sub channel
+- reconnect state: auth/welcome state is saved when a socket closes and
+  loaded when the session reconnects, on whichever worker that is
+- stats: each worker publishes its counters on a heartbeat; cluster stats
+  add them up
+
+Keys:
+- ws:session:{session_id}   hash: worker, connected_at, restaurant_id, client_host
+                            (expires unless the owner's heartbeat refreshes it)
+- ws:state:{session_id}     JSON of the state preserved across reconnects
+- ws:workers                sorted set worker_id -> last heartbeat (ms)
+- ws:worker:{worker_id}     hash of that worker's counters
+- ws:push:{worker_id}       pub/sub channel for sends and takeovers
+
+Usage:
+    registry = get_ws_session_registry()
+    if registry:
+        registry.attach(websocket_manager)
+        await registry.start()
+        delivered = await registry.route(session_id, "Your order is ready", "notification")
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+WS_SESSION_REGISTRY = os.getenv("WS_SESSION_REGISTRY", "true").lower() == "true"
+WS_REGISTRY_TTL_SECONDS = int(os.getenv("WS_REGISTRY_TTL_SECONDS", "90"))
+WS_REGISTRY_HEARTBEAT_SECONDS = int(os.getenv("WS_REGISTRY_HEARTBEAT_SECONDS", "30"))
+WS_STATE_TTL_SECONDS = int(os.getenv("WS_STATE_TTL_SECONDS", "86400"))
+# How long a takeover waits for the old owner to save state and confirm
+WS_HANDOFF_TIMEOUT_SECONDS = float(os.getenv("WS_HANDOFF_TIMEOUT_SECONDS", "1.0"))
+WS_KEY_PREFIX = "ws:"
+WS_WORKERS_KEY = f"{WS_KEY_PREFIX}workers"
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+# Deletes the session entry only if this worker still owns it (or it expired),
+# and saves the reconnect state in the same step.
+# KEYS: session, state
+# ARGV: worker_id, state_json ('' = keep), state_ttl
+# Returns 1 if this worker was the owner
+_RELEASE_SCRIPT = """
+local owner = redis.call('HGET', KEYS[1], 'worker')
+if owner and owner ~= ARGV[1] then
+  return 0
+end
+redis.call('DEL', KEYS[1])
+if ARGV[2] ~= '' then
+  redis.call('SET', KEYS[2], ARGV[2], 'EX', tonumber(ARGV[3]))
+end
+return 1
+"""
+
+
+def session_key(session_id: str) -> str:
+    return f"{WS_KEY_PREFIX}session:{session_id}"
+
+
+def state_key(session_id: str) -> str:
+    return f"{WS_KEY_PREFIX}state:{session_id}"
+
+
+def worker_channel(worker_id: str) -> str:
+    return f"{WS_KEY_PREFIX}push:{worker_id}"
+
+
+class WebSocketSessionRegistry:
+    """
+    Redis registry of which worker holds each session's socket.
+
+    The attached manager provides the local side:
+    - deliver_local(session_id, message, message_type, metadata) -> bool
+    - close_local(session_id, reason) -> None
+    - local_session_ids() -> iterable of connected session ids
+    - local_counters() -> dict of counters for cluster stats
+    - preserved_state(session_id) -> dict saved for reconnects
+    """
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.worker_id = WORKER_ID
+        self._release_script = redis_client.register_script(_RELEASE_SCRIPT)
+        self._manager: Any = None
+        self._listener: Optional[asyncio.Task] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._stopping = False
+        # session_id -> state JSON last written, so heartbeats only write changes
+        self._saved_state: Dict[str, str] = {}
+        # session_id -> takeover waiting for the old owner's confirmation
+        self._handoffs: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "claims": 0,
+            "takeovers": 0,
+            "handoff_timeouts": 0,
+            "routed": 0,
+            "route_misses": 0,
+            "received": 0,
+            "delivered": 0,
+        }
+
+    def attach(self, manager: Any) -> None:
+        self._manager = manager
+
+    # ------------------------------------------------------------- ownership
+
+    async def claim(self, session_id: str, info: Dict[str, Any]) -> Optional[str]:
+        """
+        Record this worker as the session's owner.
+
+        Returns the previous owner if it was another worker; that worker has
+        been told to close its socket for the session, and has saved the
+        session's reconnect state unless it did not confirm within
+        WS_HANDOFF_TIMEOUT_SECONDS. Call load_state() after this.
+        """
+        key = session_key(session_id)
+        fields = {"worker": self.worker_id, **{k: str(v) for k, v in info.items() if v is not None}}
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hget(key, "worker")
+            pipe.delete(key)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, WS_REGISTRY_TTL_SECONDS)
+            previous = (await pipe.execute())[0]
+
+        self.stats["claims"] += 1
+        if previous and previous != self.worker_id:
+            self.stats["takeovers"] += 1
+            handoff = self._handoffs[session_id] = asyncio.get_running_loop().create_future()
+            try:
+                receivers = await self._publish(
+                    previous, {"op": "close", "session_id": session_id, "reply_to": self.worker_id}
+                )
+                if receivers:
+                    await asyncio.wait_for(handoff, WS_HANDOFF_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                self.stats["handoff_timeouts"] += 1
+                logger.warning("ws_session_handoff_timeout", session_id=session_id, previous_worker=previous)
+            finally:
+                if self._handoffs.get(session_id) is handoff:
+                    del self._handoffs[session_id]
+            logger.info("ws_session_taken_over", session_id=session_id, previous_worker=previous)
+            return previous
+        return None
+
+    async def release(self, session_id: str, state: Optional[Dict[str, Any]] = None) -> bool:
+        """Drop the session's entry if this worker owns it, saving its reconnect state."""
+        state_json = json.dumps(state, default=str) if state else ""
+        released = await self._release_script(
+            keys=[session_key(session_id), state_key(session_id)],
+            args=[self.worker_id, state_json, WS_STATE_TTL_SECONDS]
+        )
+        self._saved_state.pop(session_id, None)
+        return bool(int(released))
+
+    async def load_state(self, session_id: str) -> Dict[str, Any]:
+        """Reconnect state saved by whichever worker last held the session."""
+        raw = await self.redis_client.get(state_key(session_id))
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return {}
+
+    async def owner(self, session_id: str) -> Optional[str]:
+        return await self.redis_client.hget(session_key(session_id), "worker")
+
+    # --------------------------------------------------------------- routing
+
+    async def _publish(self, worker_id: str, payload: Dict[str, Any]) -> int:
+        return int(await self.redis_client.publish(worker_channel(worker_id), json.dumps(payload, default=str)))
+
+    async def route(
+        self,
+        session_id: str,
+        message: str = "",
+        message_type: str = "ai_response",
+        metadata: Optional[dict] = None
+    ) -> bool:
+        """
+        Send to a session whose socket lives on another worker.
+
+        Returns True when the owning worker received the message (it may
+        still fail to write it if the socket closed in the meantime).
+        """
+        owner = await self.owner(session_id)
+        if not owner or owner == self.worker_id:
+            self.stats["route_misses"] += 1
+            return False
+        receivers = await self._publish(owner, {
+            "op": "send",
+            "session_id": session_id,
+            "message": message,
+            "message_type": message_type,
+            "metadata": metadata or {},
+        })
+        if receivers:
+            self.stats["routed"] += 1
+            return True
+        self.stats["route_misses"] += 1
+        return False
+
+    async def _handle(self, raw: str) -> None:
+        try:
+            payload = json.loads(raw)
+            session_id = payload["session_id"]
+        except (TypeError, ValueError, KeyError):
+            logger.warning("ws_registry_message_invalid", message=str(raw)[:200])
+            return
+
+        self.stats["received"] += 1
+        if payload.get("op") == "handed_over":
+            handoff = self._handoffs.get(session_id)
+            if handoff is not None and not handoff.done():
+                handoff.set_result(True)
+            return
+        if self._manager is None:
+            return
+        if payload.get("op") == "close":
+            await self._hand_over(session_id, payload.get("reply_to"))
+        elif payload.get("op") == "send":
+            if await self._manager.deliver_local(
+                session_id,
+                payload.get("message", ""),
+                payload.get("message_type", "ai_response"),
+                payload.get("metadata") or {}
+            ):
+                self.stats["delivered"] += 1
+
+    async def _hand_over(self, session_id: str, new_owner: Optional[str]) -> None:
+        """Save the session's current reconnect state, close the local socket and confirm."""
+        state = self._manager.preserved_state(session_id)
+        try:
+            if state:
+                await self.redis_client.set(
+                    state_key(session_id), json.dumps(state, default=str), ex=WS_STATE_TTL_SECONDS
+                )
+        except Exception as e:
+            logger.warning("ws_session_handoff_save_failed", session_id=session_id, error=str(e))
+        self._saved_state.pop(session_id, None)
+        await self._manager.close_local(session_id, "Session connected on another worker")
+        if new_owner:
+            await self._publish(new_owner, {"op": "handed_over", "session_id": session_id})
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        channel = worker_channel(self.worker_id)
+        while not self._stopping:
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub()
+                await pubsub.subscribe(channel)
+                logger.info("ws_registry_listener_subscribed", channel=channel)
+                backoff = 1.0
+                # redis-py can swallow a cancel inside get_message(timeout=...),
+                # so stop() also sets a flag checked between reads
+                while not self._stopping:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        await self._handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("ws_registry_listener_error", error=str(e), retry_in=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose() if hasattr(pubsub, "aclose") else await pubsub.close()
+                    except Exception:
+                        pass
+
+    # ------------------------------------------------------------- heartbeat
+
+    async def heartbeat(self) -> None:
+        """Refresh owned sessions, save changed reconnect state and publish counters."""
+        if self._manager is None:
+            return
+        session_ids = list(self._manager.local_session_ids())
+        counters = {
+            **self._manager.local_counters(),
+            **self.stats,
+            "connections": len(session_ids),
+            "heartbeat_at": int(time.time()),
+        }
+        now_ms = int(time.time() * 1000)
+        worker_key = f"{WS_KEY_PREFIX}worker:{self.worker_id}"
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.expire(session_key(session_id), WS_REGISTRY_TTL_SECONDS)
+                state = self._manager.preserved_state(session_id)
+                if state:
+                    state_json = json.dumps(state, default=str)
+                    if self._saved_state.get(session_id) != state_json:
+                        pipe.set(state_key(session_id), state_json, ex=WS_STATE_TTL_SECONDS)
+                        self._saved_state[session_id] = state_json
+            pipe.zadd(WS_WORKERS_KEY, {self.worker_id: now_ms})
+            pipe.zremrangebyscore(WS_WORKERS_KEY, "-inf", now_ms - WS_REGISTRY_TTL_SECONDS * 3000)
+            pipe.hset(worker_key, mapping={k: str(v) for k, v in counters.items()})
+            pipe.expire(worker_key, WS_REGISTRY_TTL_SECONDS)
+            await pipe.execute()
+
+        # Forget state cache entries for sessions that left without a release
+        for session_id in set(self._saved_state) - set(session_ids):
+            self._saved_state.pop(session_id, None)
+
+    async def _heartbeat_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await self.heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("ws_registry_heartbeat_failed", error=str(e))
+            await asyncio.sleep(WS_REGISTRY_HEARTBEAT_SECONDS)
+
+    # ----------------------------------------------------------------- stats
+
+    async def get_cluster_stats(self) -> Dict[str, Any]:
+        """Counters of every worker seen within the registry TTL, plus totals."""
+        now_ms = int(time.time() * 1000)
+        workers: List[str] = await self.redis_client.zrangebyscore(
+            WS_WORKERS_KEY, now_ms - WS_REGISTRY_TTL_SECONDS * 1000, "+inf"
+        )
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for worker_id in workers:
+                pipe.hgetall(f"{WS_KEY_PREFIX}worker:{worker_id}")
+            results = await pipe.execute() if workers else []
+
+        per_worker: Dict[str, Dict[str, int]] = {}
+        totals: Dict[str, int] = {}
+        for worker_id, counters in zip(workers, results):
+            values = {}
+            for name, value in (counters or {}).items():
+                try:
+                    values[name] = int(float(value))
+                except (TypeError, ValueError):
+                    continue
+            per_worker[worker_id] = values
+            for name, value in values.items():
+                if name != "heartbeat_at":
+                    totals[name] = totals.get(name, 0) + value
+
+        return {
+            "worker_id": self.worker_id,
+            "workers": len(per_worker),
+            "total_connections": totals.get("connections", 0),
+            "totals": totals,
+            "per_worker": per_worker,
+        }
+
+    # ------------------------------------------------------------- lifecycle
+
+    async def start(self) -> None:
+        self._stopping = False
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="ws-registry-listener")
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop(), name="ws-registry-heartbeat")
+        logger.info("ws_session_registry_started", worker_id=self.worker_id)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in (self._listener, self._heartbeat):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await asyncio.wait_for(task, timeout=5.0)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+        self._listener = self._heartbeat = None
+        try:
+            await self.redis_client.zrem(WS_WORKERS_KEY, self.worker_id)
+        except Exception:
+            pass
+
+
+_registry: Optional[WebSocketSessionRegistry] = None
+
+
+def get_ws_session_registry() -> Optional[WebSocketSessionRegistry]:
+    """Registry on the app Redis pool, or None (disabled / Redis not initialized)."""
+    global _registry
+
+    if not WS_SESSION_REGISTRY:
+        return None
+    if _registry is None:
+        from app.core.redis import get_redis_client
+        try:
+            _registry = WebSocketSessionRegistry(get_redis_client())
+        except RuntimeError:
+            return None
+    return _registry
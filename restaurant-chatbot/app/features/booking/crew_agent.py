@@ -25,36 +25,31 @@ logger = structlog.get_logger(__name__)
 def _get_available_tables(booking_datetime: datetime, party_size: int) -> List[Dict]:
     """Get available tables for given datetime and party size using sync DB (A24 schema)."""
     try:
-        from app.core.db_pool import SyncDBConnection
-        from psycopg2.extras import RealDictCursor
+        from app.core.db_pool import fetch_sync
 
         # Extract date and time for A24 schema (separate columns)
         booking_date = booking_datetime.date()
         booking_time = booking_datetime.time()
 
-        with SyncDBConnection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                # Get tables that can accommodate party size and are not booked
-                # A24 schema: table_info, table_booking_info with booking_date + booking_time
-                cursor.execute("""
-                    SELECT t.table_id, t.table_number, t.table_capacity, t.floor_location, t.table_type
-                    FROM table_info t
-                    WHERE t.table_capacity >= %s
-                    AND t.is_active = TRUE
-                    AND (t.is_deleted = FALSE OR t.is_deleted IS NULL)
-                    AND NOT EXISTS (
-                        SELECT 1 FROM table_booking_info b
-                        WHERE b.table_id = t.table_id
-                        AND b.booking_status NOT IN ('cancelled', 'completed')
-                        AND (b.is_deleted = FALSE OR b.is_deleted IS NULL)
-                        AND b.booking_date = %s
-                        AND b.booking_time BETWEEN %s - INTERVAL '1 hour' AND %s + INTERVAL '1 hour'
-                    )
-                    ORDER BY t.table_capacity ASC
-                    LIMIT 10
-                """, (party_size, booking_date, booking_time, booking_time))
-
-                rows = cursor.fetchall()
+        # Get tables that can accommodate party size and are not booked
+        # A24 schema: table_info, table_booking_info with booking_date + booking_time
+        rows = fetch_sync("""
+            SELECT t.table_id, t.table_number, t.table_capacity, t.floor_location, t.table_type
+            FROM table_info t
+            WHERE t.table_capacity >= $1
+            AND t.is_active = TRUE
+            AND (t.is_deleted = FALSE OR t.is_deleted IS NULL)
+            AND NOT EXISTS (
+                SELECT 1 FROM table_booking_info b
+                WHERE b.table_id = t.table_id
+                AND b.booking_status NOT IN ('cancelled', 'completed')
+                AND (b.is_deleted = FALSE OR b.is_deleted IS NULL)
+                AND b.booking_date = $2
+                AND b.booking_time BETWEEN $3 - INTERVAL '1 hour' AND $3 + INTERVAL '1 hour'
+            )
+            ORDER BY t.table_capacity ASC
+            LIMIT 10
+        """, party_size, booking_date, booking_time)
 
         if not rows:
             logger.info("no_tables_available", party_size=party_size, datetime=str(booking_datetime))
@@ -6,33 +6,18 @@ Sync wrapper functions for complaint management that are compatible with CrewAI.
 Following the same factory pattern used in food_ordering/crew_agent.py:
 - Factory functions return @tool decorated functions
 - Closures capture session_id for session awareness
-- Sync functions use DIRECT database operations (not async)
+- Sync functions run queries on the shared asyncpg pool (db_pool.fetch_sync)
 - Return plain Python dicts/strings (no complex objects)
 """
 from crewai.tools import tool
 from typing import Dict, Any, Optional
 import structlog
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
 import uuid
 from datetime import datetime, timezone
-import os
 
-logger = structlog.get_logger(__name__)
-
-
-def get_sync_db_session():
-    """Get synchronous database session for complaint operations."""
-    # Convert async database URL to sync (asyncpg -> psycopg2)
-    database_url = os.getenv("DATABASE_URL", "")
-    if "asyncpg" in database_url:
-        sync_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
-    else:
-        sync_url = database_url
+from app.core.db_pool import execute_sync, fetch_sync, fetchrow_sync
 
-    engine = create_engine(sync_url, pool_pre_ping=True)
-    Session = sessionmaker(bind=engine)
-    return Session()
+logger = structlog.get_logger(__name__)
 
 
 def create_complaint_tool(session_id: str):
@@ -90,48 +75,27 @@ def create_complaint_tool(session_id: str):
             now = datetime.now(timezone.utc)
 
             # Create complaint using direct SQL (sync operation)
-            db_session = get_sync_db_session()
-            try:
-                insert_query = text("""
-                    INSERT INTO complaints (
-                        id, user_id, description, category, priority, order_id,
-                        status, created_at, updated_at
-                    ) VALUES (
-                        :id, :user_id, :description, :category, :priority, :order_id,
-                        :status, :created_at, :updated_at
-                    )
-                """)
-
-                db_session.execute(insert_query, {
-                    "id": complaint_id,
-                    "user_id": user_id,
-                    "description": description,
-                    "category": category,
-                    "priority": priority,
-                    "order_id": order_id,
-                    "status": "open",
-                    "created_at": now,
-                    "updated_at": now
-                })
-                db_session.commit()
-
-                ticket_id = complaint_id[:8]
-
-                logger.info("complaint_created",
-                           session_id=session_id,
-                           complaint_id=complaint_id,
-                           category=category,
-                           priority=priority)
-
-                return (
-                    f"I'm so sorry about that! I've logged your complaint as #{ticket_id}. "
-                    f"We take this very seriously and will address it immediately. "
-                    f"Priority: {priority.upper()}. "
-                    f"Would you like us to offer a replacement or refund?"
-                )
-
-            finally:
-                db_session.close()
+            execute_sync("""
+                INSERT INTO complaints (
+                    id, user_id, description, category, priority, order_id,
+                    status, created_at, updated_at
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            """, complaint_id, user_id, description, category, priority, order_id, "open", now, now)
+
+            ticket_id = complaint_id[:8]
+
+            logger.info("complaint_created",
+                       session_id=session_id,
+                       complaint_id=complaint_id,
+                       category=category,
+                       priority=priority)
+
+            return (
+                f"I'm so sorry about that! I've logged your complaint as #{ticket_id}. "
+                f"We take this very seriously and will address it immediately. "
+                f"Priority: {priority.upper()}. "
+                f"Would you like us to offer a replacement or refund?"
+            )
 
         except Exception as e:
             logger.error("complaint_tool_exception",
@@ -182,55 +146,39 @@ def create_get_complaints_tool(session_id: str):
         logger.info("fetching_complaints", session_id=session_id, user_id=user_id, status=status)
 
         try:
-            db_session = get_sync_db_session()
-            try:
-                # Build query based on status filter
-                if status:
-                    query = text("""
-                        SELECT id, category, status, created_at
-                        FROM complaints
-                        WHERE user_id = :user_id AND status = :status AND deleted_at IS NULL
-                        ORDER BY created_at DESC
-                        LIMIT :limit
-                    """)
-                    result = db_session.execute(query, {
-                        "user_id": user_id,
-                        "status": status,
-                        "limit": limit
-                    })
-                else:
-                    query = text("""
-                        SELECT id, category, status, created_at
-                        FROM complaints
-                        WHERE user_id = :user_id AND deleted_at IS NULL
-                        ORDER BY created_at DESC
-                        LIMIT :limit
-                    """)
-                    result = db_session.execute(query, {
-                        "user_id": user_id,
-                        "limit": limit
-                    })
-
-                complaints = result.fetchall()
-
-                if not complaints:
-                    return "You don't have any complaints on record."
-
-                # Format complaints
-                lines = [f"Your complaints ({len(complaints)}):"]
-                for idx, complaint in enumerate(complaints, 1):
-                    complaint_id = complaint[0][:8]  # id
-                    category = complaint[1].replace("_", " ").title()  # category
-                    complaint_status = complaint[2].title()  # status
-
-                    lines.append(
-                        f"{idx}. Complaint #{complaint_id} - {category} ({complaint_status})"
-                    )
-
-                return "\n".join(lines)
-
-            finally:
-                db_session.close()
+            # Build query based on status filter
+            if status:
+                complaints = fetch_sync("""
+                    SELECT id, category, status, created_at
+                    FROM complaints
+                    WHERE user_id = $1 AND status = $2 AND deleted_at IS NULL
+                    ORDER BY created_at DESC
+                    LIMIT $3
+                """, user_id, status, limit)
+            else:
+                complaints = fetch_sync("""
+                    SELECT id, category, status, created_at
+                    FROM complaints
+                    WHERE user_id = $1 AND deleted_at IS NULL
+                    ORDER BY created_at DESC
+                    LIMIT $2
+                """, user_id, limit)
+
+            if not complaints:
+                return "You don't have any complaints on record."
+
+            # Format complaints
+            lines = [f"Your complaints ({len(complaints)}):"]
+            for idx, complaint in enumerate(complaints, 1):
+                complaint_id = complaint[0][:8]  # id
+                category = complaint[1].replace("_", " ").title()  # category
+                complaint_status = complaint[2].title()  # status
+
+                lines.append(
+                    f"{idx}. Complaint #{complaint_id} - {category} ({complaint_status})"
+                )
+
+            return "\n".join(lines)
 
         except Exception as e:
             logger.error("get_complaints_exception",
@@ -269,40 +217,32 @@ def create_complaint_status_tool(session_id: str):
         logger.info("checking_complaint_status", session_id=session_id, complaint_id=complaint_id)
 
         try:
-            db_session = get_sync_db_session()
-            try:
-                query = text("""
-                    SELECT id, category, status, resolution, created_at
-                    FROM complaints
-                    WHERE id = :complaint_id AND deleted_at IS NULL
-                    LIMIT 1
-                """)
-
-                result = db_session.execute(query, {"complaint_id": complaint_id})
-                complaint = result.fetchone()
-
-                if not complaint:
-                    return f"I couldn't find complaint #{complaint_id[:8]}. Please check the ID."
-
-                complaint_id_full = complaint[0]
-                category = complaint[1].replace("_", " ").title()
-                status = complaint[2].title()
-                resolution = complaint[3]
-
-                response = f"Complaint #{complaint_id_full[:8]} - {category}\n"
-                response += f"Status: {status}\n"
-
-                if resolution:
-                    response += f"\nResolution: {resolution}"
-                elif status == "Open":
-                    response += "\nWe're reviewing your complaint and will respond soon."
-                elif status == "In_Progress" or status == "In Progress":
-                    response += "\nYour complaint is being actively addressed."
-
-                return response
-
-            finally:
-                db_session.close()
+            complaint = fetchrow_sync("""
+                SELECT id, category, status, resolution, created_at
+                FROM complaints
+                WHERE id = $1 AND deleted_at IS NULL
+                LIMIT 1
+            """, complaint_id)
+
+            if not complaint:
+                return f"I couldn't find complaint #{complaint_id[:8]}. Please check the ID."
+
+            complaint_id_full = complaint[0]
+            category = complaint[1].replace("_", " ").title()
+            status = complaint[2].title()
+            resolution = complaint[3]
+
+            response = f"Complaint #{complaint_id_full[:8]} - {category}\n"
+            response += f"Status: {status}\n"
+
+            if resolution:
+                response += f"\nResolution: {resolution}"
+            elif status == "Open":
+                response += "\nWe're reviewing your complaint and will respond soon."
+            elif status == "In_Progress" or status == "In Progress":
+                response += "\nYour complaint is being actively addressed."
+
+            return response
 
         except Exception as e:
             logger.error("check_status_exception",
@@ -15,7 +15,8 @@ from app.core.cache import get_feature_cache
 
 # Food ordering cache instance
 # All cache keys will be prefixed with "food_ordering:"
-food_ordering_cache = get_feature_cache("food_ordering")
+# Menu/inventory reads dominate, so reads go through the process-local tier
+food_ordering_cache = get_feature_cache("food_ordering", local_tier=True)
 
 # Convenience exports
 __all__ = ["food_ordering_cache"]
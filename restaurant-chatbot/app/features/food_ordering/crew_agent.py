@@ -7,7 +7,7 @@ Architecture:
 - Single agent with tools for menu, cart, order, and payment operations
 - Tools use @tool decorator for auto-generated Pydantic schemas
 - Core tools (cart/menu) are ASYNC - native CrewAI async support (no thread pool overhead)
-- Order/payment tools remain sync (PostgreSQL via psycopg2, no AGUI emissions)
+- Order/payment tools remain sync (PostgreSQL via db_pool.fetch_sync, no AGUI emissions)
 - Session-aware tools via factory pattern with closures
 
 Best Practices Applied (from docs.crewai.com):
@@ -48,6 +48,7 @@ _CREW_VERSION = 30
 
 # Concurrency configuration - custom ThreadPoolExecutor for handling concurrent users
 import concurrent.futures
+import contextvars
 MAX_CONCURRENT_CREWS = 20  # Rate limit: max 20 concurrent crew executions
 _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
     max_workers=50,  # Thread pool size: can handle up to 50 concurrent requests
@@ -406,6 +407,31 @@ def _checkout_impl(order_type: str, session_id: str) -> str:
             if "total" in normalized:
                 normalized["total"] = float(normalized["total"])
             items.append(normalized)
+
+        # Hold the cart's stock for the order until payment settles it
+        # (payment_state_service sells it on success, returns it on failure).
+        # Cart holds expire after INVENTORY_RESERVATION_TTL_SECONDS, so those
+        # are reserved again, and checkout is refused if the items sold out
+        from app.services.inventory_cache_service import get_inventory_cache_service
+        hold = run_async(get_inventory_cache_service().hold_cart_for_checkout(
+            [{"item_id": i.get("id"), "quantity": i.get("quantity", 1)} for i in items],
+            session_id
+        ))
+        if not hold["success"]:
+            names = {i.get("id"): i.get("name") for i in items}
+            unavailable = []
+            for failed in hold["failed_items"]:
+                name = names.get(failed["item_id"], failed["item_id"])
+                if failed["available"] > 0:
+                    unavailable.append(f"{name} (only {failed['available']} left)")
+                else:
+                    unavailable.append(f"{name} (sold out)")
+            logger.warning("checkout_reservation_expired", session_id=session_id, items=unavailable)
+            return (
+                "[ITEMS UNAVAILABLE] Sorry, we could no longer hold these items from your cart: "
+                f"{', '.join(unavailable)}. Please update your cart and try checking out again."
+            )
+
         subtotal = sum(i.get("price", 0) * i.get("quantity", 1) for i in items)
 
         # Packaging charge per item - single source of truth in agui_events
@@ -442,16 +468,17 @@ def _checkout_impl(order_type: str, session_id: str) -> str:
 
         logger.info("pending_order_created", session_id=session_id, order_id=order_display_id)
 
-        # Clear session_cart in PostgreSQL so cart shows empty after checkout
-        from app.core.db_pool import SyncDBConnection
+        # Record checkout (written before continuing) and clear session_cart
+        # so cart shows empty after checkout
+        from app.core.session_events import EventType
         try:
-            with SyncDBConnection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        "UPDATE session_cart SET is_active = FALSE, updated_at = NOW() WHERE session_id = %s AND is_active = TRUE",
-                        (session_id,)
-                    )
-                    conn.commit()
+            tracker.log_event(EventType.CHECKOUT_STARTED, {
+                "order_id": order_display_id,
+                "order_type": order_type_clean,
+                "total": total,
+                "item_count": len(items),
+            })
+            tracker.clear_cart()
         except Exception as clear_err:
             logger.warning("cart_clear_after_checkout_failed", error=str(clear_err))
 
@@ -632,7 +659,7 @@ def _get_order_status_impl(order_id: str, session_id: str) -> str:
     """Sync implementation of get_order_status for crew pool."""
     from app.core.agui_events import emit_tool_activity
     from app.core.redis import get_sync_redis_client
-    from app.core.db_pool import SyncDBConnection
+    from app.core.db_pool import fetchrow_sync
 
     emit_tool_activity(session_id, "get_order_status")
 
@@ -649,17 +676,14 @@ def _get_order_status_impl(order_id: str, session_id: str) -> str:
             order_display_id = recent_orders[0].decode() if isinstance(recent_orders[0], bytes) else recent_orders[0]
 
         # Get order status from PostgreSQL
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT o.order_invoice_number, ost.order_status_name,
-                           ott.order_type_name, o.created_at, o.total_amount
-                    FROM orders o
-                    LEFT JOIN order_status_type ost ON o.order_status_type_id = ost.order_status_type_id
-                    LEFT JOIN order_type_table ott ON o.order_type_id = ott.order_type_id
-                    WHERE o.order_invoice_number = %s
-                """, (order_display_id,))
-                order = cur.fetchone()
+        order = fetchrow_sync("""
+            SELECT o.order_invoice_number, ost.order_status_name,
+                   ott.order_type_name, o.created_at, o.total_amount
+            FROM orders o
+            LEFT JOIN order_status_type ost ON o.order_status_type_id = ost.order_status_type_id
+            LEFT JOIN order_type_table ott ON o.order_type_id = ott.order_type_id
+            WHERE o.order_invoice_number = $1
+        """, order_display_id)
 
         if not order:
             return f"Order {order_display_id} not found."
@@ -678,7 +702,7 @@ def _get_order_history_impl(session_id: str) -> str:
     """Sync implementation of get_order_history for crew pool."""
     from app.core.agui_events import emit_tool_activity
     from app.core.redis import get_sync_redis_client
-    from app.core.db_pool import SyncDBConnection
+    from app.core.db_pool import fetch_sync
 
     emit_tool_activity(session_id, "get_order_history")
 
@@ -691,19 +715,15 @@ def _get_order_history_impl(session_id: str) -> str:
             return "You haven't placed any orders yet."
 
         # Get orders from PostgreSQL
-        with SyncDBConnection() as conn:
-            with conn.cursor() as cur:
-                placeholders = ','.join(['%s'] * len(order_ids))
-                cur.execute(f"""
-                    SELECT o.order_invoice_number, ost.order_status_name,
-                           ott.order_type_name, o.created_at, o.total_amount
-                    FROM orders o
-                    LEFT JOIN order_status_type ost ON o.order_status_type_id = ost.order_status_type_id
-                    LEFT JOIN order_type_table ott ON o.order_type_id = ott.order_type_id
-                    WHERE o.order_invoice_number IN ({placeholders})
-                    ORDER BY o.created_at DESC
-                """, tuple(oid.decode() if isinstance(oid, bytes) else oid for oid in order_ids))
-                orders = cur.fetchall()
+        orders = fetch_sync("""
+            SELECT o.order_invoice_number, ost.order_status_name,
+                   ott.order_type_name, o.created_at, o.total_amount
+            FROM orders o
+            LEFT JOIN order_status_type ost ON o.order_status_type_id = ost.order_status_type_id
+            LEFT JOIN order_type_table ott ON o.order_type_id = ott.order_type_id
+            WHERE o.order_invoice_number = ANY($1::text[])
+            ORDER BY o.created_at DESC
+        """, [oid.decode() if isinstance(oid, bytes) else oid for oid in order_ids])
 
         if not orders:
             return "No orders found in history."
@@ -1158,20 +1178,15 @@ def get_response_quick_replies(response: str) -> List[Dict[str, str]]:
     import json
 
     try:
-        from langchain_openai import ChatOpenAI
         from app.ai_services.llm_manager import get_llm_manager
 
-        # Get API key from LLM manager pool (round-robin across validated accounts)
+        # Account from LLM manager pool (round-robin across validated accounts);
+        # its ChatOpenAI is cached per account
         llm_manager = get_llm_manager()
-        api_key = llm_manager.get_next_api_key()
+        account = llm_manager.get_next_account()
 
         # Use GPT-4o-mini for speed (fastest, cheapest, good enough for classification)
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-            max_tokens=100,
-            api_key=api_key,
-        )
+        llm = account.get_chat_model("gpt-4o-mini", 0, max_tokens=100)
 
         # Get the agent's decision
         prompt = QUICK_REPLY_AGENT_PROMPT.format(response=response[:500])  # Limit response length
@@ -2764,7 +2779,7 @@ def create_update_quantity_tool(session_id: str):
         from app.core.agui_events import emit_tool_activity, emit_cart_data
         emit_tool_activity(session_id, "update_quantity")
 
-        from app.core.db_pool import SyncDBConnection
+        from app.core.session_events import get_sync_session_tracker
 
         try:
             # VALIDATION: Quantity must be positive and reasonable
@@ -2776,29 +2791,22 @@ def create_update_quantity_tool(session_id: str):
 
             item_name_clean = item_name.strip()
 
-            with SyncDBConnection() as conn:
-                with conn.cursor() as cur:
-                    # Update quantity in SQL session_cart (same store as event-sourced tools)
-                    cur.execute(
-                        """UPDATE session_cart
-                           SET quantity = %s, updated_at = NOW()
-                           WHERE session_id = %s AND LOWER(item_name) = LOWER(%s) AND is_active = TRUE""",
-                        (new_quantity, session_id, item_name_clean)
-                    )
-                    rows_updated = cur.rowcount
-                    conn.commit()
-
-                    if rows_updated == 0:
-                        return f"Item '{item_name}' not found in cart."
+            # Update quantity in SQL session_cart (same store as event-sourced tools)
+            tracker = get_sync_session_tracker(session_id)
+            cart_item = tracker.find_cart_item(item_name_clean)
+            if not cart_item:
+                return f"Item '{item_name}' not found in cart."
 
-                    # Get updated cart
-                    cur.execute("SELECT * FROM get_session_cart(%s)", (session_id,))
-                    columns = [desc[0] for desc in cur.description] if cur.description else []
-                    items = [dict(zip(columns, row)) for row in cur.fetchall()]
+            # The stock hold follows the cart quantity (held quantities are absolute)
+            from app.features.food_ordering.tools_event_sourced import hold_cart_stock
+            short = hold_cart_stock(session_id, {str(cart_item["item_id"]): new_quantity})
+            if short:
+                available = short[str(cart_item["item_id"])]
+                return f"[ITEMS UNAVAILABLE] Only {available} more {item_name} available right now."
 
-                    cur.execute("SELECT get_cart_total(%s)", (session_id,))
-                    total_row = cur.fetchone()
-                    new_total = float(total_row[0]) if total_row and total_row[0] else 0.0
+            cart_data = tracker.update_quantity(cart_item["item_id"], new_quantity)
+            items = cart_data.get("items", [])
+            new_total = cart_data.get("total", 0.0)
 
             # Emit updated cart card
             emit_cart_data(session_id, items, new_total)
@@ -4041,6 +4049,10 @@ def create_cancel_payment_tool(session_id: str):
             # Clear pending payment from Redis
             await redis_client.delete(f"payment_pending:{session_id}")
 
+            # Return the stock held for the order
+            from app.services.inventory_cache_service import settle_checkout_hold
+            settle_checkout_hold(session_id, sold=False)
+
             logger.info(
                 "payment_cancelled",
                 session_id=session_id,
@@ -4177,18 +4189,17 @@ def create_food_ordering_crew(session_id: str, customer_id: Optional[str] = None
         customer_id: Current customer ID (None if not authenticated)
     """
     import os
-    from langchain_openai import ChatOpenAI
     from app.ai_services.llm_manager import get_llm_manager
 
-    # Get API key from LLM manager pool (round-robin across validated accounts)
+    # Account from LLM manager pool (round-robin across validated accounts);
+    # its ChatOpenAI is cached per account and shared by every crew on it
     llm_manager = get_llm_manager()
-    api_key = llm_manager.get_next_api_key()
-    os.environ["OPENAI_API_KEY"] = api_key
+    account = llm_manager.get_next_account()
+    os.environ["OPENAI_API_KEY"] = account.api_key
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.1,  # Lower = faster, more deterministic
-        api_key=api_key,
+    llm = account.get_chat_model(
+        "gpt-4o-mini",
+        0.1,  # Lower = faster, more deterministic
         max_tokens=2048,  # CRITICAL FIX: Increased to accommodate 55 tool schemas and responses
     )
 
@@ -4414,7 +4425,10 @@ async def process_with_crew(
                 raw_response = str(result)
                 return clean_crew_response(raw_response)
 
-            response = await loop.run_in_executor(_EXECUTOR, run_crew_sync)
+            # Run in a copy of this context so tools see request-scoped
+            # contextvars (e.g. the menu branch set by use_menu_branch)
+            context = contextvars.copy_context()
+            response = await loop.run_in_executor(_EXECUTOR, context.run, run_crew_sync)
 
         logger.info(
             "crew_processing_complete",
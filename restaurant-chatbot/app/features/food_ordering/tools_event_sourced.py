@@ -17,7 +17,7 @@ Architecture:
 """
 
 from crewai.tools import tool
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from uuid import UUID
 import structlog
 import re
@@ -100,6 +100,71 @@ def resolve_ordinal_reference(item_text: str, tracker) -> Optional[str]:
 # TOOL FACTORY - Create session-scoped tools
 # ============================================================================
 
+# ============================================================================
+# STOCK HOLDS - Inventory reserved for what is in the cart
+# ============================================================================
+
+def _cart_quantities(tracker) -> Dict[str, int]:
+    """Quantity of each item in the cart (item_id -> total)."""
+    quantities: Dict[str, int] = {}
+    for item in tracker.get_cart_summary().get("items", []):
+        item_id = str(item.get("item_id"))
+        quantities[item_id] = quantities.get(item_id, 0) + int(item.get("quantity", 1))
+    return quantities
+
+
+def hold_cart_stock(session_id: str, holds: Dict[str, int]) -> Dict[str, int]:
+    """
+    Reserve stock for the cart's new quantities (item_id -> total in cart).
+
+    The holds are what checkout later moves to the order. Items without an
+    inventory count pass unreserved, and an inventory cache error doesn't
+    block ordering.
+
+    Returns:
+        Items out of stock (not reserved): item_id -> quantity still available
+    """
+    from app.core.db_pool import run_sync
+    from app.services.inventory_cache_service import get_inventory_cache_service
+
+    short: Dict[str, int] = {}
+    while holds:
+        result = run_sync(get_inventory_cache_service().reserve_multiple_items(
+            [{"item_id": item_id, "quantity": quantity} for item_id, quantity in holds.items()],
+            session_id,
+            skip_untracked=True
+        ))
+        if result["success"]:
+            break
+        # All or nothing: drop the items that are out of stock and reserve the rest
+        insufficient = {
+            failed["item_id"]: max(failed["available"], 0)
+            for failed in result["failed_items"] if failed.get("reason") == "insufficient"
+        }
+        if not insufficient:
+            logger.warning("cart_stock_hold_failed", session_id=session_id, failed=result["failed_items"])
+            break
+        short.update(insufficient)
+        holds = {item_id: quantity for item_id, quantity in holds.items() if item_id not in insufficient}
+    return short
+
+
+def release_cart_stock(session_id: str, item_ids: Iterable) -> None:
+    """Return the stock held for items taken out of the cart."""
+    from app.core.db_pool import run_sync
+    from app.services.inventory_cache_service import get_inventory_cache_service
+
+    item_ids = [str(item_id) for item_id in item_ids]
+    if item_ids:
+        run_sync(get_inventory_cache_service().release_cart_reservations(item_ids, session_id))
+
+
+def _out_of_stock_message(item_name: str, available: int) -> str:
+    if available > 0:
+        return f"Sorry, only {available} more {item_name} available right now. How many would you like?"
+    return f"Sorry, {item_name} is sold out right now. Can I suggest something else?"
+
+
 def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = None):
     """
     Factory to create event-sourced food ordering tools with session context.
@@ -185,6 +250,12 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
                     f"It's currently {meal_period} time. Would you like to see what's available now?"
                 )
 
+            # Hold the stock for the cart's new quantity of this item
+            in_cart = _cart_quantities(tracker).get(str(item_id), 0)
+            short = hold_cart_stock(session_id, {str(item_id): in_cart + quantity})
+            if short:
+                return _out_of_stock_message(item_name, short[str(item_id)])
+
             # Add to cart (logs event + updates state) - tracker already created above
             cart = tracker.add_to_cart(
                 item_id=item_id,
@@ -331,6 +402,7 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
 
             if not cart.get('success', False):
                 return f"'{item}' is not in your cart."
+            release_cart_stock(session_id, [item_id])
 
             # Emit updated cart
             emit_cart_data(session_id, cart['items'], cart['total'])
@@ -376,7 +448,9 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
 
         try:
             tracker = get_sync_session_tracker(session_id, UUID(customer_id) if customer_id else None)
+            held_ids = list(_cart_quantities(tracker))
             cart = tracker.clear_cart()
+            release_cart_stock(session_id, held_ids)
 
             # Emit empty cart to frontend
             emit_cart_data(session_id, cart['items'], cart['total'])
@@ -437,12 +511,7 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
 
             if is_specials_query:
                 # Specials: check for recommended items in the menu
-                recommended_items = [
-                    item for item in preloader._menu_cache
-                    if item.get("is_recommended", False)
-                    and item.get("is_available", True)
-                    and item.get("price", 0) > 0
-                ]
+                recommended_items = preloader.get_recommended_items()
 
                 if recommended_items:
                     # Found recommended/special items — show them
@@ -464,11 +533,7 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
                     )
                 else:
                     # No specials tagged — suggest popular items instead
-                    popular_items = [
-                        item for item in preloader._menu_cache
-                        if item.get("is_available", True)
-                        and item.get("price", 0) > 0
-                    ][:6]  # Show top 6 popular items
+                    popular_items = preloader.search()[:6]  # Show top 6 popular items
 
                     if popular_items:
                         emit_search_results(
@@ -702,6 +767,7 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
             added_categories = set()
             added_ids = set()
             failed_items = []
+            to_add = []
             cart = None
 
             for pair in pairs:
@@ -743,21 +809,35 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
                     failed_items.append(f"{found_item['name']} (only {avail_times})")
                     continue
 
-                item_id = UUID(found_item['id'])
+                to_add.append((found_item, quantity))
+
+            # Hold the stock for every item's new cart quantity in one go
+            in_cart = _cart_quantities(tracker) if to_add else {}
+            holds = {}
+            for found_item, quantity in to_add:
+                holds[found_item["id"]] = holds.get(found_item["id"], in_cart.get(found_item["id"], 0)) + quantity
+            short = hold_cart_stock(session_id, holds)
+
+            for found_item, quantity in to_add:
                 name = found_item['name']
-                price = float(found_item['price'])
+                if found_item["id"] in short:
+                    available = short[found_item["id"]]
+                    failed_items.append(f"{name} ({f'only {available} left' if available else 'sold out'})")
+                    continue
 
                 cart = tracker.add_to_cart(
-                    item_id=item_id,
+                    item_id=UUID(found_item['id']),
                     item_name=name,
                     quantity=quantity,
-                    price=price
+                    price=float(found_item['price'])
                 )
                 added_items.append(f"{quantity}x {name}")
                 added_categories.add(found_item.get("category", "Other"))
                 added_ids.add(found_item["id"])
 
             if not added_items:
+                if short:
+                    return f"Sorry, I couldn't add these items: {', '.join(failed_items)}."
                 return f"I couldn't find these items on our menu: {', '.join(failed_items)}. Try searching first?"
 
             # Emit ONE cart update after all items added
@@ -807,7 +887,7 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
             if cart:
                 msg += f" Cart total: ₹{cart['total']:.0f} ({cart['item_count']} items)."
             if failed_items:
-                msg += f"\nCouldn't find: {', '.join(failed_items)}."
+                msg += f"\nCouldn't add: {', '.join(failed_items)}."
             if upsell_items:
                 msg += " Here are some similar items you might like!"
             else:
@@ -863,6 +943,7 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
                 item_id = UUID(found_item['id'])
                 result = tracker.remove_from_cart(item_id)
                 if result.get('success', False):
+                    release_cart_stock(session_id, [item_id])
                     removed_items.append(found_item['name'])
                     cart = result
                 else:
@@ -912,6 +993,13 @@ def create_event_sourced_tools(session_id: str, customer_id: Optional[str] = Non
                 name = found_item['name']
                 price = float(found_item['price'])
 
+                in_cart = _cart_quantities(tracker).get(str(item_id), 0)
+                short = hold_cart_stock(session_id, {str(item_id): in_cart + quantity})
+                if short:
+                    available = short[str(item_id)]
+                    failed_adds.append(f"{name} ({f'only {available} left' if available else 'sold out'})")
+                    continue
+
                 cart = tracker.add_to_cart(
                     item_id=item_id,
                     item_name=name,
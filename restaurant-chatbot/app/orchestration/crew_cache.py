@@ -0,0 +1,225 @@
+"""
+Crew Cache
+==========
+Bounded per-session cache for built CrewAI crews.
+
+- LRU with an idle TTL: a crew not used for ``ttl`` seconds is dropped, and
+  the least recently used crews are dropped past ``max_entries``
+- Optional memory budget: each crew's retained size is estimated when it is
+  cached (in a worker thread with ``aset``), and LRU crews are dropped while
+  the total is over ``max_bytes``
+- Eviction hooks: ``hook(key, crew, reason)`` runs for every crew removed
+  (reason: ttl, lru, memory, invalidated)
+
+Usage:
+    cache = CrewCache(max_entries=500, ttl=1800)
+    crew = cache.get(key)
+    if crew is None:
+        crew = await cache.aset(key, build_crew(), shared=template_objects)
+"""
+
+import asyncio
+import gc
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+EvictionHook = Callable[[str, Any, str], None]
+
+# Objects visited per size estimate (bounds the cost for very large crews)
+SIZE_ESTIMATE_MAX_OBJECTS = 200_000
+
+# ids of module-level objects, refreshed when modules are imported
+_module_globals: Tuple[int, frozenset] = (0, frozenset())
+_module_globals_lock = threading.Lock()
+
+
+def _module_global_ids() -> frozenset:
+    """ids of every module attribute (singletons, registries, caches)."""
+    global _module_globals
+    with _module_globals_lock:
+        modules = list(sys.modules.values())
+        if _module_globals[0] != len(modules):
+            ids = set()
+            for module in modules:
+                try:
+                    ids.update(id(value) for value in vars(module).values())
+                except TypeError:
+                    continue
+            _module_globals = (len(modules), frozenset(ids))
+        return _module_globals[1]
+
+
+def estimate_retained_size(root: Any, shared: Iterable[Any] = ()) -> int:
+    """
+    Approximate bytes reachable from root that belong to it alone.
+
+    Modules, classes, function globals and module-level objects (service
+    singletons and the like) are not followed, and anything in ``shared``
+    (template objects, pooled LLM clients) is not counted, so the result is
+    the memory a crew adds on top of what all crews share.
+    """
+    module_globals = _module_global_ids()
+    seen = {id(obj) for obj in shared}
+    stack = [root]
+    total = 0
+    visited = 0
+    while stack and visited < SIZE_ESTIMATE_MAX_OBJECTS:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (types.ModuleType, type)) or (id(obj) in module_globals and obj is not root):
+            continue
+        visited += 1
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, types.FunctionType):
+            # Closure cells hold the session binding; globals are shared
+            stack.extend(obj.__closure__ or ())
+            stack.extend(obj.__defaults__ or ())
+            stack.append(obj.__dict__)
+        else:
+            stack.extend(gc.get_referents(obj))
+    return total
+
+
+class CrewCache:
+    """LRU + idle-TTL cache of crews with eviction hooks and size accounting (thread-safe)."""
+
+    def __init__(self, max_entries: int, ttl: float, max_bytes: int = 0, track_memory: bool = False):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.track_memory = track_memory or max_bytes > 0
+        # key -> (last_used, crew, estimated_bytes)
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hooks: List[EvictionHook] = []
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "builds": 0,
+            "evicted_ttl": 0,
+            "evicted_lru": 0,
+            "evicted_memory": 0,
+            "invalidated": 0,
+        }
+
+    def add_eviction_hook(self, hook: EvictionHook) -> None:
+        self._hooks.append(hook)
+
+    def _pop(self, key: str, reason: str, removed: List[Tuple[str, Any, str]]) -> None:
+        _, crew, size = self._entries.pop(key)
+        self._bytes -= size
+        self._stats["invalidated" if reason == "invalidated" else f"evicted_{reason}"] += 1
+        removed.append((key, crew, reason))
+
+    def _expire(self, now: float, removed: List[Tuple[str, Any, str]]) -> None:
+        # Entries are in last-used order and share one TTL, so expired ones are at the front
+        while self._entries:
+            key, (last_used, _, _) = next(iter(self._entries.items()))
+            if now - last_used < self.ttl:
+                break
+            self._pop(key, "ttl", removed)
+
+    def _run_hooks(self, removed: List[Tuple[str, Any, str]]) -> None:
+        for key, crew, reason in removed:
+            for hook in self._hooks:
+                try:
+                    hook(key, crew, reason)
+                except Exception as e:
+                    logger.warning("crew_cache_hook_failed", key=key, reason=reason, error=str(e))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached crew for key (refreshing its TTL), or None."""
+        removed: List[Tuple[str, Any, str]] = []
+        with self._lock:
+            self._expire(time.monotonic(), removed)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+                self._entries[key] = (time.monotonic(), entry[1], entry[2])
+                self._entries.move_to_end(key)
+        self._run_hooks(removed)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, crew: Any, shared: Iterable[Any] = ()) -> Any:
+        """Cache a freshly built crew; evicts expired/LRU crews to stay within bounds."""
+        size = estimate_retained_size(crew, shared) if self.track_memory else 0
+        return self._insert(key, crew, size)
+
+    async def aset(self, key: str, crew: Any, shared: Iterable[Any] = ()) -> Any:
+        """set() for event loop callers: the size estimate runs in a worker thread."""
+        size = await asyncio.to_thread(estimate_retained_size, crew, list(shared)) if self.track_memory else 0
+        return self._insert(key, crew, size)
+
+    def _insert(self, key: str, crew: Any, size: int) -> Any:
+        removed: List[Tuple[str, Any, str]] = []
+        with self._lock:
+            self._stats["builds"] += 1
+            if key in self._entries:
+                self._pop(key, "invalidated", removed)
+            self._entries[key] = (time.monotonic(), crew, size)
+            self._bytes += size
+            self._expire(time.monotonic(), removed)
+            while len(self._entries) > self.max_entries:
+                self._pop(next(iter(self._entries)), "lru", removed)
+            # Always keep the crew just built, even if it alone is over budget
+            while self.max_bytes and self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._pop(next(iter(self._entries)), "memory", removed)
+        self._run_hooks(removed)
+        return crew
+
+    def invalidate(self, predicate: Callable[[str], bool]) -> int:
+        """Drop every crew whose key matches predicate (e.g. a session reset)."""
+        removed: List[Tuple[str, Any, str]] = []
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._pop(key, "invalidated", removed)
+        self._run_hooks(removed)
+        return len(removed)
+
+    def sweep(self) -> int:
+        """Drop idle crews now (otherwise they're dropped on the next get/set)."""
+        removed: List[Tuple[str, Any, str]] = []
+        with self._lock:
+            self._expire(time.monotonic(), removed)
+        self._run_hooks(removed)
+        return len(removed)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+            total_bytes = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hit_rate_percent": round(stats["hits"] / lookups * 100, 2) if lookups else 0,
+            "evicted": stats["evicted_ttl"] + stats["evicted_lru"] + stats["evicted_memory"],
+            "memory_bytes": total_bytes,
+            "avg_crew_bytes": total_bytes // size if size else 0,
+            "max_bytes": self.max_bytes,
+        }
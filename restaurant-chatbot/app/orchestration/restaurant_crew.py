@@ -17,14 +17,17 @@ Architecture:
 """
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional, Tuple
 import structlog
 import asyncio
+import contextvars
 import os
 import re
 
 # Tool retrieval - import at module level for initialization
 from app.core.tool_retrieval import get_relevant_tools
+from app.orchestration.crew_cache import CrewCache
 
 logger = structlog.get_logger(__name__)
 
@@ -37,15 +40,43 @@ MAX_CONCURRENT_CREWS = 20  # Rate limit: max 20 concurrent crew executions
 _CREW_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_CREWS)
 
 
-# Crew cache by session
-_CREW_CACHE: Dict[str, Crew] = {}
+# Crew cache by session (LRU + idle TTL; evicted crews are rebuilt from the template)
+CREW_CACHE_MAX_SESSIONS = int(os.getenv("CREW_CACHE_MAX_SESSIONS", "500"))
+CREW_CACHE_TTL_SECONDS = float(os.getenv("CREW_CACHE_TTL_SECONDS", "1800"))
+CREW_CACHE_MAX_MEMORY_MB = float(os.getenv("CREW_CACHE_MAX_MEMORY_MB", "0"))  # 0 = no memory budget
+CREW_CACHE_TRACK_MEMORY = os.getenv("CREW_CACHE_TRACK_MEMORY", "false").lower() == "true"
+
+_CREW_CACHE = CrewCache(
+    max_entries=CREW_CACHE_MAX_SESSIONS,
+    ttl=CREW_CACHE_TTL_SECONDS,
+    max_bytes=int(CREW_CACHE_MAX_MEMORY_MB * 1024 * 1024),
+    track_memory=CREW_CACHE_TRACK_MEMORY,
+)
 _CREW_VERSION = 42
 
 
+def _on_crew_evicted(key: str, crew: Crew, reason: str):
+    logger.info("crew_evicted", key=key, reason=reason, cached_crews=len(_CREW_CACHE))
+
+
+_CREW_CACHE.add_eviction_hook(_on_crew_evicted)
+
+
+def get_crew_cache_stats() -> Dict[str, Any]:
+    """Crew cache size, hit/evict counters and estimated memory (for /monitor/status)."""
+    return {**_CREW_CACHE.get_stats(), "version": _CREW_VERSION, "templates": len(_CREW_TEMPLATES)}
+
+
+def sweep_crew_cache() -> int:
+    """Drop crews idle past the TTL (called from the periodic session cleanup)."""
+    return _CREW_CACHE.sweep()
+
+
 async def _translate_response(text: str, target_language: str) -> str:
     """
     Translate English response to target language (Hinglish/Tanglish).
-    Skips translation if text already contains target language characters.
+    Uses the shared translation cache and batches uncached lines into one
+    LLM call (see translation_service).
 
     Args:
         text: Response text (may be English or already translated)
@@ -54,65 +85,9 @@ async def _translate_response(text: str, target_language: str) -> str:
     Returns:
         Translated text, or original if translation not needed/fails
     """
-    import re
-
-    try:
-        from openai import AsyncOpenAI
-
-        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-        if target_language == "Hindi":
-            system_prompt = """Translate to casual Hinglish (Hindi-English mix in ROMAN script). Rules:
-- If the text is ALREADY in Hinglish (Roman script Hindi-English mix), return it UNCHANGED
-- Write like a young Indian texts friends — casual, short, natural. NOT formal/literary Hindi.
-- ROMAN script ONLY — NO Devanagari (अ,ब,क). Write Hindi words phonetically: "chahiye", "dikha do", "karo"
-- Use SIMPLE common Hindi words. Prefer "chahiye/chahte ho" over formal "chahenge", "karo" over "karenge", "dikha do" over "dikhana chahenge"
-- Keep lots of English mixed in — "check karo", "add kar do", "menu dekh lo", "items available hain"
-- Phonetic spelling for TTS: double vowels for long sounds (aa, ee, oo). Example: "aap", "nahi", "theek hai"
-- Keep UNCHANGED: food names, numbers, prices (₹), order IDs (ORD-...), emojis, markdown (**bold**)
-- Preserve ALL details (items, prices, totals) — do NOT shorten or drop information
-- Output ONLY the translation, no explanations
-Examples:
-  English: "Would you like to dine in or take away?" → "Aap dine in chahte ho ya take away?"
-  English: "Your cart has 2 items totaling ₹450" → "Aapke cart mein 2 items hain, total ₹450"
-  BAD: "Kya aap kuch popular options dekhna chahenge" (too formal)
-  GOOD: "Kya aap popular options check karna chahte ho?"  """
-        elif target_language == "Tamil":
-            system_prompt = """Translate to casual Tanglish (Tamil-English mix in ROMAN script). Rules:
-- If the text is ALREADY in Tanglish (Roman script Tamil-English mix), return it UNCHANGED
-- Write like a young South Indian texts friends — casual, short, natural. NOT formal/literary Tamil.
-- ROMAN script ONLY — NO Tamil script (அ,ஆ,இ). Write Tamil words phonetically as they sound.
-- Use SIMPLE common Tamil words mixed with English. Keep English technical/food words as-is.
-- Phonetic spelling for TTS: spell as spoken. "irukku", "pannunga", "paarunga", "sollunga"
-- Keep UNCHANGED: food names, numbers, prices (₹), order IDs (ORD-...), emojis, markdown (**bold**)
-- Preserve ALL details (items, prices, totals) — do NOT shorten or drop information
-- Output ONLY the translation, no explanations
-Examples:
-  English: "Would you like to dine in or take away?" → "Dine in ah illa take away ah?"
-  English: "Your cart has 2 items totaling ₹450" → "Unga cart la 2 items irukku, total ₹450"  """
-        else:
-            return text
-
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-
-        translated = response.choices[0].message.content.strip()
-        logger.debug("crew_translation_applied",
-                    original_len=len(text),
-                    translated_len=len(translated),
-                    language=target_language)
-        return translated
+    from app.ai_services.translation_service import translate_text
 
-    except Exception as e:
-        logger.warning("crew_translation_failed", error=str(e), language=target_language)
-        return text
+    return await translate_text(text, target_language, style="chat")
 
 
 def extract_unrealized_tool_call(raw_response: str) -> dict | None:
@@ -216,7 +191,8 @@ def execute_unrealized_tool_call(tool_call: dict, tools: list) -> str | None:
                 return None
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-            future = pool.submit(_run_tool)
+            # Carry contextvars (e.g. the menu branch) into the tool thread
+            future = pool.submit(contextvars.copy_context().run, _run_tool)
             # Increase timeout to 60s for slow operations like payment API calls
             result = future.result(timeout=60)
 
@@ -429,93 +405,62 @@ def _summarize_old_conversation(messages: List[str]) -> str:
         return "general conversation about restaurant services"
 
 
-def create_restaurant_crew_fixed(session_id: str, customer_id: Optional[str] = None, source: str = "web") -> Crew:
-    """
-    Create restaurant crew with a single agent handling all operations.
+@dataclass
+class _CrewTemplate:
+    """Session-independent parts of the restaurant crew, built once per source."""
+    agent_config: Dict[str, Any]
+    task_description: str
+    expected_output: str
+    # Tool name -> args schema / description of the first crew built; later
+    # crews point at these instead of keeping their own identical copies
+    tool_schemas: Dict[str, Any] = field(default_factory=dict)
+    tool_descriptions: Dict[str, str] = field(default_factory=dict)
+
+    def share_tool_definitions(self, tools: List[Any]):
+        for session_tool in tools:
+            name = session_tool.name
+            description = self.tool_descriptions.setdefault(name, session_tool.description)
+            schema = self.tool_schemas.setdefault(name, getattr(session_tool, "args_schema", None))
+            try:
+                if description is not session_tool.description and description == session_tool.description:
+                    session_tool.description = description
+                if schema is not None and schema is not session_tool.args_schema and \
+                        _schema_fields(schema) == _schema_fields(session_tool.args_schema):
+                    session_tool.args_schema = schema
+            except Exception as e:
+                logger.debug("crew_tool_share_skipped", tool=name, error=str(e))
 
-    Uses LLM manager for multi-account load balancing.
-    NOTE: Tools are dynamically filtered with RAG before each execution.
-    """
-    from langchain_openai import ChatOpenAI
-    from app.ai_services.llm_manager import get_llm_manager
+    def shared_objects(self) -> List[Any]:
+        """Objects every session crew references (not counted in per-crew memory)."""
+        return [
+            self, *self.agent_config.values(), self.task_description, self.expected_output,
+            *self.tool_schemas.values(), *self.tool_descriptions.values(),
+        ]
 
-    # Get API key from LLM manager pool (round-robin across validated accounts)
-    llm_manager = get_llm_manager()
-    api_key = llm_manager.get_next_api_key()
-    os.environ["OPENAI_API_KEY"] = api_key
 
-    # LLM for agents - temporarily using GPT-4o for better tool calling reliability
-    # (gpt-4o-mini was having issues with Optional parameter schemas)
-    llm = ChatOpenAI(
-        model="gpt-4o",  # Using gpt-4o for reliable tool calling
-        temperature=0.1,
-        api_key=api_key,
-        max_tokens=4096,  # Increased from 512 to prevent truncation causing premature JSON responses
-    )
+def _schema_fields(schema: Any) -> Optional[tuple]:
+    fields = getattr(schema, "model_fields", None) or getattr(schema, "__fields__", None)
+    return tuple(sorted(fields)) if fields is not None else None
 
-    # ========================================================================
-    # FOOD ORDERING AGENT - Event-Sourced Tools
-    # ========================================================================
-    # Import event-sourced tools (SQL-based state, zero token context)
-    from app.features.food_ordering.tools_event_sourced import create_event_sourced_tools
 
-    # Import remaining legacy tools (not yet migrated to event-sourced pattern)
-    from app.features.food_ordering.crew_agent import (
-        create_checkout_tool,
-        create_cancel_order_tool,
-        create_update_quantity_tool,
-        create_set_special_instructions_tool,
-        create_get_item_details_tool,
-        create_reorder_tool,
-        create_get_order_status_tool,
-        create_get_order_history_tool,
-        create_get_order_receipt_tool,
-        create_filter_by_cuisine_tool,
-        # Payment tools
-        create_initiate_payment_tool,
-        create_verify_payment_otp_tool,
-        create_check_payment_status_tool,
-        create_cancel_payment_tool,
-        create_select_payment_method_tool,
-    )
+_CREW_TEMPLATES: Dict[Tuple[str, int], _CrewTemplate] = {}
 
-    # Import complaint tools (session-aware sync wrappers)
-    from app.features.feedback.crew_complaint_tools import (
-        create_complaint_tool,
-        create_get_complaints_tool,
-        create_complaint_status_tool,
-    )
 
-    # Create event-sourced tools (search_menu, add_to_cart, view_cart, remove_from_cart)
-    event_sourced_tools = create_event_sourced_tools(session_id, customer_id)
+def _get_crew_template(source: str) -> _CrewTemplate:
+    """Shared agent config, prompts and tool definitions for a source (web / whatsapp)."""
+    key = (source, _CREW_VERSION)
+    template = _CREW_TEMPLATES.get(key)
+    if template is None:
+        template = _CREW_TEMPLATES[key] = _build_crew_template(source)
+        logger.info("crew_template_built", source=source, version=_CREW_VERSION)
+    return template
 
-    # Create ALL tools (event-sourced + legacy tools)
-    all_food_tools = [
-        *event_sourced_tools,  # Event-sourced: search_menu, add_to_cart, view_cart, remove_from_cart
-        # Legacy tools (not yet migrated):
-        create_checkout_tool(session_id),
-        create_cancel_order_tool(session_id),
-        create_update_quantity_tool(session_id),
-        create_set_special_instructions_tool(session_id),
-        create_get_item_details_tool(session_id),
-        create_reorder_tool(session_id),
-        create_get_order_status_tool(session_id),
-        create_get_order_history_tool(session_id),
-        create_get_order_receipt_tool(session_id),
-        create_filter_by_cuisine_tool(session_id),
-        # create_show_popular_items_tool(session_id),  # DISABLED - Popular items feature removed
-        create_complaint_tool(session_id),
-        create_get_complaints_tool(session_id),
-        create_complaint_status_tool(session_id),
-        # Payment tools
-        create_initiate_payment_tool(session_id),
-        create_verify_payment_otp_tool(session_id),
-        create_check_payment_status_tool(session_id),
-        create_cancel_payment_tool(session_id),
-        create_select_payment_method_tool(session_id),
-    ]
 
-    food_ordering_agent = Agent(
+def _build_crew_template(source: str) -> _CrewTemplate:
+    # ========================================================================
+    # FOOD ORDERING AGENT - Config shared by every session
+    # ========================================================================
+    agent_config = dict(
         role="Kavya - Food Ordering Specialist",
         goal="Help customers browse menu, manage their cart, and place orders when they're ready",
         backstory="""You are Kavya, a warm and intuitive food ordering specialist at the restaurant.
@@ -596,8 +541,6 @@ IMPORTANT - For complaints:
 When customer complains about food quality, service, wait time, or other issues:
 - Use the create_complaint tool to log the issue
 - Show empathy and offer resolution (replacement/refund)""",
-        llm=llm,
-        tools=all_food_tools,  # Will be replaced with RAG-filtered tools before each execution
         verbose=True,
         allow_delegation=False,
         respect_context_window=True,
@@ -637,9 +580,114 @@ RULES:
 - LANGUAGE: If the user message starts with [RESPOND IN TANGLISH...], respond in casual Tanglish (Roman script ONLY, NO Tamil script).
 - Keep food names, prices, order IDs in English always."""
 
-    customer_request_task = Task(
-        description=_WHATSAPP_TASK if source == "whatsapp" else _WEB_TASK,
+    return _CrewTemplate(
+        agent_config=agent_config,
+        task_description=_WHATSAPP_TASK if source == "whatsapp" else _WEB_TASK,
         expected_output="Tool output (human-friendly message from tool)",
+    )
+
+
+def create_restaurant_crew_fixed(session_id: str, customer_id: Optional[str] = None, source: str = "web") -> Crew:
+    """
+    Create restaurant crew with a single agent handling all operations.
+
+    Uses LLM manager for multi-account load balancing.
+    Agent config and prompts come from the shared template for the source;
+    only the tools are bound to the session.
+    NOTE: Tools are dynamically filtered with RAG before each execution.
+    """
+    from app.ai_services.llm_manager import get_llm_manager
+
+    template = _get_crew_template(source)
+
+    # Account from the LLM manager pool (round-robin across validated accounts);
+    # its ChatOpenAI is cached per account and shared by every crew on it
+    llm_manager = get_llm_manager()
+    account = llm_manager.get_next_account()
+    os.environ["OPENAI_API_KEY"] = account.api_key
+
+    # LLM for agents - temporarily using GPT-4o for better tool calling reliability
+    # (gpt-4o-mini was having issues with Optional parameter schemas)
+    llm = account.get_chat_model(
+        "gpt-4o",  # Using gpt-4o for reliable tool calling
+        0.1,
+        max_tokens=4096,  # Increased from 512 to prevent truncation causing premature JSON responses
+    )
+
+    # ========================================================================
+    # FOOD ORDERING AGENT - Event-Sourced Tools
+    # ========================================================================
+    # Import event-sourced tools (SQL-based state, zero token context)
+    from app.features.food_ordering.tools_event_sourced import create_event_sourced_tools
+
+    # Import remaining legacy tools (not yet migrated to event-sourced pattern)
+    from app.features.food_ordering.crew_agent import (
+        create_checkout_tool,
+        create_cancel_order_tool,
+        create_update_quantity_tool,
+        create_set_special_instructions_tool,
+        create_get_item_details_tool,
+        create_reorder_tool,
+        create_get_order_status_tool,
+        create_get_order_history_tool,
+        create_get_order_receipt_tool,
+        create_filter_by_cuisine_tool,
+        # Payment tools
+        create_initiate_payment_tool,
+        create_verify_payment_otp_tool,
+        create_check_payment_status_tool,
+        create_cancel_payment_tool,
+        create_select_payment_method_tool,
+    )
+
+    # Import complaint tools (session-aware sync wrappers)
+    from app.features.feedback.crew_complaint_tools import (
+        create_complaint_tool,
+        create_get_complaints_tool,
+        create_complaint_status_tool,
+    )
+
+    # Create event-sourced tools (search_menu, add_to_cart, view_cart, remove_from_cart)
+    event_sourced_tools = create_event_sourced_tools(session_id, customer_id)
+
+    # Create ALL tools (event-sourced + legacy tools)
+    all_food_tools = [
+        *event_sourced_tools,  # Event-sourced: search_menu, add_to_cart, view_cart, remove_from_cart
+        # Legacy tools (not yet migrated):
+        create_checkout_tool(session_id),
+        create_cancel_order_tool(session_id),
+        create_update_quantity_tool(session_id),
+        create_set_special_instructions_tool(session_id),
+        create_get_item_details_tool(session_id),
+        create_reorder_tool(session_id),
+        create_get_order_status_tool(session_id),
+        create_get_order_history_tool(session_id),
+        create_get_order_receipt_tool(session_id),
+        create_filter_by_cuisine_tool(session_id),
+        # create_show_popular_items_tool(session_id),  # DISABLED - Popular items feature removed
+        create_complaint_tool(session_id),
+        create_get_complaints_tool(session_id),
+        create_complaint_status_tool(session_id),
+        # Payment tools
+        create_initiate_payment_tool(session_id),
+        create_verify_payment_otp_tool(session_id),
+        create_check_payment_status_tool(session_id),
+        create_cancel_payment_tool(session_id),
+        create_select_payment_method_tool(session_id),
+    ]
+
+    # Point the session's tools at the template's schemas/descriptions
+    template.share_tool_definitions(all_food_tools)
+
+    food_ordering_agent = Agent(
+        **template.agent_config,
+        llm=llm,
+        tools=all_food_tools,  # Will be replaced with RAG-filtered tools before each execution
+    )
+
+    customer_request_task = Task(
+        description=template.task_description,
+        expected_output=template.expected_output,
         agent=food_ordering_agent,
     )
 
@@ -658,6 +706,8 @@ RULES:
     # Store all_food_tools for RAG filtering on each request
     crew._all_food_tools = all_food_tools
     crew._food_ordering_agent = food_ordering_agent
+    # Not counted in the crew cache's per-crew memory
+    crew._shared_objects = [*template.shared_objects(), llm]
 
     return crew
 
@@ -695,10 +745,10 @@ async def process_with_restaurant_crew(
     if any(phrase in msg_lower for phrase in ['view cart', 'show cart', 'my cart', "what's in my cart", 'whats in my cart']):
         # Emit cart data deterministically (from PostgreSQL session_cart)
         try:
-            from app.core.session_events import get_sync_session_tracker
+            from app.core.session_events import get_session_tracker
             from app.core.agui_events import emit_cart_data
-            tracker = get_sync_session_tracker(session_id)
-            cart_data = tracker.get_cart_summary()
+            tracker = get_session_tracker(session_id)
+            cart_data = await tracker.get_cart_summary()
             items = cart_data.get("items", [])
             if items:
                 emit_cart_data(session_id, items, cart_data.get("total", 0))
@@ -714,34 +764,22 @@ async def process_with_restaurant_crew(
     # v20: All tools use factory pattern with session_id closure (thread-safe)
     # Entity graph persisted to Redis, cart read from Redis (single source of truth)
 
-    from app.core.semantic_context import get_entity_graph
-
-    # RAG-based context retrieval - only get relevant entities for this query
-    graph = get_entity_graph(session_id)
-    semantic_context = graph.get_relevant_context(user_message)
-
-    logger.debug(
-        "rag_context_retrieved",
-        session_id=session_id,
-        context=semantic_context,
-        query=user_message[:50]
-    )
+    from app.core.semantic_context import begin_session_turn, end_session_turn
 
     # =========================================================================
     # AGENT PROCESSING
     # =========================================================================
     # Get or create crew (cached per session — non-streaming path is web-only)
-    global _CREW_CACHE, _CREW_VERSION
     cache_key = f"{session_id}:v{_CREW_VERSION}"
+    crew = _CREW_CACHE.get(cache_key)
 
-    if cache_key not in _CREW_CACHE:
+    if crew is None:
         logger.info("creating_restaurant_crew", session_id=session_id, version=_CREW_VERSION)
-        _CREW_CACHE[cache_key] = create_restaurant_crew_fixed(session_id, customer_id=user_id, source="web")
+        crew = create_restaurant_crew_fixed(session_id, customer_id=user_id, source="web")
+        await _CREW_CACHE.aset(cache_key, crew, shared=crew._shared_objects)
     else:
         logger.debug("reusing_cached_crew", session_id=session_id)
 
-    crew = _CREW_CACHE[cache_key]
-
     # 🚀 RAG-BASED TOOL RETRIEVAL - Dynamically filter tools per request
     # Convert tools list to dict for RAG
     all_tools_dict = {tool.name: tool for tool in crew._all_food_tools}
@@ -800,14 +838,26 @@ async def process_with_restaurant_crew(
         # Uses defaults: 96k token limit (75% of 128k), 10k estimated overhead
     )
 
-    # Prepare inputs - include entity graph context for pronoun/positional resolution
-    inputs = {
-        "user_input": user_message,
-        "semantic_context": semantic_context if semantic_context else "No tracked context yet",
-        "context": context
-    }
-
+    # RAG-based context retrieval - only get relevant entities for this query
+    # Context is loaded once per turn; tools share it and it is saved once at the end
+    graph = await begin_session_turn(session_id)
     try:
+        semantic_context = graph.get_relevant_context(user_message)
+
+        logger.debug(
+            "rag_context_retrieved",
+            session_id=session_id,
+            context=semantic_context,
+            query=user_message[:50]
+        )
+
+        # Prepare inputs - include entity graph context for pronoun/positional resolution
+        inputs = {
+            "user_input": user_message,
+            "semantic_context": semantic_context if semantic_context else "No tracked context yet",
+            "context": context
+        }
+
         # Store main event loop so run_async() in tools can schedule coroutines
         # on it instead of creating a new loop (prevents "Future attached to
         # a different loop" errors with HTTP clients/DB connections).
@@ -826,7 +876,7 @@ async def process_with_restaurant_crew(
         raw_for_tool_check = str(result.raw).strip() if hasattr(result, 'raw') and result.raw else str(result).strip()
         unrealized = extract_unrealized_tool_call(raw_for_tool_check)
         if unrealized:
-            tool_result = execute_unrealized_tool_call(unrealized, crew._all_food_tools)
+            tool_result = await asyncio.to_thread(execute_unrealized_tool_call, unrealized, crew._all_food_tools)
             if tool_result:
                 response = tool_result
 
@@ -895,15 +945,14 @@ async def process_with_restaurant_crew(
 
         return fallback_response, metadata
 
+    finally:
+        await end_session_turn(session_id)
+
 
 def reset_session(session_id: str):
     """Reset crew cache and entity graph for a session."""
-    global _CREW_CACHE
-
     # Clear crew cache
-    keys_to_remove = [k for k in _CREW_CACHE if k.startswith(f"{session_id}:")]
-    for key in keys_to_remove:
-        del _CREW_CACHE[key]
+    _CREW_CACHE.invalidate(lambda key: key.startswith(f"{session_id}:"))
 
     # Clear entity graph
     try:
@@ -957,6 +1006,7 @@ async def process_with_agui_streaming(
         Tuple of (response_text, metadata)
     """
     from app.core.agui_events import get_tool_activity_message
+    from app.core.semantic_context import begin_session_turn, end_session_turn
 
     logger.info(
         "processing_with_agui_streaming",
@@ -982,6 +1032,8 @@ async def process_with_agui_streaming(
     # NOTE: Menu deterministic emit removed - search_menu tool handles it
     # NOTE: Cart deterministic emit removed - view_cart tool handles it
 
+    # Load context (once per turn - tools share it, saved once at the end)
+    graph = await begin_session_turn(session_id)
     try:
         # =========================================================================
         # ACTIVITY FLOW - Each new activity replaces the previous (no ACTIVITY_END between)
@@ -990,9 +1042,6 @@ async def process_with_agui_streaming(
         # Phase 1: Starting
         emitter.emit_activity("thinking", "Let me help you with that...")
 
-        # Load context
-        from app.core.semantic_context import get_entity_graph
-        graph = get_entity_graph(session_id)
         semantic_context = graph.get_context_summary()
 
         # Phase 2: If returning user with context
@@ -1001,15 +1050,14 @@ async def process_with_agui_streaming(
             logger.debug("entity_graph_context", session_id=session_id, context=semantic_context[:100])
 
         # Get or create crew (cached per session+source — web and whatsapp use different prompts)
-        global _CREW_CACHE, _CREW_VERSION
         cache_key = f"{session_id}:v{_CREW_VERSION}"
+        crew = _CREW_CACHE.get(cache_key)
 
-        if cache_key not in _CREW_CACHE:
+        if crew is None:
             emitter.emit_activity("thinking", "Setting things up...")
             logger.info("creating_restaurant_crew", session_id=session_id, version=_CREW_VERSION, source=source)
-            _CREW_CACHE[cache_key] = create_restaurant_crew_fixed(session_id, customer_id=user_id, source=source)
-
-        crew = _CREW_CACHE[cache_key]
+            crew = create_restaurant_crew_fixed(session_id, customer_id=user_id, source=source)
+            await _CREW_CACHE.aset(cache_key, crew, shared=crew._shared_objects)
 
         # 🚀 RAG-BASED TOOL RETRIEVAL - Dynamically filter tools per request
         # Convert tools list to dict for RAG
@@ -1042,8 +1090,8 @@ async def process_with_agui_streaming(
         english_input = user_message
         if language != "English" and language in ["Hindi", "Tamil"] and any(ord(c) > 127 for c in user_message):
             try:
-                from openai import AsyncOpenAI
-                _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+                from app.ai_services.llm_manager import get_llm_manager
+                _client = get_llm_manager().get_openai_client()
                 _resp = await _client.chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[
@@ -1106,7 +1154,7 @@ async def process_with_agui_streaming(
         raw_for_tool_check = str(result.raw).strip() if hasattr(result, 'raw') and result.raw else str(result).strip()
         unrealized = extract_unrealized_tool_call(raw_for_tool_check)
         if unrealized:
-            tool_result = execute_unrealized_tool_call(unrealized, crew._all_food_tools)
+            tool_result = await asyncio.to_thread(execute_unrealized_tool_call, unrealized, crew._all_food_tools)
             if tool_result:
                 response = tool_result
 
@@ -1298,3 +1346,6 @@ async def process_with_agui_streaming(
         }
 
         return fallback_response, metadata
+
+    finally:
+        await end_session_turn(session_id)
@@ -0,0 +1,324 @@
+"""
+Audio DSP Execution Layer
+
+Keeps audio number crunching off the asyncio event loop so one caller's
+denoise can't stall every other chat and voice session on the worker:
+
+- VADBatcher: chunks from all voice sessions that arrive within one tick
+  (VAD_BATCH_WINDOW_MS) are converted and scored in a single hop to a
+  dedicated VAD thread and one batched model run, each session keeping its
+  own stream state, instead of one inline model call per 32ms chunk
+- preprocess_utterance(): denoise, trim and normalize a finished utterance;
+  run_preprocess() executes it in a process pool (DSP_PROCESS_WORKERS,
+  0 = thread instead)
+- PCMBuffer / PCMRingBuffer: preallocated int16 sample buffers replacing
+  per-chunk bytes lists and b''.join
+
+Usage:
+    batcher = get_vad_batcher()
+    vad_session = batcher.create_session()
+    prob = await batcher.detect(vad_session, np.frombuffer(chunk, dtype=np.int16))
+    pcm, reason = await run_preprocess(speech_buffer.take())
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+SAMPLE_RATE = 16000
+DSP_PROCESS_WORKERS = int(os.getenv("DSP_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+VAD_BATCH_WINDOW_MS = float(os.getenv("VAD_BATCH_WINDOW_MS", "2"))
+
+# Utterance preprocessing thresholds
+SILENCE_AMPLITUDE = 500  # amplitude threshold for "silence"
+TRIM_MARGIN_SAMPLES = 800  # 50ms kept around speech
+MIN_TRIMMED_SAMPLES = 4000  # 0.25s
+NORMALIZE_PEAK = 32000.0
+
+
+# ============================================================================
+# SAMPLE BUFFERS
+# ============================================================================
+
+class PCMBuffer:
+    """Growable int16 sample buffer (amortized appends, no per-chunk objects)."""
+
+    def __init__(self, capacity: int = SAMPLE_RATE * 10):
+        self._data = np.empty(capacity, dtype=np.int16)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, samples: np.ndarray) -> None:
+        end = self._size + len(samples)
+        if end > len(self._data):
+            grown = np.empty(max(end, len(self._data) * 2), dtype=np.int16)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:end] = samples
+        self._size = end
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def view(self) -> np.ndarray:
+        """Samples so far (a view: only valid until the next append/clear)."""
+        return self._data[:self._size]
+
+    def take(self) -> np.ndarray:
+        """Copy of the samples, then clear (the buffer keeps its capacity)."""
+        samples = self._data[:self._size].copy()
+        self._size = 0
+        return samples
+
+
+class PCMRingBuffer:
+    """Fixed-size ring holding the most recent samples (speech onset lookback)."""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self._capacity = capacity
+        self._end = 0  # next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, samples: np.ndarray) -> None:
+        if len(samples) >= self._capacity:
+            self._data[:] = samples[-self._capacity:]
+            self._end = 0
+            self._size = self._capacity
+            return
+        first = min(len(samples), self._capacity - self._end)
+        self._data[self._end:self._end + first] = samples[:first]
+        rest = len(samples) - first
+        if rest:
+            self._data[:rest] = samples[first:]
+        self._end = (self._end + len(samples)) % self._capacity
+        self._size = min(self._capacity, self._size + len(samples))
+
+    def drain_into(self, target: PCMBuffer) -> None:
+        """Append the ring's samples (oldest first) to target and empty the ring."""
+        start = (self._end - self._size) % self._capacity
+        if start + self._size <= self._capacity:
+            target.append(self._data[start:start + self._size])
+        else:
+            target.append(self._data[start:])
+            target.append(self._data[:self._end])
+        self._size = 0
+
+
+# ============================================================================
+# UTTERANCE PREPROCESSING (process pool)
+# ============================================================================
+
+def preprocess_utterance(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Tuple[Optional[bytes], str]:
+    """
+    Denoise, trim and normalize an utterance for Whisper.
+
+    1. Spectral noise reduction (fan, AC, laptop hum)
+    2. Silence trimming (prevents Whisper hallucinations on quiet edges)
+    3. Normalization to a consistent peak
+
+    Returns:
+        (PCM16 bytes, "ok") or (None, reason) when nothing usable is left
+    """
+    import noisereduce as nr
+
+    cleaned = nr.reduce_noise(
+        y=samples.astype(np.float32),
+        sr=sample_rate,
+        stationary=True,
+        prop_decrease=0.75,
+    )
+
+    voiced = np.flatnonzero(np.abs(cleaned) > SILENCE_AMPLITUDE)
+    if len(voiced) == 0:
+        return None, "all_silence_after_denoise"
+    start = max(0, voiced[0] - TRIM_MARGIN_SAMPLES)
+    end = min(len(cleaned), voiced[-1] + TRIM_MARGIN_SAMPLES)
+    cleaned = cleaned[start:end]
+
+    if len(cleaned) < MIN_TRIMMED_SAMPLES:
+        return None, "too_short_after_trim"
+
+    peak = np.max(np.abs(cleaned))
+    if peak > 0:
+        cleaned = cleaned * (NORMALIZE_PEAK / peak)
+
+    return cleaned.astype(np.int16).tobytes(), "ok"
+
+
+_dsp_executor: Optional[Executor] = None
+
+
+def _get_dsp_executor() -> Executor:
+    global _dsp_executor
+
+    if _dsp_executor is None:
+        if DSP_PROCESS_WORKERS > 0:
+            _dsp_executor = ProcessPoolExecutor(max_workers=DSP_PROCESS_WORKERS)
+        else:
+            _dsp_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dsp")
+        logger.info("dsp_executor_started", process_workers=DSP_PROCESS_WORKERS)
+    return _dsp_executor
+
+
+async def run_preprocess(samples: np.ndarray) -> Tuple[Optional[bytes], str]:
+    """preprocess_utterance() off the event loop (process pool; rebuilt if a worker died)."""
+    global _dsp_executor
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_dsp_executor(), preprocess_utterance, samples)
+    except BrokenProcessPool:
+        logger.warning("dsp_process_pool_broken_restarting")
+        _dsp_executor = None
+        return await loop.run_in_executor(_get_dsp_executor(), preprocess_utterance, samples)
+
+
+def shutdown_dsp_executor() -> None:
+    global _dsp_executor
+
+    if _dsp_executor is not None:
+        _dsp_executor.shutdown(wait=False, cancel_futures=True)
+        _dsp_executor = None
+
+
+# ============================================================================
+# BATCHED VAD
+# ============================================================================
+
+class VADBatcher:
+    """
+    Scores VAD chunks from all sessions in batches on one dedicated thread.
+
+    The first chunk of a tick starts a VAD_BATCH_WINDOW_MS timer; every chunk
+    submitted until it fires goes into the same batch, scored by one
+    detect_speech_batch() call with each session's own stream state. VAD
+    models aren't thread-safe, so one thread runs all inference, in
+    submission order.
+    """
+
+    def __init__(self, vad=None, window_ms: float = VAD_BATCH_WINDOW_MS, sample_rate: int = SAMPLE_RATE):
+        self._vad = vad
+        self.window = window_ms / 1000.0
+        self.sample_rate = sample_rate
+        self._pending: List[Tuple[np.ndarray, Any, asyncio.Future]] = []
+        self._scheduled = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad")
+        self.stats = {"batches": 0, "frames": 0, "max_batch": 0, "busy_seconds": 0.0}
+
+    @property
+    def vad(self):
+        if self._vad is None:
+            from app.services.vad import get_vad
+            self._vad = get_vad()
+        return self._vad
+
+    def create_session(self):
+        """Per-call stream state for detect() (app.services.vad.VADSession)"""
+        from app.services.vad import VADSession
+        return VADSession(self.vad)
+
+    def detect(self, session, samples_int16: np.ndarray) -> "asyncio.Future[float]":
+        """Speech probability of the session's next chunk (await the returned future)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((samples_int16, session.state, future))
+        if not self._scheduled:
+            self._scheduled = True
+            if self.window > 0:
+                loop.call_later(self.window, self._flush)
+            else:
+                loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        self._scheduled = False
+        if not batch:
+            return
+        loop = asyncio.get_running_loop()
+        work = loop.run_in_executor(self._executor, self._score, [(samples, state) for samples, state, _ in batch])
+        work.add_done_callback(lambda done: self._resolve(batch, done))
+
+    def _score(self, items: List[Tuple[np.ndarray, Any]]) -> List[float]:
+        started = time.perf_counter()
+        chunks = [samples for samples, _ in items]
+        lengths = {len(chunk) for chunk in chunks}
+        if len(lengths) == 1:
+            # One conversion for the whole batch
+            frames = list(np.stack(chunks).astype(np.float32) / 32768.0)
+        else:
+            frames = [chunk.astype(np.float32) / 32768.0 for chunk in chunks]
+
+        # A session's state can only advance once per model run: a second
+        # chunk from the same session goes into the next round
+        rounds: List[List[int]] = []
+        round_states: List[set] = []
+        for index, (_, state) in enumerate(items):
+            key = id(state) if state is not None else None
+            for members, states in zip(rounds, round_states):
+                if key is None or key not in states:
+                    members.append(index)
+                    states.add(key)
+                    break
+            else:
+                rounds.append([index])
+                round_states.append({key})
+
+        probs = [0.0] * len(items)
+        for members in rounds:
+            scored = self.vad.detect_speech_batch(
+                [frames[i] for i in members],
+                self.sample_rate,
+                [items[i][1] for i in members],
+            )
+            for i, prob in zip(members, scored):
+                probs[i] = prob
+
+        self.stats["busy_seconds"] += time.perf_counter() - started
+        return probs
+
+    def _resolve(self, batch, done) -> None:
+        self.stats["batches"] += 1
+        self.stats["frames"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        error = done.exception()
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(float(done.result()[index]))
+
+    def get_stats(self):
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "busy_seconds": round(self.stats["busy_seconds"], 3),
+            "avg_batch": round(self.stats["frames"] / batches, 2) if batches else 0,
+        }
+
+
+_vad_batcher: Optional[VADBatcher] = None
+
+
+def get_vad_batcher() -> VADBatcher:
+    """Process-wide VAD batcher on the configured engine (see app.services.vad)."""
+    global _vad_batcher
+
+    if _vad_batcher is None:
+        _vad_batcher = VADBatcher()
+    return _vad_batcher
@@ -9,19 +9,111 @@ Caching Strategy:
 - FAQ responses: 24 hours TTL
 - Business hours: 24 hours TTL
 - Default: 30 minutes TTL
+
+Optional semantic tier (ENABLE_SEMANTIC_CACHE): on an exact-key miss the
+query is embedded with LocalEmbeddingService and compared with the cached
+queries of the same category and restaurant; an answer is reused when the
+cosine similarity reaches SEMANTIC_CACHE_THRESHOLD. Only non-personalized
+responses (no user_id) are shared this way. Entries are scoped by the menu
+version of the branch, so a menu change starts a fresh index.
+
+Semantic keys (per category, restaurant and menu version):
+- cache:{category}:semantic:{restaurant}:{version}:vectors   field -> base64 float32 embedding
+- cache:{category}:semantic:{restaurant}:{version}:answers   field -> JSON response + LLM cost
+
+Fields are "{expires_at}:{query hash}": each entry expires on its own (stale
+fields are skipped and pruned on lookup) and the hashes expire with their
+longest-lived field.
+
+Exact-match responses are written through the feature cache (app.core.cache)
+under the "cache" namespace and tagged with their category and with
+"{category}:branch:{restaurant}", so invalidate_category() removes them from
+the tag sets instead of scanning the keyspace.
 """
 
+import asyncio
+import base64
 import os
 import json
 import hashlib
-from typing import Optional, Any, Dict
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Tuple
 from datetime import timedelta
+import numpy as np
 import structlog
 
+from app.core.cache import CacheService
 from app.core.redis import get_redis_client
+from app.core.metrics import record_cache_tier_lookup, record_llm_cache_savings
 
 logger = structlog.get_logger(__name__)
 
+ENABLE_SEMANTIC_CACHE = os.getenv("ENABLE_SEMANTIC_CACHE", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+# Cached queries kept per category/restaurant/menu version (oldest dropped first)
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "500"))
+# How often a worker pulls entries added by other workers
+SEMANTIC_CACHE_SYNC_SECONDS = float(os.getenv("SEMANTIC_CACHE_SYNC_SECONDS", "30"))
+# Scopes (category/restaurant/version) whose index is kept in memory
+SEMANTIC_CACHE_MAX_SCOPES = 64
+# Query embeddings reused between lookup and store of the same query
+_EMBEDDING_MEMO_SIZE = 256
+# Key of the LLM cost stored next to a cached response
+_LLM_META_KEY = "_llm"
+
+
+def _field_expired(field: str, now: float) -> bool:
+    return int(field.split(":", 1)[0]) <= now
+
+
+class _SemanticScope:
+    """In-memory nearest-neighbour index of one scope's cached queries."""
+
+    __slots__ = ("key", "fields", "matrix", "synced_at")
+
+    def __init__(self, key: str):
+        self.key = key
+        # Field names start with a zero-padded expiry, so sorted = first to expire first
+        self.fields: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.synced_at = 0.0
+
+    def add(self, fields: List[str], vectors: List[np.ndarray]):
+        if not fields:
+            return
+        rows = np.vstack(vectors).astype(np.float32)
+        self.fields.extend(fields)
+        self.matrix = rows if self.matrix is None else np.vstack([self.matrix, rows])
+        self._sort()
+
+    def remove(self, fields: List[str]):
+        drop = set(fields)
+        keep = [pos for pos, field in enumerate(self.fields) if field not in drop]
+        self.fields = [self.fields[pos] for pos in keep]
+        self.matrix = self.matrix[keep] if keep else None
+
+    def expired(self, now: float) -> List[str]:
+        """Fields whose entry has expired (a prefix of the sorted fields)."""
+        stale = []
+        for field in self.fields:
+            if not _field_expired(field, now):
+                break
+            stale.append(field)
+        return stale
+
+    def _sort(self):
+        order = sorted(range(len(self.fields)), key=self.fields.__getitem__)
+        self.fields = [self.fields[pos] for pos in order]
+        self.matrix = self.matrix[order]
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[str], float]:
+        if self.matrix is None or self.matrix.shape[1] != vector.shape[0]:
+            return None, 0.0
+        cosine = self.matrix @ vector
+        best = int(np.argmax(cosine))
+        return self.fields[best], float(cosine[best])
+
 
 class ResponseCacheService:
     """
@@ -32,11 +124,20 @@ class ResponseCacheService:
     - TTL-based expiration
     - Categorized caching (menu, restaurant_info, faq, etc.)
     - Cache hit/miss metrics
+    - Optional process-local tier for the generic get/set/delete methods
+    - Optional semantic tier (similar queries share an answer)
     """
 
-    def __init__(self):
-        """Initialize Redis connection and cache configuration"""
+    def __init__(self, local_tier: Optional[str] = None):
+        """
+        Initialize Redis connection and cache configuration
+
+        Args:
+            local_tier: Two-tier cache name; when set, get() is served from a
+                process-local tier and set()/delete() invalidate it on all workers
+        """
         self.enabled = os.getenv("ENABLE_RESPONSE_CACHING", "true").lower() == "true"
+        self.local_tier = None
 
         if not self.enabled:
             logger.info("response_caching_disabled")
@@ -52,6 +153,14 @@ class ResponseCacheService:
             self.enabled = False
             return
 
+        # Exact-match responses: keys cache:{category}:{user|global}:{hash}
+        self.responses = CacheService("cache")
+        self.responses.redis_client = self.redis_client
+
+        if local_tier:
+            from app.core.two_tier_cache import get_two_tier_cache
+            self.local_tier = get_two_tier_cache(local_tier)
+
         # TTL configuration (in seconds)
         self.ttl_config = {
             "menu": int(os.getenv("CACHE_TTL_MENU", "3600")),              # 1 hour
@@ -61,14 +170,25 @@ class ResponseCacheService:
             "default": int(os.getenv("CACHE_TTL_DEFAULT", "1800"))         # 30 minutes
         }
 
+        # Semantic tier
+        self.semantic_enabled = ENABLE_SEMANTIC_CACHE
+        self.semantic_threshold = SEMANTIC_CACHE_THRESHOLD
+        self._semantic_scopes: "OrderedDict[str, _SemanticScope]" = OrderedDict()
+        self._embedding_memo: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
         # Metrics
         self.cache_hits = 0
         self.cache_misses = 0
+        self.semantic_hits = 0
+        self.saved_llm_seconds = 0.0
+        self.saved_llm_tokens = 0
 
         logger.info(
             "response_cache_initialized",
             enabled=self.enabled,
             ttl_config=self.ttl_config,
+            semantic_enabled=self.semantic_enabled,
+            semantic_threshold=self.semantic_threshold,
             using_shared_pool=True
         )
 
@@ -89,19 +209,24 @@ class ResponseCacheService:
         Returns:
             Cache key string
         """
+        return f"cache:{category}:{self._cache_identifier(query, user_id)}"
+
+    def _cache_identifier(self, query: str, user_id: Optional[str] = None) -> str:
+        """Identifier of a response within its category: "{user_id|global}:{query hash}"."""
         # Normalize query (lowercase, strip whitespace)
         normalized_query = query.lower().strip()
 
         # Create hash of query for consistent key
         query_hash = hashlib.md5(normalized_query.encode()).hexdigest()[:12]
 
-        # Build cache key
-        if user_id:
-            cache_key = f"cache:{category}:{user_id}:{query_hash}"
-        else:
-            cache_key = f"cache:{category}:global:{query_hash}"
+        return f"{user_id or 'global'}:{query_hash}"
 
-        return cache_key
+    def _branch_tag(self, category: str, restaurant_id: Optional[str]) -> str:
+        """Tag of a category's responses for the branch whose menu served them."""
+        from app.core.preloader import get_menu_preloader
+
+        restaurant = restaurant_id or get_menu_preloader(restaurant_id).restaurant_id or "all"
+        return f"{category}:branch:{restaurant}"
 
     def _detect_category(self, query: str, intent: Optional[str] = None) -> str:
         """
@@ -149,21 +274,209 @@ class ResponseCacheService:
 
         return "default"
 
+    # ------------------------------------------------------------------
+    # Semantic tier
+    # ------------------------------------------------------------------
+
+    def _semantic_scope_key(self, category: str, restaurant_id: Optional[str]) -> str:
+        """Redis key prefix of a category's semantic index for a branch and its menu version."""
+        from app.core.preloader import get_menu_preloader
+
+        preloader = get_menu_preloader(restaurant_id)
+        restaurant = restaurant_id or preloader.restaurant_id or "all"
+        version = hashlib.md5((preloader.version or "none").encode()).hexdigest()[:10]
+        return f"cache:{category}:semantic:{restaurant}:{version}"
+
+    def _get_semantic_scope(self, key: str) -> _SemanticScope:
+        scope = self._semantic_scopes.get(key)
+        if scope is not None:
+            self._semantic_scopes.move_to_end(key)
+            return scope
+
+        # A new menu version makes the branch's older indexes unreachable
+        branch_prefix = key.rsplit(":", 1)[0] + ":"
+        for stale in [k for k in self._semantic_scopes if k.startswith(branch_prefix)]:
+            del self._semantic_scopes[stale]
+            logger.info("semantic_cache_scope_replaced", scope=stale, new_scope=key)
+
+        scope = self._semantic_scopes[key] = _SemanticScope(key)
+        while len(self._semantic_scopes) > SEMANTIC_CACHE_MAX_SCOPES:
+            self._semantic_scopes.popitem(last=False)
+        return scope
+
+    async def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Unit-length query embedding (None if the embedding model is unavailable)."""
+        key = " ".join(query.lower().split())
+        vector = self._embedding_memo.get(key)
+        if vector is not None:
+            self._embedding_memo.move_to_end(key)
+            return vector
+
+        try:
+            from app.ai_services.local_embedding_service import get_local_embedding_service
+            # Model load and encode are CPU-bound - keep them off the event loop
+            service = await asyncio.to_thread(get_local_embedding_service)
+            raw = await asyncio.to_thread(service.generate_embedding, key)
+        except ImportError as e:
+            logger.warning("semantic_cache_disabled", reason="sentence-transformers not installed", error=str(e))
+            self.semantic_enabled = False
+            return None
+        except Exception as e:
+            logger.error("semantic_cache_embedding_error", error=str(e))
+            return None
+
+        vector = np.asarray(raw, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0:
+            return None
+        vector /= norm
+
+        self._embedding_memo[key] = vector
+        if len(self._embedding_memo) > _EMBEDDING_MEMO_SIZE:
+            self._embedding_memo.popitem(last=False)
+        return vector
+
+    async def _sync_semantic_scope(self, scope: _SemanticScope):
+        """Pull entries other workers added (and drop deleted ones), at most every SYNC seconds."""
+        now = time.monotonic()
+        if now - scope.synced_at < SEMANTIC_CACHE_SYNC_SECONDS:
+            return
+        scope.synced_at = now
+
+        vectors_key = f"{scope.key}:vectors"
+        fields = set(await self.redis_client.hkeys(vectors_key))
+        known = set(scope.fields)
+        gone = known - fields
+        if gone:
+            scope.remove(list(gone))
+        wall_now = time.time()
+        missing = sorted(field for field in fields - known if not _field_expired(field, wall_now))
+        if missing:
+            encoded = await self.redis_client.hmget(vectors_key, missing)
+            loaded = [
+                (field, np.frombuffer(base64.b64decode(value), dtype=np.float32))
+                for field, value in zip(missing, encoded) if value
+            ]
+            scope.add([field for field, _ in loaded], [vector for _, vector in loaded])
+
+    async def _prune_semantic_scope(self, scope: _SemanticScope):
+        """Drop expired entries from the index and from Redis."""
+        stale = scope.expired(time.time())
+        if not stale:
+            return
+        scope.remove(stale)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.hdel(f"{scope.key}:vectors", *stale)
+            pipe.hdel(f"{scope.key}:answers", *stale)
+            await pipe.execute()
+
+    async def _semantic_lookup(
+        self,
+        query: str,
+        category: str,
+        restaurant_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        vector = await self._embed_query(query)
+        if vector is None:
+            return None
+
+        scope = self._get_semantic_scope(self._semantic_scope_key(category, restaurant_id))
+        await self._sync_semantic_scope(scope)
+        await self._prune_semantic_scope(scope)
+
+        field, similarity = scope.nearest(vector)
+        if field is None or similarity < self.semantic_threshold:
+            return None
+
+        cached_data = await self.redis_client.hget(f"{scope.key}:answers", field)
+        if not cached_data:
+            # Expired or invalidated on another worker
+            scope.remove([field])
+            return None
+
+        logger.info(
+            "semantic_cache_hit",
+            category=category,
+            similarity=round(similarity, 4),
+            query_preview=query[:50]
+        )
+        return json.loads(cached_data)
+
+    async def _semantic_store(
+        self,
+        query: str,
+        cached_data: str,
+        category: str,
+        restaurant_id: Optional[str],
+        ttl: int
+    ):
+        vector = await self._embed_query(query)
+        if vector is None:
+            return
+
+        scope = self._get_semantic_scope(self._semantic_scope_key(category, restaurant_id))
+        await self._prune_semantic_scope(scope)
+        _, similarity = scope.nearest(vector)
+        if similarity >= self.semantic_threshold:
+            # A similar query is already cached (stored by another worker meanwhile)
+            return
+
+        query_hash = hashlib.md5(" ".join(query.lower().split()).encode()).hexdigest()[:12]
+        field = f"{int(time.time()) + ttl:010d}:{query_hash}"
+        vectors_key, answers_key = f"{scope.key}:vectors", f"{scope.key}:answers"
+        evicted = scope.fields[:max(0, len(scope.fields) + 1 - SEMANTIC_CACHE_MAX_ENTRIES)]
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(vectors_key, field, base64.b64encode(vector.tobytes()).decode())
+            pipe.hset(answers_key, field, cached_data)
+            if evicted:
+                pipe.hdel(vectors_key, *evicted)
+                pipe.hdel(answers_key, *evicted)
+            # The hashes live as long as their longest-lived field
+            for key in (vectors_key, answers_key):
+                pipe.expire(key, ttl, nx=True)
+                pipe.expire(key, ttl, gt=True)
+            await pipe.execute()
+
+        if evicted:
+            scope.remove(evicted)
+        scope.add([field], [vector])
+
+    def _record_hit(self, tier: str, response: Dict[str, Any]):
+        """Count a hit and the LLM latency/tokens it saved (stored with the response)."""
+        self.cache_hits += 1
+        if tier == "semantic":
+            self.semantic_hits += 1
+        record_cache_tier_lookup("llm_response", tier, "hit")
+
+        meta = response.pop(_LLM_META_KEY, None)
+        if meta:
+            seconds = float(meta.get("latency_ms") or 0) / 1000
+            tokens = int(meta.get("tokens") or 0)
+            self.saved_llm_seconds += seconds
+            self.saved_llm_tokens += tokens
+            record_llm_cache_savings(tier, tokens, seconds)
+
     async def get_cached_response(
         self,
         query: str,
         category: Optional[str] = None,
         user_id: Optional[str] = None,
-        intent: Optional[str] = None
+        intent: Optional[str] = None,
+        restaurant_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Get cached response if available.
 
+        Tries the exact query key first, then (for non-personalized queries)
+        the semantic tier.
+
         Args:
             query: The user query
             category: Optional category override
             user_id: Optional user ID
             intent: Optional detected intent
+            restaurant_id: Branch for the semantic tier (default: current request's)
 
         Returns:
             Cached response dict or None if not found
@@ -183,8 +496,8 @@ class ResponseCacheService:
             cached_data = await self.redis_client.get(cache_key)
 
             if cached_data:
-                self.cache_hits += 1
                 response = json.loads(cached_data)
+                self._record_hit("exact", response)
 
                 logger.info(
                     "cache_hit",
@@ -195,18 +508,26 @@ class ResponseCacheService:
                 )
 
                 return response
-            else:
-                self.cache_misses += 1
 
-                logger.debug(
-                    "cache_miss",
-                    category=category,
-                    cache_key=cache_key,
-                    query_preview=query[:50],
-                    total_misses=self.cache_misses
-                )
+            record_cache_tier_lookup("llm_response", "exact", "miss")
+            if self.semantic_enabled and user_id is None:
+                response = await self._semantic_lookup(query, category, restaurant_id)
+                if response is not None:
+                    self._record_hit("semantic", response)
+                    return response
+                record_cache_tier_lookup("llm_response", "semantic", "miss")
 
-                return None
+            self.cache_misses += 1
+
+            logger.debug(
+                "cache_miss",
+                category=category,
+                cache_key=cache_key,
+                query_preview=query[:50],
+                total_misses=self.cache_misses
+            )
+
+            return None
 
         except Exception as e:
             logger.error(
@@ -223,7 +544,10 @@ class ResponseCacheService:
         category: Optional[str] = None,
         user_id: Optional[str] = None,
         intent: Optional[str] = None,
-        ttl_override: Optional[int] = None
+        ttl_override: Optional[int] = None,
+        restaurant_id: Optional[str] = None,
+        llm_latency_ms: Optional[float] = None,
+        llm_tokens: Optional[int] = None
     ):
         """
         Cache a response.
@@ -235,6 +559,9 @@ class ResponseCacheService:
             user_id: Optional user ID
             intent: Optional detected intent
             ttl_override: Optional TTL override (seconds)
+            restaurant_id: Branch for the semantic tier (default: current request's)
+            llm_latency_ms: LLM latency that produced the response (saved per hit)
+            llm_tokens: LLM tokens that produced the response (saved per hit)
         """
         if not self.enabled or not self.redis_client:
             return
@@ -250,11 +577,22 @@ class ResponseCacheService:
             # Get TTL
             ttl = ttl_override if ttl_override else self.ttl_config.get(category, self.ttl_config["default"])
 
-            # Serialize response
+            # Serialize response (with what it cost, for the savings metrics)
+            if llm_latency_ms is not None or llm_tokens is not None:
+                response = {**response, _LLM_META_KEY: {"latency_ms": llm_latency_ms, "tokens": llm_tokens}}
             cached_data = json.dumps(response)
 
-            # Set in cache with TTL
-            await self.redis_client.setex(cache_key, ttl, cached_data)
+            # Set in cache with TTL, tagged for invalidate_category()
+            await self.responses.set(
+                category,
+                self._cache_identifier(query, user_id),
+                response,
+                ttl=ttl,
+                tags=[category, self._branch_tag(category, restaurant_id)]
+            )
+
+            if self.semantic_enabled and user_id is None:
+                await self._semantic_store(query, cached_data, category, restaurant_id, ttl)
 
             logger.info(
                 "cache_set",
@@ -271,45 +609,44 @@ class ResponseCacheService:
                 error_type=type(e).__name__
             )
 
-    async def invalidate_category(self, category: str):
+    async def invalidate_category(self, category: str, restaurant_id: Optional[str] = None) -> int:
         """
         Invalidate all cached responses in a category.
 
+        Uses the category's tag sets, so the keyspace is never scanned.
+
         Args:
             category: Category to invalidate (menu, restaurant_info, etc.)
+            restaurant_id: Only this branch's responses, plus those served
+                from the all-branch menu (default: every branch)
+
+        Returns:
+            Number of cached responses deleted
         """
         if not self.enabled or not self.redis_client:
-            return
+            return 0
 
-        try:
-            # Find all keys matching pattern
-            pattern = f"cache:{category}:*"
-            cursor = 0
-            deleted_count = 0
-
-            while True:
-                cursor, keys = await self.redis_client.scan(cursor, match=pattern, count=100)
-
-                if keys:
-                    await self.redis_client.delete(*keys)
-                    deleted_count += len(keys)
+        if restaurant_id:
+            tags = [f"{category}:branch:{restaurant_id}", f"{category}:branch:all"]
+            semantic_prefixes = [f"cache:{category}:semantic:{restaurant_id}:", f"cache:{category}:semantic:all:"]
+        else:
+            tags = [category]
+            semantic_prefixes = [f"cache:{category}:semantic:"]
 
-                if cursor == 0:
-                    break
+        deleted_count = 0
+        for tag in tags:
+            deleted_count += await self.responses.invalidate_tag(tag)
 
-            logger.info(
-                "cache_invalidated",
-                category=category,
-                deleted_keys=deleted_count
-            )
+        for key in [k for k in self._semantic_scopes if k.startswith(tuple(semantic_prefixes))]:
+            del self._semantic_scopes[key]
 
-        except Exception as e:
-            logger.error(
-                "cache_invalidation_error",
-                category=category,
-                error=str(e),
-                error_type=type(e).__name__
-            )
+        logger.info(
+            "cache_invalidated",
+            category=category,
+            restaurant_id=restaurant_id,
+            deleted_keys=deleted_count
+        )
+        return deleted_count
 
     async def clear_all_cache(self):
         """Clear all cached responses"""
@@ -332,6 +669,8 @@ class ResponseCacheService:
                 if cursor == 0:
                     break
 
+            self._semantic_scopes.clear()
+
             logger.info(
                 "all_cache_cleared",
                 deleted_keys=deleted_count
@@ -359,6 +698,8 @@ class ResponseCacheService:
             return None
 
         try:
+            if self.local_tier:
+                return await self.local_tier.get(key)
             return await self.redis_client.get(key)
         except Exception as e:
             logger.error("cache_get_error", key=key, error=str(e))
@@ -383,6 +724,8 @@ class ResponseCacheService:
                 await self.redis_client.setex(key, ttl_seconds, value)
             else:
                 await self.redis_client.set(key, value)
+            if self.local_tier:
+                await self.local_tier.invalidate(keys=[key])
         except Exception as e:
             logger.error("cache_set_error", key=key, error=str(e))
 
@@ -398,6 +741,8 @@ class ResponseCacheService:
 
         try:
             await self.redis_client.delete(key)
+            if self.local_tier:
+                await self.local_tier.invalidate(keys=[key])
         except Exception as e:
             logger.error("cache_delete_error", key=key, error=str(e))
 
@@ -417,7 +762,17 @@ class ResponseCacheService:
             "cache_misses": self.cache_misses,
             "total_requests": total_requests,
             "hit_rate_percent": round(hit_rate, 2),
-            "ttl_config": self.ttl_config
+            "ttl_config": self.ttl_config,
+            "semantic": {
+                "enabled": self.semantic_enabled,
+                "threshold": self.semantic_threshold,
+                "hits": self.semantic_hits,
+                "hit_rate_percent": round(self.semantic_hits / total_requests * 100, 2) if total_requests else 0,
+                "indexed_scopes": len(self._semantic_scopes),
+                "indexed_queries": sum(len(scope.fields) for scope in self._semantic_scopes.values())
+            },
+            "saved_llm_seconds": round(self.saved_llm_seconds, 3),
+            "saved_llm_tokens": self.saved_llm_tokens
         }
 
     async def close(self):
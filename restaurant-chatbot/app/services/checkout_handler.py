@@ -6,6 +6,7 @@ Intercepts checkout-related messages and handles them deterministically.
 This runs BEFORE the main crew agent to ensure checkout is deterministic, not LLM-decided.
 """
 
+import asyncio
 import structlog
 from typing import Optional, Dict, Any
 
@@ -50,10 +51,10 @@ async def handle_checkout_message(
         message=message_lower
     )
 
-    # Check if cart has items (read from PostgreSQL session_cart, not Redis)
-    from app.core.session_events import get_sync_session_tracker
-    tracker = get_sync_session_tracker(session_id)
-    cart_data = tracker.get_cart_summary()
+    # Check if cart has items (session cart snapshot, seeded from session_cart)
+    from app.core.session_events import get_session_tracker
+    tracker = get_session_tracker(session_id)
+    cart_data = await tracker.get_cart_summary()
     if not cart_data or not cart_data.get("items"):
         return "🛒 Your cart is empty! Please add some items before checkout.\n\nWould you like to see our menu?"
 
@@ -61,7 +62,8 @@ async def handle_checkout_message(
     from app.features.food_ordering.crew_agent import _checkout_impl
 
     try:
-        result = _checkout_impl("take away", session_id)
+        # _checkout_impl is the blocking CrewAI tool body - keep it off the event loop
+        result = await asyncio.to_thread(_checkout_impl, "take away", session_id)
 
         logger.info(
             "checkout_completed_deterministic",
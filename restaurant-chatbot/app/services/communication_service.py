@@ -532,18 +532,18 @@ class CommunicationService:
 
             message_sent = False
             for session_id in target_sessions:
-                if session_id in websocket_manager.active_connections:
-                    # Send real-time notification via WebSocket
-                    await websocket_manager.send_message_with_metadata(
-                        session_id=session_id,
-                        message=formatted_content or message.content,
-                        message_type="notification",
-                        metadata={
-                            "notification_type": message.message_type,
-                            "priority": message.priority.value,
-                            "template_params": message.template_params or {}
-                        }
-                    )
+                # Send real-time notification via WebSocket
+                # (routed to the worker holding the session's socket)
+                if await websocket_manager.send_message_with_metadata(
+                    session_id=session_id,
+                    message=formatted_content or message.content,
+                    message_type="notification",
+                    metadata={
+                        "notification_type": message.message_type,
+                        "priority": message.priority.value,
+                        "template_params": message.template_params or {}
+                    }
+                ):
                     message_sent = True
                     # If targeting a specific session, we're done.
                     # If broadcasting (target_sessions list), we might want to send to all?
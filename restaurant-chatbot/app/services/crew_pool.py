@@ -16,13 +16,13 @@ This eliminates first-message latency by:
 """
 
 import os
+import time
 import asyncio
 import threading
 from contextvars import ContextVar
 from typing import Dict, Any, Optional, List, Tuple
-from queue import Queue, Empty
 from dataclasses import dataclass
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -32,6 +32,10 @@ logger = structlog.get_logger(__name__)
 # =============================================================================
 
 POOL_SIZE = 20  # Number of pre-warmed crews (matches MAX_CONCURRENT_CREWS)
+POOL_CHECKOUT_TIMEOUT = float(os.getenv("CREW_POOL_CHECKOUT_TIMEOUT", "15"))  # Max seconds to wait for a free crew
+POOL_LOW_WATER_MARK = int(os.getenv("CREW_POOL_LOW_WATER_MARK", "4"))  # Replenish when idle crews drop below this
+POOL_MAX_USES = int(os.getenv("CREW_POOL_MAX_USES", "200"))  # Retire a crew after this many checkouts
+POOL_BUILD_CONCURRENCY = int(os.getenv("CREW_POOL_BUILD_CONCURRENCY", "8"))  # Crews built in parallel
 LLM_MODEL = "gpt-4o-mini"
 LLM_TEMPERATURE = 0.1
 LLM_MAX_TOKENS = 512
@@ -54,8 +58,8 @@ def get_llm_for_crew(crew_index: int):
     - Crew 18 → Account 1 (wraps around)
 
     Each session that gets this crew will use this API key for all its requests.
+    The ChatOpenAI is cached per account and shares its connection pool.
     """
-    from langchain_openai import ChatOpenAI
     from app.ai_services.llm_manager import get_llm_manager
 
     llm_manager = get_llm_manager()
@@ -65,12 +69,7 @@ def get_llm_for_crew(crew_index: int):
     account_index = crew_index % num_accounts
     account = llm_manager.accounts[account_index]
 
-    llm = ChatOpenAI(
-        model=LLM_MODEL,
-        temperature=LLM_TEMPERATURE,
-        api_key=account.api_key,
-        max_tokens=LLM_MAX_TOKENS,
-    )
+    llm = account.get_chat_model(LLM_MODEL, LLM_TEMPERATURE, max_tokens=LLM_MAX_TOKENS)
 
     logger.info(
         "llm_assigned_to_crew",
@@ -96,22 +95,15 @@ async def prewarm_llm():
     logger.info("prewarming_llm_connections")
 
     try:
-        from langchain_openai import ChatOpenAI
         from app.ai_services.llm_manager import get_llm_manager
 
         llm_manager = get_llm_manager()
         num_accounts = llm_manager.get_account_count()
 
-        loop = asyncio.get_running_loop()
-
-        # Warm up each account
+        # Warm up each account's pooled connections
         for account in llm_manager.accounts:
-            llm = ChatOpenAI(
-                model=LLM_MODEL,
-                api_key=account.api_key,
-                max_tokens=10,
-            )
-            await loop.run_in_executor(None, lambda l=llm: l.invoke("OK"))
+            llm = account.get_chat_model(LLM_MODEL, LLM_TEMPERATURE, max_tokens=10)
+            await llm.ainvoke("OK")
             logger.info("llm_prewarm_complete", account_number=account.account_number)
 
         logger.info("all_llm_prewarm_complete", accounts_warmed=num_accounts)
@@ -505,60 +497,202 @@ def create_dynamic_booking_tools():
 # CREW POOL
 # =============================================================================
 
+class CrewPoolTimeoutError(RuntimeError):
+    """Raised when no crew becomes free within the checkout timeout."""
+
+
+@dataclass
+class PooledCrew:
+    """A crew plus the bookkeeping needed for health eviction."""
+    crew: Any
+    crew_index: int
+    uses: int = 0
+    errors: int = 0
+
+
 class CrewPool:
     """
-    Pool of pre-warmed CrewAI instances.
+    Pool of pre-warmed CrewAI instances (asyncio-native).
+
+    - Checkout is awaitable and bounded by ``checkout_timeout``; it never
+      builds a crew on the event loop.
+    - Crews are built in the default executor, ``build_concurrency`` at a time.
+    - When idle crews dip below ``low_water_mark`` the pool is topped back up
+      to ``size`` in the background.
+    - Crews that raised during use, or reached ``max_uses`` checkouts, are
+      evicted instead of returned.
+    - ``resize()`` grows or shrinks the pool at runtime.
 
     Usage:
         pool = CrewPool(size=20)
         await pool.initialize()
 
         # Get a crew for a session
-        with pool.get_crew() as crew:
+        async with pool.get_crew() as crew:
             set_session_context(session_id)
-            result = crew.kickoff(inputs)
+            result = await crew.akickoff(inputs)
     """
 
-    def __init__(self, size: int = POOL_SIZE):
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        checkout_timeout: float = POOL_CHECKOUT_TIMEOUT,
+        low_water_mark: int = POOL_LOW_WATER_MARK,
+        max_uses: int = POOL_MAX_USES,
+        build_concurrency: int = POOL_BUILD_CONCURRENCY,
+    ):
         self.size = size
-        self._pool: Queue = Queue(maxsize=size)
+        self.checkout_timeout = checkout_timeout
+        self.low_water_mark = min(low_water_mark, size)
+        self.max_uses = max_uses
+        self.build_concurrency = max(1, build_concurrency)
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._build_semaphore: Optional[asyncio.Semaphore] = None
+        self._replenish_task: Optional[asyncio.Task] = None
+        self._checked_out = 0
+        self._building = 0
+        self._next_index = 0
+        self._waiters = 0
         self._initialized = False
+
+        # Stats are read from other threads (monitoring), so guard them
         self._lock = threading.Lock()
         self._stats = {
             'created': 0,
             'checkouts': 0,
             'returns': 0,
             'active': 0,
+            'evicted_errors': 0,
+            'evicted_max_uses': 0,
+            'evicted_shrink': 0,
+            'build_failures': 0,
+            'checkout_timeouts': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
         }
 
+    # ------------------------------------------------------------------ stats
+
+    def _bump(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self._stats['total_wait_ms'] += wait_ms
+            if wait_ms > self._stats['max_wait_ms']:
+                self._stats['max_wait_ms'] = wait_ms
+
+    # -------------------------------------------------------------- lifecycle
+
+    def _ensure_primitives(self) -> None:
+        """Create asyncio primitives lazily, inside the running loop."""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            self._init_lock = asyncio.Lock()
+            self._build_semaphore = asyncio.Semaphore(self.build_concurrency)
+
+    @property
+    def idle_count(self) -> int:
+        return self._idle.qsize() if self._idle is not None else 0
+
+    @property
+    def total_count(self) -> int:
+        """Idle + checked out + being built."""
+        return self.idle_count + self._checked_out + self._building
+
     async def initialize(self):
-        """Initialize pool with pre-created crews."""
+        """Initialize pool with pre-created crews (built concurrently)."""
         if self._initialized:
             return
 
-        with self._lock:
+        self._ensure_primitives()
+        async with self._init_lock:
             if self._initialized:
                 return
 
-            logger.info("initializing_crew_pool", size=self.size)
+            logger.info("initializing_crew_pool", size=self.size, build_concurrency=self.build_concurrency)
 
             # Pre-warm LLM first
             await prewarm_llm()
 
-            # Create crews in thread pool (CrewAI is sync)
-            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(self._build_crew() for _ in range(self.size)))
+
+            self._initialized = True
+            logger.info("crew_pool_initialized", size=self.size, idle=self.idle_count)
 
-            for i in range(self.size):
-                # Pass crew index for round-robin API key assignment
-                crew = await loop.run_in_executor(None, lambda idx=i: self._create_pooled_crew(idx))
-                self._pool.put(crew)
-                self._stats['created'] += 1
+    async def _build_crew(self) -> bool:
+        """Build one crew off the event loop and add it to the idle queue."""
+        crew_index = self._next_index
+        self._next_index += 1
+        self._building += 1
+        try:
+            async with self._build_semaphore:
+                loop = asyncio.get_running_loop()
+                # CrewAI construction is sync - keep it off the event loop
+                crew = await loop.run_in_executor(None, self._create_pooled_crew, crew_index)
+        except Exception as e:
+            self._bump('build_failures')
+            logger.error("crew_build_failed", crew_index=crew_index, error=str(e))
+            return False
+        finally:
+            self._building -= 1
 
-                if (i + 1) % 5 == 0:
-                    logger.info("crew_pool_progress", created=i + 1, total=self.size)
+        self._bump('created')
+        self._idle.put_nowait(PooledCrew(crew=crew, crew_index=crew_index))
+        return True
 
-            self._initialized = True
-            logger.info("crew_pool_initialized", size=self.size)
+    def _schedule_replenish(self, force: bool = False) -> None:
+        """
+        Top the pool back up to ``size`` in the background.
+
+        Runs when idle crews dip below the low-water mark, or unconditionally
+        (``force``) after an eviction or resize.
+        """
+        if self._replenish_task is not None and not self._replenish_task.done():
+            return
+        if self.total_count >= self.size:
+            return
+        if not force and self.idle_count >= self.low_water_mark:
+            return
+        self._replenish_task = asyncio.create_task(self._replenish())
+
+    async def _replenish(self) -> None:
+        missing = self.size - self.total_count
+        if missing <= 0:
+            return
+        logger.info("crew_pool_replenishing", missing=missing, idle=self.idle_count, size=self.size)
+        results = await asyncio.gather(*(self._build_crew() for _ in range(missing)))
+        logger.info("crew_pool_replenished", built=sum(results), idle=self.idle_count)
+
+    async def resize(self, new_size: int, low_water_mark: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Grow or shrink the pool at runtime.
+
+        Growing builds the missing crews in the background. Shrinking drops
+        idle crews immediately; checked-out crews are dropped when returned.
+        """
+        if new_size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._ensure_primitives()
+        old_size = self.size
+        self.size = new_size
+        self.low_water_mark = min(low_water_mark if low_water_mark is not None else self.low_water_mark, new_size)
+
+        dropped = 0
+        while self.total_count > self.size and not self._idle.empty():
+            self._idle.get_nowait()
+            dropped += 1
+        if dropped:
+            self._bump('evicted_shrink', dropped)
+
+        self._schedule_replenish(force=True)
+
+        logger.info("crew_pool_resized", old_size=old_size, new_size=new_size, dropped_idle=dropped)
+        return self.get_stats()
 
     def _create_pooled_crew(self, crew_index: int = 0):
         """Create a single pooled crew with dynamic tools and dedicated API key."""
@@ -611,52 +745,97 @@ Handle the customer's request appropriately.
 
         return crew
 
-    @contextmanager
-    def get_crew(self):
+    # --------------------------------------------------------------- checkout
+
+    @asynccontextmanager
+    async def get_crew(self, timeout: Optional[float] = None):
         """
-        Get a crew from pool (context manager).
+        Check out a crew from the pool (async context manager).
+
+        Waits up to ``timeout`` (default ``checkout_timeout``) for a crew to be
+        returned and raises CrewPoolTimeoutError if none frees up. A crew whose
+        body raised is evicted and replaced in the background; a cancelled
+        body (client disconnect, timeout) returns the crew to the pool.
 
         Usage:
-            with pool.get_crew() as crew:
-                result = crew.kickoff(inputs)
+            async with pool.get_crew() as crew:
+                result = await crew.akickoff(inputs)
         """
-        crew = None
+        self._ensure_primitives()
+        timeout = self.checkout_timeout if timeout is None else timeout
+
+        started = time.perf_counter()
         try:
-            # Try to get from pool (non-blocking)
+            pooled = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            logger.warning("crew_pool_exhausted", waiters=self._waiters + 1, total=self.total_count)
+            self._schedule_replenish()
+            self._waiters += 1
             try:
-                crew = self._pool.get_nowait()
-                self._stats['checkouts'] += 1
-                self._stats['active'] += 1
-            except Empty:
-                # Pool exhausted - create a new one with round-robin API key
-                logger.warning("crew_pool_exhausted", creating_new=True)
-                crew = self._create_pooled_crew(self._stats['created'])
-                self._stats['created'] += 1
-                self._stats['active'] += 1
-
-            yield crew
-
+                pooled = await asyncio.wait_for(self._idle.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._bump('checkout_timeouts')
+                raise CrewPoolTimeoutError(f"No crew available within {timeout:.1f}s")
+            finally:
+                self._waiters -= 1
+        self._record_wait((time.perf_counter() - started) * 1000)
+
+        pooled.uses += 1
+        self._checked_out += 1
+        self._bump('checkouts')
+        self._bump('active')
+        self._schedule_replenish()
+
+        failed = False
+        try:
+            yield pooled.crew
+        except Exception:
+            failed = True
+            pooled.errors += 1
+            raise
         finally:
-            # Return crew to pool
-            if crew is not None:
-                self._stats['active'] -= 1
-                self._stats['returns'] += 1
-
-                try:
-                    self._pool.put_nowait(crew)
-                except:
-                    # Pool full - discard
-                    pass
+            self._checked_out -= 1
+            self._bump('active', -1)
+            self._bump('returns')
+            self._release(pooled, failed)
 
             # Clear session context
             clear_session_context()
 
+    def _release(self, pooled: PooledCrew, failed: bool) -> None:
+        """Return a crew to the idle queue, or evict it if it is unhealthy."""
+        if failed:
+            self._bump('evicted_errors')
+            logger.warning("crew_evicted", crew_index=pooled.crew_index, reason="error", uses=pooled.uses)
+        elif self.max_uses and pooled.uses >= self.max_uses:
+            self._bump('evicted_max_uses')
+            logger.info("crew_evicted", crew_index=pooled.crew_index, reason="max_uses", uses=pooled.uses)
+        elif self.total_count >= self.size:
+            # Pool was shrunk while this crew was checked out
+            self._bump('evicted_shrink')
+        else:
+            self._idle.put_nowait(pooled)
+            return
+
+        self._schedule_replenish(force=True)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get pool statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+        checkouts = stats['checkouts']
+        stats['avg_wait_ms'] = round(stats['total_wait_ms'] / checkouts, 2) if checkouts else 0.0
+        stats['total_wait_ms'] = round(stats['total_wait_ms'], 2)
+        stats['max_wait_ms'] = round(stats['max_wait_ms'], 2)
         return {
-            **self._stats,
-            'pool_size': self._pool.qsize(),
+            **stats,
+            'pool_size': self.idle_count,
             'max_size': self.size,
+            'building': self._building,
+            'waiters': self._waiters,
+            'low_water_mark': self.low_water_mark,
+            'max_uses': self.max_uses,
+            'checkout_timeout': self.checkout_timeout,
         }
 
 
@@ -701,7 +880,7 @@ async def process_with_pooled_crew(
     This is a drop-in replacement for process_with_restaurant_crew.
     """
     from app.orchestration.restaurant_crew import clean_crew_response
-    from app.core.semantic_context import get_entity_graph
+    from app.core.semantic_context import begin_session_turn, end_session_turn
 
     logger.info("processing_with_pooled_crew", session_id=session_id)
 
@@ -714,8 +893,8 @@ async def process_with_pooled_crew(
     # Set session context for async tools (ContextVar propagates to async tasks)
     set_session_context(session_id, user_id)
 
-    # Get entity context
-    graph = get_entity_graph(session_id)
+    # Get entity context (loaded once per turn, saved once in the finally below)
+    graph = await begin_session_turn(session_id)
     semantic_context = graph.get_context_summary()
 
     # Build conversation context
@@ -730,7 +909,7 @@ async def process_with_pooled_crew(
 
     try:
         # Get crew from pool and use akickoff() for native async execution
-        with pool.get_crew() as crew:
+        async with pool.get_crew() as crew:
             result = await crew.akickoff(inputs=inputs)
 
             # Clean response
@@ -759,3 +938,6 @@ async def process_with_pooled_crew(
             "I'm here to help! What would you like to do?",
             {"type": "error", "error": str(e)}
         )
+
+    finally:
+        await end_session_turn(session_id)
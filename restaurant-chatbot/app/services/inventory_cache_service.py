@@ -9,27 +9,275 @@ Solves the race condition problem:
 - Who gets it?  First to reserve it!
 
 Architecture:
-- Redis atomic operations (DECR, INCR) for thread-safe inventory
-- Temporary reservations with TTL (15 minutes)
-- Automatic release if user doesn't complete order
+- Lua scripts reserve, release, hold and settle a whole cart atomically in
+  one round trip (check and decrement can't interleave with another order)
+- Temporary reservations with TTL (INVENTORY_RESERVATION_TTL_SECONDS)
+- Reaper task returns expired holds to available stock
 - Real-time availability tracking
 
+Keys:
+- inventory:available:{item_id}             available count
+- inventory:reserved:{item_id}:{user_id}    quantity held by a user
+- inventory:reservations:{item_id}          users holding the item
+- inventory:holds                           sorted set "{item_id}|{user_id}" -> expiry (ms)
+- inventory:checkout:{session_id}           items held for the session's unpaid order -> quantity
+
 Flow:
 1. User adds item to cart  Reserve inventory (DECR available_count)
-2. Item reserved for 15 minutes (TTL on reservation)
-3. User completes order  Confirm reservation (update DB)
-4. User abandons cart  Auto-release after TTL expires
-5. User removes from cart  Explicit release (INCR available_count)
+2. Item reserved for the TTL (refreshed whenever the user reserves it again)
+3. User checks out  The cart's holds move to the order (holder
+   "order:{session_id}") for INVENTORY_CHECKOUT_HOLD_TTL_SECONDS; a hold that
+   expired is reserved again, or the checkout is refused
+4. Payment succeeds (or cash is chosen)  settle_checkout_hold(sold=True): the
+   order's holds become sold stock
+5. Payment fails or is cancelled  settle_checkout_hold(sold=False): the
+   order's holds go back to stock
+6. User abandons cart or order  Reaper releases the hold after the TTL
+7. User removes from cart  Explicit release (INCR available_count)
 """
 
+import asyncio
 import os
+import time
 from typing import Optional, Dict, List, Tuple
-from datetime import timedelta
 import structlog
 import redis.asyncio as redis
 
 logger = structlog.get_logger(__name__)
 
+# 0 = holds never expire (released only explicitly / on session expiry)
+RESERVATION_TTL_SECONDS = int(os.getenv("INVENTORY_RESERVATION_TTL_SECONDS", "1800"))
+# How long an unpaid order keeps its stock (the pending order lives 1 hour)
+CHECKOUT_HOLD_TTL_SECONDS = int(os.getenv("INVENTORY_CHECKOUT_HOLD_TTL_SECONDS", "3600"))
+REAPER_INTERVAL_SECONDS = float(os.getenv("INVENTORY_REAPER_INTERVAL_SECONDS", "30"))
+# Expired holds released per reaper script call
+REAPER_BATCH_SIZE = 200
+
+INVENTORY_PREFIX = "inventory:"
+HOLDS_KEY = f"{INVENTORY_PREFIX}holds"
+
+# KEYS: holds, then per item: available, reservation, reservations set
+# ARGV: user_id, expires_at_ms (0 = no expiry), skip_untracked (1/0), then per
+# item: item_id, quantity
+# Reserves every item or none. Quantities are absolute (the user's new hold).
+# Items without an inventory count fail, or are skipped with skip_untracked;
+# returns {1, {}} or {0, {{item_id, reason, available}, ...}}
+_RESERVE_SCRIPT = """
+local user_id = ARGV[1]
+local expires_at = tonumber(ARGV[2])
+local skip_untracked = ARGV[3] == '1'
+local count = (#KEYS - 1) / 3
+local failed = {}
+local changes = {}
+
+for i = 1, count do
+    local base = 1 + (i - 1) * 3
+    local item_id = ARGV[2 + i * 2]
+    local available = redis.call('GET', KEYS[base + 1])
+    if not available then
+        if not skip_untracked then
+            failed[#failed + 1] = {item_id, 'not_cached', -1}
+        end
+    else
+        local held = tonumber(redis.call('GET', KEYS[base + 2]) or '0')
+        local change = tonumber(ARGV[3 + i * 2]) - held
+        if change > tonumber(available) then
+            failed[#failed + 1] = {item_id, 'insufficient', tonumber(available)}
+        end
+        changes[i] = change
+    end
+end
+
+if #failed > 0 then
+    return {0, failed}
+end
+
+for i = 1, count do
+    if changes[i] then
+        local base = 1 + (i - 1) * 3
+        local hold = ARGV[2 + i * 2] .. '|' .. user_id
+        redis.call('DECRBY', KEYS[base + 1], changes[i])
+        redis.call('SET', KEYS[base + 2], ARGV[3 + i * 2])
+        redis.call('SADD', KEYS[base + 3], user_id)
+        if expires_at > 0 then
+            redis.call('ZADD', KEYS[1], expires_at, hold)
+        else
+            redis.call('ZREM', KEYS[1], hold)
+        end
+    end
+end
+return {1, {}}
+"""
+
+# KEYS: holds, then per item: available, reservation, reservations set
+# ARGV: user_id, then item ids
+# Returns the quantity returned to stock
+_RELEASE_SCRIPT = """
+local user_id = ARGV[1]
+local returned = 0
+
+for i = 1, (#KEYS - 1) / 3 do
+    local base = 1 + (i - 1) * 3
+    local held = tonumber(redis.call('GET', KEYS[base + 2]) or '0')
+    if held > 0 then
+        redis.call('INCRBY', KEYS[base + 1], held)
+        returned = returned + held
+    end
+    redis.call('DEL', KEYS[base + 2])
+    redis.call('SREM', KEYS[base + 3], user_id)
+    redis.call('ZREM', KEYS[1], ARGV[1 + i] .. '|' .. user_id)
+end
+return returned
+"""
+
+# KEYS: holds, checkout record, then per item: available, cart reservation,
+#       cart reservations set, order reservation, order reservations set
+# ARGV: cart holder, order holder, expires_at_ms (0 = no expiry), record TTL
+#       seconds (0 = none), key prefix, then per item: item_id, quantity
+# Moves the cart's holds to the order, all items or none. Where the holds are
+# smaller than the quantity (they expired and were reaped) the difference is
+# taken from available stock again; any excess is returned. Holds of an earlier
+# unpaid order for items not in this one are returned. Items without an
+# inventory count are not tracked and pass.
+# Returns {1, {re-reserved item_id, ...}} or {0, {{item_id, held, available}, ...}}
+_CHECKOUT_SCRIPT = """
+local cart_holder = ARGV[1]
+local order_holder = ARGV[2]
+local expires_at = tonumber(ARGV[3])
+local record_ttl = tonumber(ARGV[4])
+local prefix = ARGV[5]
+local count = (#KEYS - 2) / 5
+local failed = {}
+local rereserved = {}
+local changes = {}
+local ordered = {}
+
+for i = 1, count do
+    local base = 2 + (i - 1) * 5
+    local item_id = ARGV[4 + i * 2]
+    ordered[item_id] = true
+    local available = redis.call('GET', KEYS[base + 1])
+    if available then
+        local held = tonumber(redis.call('GET', KEYS[base + 2]) or '0')
+            + tonumber(redis.call('GET', KEYS[base + 4]) or '0')
+        local change = tonumber(ARGV[5 + i * 2]) - held
+        if change > tonumber(available) then
+            failed[#failed + 1] = {item_id, held, tonumber(available)}
+        end
+        changes[i] = change
+    end
+end
+
+if #failed > 0 then
+    return {0, failed}
+end
+
+local previous = redis.call('HKEYS', KEYS[2])
+for _, item_id in ipairs(previous) do
+    if not ordered[item_id] then
+        local reservation_key = prefix .. 'reserved:' .. item_id .. ':' .. order_holder
+        local held = tonumber(redis.call('GET', reservation_key) or '0')
+        if held > 0 then
+            redis.call('INCRBY', prefix .. 'available:' .. item_id, held)
+        end
+        redis.call('DEL', reservation_key)
+        redis.call('SREM', prefix .. 'reservations:' .. item_id, order_holder)
+        redis.call('ZREM', KEYS[1], item_id .. '|' .. order_holder)
+    end
+end
+redis.call('DEL', KEYS[2])
+
+for i = 1, count do
+    if changes[i] then
+        local base = 2 + (i - 1) * 5
+        local item_id = ARGV[4 + i * 2]
+        local quantity = ARGV[5 + i * 2]
+        if changes[i] > 0 then
+            rereserved[#rereserved + 1] = item_id
+        end
+        if changes[i] ~= 0 then
+            redis.call('DECRBY', KEYS[base + 1], changes[i])
+        end
+        redis.call('DEL', KEYS[base + 2])
+        redis.call('SREM', KEYS[base + 3], cart_holder)
+        redis.call('ZREM', KEYS[1], item_id .. '|' .. cart_holder)
+        redis.call('SET', KEYS[base + 4], quantity)
+        redis.call('SADD', KEYS[base + 5], order_holder)
+        if expires_at > 0 then
+            redis.call('ZADD', KEYS[1], expires_at, item_id .. '|' .. order_holder)
+        else
+            redis.call('ZREM', KEYS[1], item_id .. '|' .. order_holder)
+        end
+        redis.call('HSET', KEYS[2], item_id, quantity)
+    end
+end
+if record_ttl > 0 and redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('EXPIRE', KEYS[2], record_ttl)
+end
+return {1, rereserved}
+"""
+
+# KEYS: holds, checkout record
+# ARGV: order holder, key prefix, sold (1/0)
+# Settles an order's holds: sold keeps the stock deducted (taking it again where
+# the hold was already reaped), otherwise it goes back to available.
+# Returns the number of items settled.
+_SETTLE_SCRIPT = """
+local order_holder = ARGV[1]
+local prefix = ARGV[2]
+local sold = ARGV[3] == '1'
+local entries = redis.call('HGETALL', KEYS[2])
+
+for i = 1, #entries, 2 do
+    local item_id = entries[i]
+    local available_key = prefix .. 'available:' .. item_id
+    local reservation_key = prefix .. 'reserved:' .. item_id .. ':' .. order_holder
+    local held = tonumber(redis.call('GET', reservation_key) or '0')
+    if sold then
+        local shortfall = tonumber(entries[i + 1]) - held
+        if shortfall > 0 and redis.call('EXISTS', available_key) == 1 then
+            if redis.call('DECRBY', available_key, shortfall) < 0 then
+                redis.call('SET', available_key, 0)
+            end
+        end
+    elseif held > 0 then
+        redis.call('INCRBY', available_key, held)
+    end
+    redis.call('DEL', reservation_key)
+    redis.call('SREM', prefix .. 'reservations:' .. item_id, order_holder)
+    redis.call('ZREM', KEYS[1], item_id .. '|' .. order_holder)
+end
+redis.call('DEL', KEYS[2])
+return #entries / 2
+"""
+
+# KEYS: holds
+# ARGV: now_ms, batch size, key prefix
+# Releases holds that expired by now; returns {holds released, quantity returned}.
+# Per-hold keys are derived from the member, so this assumes a single Redis
+# node (not Redis Cluster), like the rest of the inventory keys.
+_REAP_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local prefix = ARGV[3]
+local returned = 0
+
+for _, hold in ipairs(expired) do
+    local separator = string.find(hold, '|', 1, true)
+    local item_id = string.sub(hold, 1, separator - 1)
+    local user_id = string.sub(hold, separator + 1)
+    local reservation_key = prefix .. 'reserved:' .. item_id .. ':' .. user_id
+    local held = tonumber(redis.call('GET', reservation_key) or '0')
+    if held > 0 then
+        redis.call('INCRBY', prefix .. 'available:' .. item_id, held)
+        returned = returned + held
+    end
+    redis.call('DEL', reservation_key)
+    redis.call('SREM', prefix .. 'reservations:' .. item_id, user_id)
+    redis.call('ZREM', KEYS[1], hold)
+end
+return {#expired, returned}
+"""
+
 
 class InventoryReservationError(Exception):
     """Raised when inventory cannot be reserved (out of stock)"""
@@ -67,10 +315,15 @@ class InventoryCacheService:
             self.enabled = False
             return
 
-        # Reservation TTL: Tied to user session (no time limit while active)
-        # Reservations released when user session expires (30 min inactivity)
-        # This is handled by user_data_manager on session expiry
-        self.reservation_ttl = None  # No TTL - managed by session lifecycle
+        # Reservation TTL: holds expire after this long without being renewed
+        # (and are still released by user_data_manager on session expiry)
+        self.reservation_ttl = RESERVATION_TTL_SECONDS or None
+
+        self._reserve_script = self.redis_client.register_script(_RESERVE_SCRIPT)
+        self._release_script = self.redis_client.register_script(_RELEASE_SCRIPT)
+        self._reap_script = self.redis_client.register_script(_REAP_SCRIPT)
+        self._checkout_script = self.redis_client.register_script(_CHECKOUT_SCRIPT)
+        self._reaper_task: Optional[asyncio.Task] = None
 
         logger.info(
             "inventory_cache_initialized",
@@ -80,15 +333,34 @@ class InventoryCacheService:
 
     def _get_inventory_key(self, item_id: str) -> str:
         """Get Redis key for item's available inventory count"""
-        return f"inventory:available:{item_id}"
+        return f"{INVENTORY_PREFIX}available:{item_id}"
 
     def _get_reservation_key(self, item_id: str, user_id: str) -> str:
         """Get Redis key for user's reservation of an item"""
-        return f"inventory:reserved:{item_id}:{user_id}"
+        return f"{INVENTORY_PREFIX}reserved:{item_id}:{user_id}"
 
     def _get_all_reservations_key(self, item_id: str) -> str:
         """Get Redis set key for all reservations of an item"""
-        return f"inventory:reservations:{item_id}"
+        return f"{INVENTORY_PREFIX}reservations:{item_id}"
+
+    @staticmethod
+    def _order_holder(session_id: str) -> str:
+        """Holder of an unpaid order's stock (kept apart from the session's cart holds)."""
+        return f"order:{session_id}"
+
+    @staticmethod
+    def _get_checkout_key(session_id: str) -> str:
+        """Get Redis hash key for the items held for a session's unpaid order"""
+        return f"{INVENTORY_PREFIX}checkout:{session_id}"
+
+    def _script_keys(self, item_ids: List[str], user_id: str) -> List[str]:
+        """KEYS for the reserve/release scripts: holds, then 3 keys per item."""
+        keys = [HOLDS_KEY]
+        for item_id in item_ids:
+            keys.append(self._get_inventory_key(item_id))
+            keys.append(self._get_reservation_key(item_id, user_id))
+            keys.append(self._get_all_reservations_key(item_id))
+        return keys
 
     # ========================================================================
     # INVENTORY INITIALIZATION (Called on startup or menu update)
@@ -221,6 +493,40 @@ class InventoryCacheService:
     # INVENTORY RESERVATION (Atomic Operations)
     # ========================================================================
 
+    async def _run_reserve(self, quantities: Dict[str, int], user_id: str, skip_untracked: bool = False) -> List[Dict]:
+        """
+        Reserve every item in quantities for user_id, or none of them.
+
+        One script call (one round trip). Returns the failed items; an empty
+        list means everything was reserved.
+        """
+        item_ids = list(quantities)
+        expires_at = int((time.time() + self.reservation_ttl) * 1000) if self.reservation_ttl else 0
+        args = [user_id, expires_at, 1 if skip_untracked else 0]
+        for item_id in item_ids:
+            args.extend((item_id, quantities[item_id]))
+
+        ok, failed = await self._reserve_script(keys=self._script_keys(item_ids, user_id), args=args)
+        if ok:
+            return []
+        return [
+            {
+                "item_id": item_id.decode() if isinstance(item_id, bytes) else item_id,
+                "reason": reason.decode() if isinstance(reason, bytes) else reason,
+                "available": int(available),
+            }
+            for item_id, reason, available in failed
+        ]
+
+    @staticmethod
+    def _failure_message(failure: Dict, quantity: int) -> str:
+        if failure["reason"] == "not_cached":
+            return f"Item {failure['item_id']} not found in inventory cache. Sync required."
+        return (
+            f"Not enough inventory for item {failure['item_id']}. "
+            f"Available: {failure['available']}, Requested: {quantity}"
+        )
+
     async def reserve_inventory(
         self,
         item_id: str,
@@ -230,15 +536,14 @@ class InventoryCacheService:
         """
         Reserve inventory for a user (atomic operation).
 
-        Flow:
-        1. Check if enough inventory available
-        2. Atomically decrement available count
-        3. Create reservation record with TTL
-        4. If user doesn't complete order in 15 min, auto-release
+        Flow (one Lua script, one round trip):
+        1. Check if enough inventory available for the change in quantity
+        2. Decrement available count by that change
+        3. Set the reservation and (re)start its TTL
 
         Args:
             item_id: Menu item ID
-            quantity: Quantity to reserve
+            quantity: Quantity to reserve (the user's total hold for the item)
             user_id: User ID reserving the item
 
         Returns:
@@ -258,54 +563,16 @@ class InventoryCacheService:
             }
 
         try:
-            inventory_key = self._get_inventory_key(item_id)
-            reservation_key = self._get_reservation_key(item_id, user_id)
-            reservations_set_key = self._get_all_reservations_key(item_id)
-
-            # Check current availability
-            available = await self.redis_client.get(inventory_key)
-            if available is None:
-                raise InventoryReservationError(
-                    f"Item {item_id} not found in inventory cache. Sync required."
-                )
-
-            available = int(available)
-
-            # Check if user already has a reservation (update scenario)
-            existing_reservation = await self.redis_client.get(reservation_key)
-            existing_qty = int(existing_reservation) if existing_reservation else 0
-
-            # Calculate net change
-            net_change = quantity - existing_qty
-
-            # Check if enough inventory for net change
-            if net_change > available:
-                raise InventoryReservationError(
-                    f"Not enough inventory for item {item_id}. "
-                    f"Available: {available}, Requested: {net_change}"
-                )
-
-            # Atomic operations (Redis transaction)
-            async with self.redis_client.pipeline(transaction=True) as pipe:
-                # Decrement available inventory
-                await pipe.decrby(inventory_key, net_change)
-
-                # Set/Update reservation (NO TTL - managed by session lifecycle)
-                await pipe.set(reservation_key, quantity)
-
-                # Add to reservations set
-                await pipe.sadd(reservations_set_key, user_id)
-
-                # Execute transaction
-                await pipe.execute()
+            failed = await self._run_reserve({item_id: quantity}, user_id)
+            if failed:
+                raise InventoryReservationError(self._failure_message(failed[0], quantity))
 
             logger.info(
                 "inventory_reserved",
                 item_id=item_id,
                 quantity=quantity,
                 user_id=user_id,
-                net_change=net_change,
-                remaining_available=available - net_change
+                ttl_seconds=self.reservation_ttl
             )
 
             return {
@@ -313,7 +580,7 @@ class InventoryCacheService:
                 "quantity": quantity,
                 "user_id": user_id,
                 "reserved": True,
-                "note": "Reservation tied to session - will be released when session expires"
+                "expires_in_seconds": self.reservation_ttl
             }
 
         except InventoryReservationError:
@@ -349,35 +616,17 @@ class InventoryCacheService:
             return
 
         try:
-            inventory_key = self._get_inventory_key(item_id)
-            reservation_key = self._get_reservation_key(item_id, user_id)
-            reservations_set_key = self._get_all_reservations_key(item_id)
-
-            # Get reserved quantity
-            reserved_qty = await self.redis_client.get(reservation_key)
-
-            if reserved_qty:
-                reserved_qty = int(reserved_qty)
-
-                # Atomic operations
-                async with self.redis_client.pipeline(transaction=True) as pipe:
-                    # Return inventory
-                    await pipe.incrby(inventory_key, reserved_qty)
-
-                    # Delete reservation
-                    await pipe.delete(reservation_key)
-
-                    # Remove from reservations set
-                    await pipe.srem(reservations_set_key, user_id)
-
-                    # Execute transaction
-                    await pipe.execute()
+            released = await self._release_script(
+                keys=self._script_keys([item_id], user_id),
+                args=[user_id, item_id]
+            )
 
+            if released:
                 logger.info(
                     "reservation_released",
                     item_id=item_id,
                     user_id=user_id,
-                    quantity_released=reserved_qty
+                    quantity_released=released
                 )
 
         except Exception as e:
@@ -388,53 +637,6 @@ class InventoryCacheService:
                 error=str(e)
             )
 
-    async def confirm_reservation(
-        self,
-        item_id: str,
-        user_id: str
-    ):
-        """
-        Confirm reservation (order completed).
-
-        Removes reservation record but doesn't return inventory
-        (inventory already deducted).
-
-        Args:
-            item_id: Menu item ID
-            user_id: User ID
-        """
-        if not self.enabled or not self.redis_client:
-            return
-
-        try:
-            reservation_key = self._get_reservation_key(item_id, user_id)
-            reservations_set_key = self._get_all_reservations_key(item_id)
-
-            # Atomic operations
-            async with self.redis_client.pipeline(transaction=True) as pipe:
-                # Delete reservation (inventory stays deducted)
-                await pipe.delete(reservation_key)
-
-                # Remove from reservations set
-                await pipe.srem(reservations_set_key, user_id)
-
-                # Execute transaction
-                await pipe.execute()
-
-            logger.info(
-                "reservation_confirmed",
-                item_id=item_id,
-                user_id=user_id
-            )
-
-        except Exception as e:
-            logger.error(
-                "confirm_reservation_error",
-                item_id=item_id,
-                user_id=user_id,
-                error=str(e)
-            )
-
     async def get_reserved_quantity(self, item_id: str) -> int:
         """
         Get total reserved quantity for an item across all users.
@@ -454,15 +656,13 @@ class InventoryCacheService:
             # Get all users who have reserved this item
             reservations_set_key = self._get_all_reservations_key(item_id)
             user_ids = await self.redis_client.smembers(reservations_set_key)
+            if not user_ids:
+                return 0
 
-            total_reserved = 0
-            for user_id in user_ids:
-                reservation_key = self._get_reservation_key(item_id, user_id)
-                reserved_qty = await self.redis_client.get(reservation_key)
-                if reserved_qty:
-                    total_reserved += int(reserved_qty)
-
-            return total_reserved
+            quantities = await self.redis_client.mget(
+                [self._get_reservation_key(item_id, user_id) for user_id in user_ids]
+            )
+            return sum(int(qty) for qty in quantities if qty)
 
         except Exception as e:
             logger.error(
@@ -472,6 +672,62 @@ class InventoryCacheService:
             )
             return 0
 
+    # ========================================================================
+    # RESERVATION EXPIRY
+    # ========================================================================
+
+    async def reap_expired_reservations(self) -> Tuple[int, int]:
+        """
+        Return expired holds to available stock.
+
+        Returns:
+            (holds released, quantity returned)
+        """
+        if not self.enabled or not self.redis_client:
+            return 0, 0
+
+        holds = returned = 0
+        now_ms = int(time.time() * 1000)
+        while True:
+            batch_holds, batch_returned = await self._reap_script(
+                keys=[HOLDS_KEY],
+                args=[now_ms, REAPER_BATCH_SIZE, INVENTORY_PREFIX]
+            )
+            holds += batch_holds
+            returned += batch_returned
+            if batch_holds < REAPER_BATCH_SIZE:
+                break
+
+        if holds:
+            logger.info("expired_reservations_released", holds=holds, quantity_returned=returned)
+        return holds, returned
+
+    async def _reaper_loop(self):
+        while True:
+            await asyncio.sleep(REAPER_INTERVAL_SECONDS)
+            try:
+                await self.reap_expired_reservations()
+            except Exception as e:
+                logger.error("reservation_reaper_error", error=str(e))
+
+    def start_reservation_reaper(self):
+        """Start the background task releasing expired holds (no-op without a TTL)."""
+        if not self.enabled or not self.redis_client or not self.reservation_ttl:
+            return
+        if self._reaper_task and not self._reaper_task.done():
+            return
+        self._reaper_task = asyncio.create_task(self._reaper_loop())
+        logger.info("reservation_reaper_started", interval_seconds=REAPER_INTERVAL_SECONDS)
+
+    async def stop_reservation_reaper(self):
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+
     # ========================================================================
     # DATABASE SYNC (3-Column System)
     # ========================================================================
@@ -526,60 +782,195 @@ class InventoryCacheService:
     async def reserve_multiple_items(
         self,
         items: List[Dict[str, any]],
-        user_id: str
+        user_id: str,
+        skip_untracked: bool = False
     ) -> Dict:
         """
         Reserve multiple items atomically.
 
+        The whole cart is checked and reserved by one script call, so either
+        every item is held or nothing changes (no compensating releases).
+
         Args:
-            items: List of {item_id, quantity}
+            items: List of {item_id, quantity} (quantity is the user's total hold)
             user_id: User ID
+            skip_untracked: Let items without an inventory count pass unreserved
 
         Returns:
             Dictionary with success status and details
         """
-        reserved_items = []
-        failed_items = []
-
+        # Repeated items add up to one hold
+        quantities: Dict[str, int] = {}
         for item in items:
             item_id = item.get("item_id")
-            quantity = item.get("quantity", 1)
+            quantities[item_id] = quantities.get(item_id, 0) + item.get("quantity", 1)
 
-            try:
-                result = await self.reserve_inventory(item_id, quantity, user_id)
-                reserved_items.append(result)
+        if not self.enabled or not self.redis_client:
+            reserved = [await self.reserve_inventory(item_id, qty, user_id) for item_id, qty in quantities.items()]
+            return {"success": True, "reserved_items": reserved, "failed_items": []}
 
-            except InventoryReservationError as e:
-                failed_items.append({
-                    "item_id": item_id,
-                    "quantity": quantity,
-                    "error": str(e)
-                })
+        try:
+            failed = await self._run_reserve(quantities, user_id, skip_untracked)
+        except Exception as e:
+            logger.error("reserve_multiple_items_error", user_id=user_id, error=str(e))
+            failed = [{"item_id": item_id, "reason": "error", "available": -1} for item_id in quantities]
 
-        # If any failed, rollback all successful reservations
-        if failed_items:
+        if failed:
             logger.warning(
-                "partial_reservation_failure_rolling_back",
+                "cart_reservation_rejected",
                 user_id=user_id,
-                failed_count=len(failed_items)
+                failed_count=len(failed)
             )
-
-            # Rollback successful reservations
-            for reserved in reserved_items:
-                await self.release_reservation(reserved["item_id"], user_id)
-
             return {
                 "success": False,
                 "reserved_items": [],
-                "failed_items": failed_items
+                "failed_items": [
+                    {
+                        "item_id": failure["item_id"],
+                        "quantity": quantities[failure["item_id"]],
+                        "reason": failure["reason"],
+                        "available": failure["available"],
+                        "error": self._failure_message(failure, quantities[failure["item_id"]])
+                    }
+                    for failure in failed
+                ]
             }
 
+        logger.info("cart_reserved", user_id=user_id, item_count=len(quantities), ttl_seconds=self.reservation_ttl)
         return {
             "success": True,
-            "reserved_items": reserved_items,
+            "reserved_items": [
+                {
+                    "item_id": item_id,
+                    "quantity": quantity,
+                    "user_id": user_id,
+                    "reserved": True,
+                    "expires_in_seconds": self.reservation_ttl
+                }
+                for item_id, quantity in quantities.items()
+            ],
             "failed_items": []
         }
 
+    async def release_cart_reservations(self, item_ids: List[str], user_id: str) -> int:
+        """
+        Release a user's holds on several items in one script call.
+
+        Returns:
+            Quantity returned to available stock
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        if not self.enabled or not self.redis_client or not item_ids:
+            return 0
+
+        try:
+            released = await self._release_script(
+                keys=self._script_keys(item_ids, user_id),
+                args=[user_id, *item_ids]
+            )
+        except Exception as e:
+            logger.error("release_cart_reservations_error", user_id=user_id, error=str(e))
+            return 0
+
+        if released:
+            logger.info("cart_reservations_released", user_id=user_id, quantity_released=released)
+        return int(released)
+
+    async def hold_cart_for_checkout(
+        self,
+        items: List[Dict[str, any]],
+        session_id: str
+    ) -> Dict:
+        """
+        Move a cart's holds to its order at checkout, atomically.
+
+        Nothing is sold yet: the order holds the stock for
+        INVENTORY_CHECKOUT_HOLD_TTL_SECONDS, until settle_checkout_hold()
+        records the payment outcome (or the reaper releases an abandoned
+        order). Holds that expired since the items were added are reserved
+        again from available stock; if that stock is gone, nothing changes
+        and the items are reported back.
+
+        Args:
+            items: List of {item_id, quantity}
+            session_id: Session holding the cart reservations
+
+        Returns:
+            Dictionary with success status, re-reserved item ids and failed items
+        """
+        quantities: Dict[str, int] = {}
+        for item in items:
+            item_id = item.get("item_id")
+            quantities[item_id] = quantities.get(item_id, 0) + item.get("quantity", 1)
+
+        if not self.enabled or not self.redis_client or not quantities:
+            return {"success": True, "rereserved": [], "failed_items": []}
+
+        order_holder = self._order_holder(session_id)
+        item_ids = list(quantities)
+        keys = [HOLDS_KEY, self._get_checkout_key(session_id)]
+        for item_id in item_ids:
+            keys.extend((
+                self._get_inventory_key(item_id),
+                self._get_reservation_key(item_id, session_id),
+                self._get_all_reservations_key(item_id),
+                self._get_reservation_key(item_id, order_holder),
+                self._get_all_reservations_key(item_id),
+            ))
+        expires_at = int((time.time() + CHECKOUT_HOLD_TTL_SECONDS) * 1000) if CHECKOUT_HOLD_TTL_SECONDS else 0
+        args = [session_id, order_holder, expires_at, CHECKOUT_HOLD_TTL_SECONDS, INVENTORY_PREFIX]
+        for item_id in item_ids:
+            args.extend((item_id, quantities[item_id]))
+
+        try:
+            ok, result = await self._checkout_script(keys=keys, args=args)
+        except Exception as e:
+            logger.error("hold_cart_for_checkout_error", session_id=session_id, error=str(e))
+            return {
+                "success": False,
+                "rereserved": [],
+                "failed_items": [
+                    {
+                        "item_id": item_id,
+                        "quantity": quantity,
+                        "available": -1,
+                        "error": f"Failed to hold inventory: {str(e)}"
+                    }
+                    for item_id, quantity in quantities.items()
+                ]
+            }
+
+        def _text(value):
+            return value.decode() if isinstance(value, bytes) else value
+
+        if not ok:
+            failed_items = []
+            for item_id, held, available in result:
+                item_id = _text(item_id)
+                failed_items.append({
+                    "item_id": item_id,
+                    "quantity": quantities[item_id],
+                    "held": int(held),
+                    "available": int(available),
+                    "error": (
+                        f"Reservation for item {item_id} expired and stock ran out. "
+                        f"Available: {int(available)}, Requested: {quantities[item_id]}"
+                    )
+                })
+            logger.warning("checkout_hold_rejected", session_id=session_id, failed_count=len(failed_items))
+            return {"success": False, "rereserved": [], "failed_items": failed_items}
+
+        rereserved = [_text(item_id) for item_id in result]
+        if rereserved:
+            logger.info("expired_reservations_rereserved", session_id=session_id, item_ids=rereserved)
+        logger.info(
+            "checkout_hold_placed",
+            session_id=session_id,
+            item_count=len(quantities),
+            ttl_seconds=CHECKOUT_HOLD_TTL_SECONDS
+        )
+        return {"success": True, "rereserved": rereserved, "failed_items": []}
+
     # ========================================================================
     # STATISTICS & MONITORING
     # ========================================================================
@@ -639,3 +1030,38 @@ def get_inventory_cache_service() -> InventoryCacheService:
         _inventory_cache_instance = InventoryCacheService()
 
     return _inventory_cache_instance
+
+
+def settle_checkout_hold(session_id: str, sold: bool) -> int:
+    """
+    Settle the stock held for a session's unpaid order (sync: called from the
+    payment state transitions, which run in routes and tool threads alike).
+
+    sold=True on payment success or an offline (cash/card) order: the stock
+    stays deducted. sold=False on payment failure or cancellation: it goes
+    back to available. A session without held stock is a no-op.
+
+    Returns:
+        Number of items settled
+    """
+    if os.getenv("ENABLE_INVENTORY_CACHE", "true").lower() != "true":
+        return 0
+
+    from app.core.redis import get_sync_redis_client
+    try:
+        settled = get_sync_redis_client().eval(
+            _SETTLE_SCRIPT,
+            2,
+            HOLDS_KEY,
+            InventoryCacheService._get_checkout_key(session_id),
+            InventoryCacheService._order_holder(session_id),
+            INVENTORY_PREFIX,
+            1 if sold else 0,
+        )
+    except Exception as e:
+        logger.error("settle_checkout_hold_error", session_id=session_id, sold=sold, error=str(e))
+        return 0
+
+    if settled:
+        logger.info("checkout_hold_settled", session_id=session_id, sold=sold, item_count=settled)
+    return int(settled)
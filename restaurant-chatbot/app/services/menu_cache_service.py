@@ -11,12 +11,14 @@ Architecture:
 
 Flow:
 1. Startup → Load all menu items from DB to Redis
-2. Cart operations → Get item data from Redis (no DB query)
-3. Menu update → Refresh specific items in Redis
+2. Cart operations → Get item data from the process-local tier, then Redis (no DB query)
+3. Menu update → Refresh specific items in Redis, invalidate local copies on all workers
+4. Menu change set (PetPooja sync) → apply_menu_changes: only the changed
+   items are re-read (one query) and rewritten (one pipeline)
 """
 
 import os
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Any
 from datetime import datetime
 import structlog
 import json
@@ -24,11 +26,15 @@ import json
 from app.features.food_ordering.models import MenuItem, MenuCategory, MenuItemCategoryMapping, MenuItemAvailabilitySchedule
 from app.core.database import get_db_session
 from app.core.redis import get_redis_client
+from app.core.two_tier_cache import get_two_tier_cache
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 logger = structlog.get_logger(__name__)
 
+# Change sets are applied to Redis by one worker; the marker expires after this
+MENU_CHANGE_CLAIM_TTL_SECONDS = int(os.getenv("MENU_CHANGE_CLAIM_TTL_SECONDS", "600"))
+
 
 class MenuCacheService:
     """
@@ -59,6 +65,9 @@ class MenuCacheService:
             self.enabled = False
             return
 
+        # Item/category reads go through a process-local tier in front of Redis
+        self.local_tier = get_two_tier_cache("menu")
+
         # Cache TTL: None (indefinite, manually refreshed)
         # Menu data doesn't expire - it's updated on menu changes
         self.cache_ttl = None
@@ -228,6 +237,8 @@ class MenuCacheService:
                     # Execute pipeline
                     await pipe.execute()
 
+                await self.local_tier.invalidate(prefixes=["menu:"])
+
                 logger.info(
                     "menu_cache_load_completed",
                     items_cached=cached_items,
@@ -329,6 +340,8 @@ class MenuCacheService:
 
                     await pipe.execute()
 
+                await self.local_tier.invalidate(keys=[item_key])
+
                 logger.info("menu_item_refreshed", item_id=item_id, item_name=item.menu_item_name)
 
         except Exception as e:
@@ -357,11 +370,157 @@ class MenuCacheService:
                 await pipe.srem(self._get_all_menu_items_key(), item_id)
                 await pipe.execute()
 
+            await self.local_tier.invalidate(keys=[item_key])
+
             logger.info("menu_item_removed", item_id=item_id)
 
         except Exception as e:
             logger.error("menu_item_remove_error", item_id=item_id, error=str(e))
 
+    async def refresh_items(self, item_ids: List[str]) -> Dict[str, int]:
+        """
+        Refresh several items in one query and one pipeline.
+
+        Items that are gone, deleted or out of stock are removed from the
+        cache (load_menu_from_db caches in-stock items only).
+
+        Args:
+            item_ids: Menu item IDs to refresh
+
+        Returns:
+            {"refreshed": n, "removed": n}
+        """
+        if not self.enabled or not self.redis_client or not item_ids:
+            return {"refreshed": 0, "removed": 0}
+
+        async with get_db_session() as db_session:
+            result = await db_session.execute(
+                select(MenuItem)
+                .options(
+                    selectinload(MenuItem.category_mappings),
+                    selectinload(MenuItem.availability_schedules).selectinload(MenuItemAvailabilitySchedule.meal_type)
+                )
+                .where(MenuItem.menu_item_id.in_(item_ids))
+            )
+            items = {str(item.menu_item_id): item for item in result.scalars().all()}
+
+            category_ids = {
+                item.category_mappings[0].menu_category_id
+                for item in items.values() if item.category_mappings
+            }
+            category_names = {}
+            if category_ids:
+                cat_result = await db_session.execute(
+                    select(MenuCategory).where(MenuCategory.menu_category_id.in_(category_ids))
+                )
+                category_names = {
+                    str(category.menu_category_id): category.menu_category_name
+                    for category in cat_result.scalars().all()
+                }
+
+        refreshed = 0
+        removed = 0
+        item_keys = []
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for item_id in item_ids:
+                item_key = self._get_menu_item_key(item_id)
+                item_keys.append(item_key)
+                item = items.get(item_id)
+
+                if item is None or item.is_deleted or not item.menu_item_in_stock:
+                    await pipe.delete(item_key)
+                    await pipe.srem(self._get_all_menu_items_key(), item_id)
+                    removed += 1
+                    continue
+
+                category_id = None
+                if item.category_mappings:
+                    category_id = str(item.category_mappings[0].menu_category_id)
+
+                meal_timings = []
+                for schedule in item.availability_schedules or []:
+                    if schedule.meal_type and not schedule.is_deleted:
+                        meal_name = schedule.meal_type.meal_type_name.lower()
+                        if meal_name not in meal_timings:
+                            meal_timings.append(meal_name)
+
+                item_data = {
+                    "id": item_id,
+                    "name": item.menu_item_name,
+                    "price": float(item.menu_item_price),
+                    "category_id": category_id,
+                    "category_name": category_names.get(category_id, "Unknown"),
+                    "description": item.menu_item_description or "",
+                    "is_available": item.menu_item_in_stock,
+                    "is_popular": item.menu_item_is_recommended or False,
+                    "spice_level": item.menu_item_spice_level or "",
+                    "calories": item.menu_item_calories or 0,
+                    "prep_time_minutes": item.menu_item_minimum_preparation_time or 0,
+                    "availability_time": ",".join(meal_timings) if meal_timings else None,
+                    "cached_at": datetime.now().isoformat()
+                }
+                await pipe.set(item_key, json.dumps(item_data))
+                await pipe.sadd(self._get_all_menu_items_key(), item_id)
+                if category_id:
+                    await pipe.sadd(self._get_category_items_key(category_id), item_id)
+                refreshed += 1
+
+            await pipe.execute()
+
+        await self.local_tier.invalidate(keys=item_keys)
+        return {"refreshed": refreshed, "removed": removed}
+
+    async def apply_menu_changes(self, change: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Apply a menu change set (see app.core.menu_changes) to the Redis cache.
+
+        Every worker receives the change set; the first one to claim it
+        (SET NX on menu:changes:{change_id}) writes Redis, and local copies
+        are invalidated on all workers through the two-tier cache. If
+        applying it fails, the claiming worker reloads the full menu instead.
+
+        Returns:
+            {"refreshed": n, "removed": n, "reloaded": 0 | 1}; all 0 when
+            another worker applied it
+        """
+        applied = {"refreshed": 0, "removed": 0, "reloaded": 0}
+        if not self.enabled or not self.redis_client:
+            return applied
+
+        try:
+            change_id = change.get("change_id")
+            if change_id:
+                claimed = await self.redis_client.set(
+                    f"menu:changes:{change_id}", "1", nx=True, ex=MENU_CHANGE_CLAIM_TTL_SECONDS
+                )
+                if not claimed:
+                    return applied
+
+            if change.get("full") or change.get("categories_changed"):
+                await self.load_menu_from_db()
+                applied["reloaded"] = 1
+                return applied
+
+            items = change.get("items") or {}
+            stock = change.get("stock") or {}
+            item_ids = []
+            for ids in (
+                items.get("added"), items.get("updated"), items.get("removed"), stock.get("in"), stock.get("out")
+            ):
+                item_ids.extend(ids or [])
+            # Removed items come back deleted and are dropped like any other
+            counts = await self.refresh_items(list(dict.fromkeys(item_ids)))
+            applied.update(counts)
+            return applied
+
+        except Exception as e:
+            logger.error("menu_cache_apply_changes_error", change_id=change.get("change_id"), error=str(e), exc_info=True)
+            # Nobody else will apply it: the other workers skipped the claimed
+            # change set and NOTIFY is never redelivered. Rebuild the whole cache.
+            await self.load_menu_from_db()
+            applied["reloaded"] = 1
+            return applied
+
     # ========================================================================
     # GET MENU DATA FROM CACHE
     # ========================================================================
@@ -382,7 +541,7 @@ class MenuCacheService:
 
         try:
             item_key = self._get_menu_item_key(item_id)
-            item_json = await self.redis_client.get(item_key)
+            item_json = await self.local_tier.get(item_key)
 
             if not item_json:
                 # Cache miss - try loading from database
@@ -390,7 +549,7 @@ class MenuCacheService:
                 await self.refresh_item(item_id)
 
                 # Try again
-                item_json = await self.redis_client.get(item_key)
+                item_json = await self.local_tier.get(item_key)
                 if not item_json:
                     return None
 
@@ -482,7 +641,7 @@ class MenuCacheService:
 
         try:
             category_key = self._get_category_key(category_id)
-            category_json = await self.redis_client.get(category_key)
+            category_json = await self.local_tier.get(category_key)
 
             if not category_json:
                 logger.warning("category_cache_miss", category_id=category_id)
@@ -514,11 +673,7 @@ class MenuCacheService:
 
             # Fetch all category data
             categories = []
-            async with self.redis_client.pipeline(transaction=False) as pipe:
-                for category_id in category_ids:
-                    await pipe.get(self._get_category_key(category_id))
-
-                results = await pipe.execute()
+            results = await self.local_tier.mget([self._get_category_key(category_id) for category_id in category_ids])
 
             for category_json in results:
                 if category_json:
@@ -556,11 +711,7 @@ class MenuCacheService:
 
             # Fetch all item data
             items = []
-            async with self.redis_client.pipeline(transaction=False) as pipe:
-                for item_id in item_ids:
-                    await pipe.get(self._get_menu_item_key(item_id))
-
-                results = await pipe.execute()
+            results = await self.local_tier.mget([self._get_menu_item_key(item_id) for item_id in item_ids])
 
             for item_json in results:
                 if item_json:
@@ -590,11 +741,7 @@ class MenuCacheService:
 
             # Fetch all item data
             items = []
-            async with self.redis_client.pipeline(transaction=False) as pipe:
-                for item_id in item_ids:
-                    await pipe.get(self._get_menu_item_key(item_id))
-
-                results = await pipe.execute()
+            results = await self.local_tier.mget([self._get_menu_item_key(item_id) for item_id in item_ids])
 
             for item_json in results:
                 if item_json:
@@ -626,7 +773,8 @@ class MenuCacheService:
             return {
                 "enabled": True,
                 "total_items_cached": len(item_ids),
-                "cache_keys_used": len(item_ids) + 1  # items + all_items_set
+                "cache_keys_used": len(item_ids) + 1,  # items + all_items_set
+                "tiers": self.local_tier.get_stats()
             }
 
         except Exception as e:
@@ -109,6 +109,14 @@ def set_payment_state(session_id: str, state: Dict[str, Any], ttl_hours: int = 2
         return False
 
 
+def _settle_inventory(session_id: str, step: PaymentStep) -> None:
+    """Sell or release the stock held for the order once payment is decided."""
+    if step not in (PaymentStep.PAYMENT_SUCCESS, PaymentStep.CASH_SELECTED, PaymentStep.PAYMENT_FAILED):
+        return
+    from app.services.inventory_cache_service import settle_checkout_hold
+    settle_checkout_hold(session_id, sold=step != PaymentStep.PAYMENT_FAILED)
+
+
 def init_payment_workflow(
     session_id: str,
     order_id: str,
@@ -204,6 +212,7 @@ def update_payment_step(
     ]
 
     set_payment_state(session_id, state)
+    _settle_inventory(session_id, step)
 
     logger.info(
         "payment_step_updated",
@@ -238,6 +247,7 @@ def mark_payment_success(
     state["completed_at"] = datetime.now().isoformat()
 
     set_payment_state(session_id, state)
+    _settle_inventory(session_id, PaymentStep.PAYMENT_SUCCESS)
 
     logger.info(
         "payment_success",
@@ -271,6 +281,7 @@ def mark_payment_failed(
     state["failed_at"] = datetime.now().isoformat()
 
     set_payment_state(session_id, state)
+    _settle_inventory(session_id, PaymentStep.PAYMENT_FAILED)
 
     logger.info(
         "payment_failed",
@@ -1,31 +1,116 @@
 """
 Rate Limiting Service for Multi-Tenant API
 Provides configurable rate limiting per restaurant API key
+
+One Lua call checks and counts every window (minute/hour/day) of a subject
+atomically, so concurrent requests can't all pass a check before any of them
+is counted. Used by the HTTP middleware (per restaurant / client) and the chat
+WebSocket (per session).
+
+Each window is a sliding-window counter: the count of the current fixed
+bucket plus the previous bucket's count weighted by how much of it still
+overlaps the window. All windows of a subject live in one hash:
+- rate_limit:sw:{subject}   b{i} (bucket number), c{i} (current), p{i} (previous)
+
+Timestamps come from the Redis clock (TIME), so workers agree on buckets.
 """
-import time
-from typing import Optional, Dict, Any
+import os
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import structlog
 
-from app.services.cache_service import CacheService
-
 logger = structlog.get_logger(__name__)
 
+RATE_LIMIT_KEY_PREFIX = "rate_limit:sw:"
+
+# Chat WebSocket messages per session
+WS_RATE_LIMIT_MESSAGES = int(os.getenv("WS_RATE_LIMIT_MESSAGES", "10"))
+WS_RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("WS_RATE_LIMIT_WINDOW_SECONDS", "60"))
+
+WINDOW_NAMES = {60: "minute", 3600: "hour", 86400: "day"}
+
+# KEYS: subject hash
+# ARGV: cost, then per window: window_seconds, limit
+# Returns {allowed (1/0), then per window: count (after this request if
+#          allowed), retry_after_ms (0 unless this window denied it)}
+_SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local cost = tonumber(ARGV[1])
+local n = (#ARGV - 1) / 2
+local allowed = 1
+local state = {}
+local longest = 0
+
+for i = 1, n do
+  local window = tonumber(ARGV[2 * i]) * 1000
+  local limit = tonumber(ARGV[2 * i + 1])
+  if window > longest then longest = window end
+  local bucket = math.floor(now / window)
+  local elapsed = now - bucket * window
+  local fields = redis.call('HMGET', KEYS[1], 'b' .. i, 'c' .. i, 'p' .. i)
+  local stored = tonumber(fields[1] or '-1')
+  local cur, prev = tonumber(fields[2] or '0'), tonumber(fields[3] or '0')
+  if stored ~= bucket then
+    if stored == bucket - 1 then prev = cur else prev = 0 end
+    cur = 0
+  end
+  local count = prev * (window - elapsed) / window + cur
+  local retry = 0
+  if count + cost > limit then
+    allowed = 0
+    if cur + cost > limit then
+      -- this bucket alone is over: wait for it to roll over and then decay
+      if cur > 0 and limit >= cost then
+        retry = (window - elapsed) + math.ceil(window * (1 - (limit - cost) / cur))
+      else
+        retry = (window - elapsed) + window
+      end
+    else
+      -- wait until enough of the previous bucket has slid out
+      retry = math.ceil(window * (1 - (limit - cur - cost) / prev)) - elapsed
+    end
+    if retry < 1 then retry = 1 end
+  end
+  state[i] = {bucket, cur, prev, count, retry}
+end
+
+local result = {allowed}
+for i = 1, n do
+  local s = state[i]
+  if allowed == 1 then
+    s[2] = s[2] + cost
+    s[4] = s[4] + cost
+  end
+  redis.call('HSET', KEYS[1], 'b' .. i, s[1], 'c' .. i, s[2], 'p' .. i, s[3])
+  result[#result + 1] = math.ceil(s[4])
+  result[#result + 1] = s[5]
+end
+redis.call('PEXPIRE', KEYS[1], longest * 2)
+return result
+"""
+
+
+def subject_key(subject: str) -> str:
+    return f"{RATE_LIMIT_KEY_PREFIX}{subject}"
+
 
 class RateLimiter:
     """
     Redis-based rate limiter for API requests.
 
     Features:
-    - Sliding window rate limiting
-    - Per-restaurant limits
+    - Sliding window rate limiting (one atomic Lua call per check)
+    - Per-restaurant and per-session limits
     - Configurable windows (minute, hour, day)
     - Graceful degradation if Redis unavailable
     """
 
-    def __init__(self, cache_service: Optional[CacheService] = None):
-        self.cache = cache_service or CacheService()
+    def __init__(self, cache_service: Optional[Any] = None, redis_client=None):
+        self.cache = cache_service
+        self._redis_client = redis_client
+        self._script = None
 
         self.default_limits = {
             "requests_per_minute": 60,
@@ -35,6 +120,23 @@ class RateLimiter:
 
         self.custom_limits: Dict[str, Dict[str, int]] = {}
 
+    @property
+    def redis_client(self):
+        """
+        Shared Redis pool (resolved lazily so the limiter can be built before
+        Redis init). A cache service's client is used when one is passed.
+        """
+        if self._redis_client is None:
+            if self.cache is not None and self.cache.redis_client is not None:
+                self._redis_client = self.cache.redis_client
+            else:
+                from app.core.redis import get_redis_client
+                try:
+                    self._redis_client = get_redis_client()
+                except RuntimeError:
+                    return None
+        return self._redis_client
+
     def set_custom_limits(self, restaurant_id: str, limits: Dict[str, int]):
         """
         Set custom rate limits for a specific restaurant.
@@ -54,6 +156,106 @@ class RateLimiter:
         """Get rate limits for restaurant (custom or default)"""
         return self.custom_limits.get(restaurant_id, self.default_limits)
 
+    @staticmethod
+    def windows_for(limits: Dict[str, int]) -> List[Tuple[int, int]]:
+        return [
+            (60, limits["requests_per_minute"]),
+            (3600, limits["requests_per_hour"]),
+            (86400, limits["requests_per_day"]),
+        ]
+
+    async def hit(
+        self,
+        subject: str,
+        windows: Sequence[Tuple[int, int]],
+        cost: int = 1
+    ) -> Tuple[bool, List[Tuple[int, int, int, int]]]:
+        """
+        Check and count one request against every window of a subject.
+
+        Args:
+            subject: Key suffix, e.g. "restaurant:{id}" or "session:{id}"
+            windows: (window_seconds, limit) pairs
+            cost: Units this request uses
+
+        Returns:
+            (allowed, [(window_seconds, limit, count, retry_after_ms) per window])
+
+        Raises:
+            RuntimeError: Redis is not initialized
+        """
+        client = self.redis_client
+        if client is None:
+            raise RuntimeError("Redis not initialized")
+        if self._script is None:
+            self._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+
+        args: List[Any] = [int(cost)]
+        for window, limit in windows:
+            args.extend((int(window), int(limit)))
+        result = await self._script(keys=[subject_key(subject)], args=args)
+
+        values = [int(v) for v in result]
+        return bool(values[0]), [
+            (window, limit, values[1 + 2 * i], values[2 + 2 * i])
+            for i, (window, limit) in enumerate(windows)
+        ]
+
+    def _allow_all(self, window: int, limit: int) -> Dict[str, Any]:
+        return {
+            "allowed": True,
+            "limit": limit,
+            "remaining": limit,
+            "reset_at": datetime.now() + timedelta(seconds=window),
+            "retry_after": 0,
+            "window": WINDOW_NAMES.get(window, f"{window}s")
+        }
+
+    async def check_subject(self, subject: str, windows: Sequence[Tuple[int, int]], cost: int = 1) -> Dict[str, Any]:
+        """
+        Check a subject against its windows.
+
+        Returns:
+            dict: {
+                "allowed": bool,
+                "limit": int (of the window that denied, else the shortest),
+                "remaining": int,
+                "reset_at": datetime,
+                "retry_after": int (seconds),
+                "window": "minute" | "hour" | "day" | "{n}s"
+            }
+        """
+        try:
+            allowed, usage = await self.hit(subject, windows, cost)
+        except RuntimeError:
+            logger.warning("rate_limiter_redis_unavailable_allowing_request")
+            return self._allow_all(*windows[0])
+        except Exception as e:
+            logger.error("rate_limit_check_error", error=str(e))
+            return self._allow_all(*windows[0])
+
+        window, limit, count, retry_ms = usage[0]
+        if not allowed:
+            window, limit, count, retry_ms = max(usage, key=lambda entry: entry[3])
+        window_name = WINDOW_NAMES.get(window, f"{window}s")
+        retry_after = -(-retry_ms // 1000)
+
+        if not allowed:
+            logger.warning(
+                f"rate_limit_exceeded_{window_name}",
+                subject=subject,
+                count=count,
+                limit=limit
+            )
+        return {
+            "allowed": allowed,
+            "limit": limit,
+            "remaining": max(0, limit - count),
+            "reset_at": datetime.now() + timedelta(seconds=retry_after if not allowed else window),
+            "retry_after": retry_after,
+            "window": window_name
+        }
+
     async def check_rate_limit(
         self,
         restaurant_id: str,
@@ -75,103 +277,17 @@ class RateLimiter:
                 "retry_after": int (seconds)
             }
         """
-        try:
-            limits = self.get_limits(restaurant_id)
-
-            minute_key = f"rate_limit:{restaurant_id}:minute:{int(time.time() // 60)}"
-            hour_key = f"rate_limit:{restaurant_id}:hour:{int(time.time() // 3600)}"
-            day_key = f"rate_limit:{restaurant_id}:day:{int(time.time() // 86400)}"
-
-            if not self.cache.redis_client:
-                logger.warning("rate_limiter_redis_unavailable_allowing_request")
-                return {
-                    "allowed": True,
-                    "limit": limits["requests_per_minute"],
-                    "remaining": limits["requests_per_minute"],
-                    "reset_at": datetime.now() + timedelta(minutes=1),
-                    "retry_after": 0
-                }
-
-            minute_count = await self.cache.redis_client.get(minute_key)
-            minute_count = int(minute_count) if minute_count else 0
-
-            hour_count = await self.cache.redis_client.get(hour_key)
-            hour_count = int(hour_count) if hour_count else 0
-
-            day_count = await self.cache.redis_client.get(day_key)
-            day_count = int(day_count) if day_count else 0
-
-            if minute_count >= limits["requests_per_minute"]:
-                logger.warning(
-                    "rate_limit_exceeded_minute",
-                    restaurant_id=restaurant_id,
-                    count=minute_count,
-                    limit=limits["requests_per_minute"]
-                )
-                return {
-                    "allowed": False,
-                    "limit": limits["requests_per_minute"],
-                    "remaining": 0,
-                    "reset_at": datetime.now() + timedelta(seconds=60 - (int(time.time()) % 60)),
-                    "retry_after": 60 - (int(time.time()) % 60)
-                }
-
-            if hour_count >= limits["requests_per_hour"]:
-                logger.warning(
-                    "rate_limit_exceeded_hour",
-                    restaurant_id=restaurant_id,
-                    count=hour_count,
-                    limit=limits["requests_per_hour"]
-                )
-                return {
-                    "allowed": False,
-                    "limit": limits["requests_per_hour"],
-                    "remaining": 0,
-                    "reset_at": datetime.now() + timedelta(seconds=3600 - (int(time.time()) % 3600)),
-                    "retry_after": 3600 - (int(time.time()) % 3600)
-                }
-
-            if day_count >= limits["requests_per_day"]:
-                logger.warning(
-                    "rate_limit_exceeded_day",
-                    restaurant_id=restaurant_id,
-                    count=day_count,
-                    limit=limits["requests_per_day"]
-                )
-                return {
-                    "allowed": False,
-                    "limit": limits["requests_per_day"],
-                    "remaining": 0,
-                    "reset_at": datetime.now() + timedelta(seconds=86400 - (int(time.time()) % 86400)),
-                    "retry_after": 86400 - (int(time.time()) % 86400)
-                }
-
-            await self.cache.redis_client.incr(minute_key)
-            await self.cache.redis_client.expire(minute_key, 60)
-
-            await self.cache.redis_client.incr(hour_key)
-            await self.cache.redis_client.expire(hour_key, 3600)
-
-            await self.cache.redis_client.incr(day_key)
-            await self.cache.redis_client.expire(day_key, 86400)
-
-            return {
-                "allowed": True,
-                "limit": limits["requests_per_minute"],
-                "remaining": limits["requests_per_minute"] - minute_count - 1,
-                "reset_at": datetime.now() + timedelta(seconds=60 - (int(time.time()) % 60)),
-                "retry_after": 0
-            }
+        subject = f"restaurant:{restaurant_id}" + (f":{endpoint}" if endpoint else "")
+        return await self.check_subject(subject, self.windows_for(self.get_limits(restaurant_id)))
 
-        except Exception as e:
-            logger.error("rate_limit_check_error", error=str(e))
-            return {
-                "allowed": True,
-                "limit": self.default_limits["requests_per_minute"],
-                "remaining": self.default_limits["requests_per_minute"],
-                "reset_at": datetime.now() + timedelta(minutes=1),
-                "retry_after": 0
-            }
+    async def check_session_rate_limit(
+        self,
+        session_id: str,
+        limit: int = WS_RATE_LIMIT_MESSAGES,
+        window_seconds: int = WS_RATE_LIMIT_WINDOW_SECONDS
+    ) -> Dict[str, Any]:
+        """Per-session message limit (chat WebSocket)."""
+        return await self.check_subject(f"session:{session_id}", [(window_seconds, limit)])
 
     async def reset_limits(self, restaurant_id: str):
         """
@@ -181,25 +297,22 @@ class RateLimiter:
             restaurant_id: Restaurant ID
         """
         try:
-            if not self.cache.redis_client:
+            if not self.redis_client:
                 return
 
-            minute_pattern = f"rate_limit:{restaurant_id}:minute:*"
-            hour_pattern = f"rate_limit:{restaurant_id}:hour:*"
-            day_pattern = f"rate_limit:{restaurant_id}:day:*"
-
-            for pattern in [minute_pattern, hour_pattern, day_pattern]:
-                cursor = 0
-                while True:
-                    cursor, keys = await self.cache.redis_client.scan(
-                        cursor=cursor,
-                        match=pattern,
-                        count=100
-                    )
-                    if keys:
-                        await self.cache.redis_client.delete(*keys)
-                    if cursor == 0:
-                        break
+            # Restaurant-wide and per-endpoint subjects
+            keys = [subject_key(f"restaurant:{restaurant_id}")]
+            cursor = 0
+            while True:
+                cursor, found = await self.redis_client.scan(
+                    cursor=cursor,
+                    match=subject_key(f"restaurant:{restaurant_id}:*"),
+                    count=100
+                )
+                keys.extend(found)
+                if cursor == 0:
+                    break
+            await self.redis_client.delete(*keys)
 
             logger.info("rate_limits_reset", restaurant_id=restaurant_id)
 
@@ -50,7 +50,8 @@ class RestaurantCache:
 
     def __init__(self, cache_service: Optional[ResponseCacheService] = None):
         """Initialize with cache service"""
-        self.cache_service = cache_service or ResponseCacheService()
+        # Config is read on every request and rarely changes: keep a process-local copy
+        self.cache_service = cache_service or ResponseCacheService(local_tier="restaurant")
         self.cache_ttl = timedelta(hours=24)  # 24-hour TTL
         self.key_prefix = "restaurant:"
         self.id_key_prefix = "restaurant_id:"
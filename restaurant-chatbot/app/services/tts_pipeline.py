@@ -0,0 +1,349 @@
+"""
+Sentence TTS Pipeline and Phrase Audio Cache
+
+Voice replies are synthesized sentence by sentence. Instead of one TTS
+round trip after another (the gap between sentences was a full request),
+SentenceTTSPipeline starts the next sentences' requests while the current
+one streams:
+
+- Bounded: at most TTS_PREFETCH_SENTENCES sentences in flight (the one
+  playing included)
+- Ordered: audio always goes out in sentence order
+- Cancellable: stop() (stop_speech) cancels every request in flight
+
+PhraseAudioCache keeps synthesized PCM on disk, content-addressed by
+model + voice + speed + language + text, with LRU eviction at
+TTS_CACHE_MAX_MB. Repeated phrases ("Anything else?", the repeat-please
+prompt, order confirmations) are played from disk instead of synthesized
+again. Files are written atomically, so workers can share the directory.
+
+Usage:
+    pipeline = SentenceTTSPipeline(client, language=language)
+    state["tts_pipeline"] = pipeline  # stop_speech -> pipeline.stop()
+    async with aclosing(pipeline.stream(sentence_queue)) as chunks:
+        async for chunk in chunks:
+            await websocket.send_json(...)
+"""
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+TTS_MODEL = "tts-1"  # Faster model for real-time streaming
+TTS_VOICE = "nova"
+TTS_SPEED = 1.0
+TTS_CHUNK_SIZE = 4096
+
+TTS_PREFETCH_SENTENCES = max(1, int(os.getenv("TTS_PREFETCH_SENTENCES", "2")))
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "data/tts_cache")
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "256"))
+# Longer sentences are rarely repeated word for word: don't let them evict phrases
+TTS_CACHE_MAX_CHARS = int(os.getenv("TTS_CACHE_MAX_CHARS", "200"))
+
+
+# ============================================================================
+# PHRASE AUDIO CACHE
+# ============================================================================
+
+def phrase_key(
+    text: str,
+    language: str,
+    voice: str = TTS_VOICE,
+    model: str = TTS_MODEL,
+    speed: float = TTS_SPEED
+) -> str:
+    """Content address of a phrase's audio (whitespace-insensitive)."""
+    normalized = re.sub(r"\s+", " ", text).strip()
+    return hashlib.sha256(f"{model}|{voice}|{speed}|{language}|{normalized}".encode("utf-8")).hexdigest()
+
+
+class PhraseAudioCache:
+    """
+    On-disk PCM cache with LRU eviction.
+
+    Layout: {directory}/{key[:2]}/{key}.pcm. The LRU index is rebuilt from
+    file access times at startup; files another worker evicted are misses.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        # File I/O runs in worker threads
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pcm")
+
+    def _load_index(self) -> None:
+        entries = []
+        if os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(".pcm"):
+                        continue
+                    try:
+                        info = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    entries.append((max(info.st_atime, info.st_mtime), name[:-4], info.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._loaded = True
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+
+    def get_sync(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Recency survives restarts through the access time
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._bytes -= self._index.pop(key, 0)
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self.stats["hits"] += 1
+        return data
+
+    def put_sync(self, key: str, pcm: bytes) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pcm)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._bytes += len(pcm) - self._index.pop(key, 0)
+            self._index[key] = len(pcm)
+            self.stats["writes"] += 1
+            self._evict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def put(self, key: str, pcm: bytes) -> None:
+        try:
+            await asyncio.to_thread(self.put_sync, key, pcm)
+        except OSError as e:
+            logger.warning("tts_cache_write_failed", error=str(e))
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, "entries": len(self._index), "bytes": self._bytes}
+
+
+_phrase_cache: Optional[PhraseAudioCache] = None
+
+
+def get_phrase_cache() -> Optional[PhraseAudioCache]:
+    """Process-wide phrase cache (None when TTS_CACHE_ENABLED=false)."""
+    global _phrase_cache
+
+    if TTS_CACHE_ENABLED and _phrase_cache is None:
+        _phrase_cache = PhraseAudioCache()
+    return _phrase_cache
+
+
+# ============================================================================
+# SYNTHESIS
+# ============================================================================
+
+async def synthesize_phrase(
+    client,
+    text: str,
+    language: str,
+    cache: Optional[PhraseAudioCache] = None
+) -> AsyncIterator[bytes]:
+    """
+    PCM chunks of one phrase: from the cache, or streamed from the TTS API
+    (and cached once complete).
+    """
+    cacheable = cache is not None and len(text) <= TTS_CACHE_MAX_CHARS
+    key = phrase_key(text, language) if cacheable else None
+
+    if cacheable:
+        cached = await cache.get(key)
+        if cached is not None:
+            for start in range(0, len(cached), TTS_CHUNK_SIZE):
+                yield cached[start:start + TTS_CHUNK_SIZE]
+            return
+
+    parts: List[bytes] = []
+    async with client.audio.speech.with_streaming_response.create(
+        model=TTS_MODEL,
+        voice=TTS_VOICE,
+        input=text,
+        response_format="pcm",
+        speed=TTS_SPEED
+    ) as tts_response:
+        async for chunk in tts_response.iter_bytes(chunk_size=TTS_CHUNK_SIZE):
+            if chunk:
+                if cacheable:
+                    parts.append(chunk)
+                yield chunk
+
+    if cacheable and parts:
+        await cache.put(key, b"".join(parts))
+
+
+_END = object()
+
+
+class SentenceTTSPipeline:
+    """
+    Streams TTS audio for a sequence of sentences with prefetch.
+
+    Each sentence is synthesized by its own task into its own chunk queue;
+    the consumer drains the queues in sentence order. A sentence's slot is
+    freed once its audio has been handed out, so at most `prefetch`
+    sentences are being synthesized or waiting to play.
+    """
+
+    def __init__(
+        self,
+        client,
+        language: str = "English",
+        prefetch: int = TTS_PREFETCH_SENTENCES,
+        cache: Optional[PhraseAudioCache] = None
+    ):
+        self.client = client
+        self.language = language
+        self.prefetch = prefetch
+        self.cache = cache if cache is not None else get_phrase_cache()
+        self._slots = asyncio.Semaphore(prefetch)
+        self._ordered: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._current: Optional[asyncio.Queue] = None
+        self._stopped = False
+
+        # Timing (ms from stream start)
+        self.started_at: Optional[float] = None
+        self.first_audio_ms: Optional[float] = None
+        self.gaps_ms: List[float] = []
+        self.sentences = 0
+
+    async def _synthesize(self, sentence: str, chunks: asyncio.Queue) -> None:
+        try:
+            async for chunk in synthesize_phrase(self.client, sentence, self.language, self.cache):
+                chunks.put_nowait(chunk)
+            chunks.put_nowait(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            chunks.put_nowait(e)
+
+    async def _feed(self, sentence_queue: asyncio.Queue) -> None:
+        try:
+            while True:
+                sentence = await sentence_queue.get()
+                if sentence is None:
+                    break
+                if not sentence.strip():
+                    continue
+                await self._slots.acquire()
+                chunks: asyncio.Queue = asyncio.Queue()
+                self._tasks.append(asyncio.create_task(self._synthesize(sentence, chunks)))
+                self._ordered.put_nowait(chunks)
+        finally:
+            self._ordered.put_nowait(None)
+
+    async def stream(self, sentence_queue: asyncio.Queue) -> AsyncIterator[bytes]:
+        """
+        PCM chunks for the sentences put on sentence_queue (None ends it), in order.
+
+        Close the generator (contextlib.aclosing) to cancel outstanding requests.
+        """
+        self.started_at = time.perf_counter()
+        feeder = asyncio.create_task(self._feed(sentence_queue))
+        self._tasks.append(feeder)
+        last_chunk_at: Optional[float] = None
+        try:
+            while not self._stopped:
+                chunks = await self._ordered.get()
+                if chunks is None:
+                    break
+                self.sentences += 1
+                self._current = chunks
+                first = True
+                try:
+                    while True:
+                        chunk = await chunks.get()
+                        if chunk is _END or self._stopped:
+                            break
+                        if isinstance(chunk, Exception):
+                            raise chunk
+                        now = time.perf_counter()
+                        if first:
+                            first = False
+                            if last_chunk_at is None:
+                                self.first_audio_ms = (now - self.started_at) * 1000
+                            else:
+                                self.gaps_ms.append((now - last_chunk_at) * 1000)
+                        yield chunk
+                        last_chunk_at = time.perf_counter()
+                finally:
+                    self._slots.release()
+        finally:
+            self._cancel()
+
+    def stop(self) -> None:
+        """Stop playback now (stop_speech): cancels every request in flight."""
+        self._stopped = True
+        self._cancel()
+        # Wake the consumer wherever it is waiting
+        self._ordered.put_nowait(None)
+        if self._current is not None:
+            self._current.put_nowait(_END)
+
+    def _cancel(self) -> None:
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def timings(self):
+        return {
+            "sentences": self.sentences,
+            "first_audio_ms": round(self.first_audio_ms, 1) if self.first_audio_ms is not None else None,
+            "max_gap_ms": round(max(self.gaps_ms), 1) if self.gaps_ms else None,
+            "avg_gap_ms": round(sum(self.gaps_ms) / len(self.gaps_ms), 1) if self.gaps_ms else None,
+        }
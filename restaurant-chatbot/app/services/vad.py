@@ -7,18 +7,36 @@ Supports multiple VAD engines configurable via environment variable:
 - webrtc: WebRTC VAD - Lightweight, minimal resource usage
 
 Set VAD_ENGINE environment variable to select the engine.
+
+Model weights are loaded once per process (get_vad()). Each voice call owns a
+VADSession holding its own stream state (Silero's recurrent state and audio
+context, a WebRTC VAD instance), so callers don't bleed into each other, and
+detect_speech_batch() scores one frame from many sessions in a single model
+run (see app.services.audio_dsp.VADBatcher).
 """
 import os
 import numpy as np
 import structlog
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, List, Optional, Sequence
 
 logger = structlog.get_logger(__name__)
 
 # Environment variable for VAD engine selection
 VAD_ENGINE = os.getenv("VAD_ENGINE", "silero").lower()
 
+# Threads per ONNX inference (1 = one core per batch, like Silero's own wrapper)
+VAD_ONNX_THREADS = int(os.getenv("VAD_ONNX_THREADS", "1"))
+
+
+def _onnx_session(model_path: str):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.inter_op_num_threads = 1
+    options.intra_op_num_threads = VAD_ONNX_THREADS
+    return ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+
 
 class BaseVAD(ABC):
     """Abstract base class for VAD implementations"""
@@ -46,6 +64,57 @@ class BaseVAD(ABC):
         """Reset VAD state (if stateful)"""
         pass
 
+    def create_state(self) -> Any:
+        """New per-session stream state (None for stateless engines)"""
+        return None
+
+    def detect_speech_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        sample_rate: int = 16000,
+        states: Optional[Sequence[Any]] = None
+    ) -> List[float]:
+        """
+        Speech probability of one frame from each of several streams.
+
+        Args:
+            frames: float32 frames (normalized to -1.0 to 1.0), one per stream
+            sample_rate: Audio sample rate (default 16kHz)
+            states: Per-stream state from create_state(), updated in place;
+                    each state at most once per call
+
+        Returns:
+            Speech probabilities, in frame order
+        """
+        return [self.detect_speech(frame, sample_rate) for frame in frames]
+
+
+class VADSession:
+    """Per-call VAD stream state on the shared engine"""
+
+    __slots__ = ("vad", "state")
+
+    def __init__(self, vad: BaseVAD):
+        self.vad = vad
+        self.state = vad.create_state()
+
+    def reset(self):
+        self.state = self.vad.create_state()
+
+
+class SileroState:
+    """Recurrent state and trailing audio context of one Silero stream"""
+
+    __slots__ = ("rnn", "context", "sample_rate")
+
+    def __init__(self, sample_rate: int = 16000):
+        self.reset(sample_rate)
+
+    def reset(self, sample_rate: int = 16000):
+        self.rnn = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros(64 if sample_rate == 16000 else 32, dtype=np.float32)
+        self.sample_rate = sample_rate
+
 
 class SileroVAD(BaseVAD):
     """
@@ -59,24 +128,76 @@ class SileroVAD(BaseVAD):
     Cons:
     - Higher latency than WebRTC
     - Larger model size (~2MB)
+
+    Runs the ONNX build shipped with the silero-vad package directly, so the
+    recurrent state can be kept per session and frames from many sessions
+    stacked into one batch (the package's own wrappers keep one state per
+    model instance).
     """
 
     def __init__(self):
-        import torch
-        from silero_vad import load_silero_vad
-
         logger.info("Loading Silero VAD model...")
-        self.model = load_silero_vad()
-        self.torch = torch
+        self.session = _onnx_session(self._get_model_path())
+        self._state = SileroState()
         logger.info("Silero VAD model loaded successfully")
 
+    @staticmethod
+    def _get_model_path() -> str:
+        """silero_vad.onnx from the installed silero-vad package (without importing it: that pulls in torch)"""
+        from importlib.util import find_spec
+
+        spec = find_spec("silero_vad")
+        if spec is None or not spec.submodule_search_locations:
+            raise ImportError(
+                "Silero VAD requires silero-vad and onnxruntime. Install with: pip install silero-vad onnxruntime"
+            )
+        return os.path.join(list(spec.submodule_search_locations)[0], "data", "silero_vad.onnx")
+
+    def create_state(self) -> SileroState:
+        return SileroState()
+
     def detect_speech(self, audio_float32: np.ndarray, sample_rate: int = 16000) -> float:
-        audio_tensor = self.torch.from_numpy(audio_float32)
-        return self.model(audio_tensor, sample_rate).item()
+        return self.detect_speech_batch([audio_float32], sample_rate, [self._state])[0]
+
+    def detect_speech_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        sample_rate: int = 16000,
+        states: Optional[Sequence[SileroState]] = None
+    ) -> List[float]:
+        if sample_rate not in (8000, 16000):
+            raise ValueError(f"Silero VAD supports 8000 and 16000 Hz, got {sample_rate}")
+        if states is None:
+            states = [SileroState(sample_rate) for _ in frames]
+
+        num_samples = 512 if sample_rate == 16000 else 256
+        context_size = 64 if sample_rate == 16000 else 32
+        batch_size = len(frames)
+
+        # Row i: session i's context + frame; state column i: session i's RNN state
+        batch = np.zeros((batch_size, context_size + num_samples), dtype=np.float32)
+        rnn = np.empty((2, batch_size, 128), dtype=np.float32)
+        for i, (frame, state) in enumerate(zip(frames, states)):
+            if state.sample_rate != sample_rate:
+                state.reset(sample_rate)
+            frame = frame[-num_samples:]
+            batch[i, :context_size] = state.context
+            batch[i, context_size:context_size + len(frame)] = frame
+            rnn[:, i] = state.rnn[:, 0]
+
+        out, rnn = self.session.run(None, {
+            "input": batch,
+            "state": rnn,
+            "sr": np.array(sample_rate, dtype=np.int64),
+        })
+
+        for i, state in enumerate(states):
+            state.rnn = rnn[:, i:i + 1].copy()
+            state.context = batch[i, -context_size:].copy()
+        return out[:, 0].tolist()
 
     def reset(self):
-        # Silero VAD is mostly stateless per-call
-        pass
+        self._state = SileroState()
 
 
 class TenVAD(BaseVAD):
@@ -96,7 +217,7 @@ class TenVAD(BaseVAD):
 
     def __init__(self):
         try:
-            import onnxruntime as ort
+            import onnxruntime  # noqa: F401
 
             logger.info("Loading TEN VAD model...")
 
@@ -104,14 +225,13 @@ class TenVAD(BaseVAD):
             model_path = self._get_model_path()
 
             # Create ONNX inference session
-            self.session = ort.InferenceSession(
-                model_path,
-                providers=['CPUExecutionProvider']
-            )
+            self.session = _onnx_session(model_path)
 
             # Get input/output names
             self.input_name = self.session.get_inputs()[0].name
             self.output_name = self.session.get_outputs()[0].name
+            # Frames can be stacked into one run when the batch dimension is dynamic
+            self.batchable = not isinstance(self.session.get_inputs()[0].shape[0], int)
 
             # Frame size for TEN VAD (160 samples = 10ms at 16kHz)
             self.frame_size = 160
@@ -167,6 +287,22 @@ class TenVAD(BaseVAD):
 
         return prob
 
+    def detect_speech_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        sample_rate: int = 16000,
+        states: Optional[Sequence[Any]] = None
+    ) -> List[float]:
+        width = max(self.frame_size, max(len(frame) for frame in frames))
+        if not self.batchable or len(frames) == 1 or any(len(frame) != width for frame in frames):
+            return super().detect_speech_batch(frames, sample_rate, states)
+
+        input_data = np.stack(frames).astype(np.float32, copy=False)
+        prob = self.session.run([self.output_name], {self.input_name: input_data})[0]
+        if prob.shape[0] != len(frames):
+            return super().detect_speech_batch(frames, sample_rate, states)
+        return prob.reshape(len(frames), -1).mean(axis=1).tolist()
+
     def reset(self):
         pass
 
@@ -200,6 +336,7 @@ class WebRTCVAD(BaseVAD):
             import webrtcvad
 
             logger.info(f"Loading WebRTC VAD (aggressiveness={aggressiveness})...")
+            self._webrtcvad = webrtcvad
             self.vad = webrtcvad.Vad(aggressiveness)
             self.aggressiveness = aggressiveness
             logger.info("WebRTC VAD loaded successfully")
@@ -209,7 +346,26 @@ class WebRTCVAD(BaseVAD):
                 "WebRTC VAD requires webrtcvad. Install with: pip install webrtcvad"
             )
 
+    def create_state(self):
+        # The WebRTC VAD adapts its noise estimate frame by frame: one per session
+        return self._webrtcvad.Vad(self.aggressiveness)
+
     def detect_speech(self, audio_float32: np.ndarray, sample_rate: int = 16000) -> float:
+        return self._speech_ratio(self.vad, audio_float32, sample_rate)
+
+    def detect_speech_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        sample_rate: int = 16000,
+        states: Optional[Sequence[Any]] = None
+    ) -> List[float]:
+        # No model to batch: one pass over the sessions' own VAD instances
+        if states is None:
+            states = [self.create_state() for _ in frames]
+        return [self._speech_ratio(vad, frame, sample_rate) for frame, vad in zip(frames, states)]
+
+    @staticmethod
+    def _speech_ratio(vad, audio_float32: np.ndarray, sample_rate: int) -> float:
         # WebRTC VAD requires specific frame durations: 10, 20, or 30 ms
         # At 16kHz: 160, 320, or 480 samples
 
@@ -234,7 +390,7 @@ class WebRTCVAD(BaseVAD):
             frame = audio_bytes[i:i + frame_bytes]
             if len(frame) == frame_bytes:
                 try:
-                    is_speech = self.vad.is_speech(frame, sample_rate)
+                    is_speech = vad.is_speech(frame, sample_rate)
                     speech_frames += int(is_speech)
                     total_frames += 1
                 except Exception:
@@ -290,6 +446,11 @@ def get_vad() -> BaseVAD:
     return _vad_instance
 
 
+def create_vad_session() -> VADSession:
+    """Per-call stream state on the process-wide VAD engine."""
+    return VADSession(get_vad())
+
+
 def detect_speech(audio_float32: np.ndarray, sample_rate: int = 16000) -> float:
     """
     Convenience function to detect speech using the configured VAD.
@@ -0,0 +1,213 @@
+"""
+Inventory Reservation Stress Test & Benchmark
+=============================================
+Fires many concurrent cart reservations at a few low-stock items and checks
+for oversell, then reports throughput, latency and Redis commands per cart.
+
+  legacy  - previous per-item path: GET availability, GET existing hold,
+            then a MULTI pipeline per item; a failed cart releases the
+            items it already reserved
+  lua     - InventoryCacheService.reserve_multiple_items: one script call
+            reserves the whole cart or nothing
+
+Checks after the run (per item):
+  - available never below zero (oversell)
+  - available + sum of holds == initial stock (no lost or duplicated units)
+
+In lua mode the holds get a short TTL and the reaper is run afterwards to
+check every unit is returned to stock.
+
+Commands are measured server-side (INFO stats total_commands_processed),
+so run it against a Redis nothing else is using. Keys use item ids starting
+with "bench-" and are deleted afterwards.
+
+Run:
+    python scripts/benchmark_inventory_reservations.py --path legacy --carts 2000
+    python scripts/benchmark_inventory_reservations.py --path lua --carts 2000 --stock 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.redis import redis_manager, get_redis_client
+from app.services.inventory_cache_service import InventoryCacheService, InventoryReservationError
+
+
+# ---------------------------------------------------------------------------
+# Previous per-item implementation (reference)
+# ---------------------------------------------------------------------------
+
+async def legacy_reserve_inventory(service: InventoryCacheService, item_id: str, quantity: int, user_id: str):
+    client = service.redis_client
+    inventory_key = service._get_inventory_key(item_id)
+    reservation_key = service._get_reservation_key(item_id, user_id)
+
+    available = await client.get(inventory_key)
+    if available is None:
+        raise InventoryReservationError(f"Item {item_id} not found in inventory cache. Sync required.")
+    available = int(available)
+
+    existing = await client.get(reservation_key)
+    net_change = quantity - (int(existing) if existing else 0)
+    if net_change > available:
+        raise InventoryReservationError(f"Not enough inventory for item {item_id}")
+
+    async with client.pipeline(transaction=True) as pipe:
+        await pipe.decrby(inventory_key, net_change)
+        await pipe.set(reservation_key, quantity)
+        await pipe.sadd(service._get_all_reservations_key(item_id), user_id)
+        await pipe.execute()
+
+
+async def legacy_release_reservation(service: InventoryCacheService, item_id: str, user_id: str):
+    client = service.redis_client
+    reservation_key = service._get_reservation_key(item_id, user_id)
+    reserved_qty = await client.get(reservation_key)
+    if reserved_qty:
+        async with client.pipeline(transaction=True) as pipe:
+            await pipe.incrby(service._get_inventory_key(item_id), int(reserved_qty))
+            await pipe.delete(reservation_key)
+            await pipe.srem(service._get_all_reservations_key(item_id), user_id)
+            await pipe.execute()
+
+
+async def legacy_reserve_multiple_items(service: InventoryCacheService, items: List[Dict], user_id: str) -> Dict:
+    reserved, failed = [], []
+    for item in items:
+        try:
+            await legacy_reserve_inventory(service, item["item_id"], item["quantity"], user_id)
+            reserved.append(item["item_id"])
+        except InventoryReservationError:
+            failed.append(item["item_id"])
+    if failed:
+        for item_id in reserved:
+            await legacy_release_reservation(service, item_id, user_id)
+        return {"success": False}
+    return {"success": True}
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+async def commands_processed(client) -> int:
+    return int((await client.info("stats"))["total_commands_processed"])
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def check_stock(service: InventoryCacheService, item_ids: List[str], stock: int) -> Dict[str, int]:
+    """Oversold units and units missing from available + holds, summed over items."""
+    oversold = mismatched = 0
+    for item_id in item_ids:
+        available = await service.get_available_quantity(item_id)
+        held = await service.get_reserved_quantity(item_id)
+        oversold += max(0, -available)
+        mismatched += abs(available + held - stock)
+    return {"oversold": oversold, "mismatched": mismatched}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", choices=["legacy", "lua"], required=True)
+    parser.add_argument("--carts", type=int, default=1000, help="cart reservations")
+    parser.add_argument("--concurrency", type=int, default=50, help="carts in flight (stay under the Redis pool size)")
+    parser.add_argument("--items", type=int, default=8, help="distinct menu items")
+    parser.add_argument("--cart-size", type=int, default=3, help="items per cart")
+    parser.add_argument("--stock", type=int, default=50, help="initial stock per item")
+    parser.add_argument("--ttl", type=int, default=2, help="hold TTL in lua mode (seconds)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    redis_manager.init_redis()
+    client = get_redis_client()
+    service = InventoryCacheService()
+    if not service.enabled:
+        print("Inventory cache is disabled (ENABLE_INVENTORY_CACHE)")
+        return 1
+    service.reservation_ttl = args.ttl
+
+    run_id = uuid.uuid4().hex[:8]
+    item_ids = [f"bench-{run_id}-{n}" for n in range(args.items)]
+    await service.sync_inventory_from_db([{"id": item_id, "available_quantity": args.stock} for item_id in item_ids])
+
+    rng = random.Random(args.seed)
+    carts = [
+        [{"item_id": item_id, "quantity": rng.randint(1, 3)} for item_id in rng.sample(item_ids, args.cart_size)]
+        for _ in range(args.carts)
+    ]
+
+    latencies: List[float] = []
+    in_flight = asyncio.Semaphore(args.concurrency)
+
+    async def reserve(n: int, cart: List[Dict]) -> bool:
+        user_id = f"bench-user-{run_id}-{n}"
+        async with in_flight:
+            start = time.perf_counter()
+            if args.path == "legacy":
+                result = await legacy_reserve_multiple_items(service, cart, user_id)
+            else:
+                result = await service.reserve_multiple_items(cart, user_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return result["success"]
+
+    before = await commands_processed(client)
+    start = time.perf_counter()
+    results = await asyncio.gather(*[reserve(n, cart) for n, cart in enumerate(carts)])
+    elapsed = time.perf_counter() - start
+    # The closing INFO call is counted too
+    commands = await commands_processed(client) - before - 1
+
+    stock_check = await check_stock(service, item_ids, args.stock)
+
+    expiry_check = None
+    if args.path == "lua":
+        await asyncio.sleep(args.ttl + 0.5)
+        holds, returned = await service.reap_expired_reservations()
+        remaining = [await service.get_available_quantity(item_id) for item_id in item_ids]
+        expiry_check = (holds, returned, all(available == args.stock for available in remaining))
+
+    keys = []
+    for item_id in item_ids:
+        keys.append(service._get_inventory_key(item_id))
+        keys.append(service._get_all_reservations_key(item_id))
+        keys.extend(service._get_reservation_key(item_id, f"bench-user-{run_id}-{n}") for n in range(args.carts))
+    for chunk in range(0, len(keys), 500):
+        await client.delete(*keys[chunk:chunk + 500])
+    await redis_manager.close()
+
+    accepted = sum(results)
+    print("=" * 64)
+    print(f"INVENTORY RESERVATION BENCHMARK ({args.path}, {args.carts} carts x {args.cart_size} items, "
+          f"{args.items} items x {args.stock} stock)")
+    print("=" * 64)
+    print(f"Carts accepted:        {accepted} / {args.carts}")
+    print(f"Throughput:            {args.carts / elapsed:.0f} carts/s")
+    print(f"Latency (ms):          p50 {statistics.median(latencies):.2f}, p95 {percentile(latencies, 95):.2f}, "
+          f"max {max(latencies):.2f}")
+    print(f"Redis commands:        {commands} ({commands / args.carts:.2f} per cart)")
+    print(f"Oversold units:        {stock_check['oversold']}")
+    print(f"Stock mismatch:        {stock_check['mismatched']} units (available + holds vs initial stock)")
+    if expiry_check:
+        holds, returned, restored = expiry_check
+        print(f"Reaper:                {holds} expired holds, {returned} units returned, "
+              f"stock restored: {'yes' if restored else 'NO'}")
+    return 0 if stock_check["oversold"] == 0 and stock_check["mismatched"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
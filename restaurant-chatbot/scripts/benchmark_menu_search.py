@@ -0,0 +1,211 @@
+"""
+Menu Search Benchmark
+=====================
+Compares the indexed MenuPreloader search paths against the previous
+full-scan implementations on a synthetic multi-branch menu.
+
+Checks that both paths return the same items, then reports per-call latency.
+
+Run:
+    python scripts/benchmark_menu_search.py --items 5000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.preloader import MenuPreloader
+
+DISHES = [
+    "dosa", "masala dosa", "idli", "vada", "uttapam", "pongal", "parota", "aloo paratha",
+    "chicken biryani", "mutton biryani", "veg biryani", "paneer tikka", "butter chicken",
+    "dal makhani", "gobi manchurian", "chilli paneer", "fried rice", "noodles", "lassi",
+    "filter coffee", "masala chai", "amla juice", "lime soda", "gulab jamun", "rasmalai",
+]
+STYLES = ["special", "classic", "home style", "chettinad", "malabar", "andhra", "family pack", "mini"]
+CATEGORIES = ["Breakfast", "Rice", "Starters", "Curries", "Breads", "Beverages", "Desserts", "Chinese"]
+MEALS = ["Breakfast", "Lunch", "Dinner", "All Day"]
+
+QUERIES = ["dosa", "biryani", "paneer", "coffee", "chettinad", "xyz", "dessert", "biriyani", "parotta"]
+FIND_NAMES = ["masala dosa", "chicken biryani", "biriyani", "aloo parota", "amla juice", "filter cofee", "idlis"]
+
+
+def build_menu(size: int, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(size):
+        dish = rng.choice(DISHES)
+        name = f"{rng.choice(STYLES).title()} {dish.title()} {i}"
+        meal_types = rng.sample(MEALS, rng.randint(1, 2))
+        if "All Day" in meal_types:
+            meal_types = list(MEALS)
+        items.append({
+            "id": str(i),
+            "name": name,
+            "price": rng.choice([0.0, 60.0, 120.0, 240.0]) if i % 17 == 0 else rng.choice([60.0, 120.0, 240.0]),
+            "description": f"Freshly made {dish} served {rng.choice(STYLES)}",
+            "is_available": rng.random() > 0.1,
+            "is_recommended": rng.random() > 0.9,
+            "meal_types": meal_types,
+            "category": rng.choice(CATEGORIES),
+        })
+    items.sort(key=lambda item: (not item["is_recommended"], item["name"]))
+    return items
+
+
+# ---------------------------------------------------------------------------
+# Previous full-scan implementations (reference)
+# ---------------------------------------------------------------------------
+
+def legacy_search(menu: List[Dict], query: str = "", meal_period: Optional[str] = None) -> List[Dict]:
+    available_items = [
+        item for item in menu
+        if item.get("is_available", True) and item.get("price", 0) > 0
+    ]
+    if query and query.lower() not in ["", "all", "show all", "everything"]:
+        query_lower = query.lower()
+        matched_items = [
+            item for item in available_items
+            if query_lower in item.get("name", "").lower() or query_lower in item.get("description", "").lower()
+        ]
+        if not matched_items and len(query_lower) >= 4:
+            matched_items = [
+                item for item in available_items
+                if SequenceMatcher(None, query_lower, item.get("name", "").lower()).ratio() >= 0.65
+            ]
+        available_items = matched_items
+    if meal_period:
+        def is_for_meal(item):
+            meal_types = item.get("meal_types", ["All Day"])
+            return meal_period in meal_types or "All Day" in meal_types
+
+        available_items = (
+            [item for item in available_items if is_for_meal(item)]
+            + [item for item in available_items if not is_for_meal(item)]
+        )
+    return available_items
+
+
+def legacy_find_item(menu: List[Dict], name: str) -> Optional[Dict]:
+    name_lower = name.lower().strip()
+    name_singular = name_lower.rstrip('s') if name_lower.endswith('s') else name_lower
+    for item in menu:
+        if item.get("price", 0) <= 0:
+            continue
+        item_name = item.get("name", "").lower()
+        if item_name == name_lower or item_name == name_singular:
+            return item
+    best_substring, best_len = None, 0
+    for item in menu:
+        if item.get("price", 0) <= 0:
+            continue
+        item_name = item.get("name", "").lower()
+        if name_lower in item_name or name_singular in item_name or item_name in name_lower:
+            if len(item_name) > best_len:
+                best_len, best_substring = len(item_name), item
+    if best_substring:
+        return best_substring
+    best_match, best_ratio = None, 0.0
+    for item in menu:
+        if item.get("price", 0) <= 0:
+            continue
+        ratio = SequenceMatcher(None, name_lower, item.get("name", "").lower()).ratio()
+        if ratio > best_ratio:
+            best_ratio, best_match = ratio, item
+    return best_match if best_ratio >= 0.75 else None
+
+
+def legacy_meal_suggestions(menu: List[Dict], meal_period: str, limit: int = 5) -> List[Dict]:
+    return [
+        item for item in menu
+        if item.get("is_available", True) and item.get("price", 0) > 0 and (
+            meal_period in item.get("meal_types", ["All Day"]) or "All Day" in item.get("meal_types", [])
+        )
+    ][:limit]
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def time_calls(fn, args_list, repeat: int) -> float:
+    """Median per-call latency in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            fn(*args)
+        samples.append((time.perf_counter() - start) / len(args_list))
+    return statistics.median(samples) * 1e6
+
+
+def ids(items) -> List[str]:
+    if items is None:
+        return []
+    if isinstance(items, dict):
+        return [items["id"]]
+    return [item["id"] for item in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000, help="synthetic menu size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    menu = build_menu(args.items)
+    preloader = MenuPreloader()
+
+    start = time.perf_counter()
+    preloader._set_menu(menu)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    search_args = [(q, "Lunch") for q in QUERIES]
+    find_args = [(n,) for n in FIND_NAMES]
+    meal_args = [(m, 10) for m in MEALS]
+
+    # Parity: the indexed path must return what the full scan returned
+    mismatches = 0
+    for query, meal in search_args:
+        if ids(preloader.search(query, meal_period=meal)) != ids(legacy_search(menu, query, meal)):
+            mismatches += 1
+            print(f"  search mismatch: {query!r}")
+    for (name,) in find_args:
+        if ids(preloader.find_item(name)) != ids(legacy_find_item(menu, name)):
+            mismatches += 1
+            print(f"  find_item mismatch: {name!r}")
+    for meal, limit in meal_args:
+        if ids(preloader.get_meal_suggestions(meal, limit)) != ids(legacy_meal_suggestions(menu, meal, limit)):
+            mismatches += 1
+            print(f"  meal suggestion mismatch: {meal!r}")
+
+    rows = [
+        ("search", time_calls(lambda q, m: legacy_search(menu, q, m), search_args, args.repeat),
+         time_calls(lambda q, m: preloader.search(q, meal_period=m), search_args, args.repeat)),
+        ("find_item", time_calls(lambda n: legacy_find_item(menu, n), find_args, args.repeat),
+         time_calls(preloader.find_item, find_args, args.repeat)),
+        ("get_meal_suggestions", time_calls(lambda m, k: legacy_meal_suggestions(menu, m, k), meal_args, args.repeat),
+         time_calls(preloader.get_meal_suggestions, meal_args, args.repeat)),
+    ]
+
+    print("=" * 64)
+    print(f"MENU SEARCH BENCHMARK ({args.items} items, index build {build_ms:.1f} ms)")
+    print("=" * 64)
+    print(f"{'operation':<24}{'full scan (us)':>14}{'indexed (us)':>14}{'speedup':>10}")
+    for name, old_us, new_us in rows:
+        print(f"{name:<24}{old_us:>14.1f}{new_us:>14.1f}{old_us / max(new_us, 1e-9):>9.1f}x")
+    print(f"\nParity mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Rate Limiter Microbenchmark
+===========================
+Measures rate-limit checks per second and checks that concurrent requests
+can't slip past the limit.
+
+  legacy  - previous RateLimiter.check_rate_limit: three GETs, then
+            INCR + EXPIRE per window (nine round trips, check and
+            increment not atomic)
+  lua     - RateLimiter.check_rate_limit: one sliding-window script call
+            for the minute/hour/day windows
+
+Phases:
+  throughput  - --checks checks spread over --subjects restaurants with a
+                limit high enough that every check is allowed
+  burst       - --burst concurrent checks against one subject with a
+                per-minute limit of --limit; more than --limit allowed means
+                the limiter let a race through
+
+Run it against a Redis nothing else is using. Keys use restaurant ids
+starting with "bench-" and are deleted afterwards.
+
+Run:
+    python scripts/benchmark_rate_limiter.py --path legacy
+    python scripts/benchmark_rate_limiter.py --path lua --checks 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.redis import redis_manager, get_redis_client
+from app.services.rate_limiter import RateLimiter
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (reference)
+# ---------------------------------------------------------------------------
+
+async def legacy_check_rate_limit(client, restaurant_id: str, limits: Dict[str, int]) -> bool:
+    now = time.time()
+    minute_key = f"rate_limit:{restaurant_id}:minute:{int(now // 60)}"
+    hour_key = f"rate_limit:{restaurant_id}:hour:{int(now // 3600)}"
+    day_key = f"rate_limit:{restaurant_id}:day:{int(now // 86400)}"
+
+    minute_count = int(await client.get(minute_key) or 0)
+    hour_count = int(await client.get(hour_key) or 0)
+    day_count = int(await client.get(day_key) or 0)
+
+    if minute_count >= limits["requests_per_minute"]:
+        return False
+    if hour_count >= limits["requests_per_hour"]:
+        return False
+    if day_count >= limits["requests_per_day"]:
+        return False
+
+    await client.incr(minute_key)
+    await client.expire(minute_key, 60)
+    await client.incr(hour_key)
+    await client.expire(hour_key, 3600)
+    await client.incr(day_key)
+    await client.expire(day_key, 86400)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_checks(check: Callable[[str], Awaitable[bool]], subjects: List[str], total: int, concurrency: int):
+    latencies: List[float] = []
+    allowed = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal allowed, next_index
+        while next_index < total:
+            subject = subjects[next_index % len(subjects)]
+            next_index += 1
+            start = time.perf_counter()
+            if await check(subject):
+                allowed += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, allowed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", choices=["legacy", "lua"], required=True)
+    parser.add_argument("--checks", type=int, default=10000, help="checks in the throughput phase")
+    parser.add_argument("--concurrency", type=int, default=50, help="checks in flight (stay under the Redis pool size)")
+    parser.add_argument("--subjects", type=int, default=20, help="distinct restaurants in the throughput phase")
+    parser.add_argument("--burst", type=int, default=200, help="concurrent checks in the burst phase")
+    parser.add_argument("--limit", type=int, default=50, help="per-minute limit in the burst phase")
+    args = parser.parse_args()
+
+    redis_manager.init_redis()
+    client = get_redis_client()
+    run_id = uuid.uuid4().hex[:8]
+    limiter = RateLimiter(redis_client=client)
+
+    open_limits = {"requests_per_minute": 10 ** 9, "requests_per_hour": 10 ** 9, "requests_per_day": 10 ** 9}
+    burst_limits = {"requests_per_minute": args.limit, "requests_per_hour": 10 ** 9, "requests_per_day": 10 ** 9}
+
+    def make_check(limits: Dict[str, int]) -> Callable[[str], Awaitable[bool]]:
+        if args.path == "legacy":
+            return lambda restaurant_id: legacy_check_rate_limit(client, restaurant_id, limits)
+
+        async def check(restaurant_id: str) -> bool:
+            limiter.custom_limits[restaurant_id] = limits
+            return (await limiter.check_rate_limit(restaurant_id))["allowed"]
+        return check
+
+    subjects = [f"bench-{run_id}-{i}" for i in range(args.subjects)]
+    burst_subject = f"bench-{run_id}-burst"
+
+    try:
+        info = await client.info("stats")
+        commands_before = int(info["total_commands_processed"])
+        elapsed, latencies, _ = await run_checks(make_check(open_limits), subjects, args.checks, args.concurrency)
+        info = await client.info("stats")
+        commands = int(info["total_commands_processed"]) - commands_before - 1
+
+        _, _, burst_allowed = await run_checks(make_check(burst_limits), [burst_subject], args.burst, args.burst)
+    finally:
+        cursor = 0
+        while True:
+            cursor, keys = await client.scan(cursor=cursor, match=f"rate_limit:*bench-{run_id}*", count=500)
+            if keys:
+                await client.delete(*keys)
+            if cursor == 0:
+                break
+        await redis_manager.close()
+
+    print("=" * 64)
+    print(f"RATE LIMITER BENCHMARK ({args.path}, {args.checks} checks, concurrency {args.concurrency})")
+    print("=" * 64)
+    print(f"Throughput:            {args.checks / elapsed:.0f} checks/s")
+    print(f"Latency (ms):          p50 {statistics.median(latencies):.2f}, p95 {percentile(latencies, 95):.2f}, "
+          f"p99 {percentile(latencies, 99):.2f}")
+    print(f"Redis commands:        {commands} ({commands / args.checks:.2f} per check)")
+    print(f"Burst:                 {burst_allowed} of {args.burst} allowed with limit {args.limit} "
+          f"({'OK' if burst_allowed <= args.limit else 'OVER LIMIT'})")
+    return 0 if burst_allowed <= args.limit else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,167 @@
+"""
+Semantic Context Redis Benchmark
+================================
+Counts Redis commands per chat turn for the session context (entity graph)
+with the previous and the turn-scoped implementation.
+
+  legacy  - previous layout: in-process dict of graphs, JSON blob re-written
+            with SETEX on every mutation, cart snapshot read on each context
+            call (sync client)
+  turn    - begin_session_turn() / end_session_turn(): one pipelined read at
+            turn start, one HSET of changed fields at turn end
+
+A simulated turn reads the context summary and the query-relevant context
+(like the orchestrator) and then applies --mutations tool updates
+(displayed menu / last mentioned item) from a worker thread.
+
+Commands are measured server-side (INFO stats total_commands_processed),
+so run it against a Redis nothing else is using. Keys use session ids
+starting with "bench-" and are deleted afterwards.
+
+Run:
+    python scripts/benchmark_semantic_context.py --mode legacy
+    python scripts/benchmark_semantic_context.py --mode turn --turns 200 --mutations 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.redis import redis_manager, get_redis_client, get_sync_redis_client
+from app.core import semantic_context
+from app.core.semantic_context import EntityGraph, begin_session_turn, end_session_turn, get_entity_graph
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (reference)
+# ---------------------------------------------------------------------------
+
+_LEGACY_GRAPHS: Dict[str, EntityGraph] = {}
+
+
+def legacy_save(graph: EntityGraph):
+    get_sync_redis_client().setex(
+        f"{semantic_context.LEGACY_ENTITY_GRAPH_PREFIX}{graph.session_id}",
+        semantic_context.ENTITY_GRAPH_TTL,
+        json.dumps(graph.to_dict())
+    )
+
+
+def legacy_get(session_id: str) -> EntityGraph:
+    if session_id in _LEGACY_GRAPHS:
+        return _LEGACY_GRAPHS[session_id]
+    data = get_sync_redis_client().get(f"{semantic_context.LEGACY_ENTITY_GRAPH_PREFIX}{session_id}")
+    graph = EntityGraph.from_dict(json.loads(data)) if data else EntityGraph(session_id=session_id)
+    _LEGACY_GRAPHS[session_id] = graph
+    return graph
+
+
+def legacy_tool_updates(session_id: str, mutations: int):
+    graph = legacy_get(session_id)
+    for n in range(mutations):
+        if n % 2 == 0:
+            graph.displayed_menu = [f"Item {i}" for i in range(15)]
+        else:
+            graph.last_mentioned_item = f"Item {n}"
+            graph.last_mentioned_items = (graph.last_mentioned_items + [f"Item {n}"])[-5:]
+        legacy_save(graph)
+
+
+async def legacy_turn(session_id: str, mutations: int):
+    graph = legacy_get(session_id)
+    # Both context calls read the cart snapshot separately
+    graph.get_context_summary()
+    graph.get_relevant_context("what is in my cart")
+    await asyncio.to_thread(legacy_tool_updates, session_id, mutations)
+
+
+# ---------------------------------------------------------------------------
+# Turn-scoped implementation
+# ---------------------------------------------------------------------------
+
+def tool_updates(session_id: str, mutations: int):
+    graph = get_entity_graph(session_id)
+    for n in range(mutations):
+        if n % 2 == 0:
+            graph.set_displayed_menu([f"Item {i}" for i in range(15)])
+        else:
+            graph.update_last_mentioned(f"Item {n}")
+
+
+async def scoped_turn(session_id: str, mutations: int):
+    graph = await begin_session_turn(session_id)
+    try:
+        graph.get_context_summary()
+        graph.get_relevant_context("what is in my cart")
+        await asyncio.to_thread(tool_updates, session_id, mutations)
+    finally:
+        await end_session_turn(session_id)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+async def commands_processed(client) -> int:
+    return int((await client.info("stats"))["total_commands_processed"])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["legacy", "turn"], required=True)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=10, help="turns per session")
+    parser.add_argument("--mutations", type=int, default=2, help="tool updates per turn")
+    args = parser.parse_args()
+
+    redis_manager.init_redis()
+    client = get_redis_client()
+
+    run_id = uuid.uuid4().hex[:8]
+    sessions = [f"bench-{run_id}-{n}" for n in range(args.sessions)]
+    turn = legacy_turn if args.mode == "legacy" else scoped_turn
+
+    latencies = []
+    before = await commands_processed(client)
+    for _ in range(args.turns):
+        for session_id in sessions:
+            start = time.perf_counter()
+            await turn(session_id, args.mutations)
+            latencies.append((time.perf_counter() - start) * 1000)
+    # The closing INFO call is counted too
+    commands = await commands_processed(client) - before - 1
+
+    for session_id in sessions:
+        await client.delete(
+            f"{semantic_context.SESSION_CONTEXT_PREFIX}{session_id}",
+            f"{semantic_context.LEGACY_ENTITY_GRAPH_PREFIX}{session_id}"
+        )
+    await redis_manager.close()
+
+    total_turns = args.sessions * args.turns
+    print("=" * 64)
+    print(f"SEMANTIC CONTEXT BENCHMARK ({args.mode}, {total_turns} turns, {args.mutations} updates/turn)")
+    print("=" * 64)
+    print(f"Redis commands:        {commands} ({commands / total_turns:.2f} per turn)")
+    print(f"Turn latency (ms):     p50 {statistics.median(latencies):.2f}, max {max(latencies):.2f}")
+    if args.mode == "turn":
+        stats = semantic_context.get_session_context_stats()
+        print(f"Round trips per turn:  {stats['redis_round_trips_per_turn']}")
+    else:
+        # No pipelining: every command is its own round trip
+        print(f"Round trips per turn:  {commands / total_turns:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
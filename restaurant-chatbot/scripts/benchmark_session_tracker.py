@@ -0,0 +1,263 @@
+"""
+Session Tracker Benchmark
+=========================
+Measures cart operations under concurrent sessions with the two tracker
+setups and reports latency percentiles plus the peak number of Postgres
+connections the worker held (pg_stat_activity, by application_name).
+
+  legacy   - previous layout: tool threads use a psycopg2 ThreadedConnectionPool
+             with one INSERT per event and two queries per cart read, async
+             handlers use the asyncpg pool
+  unified  - SyncSessionEventTracker facade from tool threads and
+             SessionEventTracker from the loop, one asyncpg pool
+
+Each simulated session adds items from a worker thread (like a CrewAI tool)
+and reads the cart from the event loop (like the chat handler).
+
+Needs a live database with menu items and Redis. Benchmark rows use
+session ids starting with "bench-" and are deleted afterwards.
+
+Run:
+    python scripts/benchmark_session_tracker.py --mode legacy --sessions 50
+    python scripts/benchmark_session_tracker.py --mode unified --sessions 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.db_pool import APPLICATION_NAME, AsyncDBConnection, close_async_pool, get_async_pool
+from app.core.redis import redis_manager
+
+
+# ---------------------------------------------------------------------------
+# Previous psycopg2 implementation (reference)
+# ---------------------------------------------------------------------------
+
+class LegacySyncTracker:
+    def __init__(self, pool, session_id: str):
+        self.pool = pool
+        self.session_id = session_id
+
+    def add_to_cart(self, item_id: str, item_name: str, quantity: int, price: float) -> Dict:
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO session_events (session_id, user_id, event_type, event_data)
+                    VALUES (%s, NULL, 'item_added', %s) RETURNING event_id
+                    """,
+                    (self.session_id, json.dumps({"item_id": item_id, "item_name": item_name,
+                                                  "quantity": quantity, "price": price}))
+                )
+                conn.commit()
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO session_cart (session_id, item_id, item_name, quantity, price)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (session_id, item_id) DO UPDATE SET
+                        quantity = session_cart.quantity + EXCLUDED.quantity,
+                        updated_at = NOW(), is_active = TRUE
+                    """,
+                    (self.session_id, item_id, item_name, quantity, price)
+                )
+                cur.execute(
+                    """
+                    INSERT INTO session_state (session_id, last_mentioned_item_id, last_mentioned_item_name)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (session_id) DO UPDATE SET
+                        last_mentioned_item_id = EXCLUDED.last_mentioned_item_id,
+                        last_mentioned_item_name = EXCLUDED.last_mentioned_item_name
+                    """,
+                    (self.session_id, item_id, item_name)
+                )
+                conn.commit()
+        finally:
+            self.pool.putconn(conn)
+        return self.get_cart_summary()
+
+    def get_cart_summary(self) -> Dict:
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM get_session_cart(%s)", (self.session_id,))
+                items = cur.fetchall()
+                cur.execute("SELECT get_cart_total(%s)", (self.session_id,))
+                total = cur.fetchone()[0]
+        finally:
+            self.pool.putconn(conn)
+        return {"items": items, "total": float(total or 0)}
+
+
+async def legacy_async_cart(session_id: str) -> Dict:
+    async with AsyncDBConnection() as db:
+        items = await db.fetch("SELECT * FROM get_session_cart($1)", session_id)
+        total = await db.fetchrow("SELECT get_cart_total($1) AS total", session_id)
+    return {"items": items, "total": float(total["total"] or 0)}
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+class ConnectionSampler:
+    """Samples pg_stat_activity on a dedicated connection."""
+
+    def __init__(self):
+        self.samples: List[int] = []
+        self._task = None
+
+    async def start(self):
+        import asyncpg
+        self._conn = await asyncpg.connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=int(os.getenv('DB_PORT', 5432)),
+            user=os.getenv('DB_USER', 'postgres'),
+            password=os.getenv('DB_PASSWORD', '123456'),
+            database=os.getenv('DB_NAME', 'restaurant_ai_dev'),
+        )
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            count = await self._conn.fetchval(
+                "SELECT count(*) FROM pg_stat_activity WHERE application_name = $1",
+                APPLICATION_NAME
+            )
+            self.samples.append(count)
+            await asyncio.sleep(0.05)
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self._conn.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_session(mode, session_id, menu, ops, executor, timings, legacy_pool=None):
+    loop = asyncio.get_running_loop()
+    if mode == "legacy":
+        tool_tracker = LegacySyncTracker(legacy_pool, session_id)
+    else:
+        from app.core.session_events import get_session_tracker, get_sync_session_tracker
+        tool_tracker = get_sync_session_tracker(session_id)
+        loop_tracker = get_session_tracker(session_id)
+
+    for i in range(ops):
+        item_id, item_name, price = menu[i % len(menu)]
+
+        start = time.perf_counter()
+        if mode == "legacy":
+            await loop.run_in_executor(executor, tool_tracker.add_to_cart, item_id, item_name, 1, price)
+        else:
+            await loop.run_in_executor(executor, tool_tracker.add_to_cart, uuid.UUID(item_id), item_name, 1, price)
+        timings["add_to_cart (thread)"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        if mode == "legacy":
+            await legacy_async_cart(session_id)
+        else:
+            await loop_tracker.get_cart_summary()
+        timings["get_cart_summary (loop)"].append((time.perf_counter() - start) * 1000)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["legacy", "unified"], required=True)
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent sessions")
+    parser.add_argument("--ops", type=int, default=20, help="add+read pairs per session")
+    args = parser.parse_args()
+
+    redis_manager.init_redis()
+    await get_async_pool()
+
+    async with AsyncDBConnection() as db:
+        menu = [
+            (str(r["menu_item_id"]), r["menu_item_name"], float(r["menu_item_price"] or 100))
+            for r in await db.fetch("SELECT menu_item_id, menu_item_name, menu_item_price FROM menu_item LIMIT 20")
+        ]
+    if not menu:
+        print("No menu items found - load the menu first")
+        return 1
+
+    legacy_pool = None
+    if args.mode == "legacy":
+        from psycopg2 import pool
+        legacy_pool = pool.ThreadedConnectionPool(
+            minconn=5, maxconn=20,
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=int(os.getenv('DB_PORT', 5432)),
+            user=os.getenv('DB_USER', 'postgres'),
+            password=os.getenv('DB_PASSWORD', '123456'),
+            database=os.getenv('DB_NAME', 'restaurant_ai_dev'),
+            application_name=APPLICATION_NAME,
+        )
+    else:
+        from app.core.session_events import start_session_event_writer
+        await start_session_event_writer()
+
+    timings: Dict[str, List[float]] = {"add_to_cart (thread)": [], "get_cart_summary (loop)": []}
+    executor = ThreadPoolExecutor(max_workers=args.sessions)
+    sampler = ConnectionSampler()
+    await sampler.start()
+
+    run_id = uuid.uuid4().hex[:8]
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_session(args.mode, f"bench-{run_id}-{n}", menu, args.ops, executor, timings, legacy_pool)
+        for n in range(args.sessions)
+    ])
+    elapsed = time.perf_counter() - start
+
+    await sampler.stop()
+    executor.shutdown()
+
+    if args.mode == "unified":
+        from app.core.session_events import stop_session_event_writer
+        await stop_session_event_writer()
+    else:
+        legacy_pool.closeall()
+
+    async with AsyncDBConnection() as db:
+        for table in ("session_events", "session_cart", "session_state"):
+            await db.execute(f"DELETE FROM {table} WHERE session_id LIKE $1", f"bench-{run_id}-%")
+
+    await redis_manager.close()
+    await close_async_pool()
+
+    total_ops = sum(len(v) for v in timings.values())
+    print("=" * 64)
+    print(f"SESSION TRACKER BENCHMARK ({args.mode}, {args.sessions} sessions x {args.ops} ops)")
+    print("=" * 64)
+    print(f"{'operation':<28}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}")
+    for name, values in timings.items():
+        print(f"{name:<28}{statistics.median(values):>10.2f}{percentile(values, 95):>10.2f}{max(values):>10.2f}")
+    print(f"\nThroughput:           {total_ops / elapsed:.0f} ops/s")
+    print(f"Postgres connections: peak {max(sampler.samples)}, "
+          f"mean {statistics.mean(sampler.samples):.1f} (application_name={APPLICATION_NAME})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,225 @@
+"""
+AG-UI SSE Streaming Benchmark
+=============================
+Connects many SSE clients at once, leaves them idle, then pushes bursts of
+events to every session and reports throughput, writes and CPU per client.
+
+  legacy  - previous stream_events: asyncio.Queue, wait_for(get(), 1.0) per
+            event (a timer per wakeup, a keepalive every idle second), one
+            write per event, asdict + json.dumps per event
+  current - app.core.agui_events.stream_events: waits on the session queue
+            without a timeout, one keepalive timer per stream, every ready
+            event in one write, cached field lists + orjson (when installed)
+
+Phases:
+  idle    - all clients connected, no events (CPU here is pure overhead)
+  loaded  - every session gets --events events in bursts of --burst, then
+            RUN_FINISHED; the phase ends when every stream has closed
+
+CPU is process time (user + sys) of this process, so close other work on
+the machine. Runs in memory only; no Redis or database is needed.
+
+Run:
+    python scripts/benchmark_sse_streaming.py --sessions 1000
+    python scripts/benchmark_sse_streaming.py --path current --sessions 1000 --events 50 --burst 10
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core import agui_events
+from app.core.agui_events import (
+    EventType,
+    RunFinishedEvent,
+    SearchResultsEvent,
+    TextMessageContentEvent,
+    ToolCallResultEvent,
+)
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (reference)
+# ---------------------------------------------------------------------------
+
+def legacy_to_json(event) -> str:
+    data = asdict(event)
+    data['type'] = event.type.value
+    return json.dumps(data)
+
+
+async def legacy_stream_events(queue: asyncio.Queue, timeout: float) -> AsyncGenerator[str, None]:
+    start_time = asyncio.get_event_loop().time()
+    while True:
+        if asyncio.get_event_loop().time() - start_time > timeout:
+            break
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=1.0)
+            yield f"data: {legacy_to_json(event)}\n\n"
+            if event.type in (EventType.RUN_FINISHED, EventType.RUN_ERROR):
+                break
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+def make_events(count: int) -> List[Any]:
+    """A chat turn's mix: text deltas, tool results and a search result card."""
+    items = [
+        {"id": f"item-{i}", "name": f"Dish {i}", "price": 120.0 + i, "category": "Mains",
+         "is_available_now": i % 4 != 0, "meal_types": ["Lunch", "Dinner"]}
+        for i in range(12)
+    ]
+    events: List[Any] = []
+    for i in range(count):
+        kind = i % 10
+        if kind == 9:
+            events.append(SearchResultsEvent(query="biryani", items=items, current_meal_period="Lunch",
+                                             available_count=9, unavailable_count=3))
+        elif kind in (3, 7):
+            events.append(ToolCallResultEvent(tool_call_id=f"call-{i}", summary="Found 12 matching items"))
+        else:
+            events.append(TextMessageContentEvent(message_id="msg-1", delta=f"chunk {i} of the reply "))
+    return events
+
+
+class Client:
+    """Drains one SSE stream, counting writes, events and keepalives."""
+
+    def __init__(self):
+        self.writes = 0
+        self.events = 0
+        self.keepalives = 0
+        self.done = asyncio.Event()
+
+    async def consume(self, stream: AsyncGenerator[str, None]) -> None:
+        try:
+            async for chunk in stream:
+                self.writes += 1
+                if chunk.startswith(":"):
+                    self.keepalives += 1
+                else:
+                    self.events += chunk.count("data: ")
+        finally:
+            self.done.set()
+
+
+def snapshot(clients: List[Client]) -> Dict[str, int]:
+    return {
+        "writes": sum(c.writes for c in clients),
+        "events": sum(c.events for c in clients),
+        "keepalives": sum(c.keepalives for c in clients),
+    }
+
+
+async def run_path(path: str, args) -> Dict[str, Any]:
+    sessions = [f"bench-sse-{i}" for i in range(args.sessions)]
+    clients = [Client() for _ in sessions]
+    events = make_events(args.events)
+
+    if path == "legacy":
+        queues = {sid: asyncio.Queue() for sid in sessions}
+        streams = [legacy_stream_events(queues[sid], args.timeout) for sid in sessions]
+        put: Callable[[str, Any], None] = lambda sid, event: queues[sid].put_nowait(event)
+    else:
+        agui_events.SSE_KEEPALIVE_SECONDS = args.keepalive
+        streams = [agui_events.stream_events(sid, timeout=args.timeout) for sid in sessions]
+        put = lambda sid, event: agui_events.get_event_queue(sid).put_nowait(event)
+
+    tasks = [asyncio.create_task(client.consume(stream)) for client, stream in zip(clients, streams)]
+    await asyncio.sleep(0.5)  # let every client subscribe
+
+    # Idle phase
+    before = snapshot(clients)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.sleep(args.idle_seconds)
+    idle_cpu = time.process_time() - cpu_start
+    idle_wall = time.perf_counter() - wall_start
+    idle = {key: value - before[key] for key, value in snapshot(clients).items()}
+
+    # Loaded phase
+    before = snapshot(clients)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for offset in range(0, len(events), args.burst):
+        for sid in sessions:
+            for event in events[offset:offset + args.burst]:
+                put(sid, event)
+        await asyncio.sleep(0)
+    for sid in sessions:
+        put(sid, RunFinishedEvent())
+    await asyncio.gather(*(client.done.wait() for client in clients))
+    loaded_cpu = time.process_time() - cpu_start
+    loaded_wall = time.perf_counter() - wall_start
+    loaded = {key: value - before[key] for key, value in snapshot(clients).items()}
+
+    await asyncio.gather(*tasks)
+    return {
+        "idle_wall": idle_wall,
+        "idle_cpu": idle_cpu,
+        "idle": idle,
+        "loaded_wall": loaded_wall,
+        "loaded_cpu": loaded_cpu,
+        "loaded": loaded,
+    }
+
+
+def bench_serializer(count: int) -> Dict[str, float]:
+    events = make_events(count)
+    results = {}
+    for name, encode in (("legacy", legacy_to_json), ("current", lambda event: event.to_json())):
+        start = time.perf_counter()
+        for event in events:
+            encode(event)
+        results[name] = count / (time.perf_counter() - start)
+    return results
+
+
+def report(path: str, result: Dict[str, Any], sessions: int) -> None:
+    idle, loaded = result["idle"], result["loaded"]
+    print(f"\n[{path}]")
+    print(f"  idle   {result['idle_wall']:.1f}s: cpu {result['idle_cpu'] * 1000:.1f} ms "
+          f"({result['idle_cpu'] / sessions * 1e6:.1f} us/client), keepalives {idle['keepalives']}")
+    print(f"  loaded {result['loaded_wall']:.2f}s: {loaded['events']} events in {loaded['writes']} writes, "
+          f"{loaded['events'] / result['loaded_wall']:,.0f} events/s")
+    print(f"         cpu {result['loaded_cpu'] * 1000:.1f} ms "
+          f"({result['loaded_cpu'] / sessions * 1e6:.1f} us/client, "
+          f"{result['loaded_cpu'] / max(loaded['events'], 1) * 1e6:.2f} us/event)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark AG-UI SSE streaming")
+    parser.add_argument("--path", choices=["legacy", "current", "both"], default="both")
+    parser.add_argument("--sessions", type=int, default=1000, help="Concurrent SSE clients")
+    parser.add_argument("--events", type=int, default=20, help="Events per session in the loaded phase")
+    parser.add_argument("--burst", type=int, default=5, help="Events queued per session before yielding")
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument("--keepalive", type=float, default=15.0, help="Keepalive interval (current path)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Stream timeout")
+    args = parser.parse_args()
+
+    serializer = bench_serializer(20_000)
+    print(f"Serializer: legacy {serializer['legacy']:,.0f} events/s, "
+          f"current {serializer['current']:,.0f} events/s "
+          f"(orjson {'on' if agui_events.orjson is not None else 'off'})")
+    print(f"Sessions: {args.sessions}, events/session: {args.events}, burst: {args.burst}")
+
+    paths = ["legacy", "current"] if args.path == "both" else [args.path]
+    for path in paths:
+        report(path, await run_path(path, args), args.sessions)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,215 @@
+"""
+Voice TTS Pipeline Benchmark
+============================
+Time-to-first-audio and inter-sentence gaps of a spoken reply.
+
+  sequential - previous process_speech_segment loop: one TTS request per
+               sentence, started after the previous sentence finished
+  pipelined  - SentenceTTSPipeline, cold phrase cache
+  cached     - SentenceTTSPipeline, replaying the same replies (phrases
+               now come from the on-disk cache)
+
+By default the TTS endpoint is simulated: --ttfb-ms until the first byte,
+then audio streamed at --stream-speed x real time (24kHz PCM16, about
+--chars-per-second characters of text per second of speech). Pass --live
+to call the OpenAI TTS API instead (uses OPENAI_API_KEY, costs tokens).
+
+Reported per mode (mean / max over replies):
+  - time to first audio: reply start -> first chunk sent
+  - send gap: last chunk of a sentence -> first chunk of the next
+  - audible gap: silence the listener hears between sentences, playing
+    chunks back at real time as they arrive
+
+Run:
+    python scripts/benchmark_tts_pipeline.py
+    python scripts/benchmark_tts_pipeline.py --ttfb-ms 700 --prefetch 3
+    python scripts/benchmark_tts_pipeline.py --live --replies 3
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.tts_pipeline import PhraseAudioCache, SentenceTTSPipeline, TTS_CHUNK_SIZE
+
+PCM_BYTES_PER_SECOND = 24000 * 2  # OpenAI TTS pcm: 24kHz, 16-bit mono
+
+REPLIES = [
+    "Sure, I've added two Butter Chicken to your cart. Would you like some naan with that? Anything else?",
+    "Your cart has 3 items with a total of 640 rupees. Would you like to proceed to checkout? Anything else?",
+    "I'm sorry, I didn't catch that clearly. Could you please repeat?",
+    "We have Paneer Tikka, Veg Biryani and Dal Makhani in the vegetarian section. Would you like to hear the prices? Anything else?",
+    "Your order has been placed. It will be ready in about 25 minutes. Thank you for ordering with us!",
+    "Sure, I've added one Mango Lassi to your cart. Anything else?",
+]
+
+
+# ---------------------------------------------------------------------------
+# Simulated TTS endpoint
+# ---------------------------------------------------------------------------
+
+class _SimulatedResponse:
+    def __init__(self, text: str, args):
+        self.text = text
+        self.args = args
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.args.ttfb_ms / 1000)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def iter_bytes(self, chunk_size: int):
+        total = int(len(self.text) / self.args.chars_per_second * PCM_BYTES_PER_SECOND)
+        per_chunk = chunk_size / PCM_BYTES_PER_SECOND / self.args.stream_speed
+        for start in range(0, total, chunk_size):
+            await asyncio.sleep(per_chunk)
+            yield bytes(min(chunk_size, total - start))
+
+
+class SimulatedTTSClient:
+    def __init__(self, args):
+        self.args = args
+        self.requests = 0
+        self.audio = self
+        self.speech = self
+        self.with_streaming_response = self
+
+    def create(self, input: str, **kwargs):
+        self.requests += 1
+        return _SimulatedResponse(input, self.args)
+
+
+# ---------------------------------------------------------------------------
+# Modes
+# ---------------------------------------------------------------------------
+
+class PlaybackClock:
+    """Listener-side timing: chunks play back to back at real time."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_audio_ms: Optional[float] = None
+        self.playing_until = 0.0
+        self.sentence_end: Optional[float] = None
+        self.send_gaps: List[float] = []
+        self.audible_gaps: List[float] = []
+        self.new_sentence = True
+
+    def chunk(self, size: int) -> None:
+        now = time.perf_counter()
+        if self.first_audio_ms is None:
+            self.first_audio_ms = (now - self.started) * 1000
+        elif self.new_sentence:
+            self.send_gaps.append((now - self.sentence_end) * 1000)
+            self.audible_gaps.append(max(0.0, now - self.playing_until) * 1000)
+        self.new_sentence = False
+        self.playing_until = max(self.playing_until, now) + size / PCM_BYTES_PER_SECOND
+        self.sentence_end = now
+
+    def end_sentence(self) -> None:
+        self.new_sentence = True
+
+
+async def run_sequential(client, sentences: List[str], _) -> PlaybackClock:
+    clock = PlaybackClock()
+    for sentence in sentences:
+        async with client.audio.speech.with_streaming_response.create(
+            model="tts-1", voice="nova", input=sentence, response_format="pcm", speed=1.0
+        ) as tts_response:
+            async for chunk in tts_response.iter_bytes(chunk_size=TTS_CHUNK_SIZE):
+                if chunk:
+                    clock.chunk(len(chunk))
+        clock.end_sentence()
+    return clock
+
+
+async def run_pipelined(client, sentences: List[str], options) -> PlaybackClock:
+    clock = PlaybackClock()
+    queue: asyncio.Queue = asyncio.Queue()
+    for sentence in sentences:
+        queue.put_nowait(sentence)
+    queue.put_nowait(None)
+
+    pipeline = SentenceTTSPipeline(client, language="English", prefetch=options["prefetch"], cache=options["cache"])
+    current = 0
+    async for chunk in pipeline.stream(queue):
+        if pipeline.sentences != current:
+            if current:
+                clock.end_sentence()
+            current = pipeline.sentences
+        clock.chunk(len(chunk))
+    return clock
+
+
+def summarize(name: str, clocks: List[PlaybackClock], requests: Optional[int]) -> None:
+    ttfa = [c.first_audio_ms for c in clocks if c.first_audio_ms is not None]
+    send = [g for c in clocks for g in c.send_gaps]
+    audible = [g for c in clocks for g in c.audible_gaps]
+
+    def fmt(values: List[float]) -> str:
+        return f"{statistics.mean(values):7.0f} / {max(values):7.0f}" if values else "      - /       -"
+
+    print(f"  {name:<11} {fmt(ttfa)}   {fmt(send)}   {fmt(audible)}   {'-' if requests is None else requests:>8}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sentence TTS pipelining and the phrase cache")
+    parser.add_argument("--replies", type=int, default=len(REPLIES), help="Replies to speak per mode")
+    parser.add_argument("--prefetch", type=int, default=2, help="Sentences in flight (TTS_PREFETCH_SENTENCES)")
+    parser.add_argument("--ttfb-ms", type=float, default=450.0, help="Simulated TTS time to first byte")
+    parser.add_argument("--stream-speed", type=float, default=1.5, help="Simulated audio streaming speed vs real time")
+    parser.add_argument("--chars-per-second", type=float, default=15.0, help="Simulated speaking rate")
+    parser.add_argument("--live", action="store_true", help="Use the OpenAI TTS API")
+    args = parser.parse_args()
+
+    from app.api.routes.voice import split_into_sentences
+
+    if args.live:
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=os.getenv("OPENAI_VOICE_API_KEY") or os.getenv("OPENAI_API_KEY"))
+    else:
+        client = SimulatedTTSClient(args)
+
+    replies = [split_into_sentences(REPLIES[i % len(REPLIES)]) for i in range(args.replies)]
+    cache_dir = tempfile.mkdtemp(prefix="tts-cache-bench-")
+    cache = PhraseAudioCache(directory=cache_dir)
+
+    print("=" * 78)
+    print(f"TTS PIPELINE BENCHMARK ({'live' if args.live else 'simulated'}, {args.replies} replies, "
+          f"{sum(len(r) for r in replies)} sentences, prefetch {args.prefetch})")
+    print("=" * 78)
+    print(f"  {'mode':<11} {'first audio ms':>17}   {'send gap ms':>17}   {'audible gap ms':>17}   {'requests':>8}")
+    print(f"  {'':<11} {'mean / max':>17}   {'mean / max':>17}   {'mean / max':>17}")
+
+    try:
+        modes: Dict[str, tuple] = {
+            "sequential": (run_sequential, None),
+            "pipelined": (run_pipelined, cache),
+            "cached": (run_pipelined, cache),
+        }
+        for name, (run, mode_cache) in modes.items():
+            before = getattr(client, "requests", None)
+            clocks = []
+            for sentences in replies:
+                clocks.append(await run(client, sentences, {"prefetch": args.prefetch, "cache": mode_cache}))
+            summarize(name, clocks, None if before is None else client.requests - before)
+        print(f"\n  phrase cache: {cache.get_stats()}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,166 @@
+"""
+VAD Runtime Benchmark
+=====================
+Throughput and accuracy parity of the batched VAD runtime against
+per-session calls, for each engine (silero, ten, webrtc).
+
+N sessions each stream synthetic 16kHz speech (bursts and pauses) in 32ms
+frames. Every tick, one frame per session is scored by:
+
+  per-session - one detect call per session per frame, each session with
+                its own stream state (batch size 1)
+  shared      - the previous behaviour: every session feeds the one global
+                engine instance (get_vad()), so stateful engines mix callers'
+                streams
+  batched     - one detect_speech_batch() call per tick with every session's
+                frame and state (what VADBatcher runs)
+  package     - silero only, when torch is installed: one silero-vad package
+                model per session (the model the app used before), as an
+                independent reference for the ONNX runtime
+
+Reported per path:
+  - frames/sec per core: frames / process CPU seconds (ONNX runs single
+    threaded by default, see VAD_ONNX_THREADS)
+  - max |prob - per-session prob| and how often the speech decision
+    (prob > --threshold) agrees with the per-session path
+
+Run:
+    python scripts/benchmark_vad_runtime.py --sessions 64 --seconds 10
+    python scripts/benchmark_vad_runtime.py --engines silero --sessions 128
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.vad import BaseVAD, SileroVAD, TenVAD, WebRTCVAD
+
+SAMPLE_RATE = 16000
+FRAME = 512  # 32ms
+
+ENGINES: Dict[str, Callable[[], BaseVAD]] = {
+    "silero": SileroVAD,
+    "ten": TenVAD,
+    "webrtc": WebRTCVAD,
+}
+
+
+def synth_session(seconds: float, seed: int) -> np.ndarray:
+    """float32 frames [n, FRAME]: voiced bursts (harmonics) over room noise."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE) // FRAME * FRAME
+    audio = rng.normal(0, 120, total)
+    position = int(rng.uniform(0.2, 1.0) * SAMPLE_RATE)
+    while position < total:
+        length = int(rng.uniform(0.8, 2.5) * SAMPLE_RATE)
+        t = np.arange(min(length, total - position)) / SAMPLE_RATE
+        pitch = rng.uniform(100, 240)
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 6) * t)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        audio[position:position + len(t)] += rng.uniform(2000, 8000) * envelope * voiced
+        position += length + int(rng.uniform(0.8, 2.0) * SAMPLE_RATE)
+    audio = np.clip(audio, -32768, 32767).astype(np.int16)
+    return (audio.astype(np.float32) / 32768.0).reshape(-1, FRAME)
+
+
+def timed(run: Callable[[], np.ndarray]):
+    cpu, wall = time.process_time(), time.perf_counter()
+    probs = run()
+    return probs, time.process_time() - cpu, time.perf_counter() - wall
+
+
+def run_per_session(vad: BaseVAD, sessions: List[np.ndarray]) -> np.ndarray:
+    states = [vad.create_state() for _ in sessions]
+    probs = np.zeros((len(sessions[0]), len(sessions)))
+    for tick in range(len(sessions[0])):
+        for s, frames in enumerate(sessions):
+            probs[tick, s] = vad.detect_speech_batch([frames[tick]], SAMPLE_RATE, [states[s]])[0]
+    return probs
+
+
+def run_shared(vad: BaseVAD, sessions: List[np.ndarray]) -> np.ndarray:
+    vad.reset()
+    probs = np.zeros((len(sessions[0]), len(sessions)))
+    for tick in range(len(sessions[0])):
+        for s, frames in enumerate(sessions):
+            probs[tick, s] = vad.detect_speech(frames[tick], SAMPLE_RATE)
+    return probs
+
+
+def run_batched(vad: BaseVAD, sessions: List[np.ndarray]) -> np.ndarray:
+    states = [vad.create_state() for _ in sessions]
+    probs = np.zeros((len(sessions[0]), len(sessions)))
+    for tick in range(len(sessions[0])):
+        probs[tick] = vad.detect_speech_batch([frames[tick] for frames in sessions], SAMPLE_RATE, states)
+    return probs
+
+
+def make_package_runner() -> Optional[Callable[[BaseVAD, List[np.ndarray]], np.ndarray]]:
+    try:
+        import torch
+        from silero_vad import load_silero_vad
+    except ImportError:
+        return None
+    torch.set_num_threads(1)
+
+    def run_package(_: BaseVAD, sessions: List[np.ndarray]) -> np.ndarray:
+        models = [load_silero_vad() for _ in sessions]
+        probs = np.zeros((len(sessions[0]), len(sessions)))
+        for tick in range(len(sessions[0])):
+            for s, frames in enumerate(sessions):
+                probs[tick, s] = models[s](torch.from_numpy(frames[tick]), SAMPLE_RATE).item()
+        return probs
+    return run_package
+
+
+def benchmark_engine(name: str, sessions: List[np.ndarray], threshold: float) -> None:
+    try:
+        vad = ENGINES[name]()
+    except Exception as e:
+        print(f"\n[{name}] skipped: {e}")
+        return
+
+    paths = {"per-session": run_per_session, "shared": run_shared, "batched": run_batched}
+    if name == "silero":
+        package = make_package_runner()
+        if package is not None:
+            paths["package"] = package
+        else:
+            print("\n(silero package reference skipped: torch / silero-vad not installed)")
+
+    frames = len(sessions) * len(sessions[0])
+    results = {path: timed(lambda run=run: run(vad, sessions)) for path, run in paths.items()}
+    reference = results["per-session"][0]
+
+    print(f"\n[{name}] {len(sessions)} sessions x {len(sessions[0])} frames")
+    print(f"  {'path':<12} {'frames/s/core':>14} {'frames/s wall':>14} {'max |dp|':>10} {'decisions agree':>16}")
+    for path, (probs, cpu, wall) in results.items():
+        diff = float(np.max(np.abs(probs - reference)))
+        agree = float(np.mean((probs > threshold) == (reference > threshold))) * 100
+        print(f"  {path:<12} {frames / max(cpu, 1e-9):>14,.0f} {frames / max(wall, 1e-9):>14,.0f} "
+              f"{diff:>10.2e} {agree:>15.2f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the batched VAD runtime")
+    parser.add_argument("--engines", default="silero,ten,webrtc", help="Comma-separated engines")
+    parser.add_argument("--sessions", type=int, default=64, help="Concurrent sessions")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Audio per session")
+    parser.add_argument("--threshold", type=float, default=0.6, help="Speech decision threshold")
+    args = parser.parse_args()
+
+    sessions = [synth_session(args.seconds, seed) for seed in range(args.sessions)]
+    for name in args.engines.split(","):
+        benchmark_engine(name.strip(), sessions, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
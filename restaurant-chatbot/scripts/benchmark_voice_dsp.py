@@ -0,0 +1,236 @@
+"""
+Voice DSP Load Test
+===================
+Simulates many concurrent voice calls on one event loop and reports how
+much the audio processing stalls the loop.
+
+Each call streams 32ms PCM16 chunks at real-time pace (speech bursts and
+pauses), runs VAD on every chunk and, at the end of each utterance, the
+denoise/trim/normalize step that precedes Whisper.
+
+  legacy  - previous voice.py path: float conversion + vad.detect_speech
+            inline per chunk, bytes lists + b''.join, noisereduce inline
+  current - app.services.audio_dsp: batched VAD (per-call state) on the VAD thread,
+            preallocated sample buffers, preprocessing in the process pool
+
+Reported:
+  - event-loop lag: how late a 10ms sleep on the same loop wakes up
+    (p50 / p99 / max); every chat and voice session on the worker sees this
+  - real-time factor per call: time spent waiting on DSP / audio duration
+    (mean and p95 over calls; below 1.0 keeps up with real time)
+  - late chunks: chunks handled more than one chunk duration after their
+    scheduled time
+
+The VAD engine is the configured one (VAD_ENGINE, see app/services/vad.py).
+
+Run:
+    python scripts/benchmark_voice_dsp.py --calls 50 --seconds 20
+    VAD_ENGINE=webrtc python scripts/benchmark_voice_dsp.py --path current --calls 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.audio_dsp import (
+    PCMBuffer,
+    PCMRingBuffer,
+    get_vad_batcher,
+    preprocess_utterance,
+    run_preprocess,
+    shutdown_dsp_executor,
+)
+from app.services.vad import VAD_ENGINE, get_vad
+
+SAMPLE_RATE = 16000
+CHUNK = 512  # 32ms
+CHUNK_SECONDS = CHUNK / SAMPLE_RATE
+SPEECH_THRESHOLD = 0.6
+
+
+def synth_call(seconds: float, seed: int) -> np.ndarray:
+    """Speech-like bursts (voiced harmonics + noise) separated by quiet pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = rng.normal(0, 120, total)  # room noise
+    position = int(rng.uniform(0.3, 1.0) * SAMPLE_RATE)
+    while position < total:
+        length = int(rng.uniform(1.0, 3.0) * SAMPLE_RATE)
+        t = np.arange(min(length, total - position)) / SAMPLE_RATE
+        pitch = rng.uniform(110, 220)
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        audio[position:position + len(t)] += 6000 * envelope * voiced
+        position += length + int(rng.uniform(1.5, 2.5) * SAMPLE_RATE)
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+async def legacy_call(audio: np.ndarray, silence_chunks: int, metrics: Dict[str, float]) -> None:
+    import noisereduce as nr
+
+    vad = get_vad()
+    speech_buffer: List[bytes] = []
+    is_speaking = False
+    silence = 0
+    start = time.perf_counter()
+    for index in range(len(audio) // CHUNK):
+        scheduled = start + index * CHUNK_SECONDS
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif -delay > CHUNK_SECONDS:
+            metrics["late_chunks"] += 1
+
+        audio_data = audio[index * CHUNK:(index + 1) * CHUNK].tobytes()
+        began = time.perf_counter()
+        audio_float32 = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        prob = vad.detect_speech(audio_float32, SAMPLE_RATE)
+        metrics["dsp_seconds"] += time.perf_counter() - began
+
+        if prob > SPEECH_THRESHOLD:
+            silence = 0
+            is_speaking = True
+            speech_buffer.append(audio_data)
+        elif is_speaking:
+            silence += 1
+            speech_buffer.append(audio_data)
+            if silence >= silence_chunks:
+                is_speaking = False
+                silence = 0
+                began = time.perf_counter()
+                samples = np.frombuffer(b''.join(speech_buffer), dtype=np.int16).astype(np.float32)
+                cleaned = nr.reduce_noise(y=samples, sr=SAMPLE_RATE, stationary=True, prop_decrease=0.75)
+                voiced = np.where(np.abs(cleaned) > 500)[0]
+                if len(voiced):
+                    cleaned = cleaned[max(0, voiced[0] - 800):voiced[-1] + 800]
+                    cleaned = cleaned * (32000.0 / np.max(np.abs(cleaned)))
+                    cleaned.astype(np.int16).tobytes()
+                metrics["dsp_seconds"] += time.perf_counter() - began
+                metrics["utterances"] += 1
+                speech_buffer = []
+
+
+async def current_call(audio: np.ndarray, silence_chunks: int, metrics: Dict[str, float]) -> None:
+    batcher = get_vad_batcher()
+    vad_session = batcher.create_session()
+    speech_buffer = PCMBuffer()
+    pre_buffer = PCMRingBuffer(10 * CHUNK)
+    is_speaking = False
+    silence = 0
+    pending: List[asyncio.Task] = []
+    start = time.perf_counter()
+    for index in range(len(audio) // CHUNK):
+        scheduled = start + index * CHUNK_SECONDS
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif -delay > CHUNK_SECONDS:
+            metrics["late_chunks"] += 1
+
+        chunk = np.frombuffer(audio[index * CHUNK:(index + 1) * CHUNK].tobytes(), dtype=np.int16)
+        began = time.perf_counter()
+        prob = await batcher.detect(vad_session, chunk)
+        metrics["dsp_seconds"] += time.perf_counter() - began
+
+        if prob > SPEECH_THRESHOLD:
+            silence = 0
+            if not is_speaking:
+                is_speaking = True
+                speech_buffer.clear()
+                pre_buffer.drain_into(speech_buffer)
+            speech_buffer.append(chunk)
+        elif is_speaking:
+            silence += 1
+            speech_buffer.append(chunk)
+            if silence >= silence_chunks:
+                is_speaking = False
+                silence = 0
+                # Like process_speech_segment: the call keeps streaming meanwhile
+                pending.append(asyncio.create_task(_timed_preprocess(speech_buffer.take(), metrics)))
+        pre_buffer.append(chunk)
+    await asyncio.gather(*pending)
+
+
+async def _timed_preprocess(samples: np.ndarray, metrics: Dict[str, float]) -> None:
+    began = time.perf_counter()
+    await run_preprocess(samples)
+    metrics["dsp_seconds"] += time.perf_counter() - began
+    metrics["utterances"] += 1
+
+
+async def monitor_loop_lag(lags: List[float], stop: asyncio.Event) -> None:
+    interval = 0.010
+    while not stop.is_set():
+        began = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - began - interval) * 1000)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+async def run_path(path: str, args) -> None:
+    calls = [synth_call(args.seconds, seed) for seed in range(args.calls)]
+    metrics = [{"dsp_seconds": 0.0, "late_chunks": 0, "utterances": 0} for _ in calls]
+    silence_chunks = int(args.silence_ms / (CHUNK_SECONDS * 1000))
+    run_call = legacy_call if path == "legacy" else current_call
+
+    # Load models / start pools before measuring
+    get_vad()
+    if path == "current":
+        batcher = get_vad_batcher()
+        await batcher.detect(batcher.create_session(), np.zeros(CHUNK, dtype=np.int16))
+        await run_preprocess(calls[0][:SAMPLE_RATE])
+    else:
+        preprocess_utterance(calls[0][:SAMPLE_RATE])
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(lags, stop))
+    began = time.perf_counter()
+    await asyncio.gather(*(run_call(audio, silence_chunks, m) for audio, m in zip(calls, metrics)))
+    elapsed = time.perf_counter() - began
+    stop.set()
+    await monitor
+
+    rtf = [m["dsp_seconds"] / args.seconds for m in metrics]
+    print(f"\n[{path}] {args.calls} calls x {args.seconds:.0f}s audio, VAD engine {VAD_ENGINE}")
+    print(f"  wall time:         {elapsed:.1f}s")
+    print(f"  event-loop lag ms: p50 {percentile(lags, 50):.1f}, p99 {percentile(lags, 99):.1f}, max {max(lags):.1f}")
+    print(f"  real-time factor:  mean {statistics.mean(rtf):.3f}, p95 {percentile(rtf, 95):.3f}")
+    print(f"  late chunks:       {sum(m['late_chunks'] for m in metrics)} of {args.calls * (len(calls[0]) // CHUNK)}")
+    print(f"  utterances:        {sum(m['utterances'] for m in metrics)}")
+    if path == "current":
+        print(f"  VAD batches:       {get_vad_batcher().get_stats()}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test voice audio DSP")
+    parser.add_argument("--path", choices=["legacy", "current", "both"], default="both")
+    parser.add_argument("--calls", type=int, default=50, help="Concurrent voice calls")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Audio per call")
+    parser.add_argument("--silence-ms", type=float, default=1000.0, help="Silence that ends an utterance")
+    args = parser.parse_args()
+
+    paths = ["legacy", "current"] if args.path == "both" else [args.path]
+    try:
+        for path in paths:
+            await run_path(path, args)
+    finally:
+        shutdown_dsp_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Replay Session Cart Snapshots
+=============================
+Rebuilds per-session cart snapshots from session_events using the same
+reducer as the live path (apply_cart_event) and compares the result with
+the session_cart table and the Redis snapshot.
+
+A clean run (0 mismatches) shows that the event log, the materialized
+table and the snapshot agree. Sessions whose carts were changed before
+cart events were logged for every mutation may legitimately differ.
+
+Run:
+    python scripts/replay_session_snapshots.py                 # sessions active in the last 24h
+    python scripts/replay_session_snapshots.py --session abc123
+    python scripts/replay_session_snapshots.py --hours 72 --write   # also rewrite Redis snapshots
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.db_pool import AsyncDBConnection, close_async_pool
+from app.core.redis import redis_manager, get_redis_client
+from app.core.session_events import (
+    CART_EVENT_TYPES,
+    _LOAD_CART_ROWS_SQL,
+    _rows_from_db,
+    apply_cart_event,
+    cart_summary_from_rows,
+    get_cart_snapshot_store,
+    get_session_event_writer,
+)
+
+
+def comparable(rows: List[Dict[str, Any]]) -> List[tuple]:
+    """Active lines in cart order, as compared by get_cart_summary()."""
+    return [
+        (item["item_id"], item["quantity"], item["price"], item["special_instructions"])
+        for item in cart_summary_from_rows(rows)["items"]
+    ]
+
+
+async def session_ids(db, args) -> List[str]:
+    if args.session:
+        return args.session
+    records = await db.fetch(
+        """
+        SELECT DISTINCT session_id
+        FROM session_events
+        WHERE event_type = ANY($1::text[])
+          AND timestamp > NOW() - make_interval(hours => $2)
+        LIMIT $3
+        """,
+        list(CART_EVENT_TYPES),
+        args.hours,
+        args.limit
+    )
+    return [record["session_id"] for record in records]
+
+
+async def replay_session(db, session_id: str) -> List[Dict[str, Any]]:
+    events = await db.fetch(
+        """
+        SELECT event_type, event_data
+        FROM session_events
+        WHERE session_id = $1 AND event_type = ANY($2::text[])
+        ORDER BY timestamp, event_id
+        """,
+        session_id,
+        list(CART_EVENT_TYPES)
+    )
+    rows: List[Dict[str, Any]] = []
+    for event in events:
+        data = event["event_data"]
+        if isinstance(data, str):
+            data = json.loads(data)
+        apply_cart_event(rows, event["event_type"], data)
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--session", action="append", help="session id to check (repeatable)")
+    parser.add_argument("--hours", type=int, default=24, help="look-back window when no --session is given")
+    parser.add_argument("--limit", type=int, default=1000, help="max sessions to check")
+    parser.add_argument("--write", action="store_true", help="overwrite Redis snapshots with the replayed state")
+    parser.add_argument("--verbose", action="store_true", help="print each mismatching cart")
+    args = parser.parse_args()
+
+    redis_manager.init_redis()
+    redis_client = get_redis_client()
+    store = get_cart_snapshot_store()
+
+    # Events logged by this process are not in the table until flushed
+    await get_session_event_writer().flush()
+
+    checked = table_mismatches = snapshot_mismatches = snapshots_missing = written = 0
+
+    async with AsyncDBConnection() as db:
+        for session_id in await session_ids(db, args):
+            checked += 1
+            replayed = await replay_session(db, session_id)
+            table_rows = _rows_from_db(await db.fetch(_LOAD_CART_ROWS_SQL, session_id))
+
+            if comparable(replayed) != comparable(table_rows):
+                table_mismatches += 1
+                if args.verbose:
+                    print(f"[table]    {session_id}\n  replayed: {comparable(replayed)}\n  table:    {comparable(table_rows)}")
+
+            cached = await redis_client.hget(store.key(session_id), "cart")
+            if cached is None:
+                snapshots_missing += 1
+            elif comparable(json.loads(cached)) != comparable(replayed):
+                snapshot_mismatches += 1
+                if args.verbose:
+                    print(f"[snapshot] {session_id}\n  replayed: {comparable(replayed)}\n  snapshot: {comparable(json.loads(cached))}")
+
+            if args.write:
+                await redis_client.hset(store.key(session_id), "cart", json.dumps(replayed))
+                await redis_client.expire(store.key(session_id), store.ttl)
+                written += 1
+
+    await redis_manager.close()
+    await close_async_pool()
+
+    print("=" * 64)
+    print("SESSION CART REPLAY")
+    print("=" * 64)
+    print(f"Sessions checked:        {checked}")
+    print(f"Replay vs session_cart:  {table_mismatches} mismatches")
+    print(f"Replay vs Redis:         {snapshot_mismatches} mismatches ({snapshots_missing} not cached)")
+    if args.write:
+        print(f"Snapshots rewritten:     {written}")
+    return 1 if table_mismatches or snapshot_mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
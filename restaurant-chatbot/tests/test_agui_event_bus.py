@@ -0,0 +1,53 @@
+"""Tests for AG-UI event bus queue lifetime and Redis Stream subscriptions."""
+
+import time
+
+import pytest
+
+from app.core.agui_event_bus import InMemoryEventBus, RedisStreamEventBus
+
+
+class _Event:
+    def __init__(self, type_, payload="{}"):
+        self.type = type_
+        self.payload = payload
+
+    def to_json(self):
+        return self.payload
+
+
+def test_disconnected_session_keeps_replay_until_idle():
+    bus = InMemoryEventBus()
+    queue = bus.queue("s1")
+    for _ in range(3):
+        queue.put_nowait(_Event("TEXT_MESSAGE_CONTENT"))
+        queue.get_nowait()
+
+    # The client dropped after the first event and reconnects
+    assert bus.expire_idle(idle_seconds=60) == 0
+    subscription = bus.subscribe("s1", last_event_id=f"{queue.token}-1")
+    assert [entry.event_id for entry in subscription._replay] == [f"{queue.token}-2", f"{queue.token}-3"]
+
+    queue.last_active = time.monotonic() - 120
+    assert bus.expire_idle(idle_seconds=60) == 1
+    assert bus.queue("s1") is not queue
+
+
+@pytest.mark.asyncio
+async def test_subscribe_without_last_event_id_starts_at_tail(redis_client):
+    bus = RedisStreamEventBus()
+    key = bus.stream_key("s1")
+    old_id = await redis_client.xadd(key, {"type": "RUN_FINISHED", "data": "{}"})
+
+    fresh = bus.subscribe("s1")
+    resumed = bus.subscribe("s1", last_event_id="0-0")
+    bus._reader.cancel()
+    await bus._pin_new_cursors(redis_client)
+
+    assert fresh.cursor == old_id
+    assert resumed.cursor == "0-0"
+
+    empty = bus.subscribe("s2")
+    bus._reader.cancel()
+    await bus._pin_new_cursors(redis_client)
+    assert empty.cursor == "0-0"
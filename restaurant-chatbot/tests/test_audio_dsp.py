@@ -0,0 +1,59 @@
+"""Tests for the preallocated PCM sample buffers."""
+
+import numpy as np
+import pytest
+
+from app.services.audio_dsp import PCMBuffer, PCMRingBuffer
+
+
+def _samples(start, stop):
+    return np.arange(start, stop, dtype=np.int16)
+
+
+def _drained(ring):
+    target = PCMBuffer(capacity=4)
+    ring.drain_into(target)
+    return target.take().tolist()
+
+
+def test_ring_keeps_most_recent_samples_across_wraparound():
+    ring = PCMRingBuffer(8)
+    ring.append(_samples(0, 5))
+    ring.append(_samples(5, 11))
+
+    assert len(ring) == 8
+    assert _drained(ring) == list(range(3, 11))
+    assert len(ring) == 0
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([(0, 3)], [0, 1, 2]),
+    ([(0, 8)], list(range(8))),
+    ([(0, 20)], list(range(12, 20))),
+    ([(0, 6), (6, 8), (8, 9)], list(range(1, 9))),
+])
+def test_ring_drains_oldest_first(chunks, expected):
+    ring = PCMRingBuffer(8)
+    for start, stop in chunks:
+        ring.append(_samples(start, stop))
+
+    assert _drained(ring) == expected
+
+
+def test_ring_reuse_after_drain():
+    ring = PCMRingBuffer(4)
+    ring.append(_samples(0, 3))
+    _drained(ring)
+    ring.append(_samples(10, 13))
+
+    assert _drained(ring) == [10, 11, 12]
+
+
+def test_pcm_buffer_grows_and_take_clears():
+    buffer = PCMBuffer(capacity=2)
+    buffer.append(_samples(0, 3))
+    buffer.append(_samples(3, 5))
+
+    assert buffer.view().tolist() == [0, 1, 2, 3, 4]
+    assert buffer.take().tolist() == [0, 1, 2, 3, 4]
+    assert len(buffer) == 0
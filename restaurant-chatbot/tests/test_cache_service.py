@@ -0,0 +1,87 @@
+"""Tests for the response cache: semantic tier and tag-based invalidation."""
+
+import time
+
+import numpy as np
+import pytest
+
+import app.services.cache_service as cache_module
+from app.services.cache_service import ResponseCacheService
+
+SCOPE = "cache:faq:semantic:rest-1:v1"
+
+
+@pytest.fixture
+def cache(redis_client, monkeypatch):
+    monkeypatch.setattr(cache_module, "get_redis_client", lambda: redis_client)
+    service = ResponseCacheService()
+    service.semantic_enabled = True
+    service.semantic_threshold = 0.9
+
+    async def embed(query):
+        return np.array([1.0, 0.0] if "hours" in query else [0.0, 1.0], dtype=np.float32)
+
+    monkeypatch.setattr(service, "_embed_query", embed)
+    monkeypatch.setattr(service, "_semantic_scope_key", lambda category, restaurant_id: SCOPE)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_each_entry_keeps_its_own_expiry(cache, redis_client):
+    await cache._semantic_store("opening hours?", '{"a": 1}', "faq", None, ttl=100)
+    first_ttl = await redis_client.ttl(f"{SCOPE}:answers")
+    await cache._semantic_store("parking?", '{"a": 2}', "faq", None, ttl=10)
+
+    # A shorter-lived entry does not shorten (or re-extend) the hash
+    assert await redis_client.ttl(f"{SCOPE}:answers") == first_ttl
+    fields = sorted(await redis_client.hkeys(f"{SCOPE}:answers"))
+    expiries = sorted(int(field.split(":")[0]) - int(time.time()) for field in fields)
+    assert 8 <= expiries[0] <= 10 and 98 <= expiries[1] <= 100
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_skipped_and_pruned(cache, redis_client, monkeypatch):
+    await cache._semantic_store("opening hours?", '{"a": 1}', "faq", None, ttl=60)
+    assert await cache._semantic_lookup("what are your hours", "faq", None) == {"a": 1}
+
+    later = time.time() + 61
+    monkeypatch.setattr(cache_module.time, "time", lambda: later)
+
+    assert await cache._semantic_lookup("what are your hours", "faq", None) is None
+    assert await redis_client.hlen(f"{SCOPE}:answers") == 0
+    assert await redis_client.hlen(f"{SCOPE}:vectors") == 0
+
+    # A fresh answer can be stored for the same query again
+    await cache._semantic_store("opening hours?", '{"a": 3}', "faq", None, ttl=60)
+    assert await cache._semantic_lookup("what are your hours", "faq", None) == {"a": 3}
+
+
+@pytest.mark.asyncio
+async def test_invalidate_category_for_branch_uses_tags(cache, redis_client):
+    cache.semantic_enabled = False
+    await cache.set_cached_response("veg starters?", {"content": "a"}, category="menu", restaurant_id="rest-1")
+    await cache.set_cached_response("desserts?", {"content": "b"}, category="menu", restaurant_id="rest-2")
+    await cache.set_cached_response("parking?", {"content": "c"}, category="faq", restaurant_id="rest-1")
+
+    assert await cache.invalidate_category("menu", restaurant_id="rest-1") == 1
+    assert await cache.get_cached_response("veg starters?", category="menu") is None
+    assert await cache.get_cached_response("desserts?", category="menu") == {"content": "b"}
+    assert await cache.get_cached_response("parking?", category="faq") == {"content": "c"}
+
+    assert await cache.invalidate_category("menu") == 1
+    assert await cache.get_cached_response("desserts?", category="menu") is None
+    assert not await redis_client.exists("cache:tag:menu")
+
+
+@pytest.mark.asyncio
+async def test_feature_cache_batch_operations(redis_client):
+    from app.core.cache import CacheService
+
+    feature = CacheService("food_ordering")
+    feature.redis_client = redis_client
+
+    assert await feature.set_many("item", {"1": {"n": 1}, "2": {"n": 2}}, ttl=60, tags=["branch:9"])
+    assert await feature.get_many("item", ["1", "2", "3"]) == {"1": {"n": 1}, "2": {"n": 2}}
+    assert await feature.delete_many("item", ["1"]) == 1
+    assert await feature.invalidate_tag("branch:9") == 1
+    assert await feature.get_many("item", ["1", "2"]) == {}
@@ -0,0 +1,42 @@
+"""Tests for the crew cache size accounting."""
+
+import logging
+
+import pytest
+
+from app.orchestration.crew_cache import CrewCache, estimate_retained_size
+
+
+class _Crew:
+    def __init__(self):
+        self.history = ["message"] * 100
+        # Module-level singleton shared by every crew
+        self.logger = logging.getLogger()
+
+
+def test_estimate_skips_module_level_singletons():
+    crew = _Crew()
+    without_logger = _Crew()
+    without_logger.logger = None
+
+    size = estimate_retained_size(crew)
+
+    assert size == estimate_retained_size(without_logger)
+    assert estimate_retained_size(crew, shared=[crew.history]) < size
+
+
+@pytest.mark.asyncio
+async def test_aset_estimates_size_in_worker_thread():
+    cache = CrewCache(max_entries=4, ttl=60, track_memory=True)
+    crew = _Crew()
+
+    assert await cache.aset("s1", crew) is crew
+    assert cache.get("s1") is crew
+    assert cache.get_stats()["memory_bytes"] == estimate_retained_size(crew)
+
+
+def test_memory_tracking_is_off_by_default():
+    cache = CrewCache(max_entries=4, ttl=60)
+    cache.set("s1", _Crew())
+
+    assert cache.get_stats()["memory_bytes"] == 0
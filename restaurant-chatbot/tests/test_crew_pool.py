@@ -0,0 +1,42 @@
+"""Tests for crew checkout and eviction in the crew pool."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.services.crew_pool import CrewPool
+
+
+@pytest_asyncio.fixture
+async def pool(monkeypatch):
+    pool = CrewPool(size=1, checkout_timeout=1.0, low_water_mark=0, max_uses=0, build_concurrency=1)
+    monkeypatch.setattr(pool, "_create_pooled_crew", lambda crew_index: {"crew": crew_index})
+    pool._ensure_primitives()
+    await pool._build_crew()
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_cancelled_body_returns_crew_to_pool(pool):
+    async def run():
+        async with pool.get_crew():
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert pool.idle_count == 1
+    assert pool.get_stats()["evicted_errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_body_evicts_crew(pool):
+    with pytest.raises(RuntimeError):
+        async with pool.get_crew():
+            raise RuntimeError("tool crashed")
+
+    assert pool.get_stats()["evicted_errors"] == 1
@@ -0,0 +1,246 @@
+"""Tests for the Lua-backed inventory reservations (reserve, release, reap, checkout, settle)."""
+
+import time
+
+import pytest
+
+pytest.importorskip("lupa")
+
+import app.services.inventory_cache_service as inventory_module
+from app.services.inventory_cache_service import (
+    HOLDS_KEY,
+    InventoryCacheService,
+    InventoryReservationError,
+    settle_checkout_hold,
+)
+
+
+@pytest.fixture
+def inventory(redis_client):
+    service = InventoryCacheService()
+    assert service.enabled
+    return service
+
+
+async def _available(redis_client, item_id):
+    return int(await redis_client.get(f"inventory:available:{item_id}"))
+
+
+async def _expire_holds(redis_client):
+    """Move every hold's expiry into the past."""
+    for hold in await redis_client.zrange(HOLDS_KEY, 0, -1):
+        await redis_client.zadd(HOLDS_KEY, {hold: int(time.time() * 1000) - 1000})
+
+
+@pytest.mark.asyncio
+async def test_reserve_decrements_and_rereserve_adjusts(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+
+    await inventory.reserve_inventory("itm1", 3, "u1")
+    assert await _available(redis_client, "itm1") == 7
+    assert await inventory.get_reserved_quantity("itm1") == 3
+
+    # Quantities are the user's absolute hold, not increments
+    await inventory.reserve_inventory("itm1", 5, "u1")
+    assert await _available(redis_client, "itm1") == 5
+    await inventory.reserve_inventory("itm1", 2, "u1")
+    assert await _available(redis_client, "itm1") == 8
+    assert await redis_client.zscore(HOLDS_KEY, "itm1|u1") is not None
+
+
+@pytest.mark.asyncio
+async def test_reserve_insufficient_stock_raises(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 2)
+
+    with pytest.raises(InventoryReservationError):
+        await inventory.reserve_inventory("itm1", 3, "u1")
+    assert await _available(redis_client, "itm1") == 2
+
+
+@pytest.mark.asyncio
+async def test_reserve_multiple_items_is_all_or_nothing(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 5)
+    await inventory.set_item_inventory("itm2", 1)
+
+    result = await inventory.reserve_multiple_items(
+        [{"item_id": "itm1", "quantity": 2}, {"item_id": "itm2", "quantity": 2}], "u1"
+    )
+
+    assert not result["success"]
+    assert [failure["item_id"] for failure in result["failed_items"]] == ["itm2"]
+    assert await _available(redis_client, "itm1") == 5
+    assert await _available(redis_client, "itm2") == 1
+
+
+@pytest.mark.asyncio
+async def test_release_returns_stock(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.reserve_inventory("itm1", 4, "u1")
+
+    await inventory.release_reservation("itm1", "u1")
+
+    assert await _available(redis_client, "itm1") == 10
+    assert await inventory.get_reserved_quantity("itm1") == 0
+    assert await redis_client.zcard(HOLDS_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_reaper_returns_only_expired_holds(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.reserve_inventory("itm1", 4, "u1")
+    await _expire_holds(redis_client)
+    await inventory.reserve_inventory("itm1", 1, "u2")
+
+    assert await inventory.reap_expired_reservations() == (1, 4)
+    assert await _available(redis_client, "itm1") == 9
+    assert await inventory.get_item_reservations("itm1") == ["u2"]
+
+
+@pytest.mark.asyncio
+async def test_reaper_works_in_batches(inventory, redis_client, monkeypatch):
+    monkeypatch.setattr(inventory_module, "REAPER_BATCH_SIZE", 2)
+    await inventory.set_item_inventory("itm1", 10)
+    for user in ("u1", "u2", "u3", "u4", "u5"):
+        await inventory.reserve_inventory("itm1", 1, user)
+    await _expire_holds(redis_client)
+
+    assert await inventory.reap_expired_reservations() == (5, 5)
+    assert await _available(redis_client, "itm1") == 10
+
+
+@pytest.mark.asyncio
+async def test_reserve_can_skip_untracked_items(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 5)
+    items = [{"item_id": "itm1", "quantity": 2}, {"item_id": "untracked", "quantity": 1}]
+
+    assert not (await inventory.reserve_multiple_items(items, "s1"))["success"]
+    assert (await inventory.reserve_multiple_items(items, "s1", skip_untracked=True))["success"]
+    assert await _available(redis_client, "itm1") == 3
+    assert await redis_client.get("inventory:available:untracked") is None
+
+
+@pytest.mark.asyncio
+async def test_checkout_moves_cart_holds_to_the_order(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.reserve_inventory("itm1", 3, "s1")
+
+    result = await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 3}], "s1")
+
+    assert result == {"success": True, "rereserved": [], "failed_items": []}
+    # Still held, not sold: the order owns the hold until payment settles it
+    assert await _available(redis_client, "itm1") == 7
+    assert await inventory.get_reserved_quantity("itm1") == 3
+    assert await inventory.get_item_reservations("itm1") == ["order:s1"]
+    assert await redis_client.zscore(HOLDS_KEY, "itm1|order:s1") is not None
+
+
+@pytest.mark.asyncio
+async def test_paid_order_keeps_stock_sold(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.reserve_inventory("itm1", 3, "s1")
+    await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 3}], "s1")
+
+    assert settle_checkout_hold("s1", sold=True) == 1
+
+    assert await _available(redis_client, "itm1") == 7
+    assert await inventory.get_reserved_quantity("itm1") == 0
+    assert await redis_client.zcard(HOLDS_KEY) == 0
+    # Settling again (a duplicate callback) changes nothing
+    assert settle_checkout_hold("s1", sold=True) == 0
+    assert await _available(redis_client, "itm1") == 7
+
+
+@pytest.mark.asyncio
+async def test_failed_payment_returns_stock(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.reserve_inventory("itm1", 3, "s1")
+    await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 3}], "s1")
+
+    assert settle_checkout_hold("s1", sold=False) == 1
+
+    assert await _available(redis_client, "itm1") == 10
+    assert await inventory.get_reserved_quantity("itm1") == 0
+
+
+@pytest.mark.asyncio
+async def test_abandoned_order_is_reaped(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 2}], "s1")
+    await _expire_holds(redis_client)
+
+    assert await inventory.reap_expired_reservations() == (1, 2)
+    assert await _available(redis_client, "itm1") == 10
+
+
+@pytest.mark.asyncio
+async def test_payment_after_reap_takes_the_stock_again(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 2}], "s1")
+    await _expire_holds(redis_client)
+    await inventory.reap_expired_reservations()
+
+    settle_checkout_hold("s1", sold=True)
+
+    assert await _available(redis_client, "itm1") == 8
+
+
+@pytest.mark.asyncio
+async def test_checkout_rereserves_expired_hold(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.reserve_inventory("itm1", 3, "s1")
+    await _expire_holds(redis_client)
+    await inventory.reap_expired_reservations()
+    assert await _available(redis_client, "itm1") == 10
+
+    result = await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 3}], "s1")
+
+    assert result["success"]
+    assert result["rereserved"] == ["itm1"]
+    assert await _available(redis_client, "itm1") == 7
+
+
+@pytest.mark.asyncio
+async def test_checkout_refused_when_expired_hold_sold_out(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 3)
+    await inventory.set_item_inventory("itm2", 5)
+    await inventory.reserve_multiple_items(
+        [{"item_id": "itm1", "quantity": 3}, {"item_id": "itm2", "quantity": 1}], "s1"
+    )
+    await _expire_holds(redis_client)
+    await inventory.reap_expired_reservations()
+    # Someone else buys the stock the reaper returned
+    await inventory.reserve_inventory("itm1", 2, "s2")
+
+    result = await inventory.hold_cart_for_checkout(
+        [{"item_id": "itm1", "quantity": 3}, {"item_id": "itm2", "quantity": 1}], "s1"
+    )
+
+    assert not result["success"]
+    assert [(f["item_id"], f["held"], f["available"]) for f in result["failed_items"]] == [("itm1", 0, 1)]
+    # Nothing was taken for the other item either
+    assert await _available(redis_client, "itm2") == 5
+
+
+@pytest.mark.asyncio
+async def test_new_checkout_returns_items_dropped_from_the_order(inventory, redis_client):
+    await inventory.set_item_inventory("itm1", 10)
+    await inventory.set_item_inventory("itm2", 10)
+    await inventory.hold_cart_for_checkout(
+        [{"item_id": "itm1", "quantity": 2}, {"item_id": "itm2", "quantity": 1}], "s1"
+    )
+
+    await inventory.hold_cart_for_checkout([{"item_id": "itm1", "quantity": 1}], "s1")
+
+    assert await _available(redis_client, "itm1") == 9
+    assert await _available(redis_client, "itm2") == 10
+    settle_checkout_hold("s1", sold=True)
+    assert await _available(redis_client, "itm1") == 9
+
+
+@pytest.mark.asyncio
+async def test_checkout_ignores_untracked_items(inventory, redis_client):
+    result = await inventory.hold_cart_for_checkout([{"item_id": "untracked", "quantity": 2}], "s1")
+
+    assert result["success"]
+    assert await redis_client.get("inventory:available:untracked") is None
+    assert settle_checkout_hold("s1", sold=True) == 0
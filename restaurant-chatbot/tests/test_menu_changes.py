@@ -0,0 +1,165 @@
+"""Tests for applying menu change sets to the preloaded menu and the Redis menu cache."""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import app.services.menu_cache_service as menu_cache_module
+from app.core.preloader import MenuPreloader, _MenuSnapshot, _merge_menu_items
+from app.services.menu_cache_service import MenuCacheService
+
+
+def _item(item_id, name, recommended=False, price=100):
+    return {"id": item_id, "name": name, "is_recommended": recommended, "price": price}
+
+
+def _ids(items):
+    return [item["id"] for item in items]
+
+
+def test_merge_updates_in_place_and_drops_removed():
+    current = [_item("a", "Biryani", recommended=True), _item("b", "Dal"), _item("c", "Naan")]
+
+    merged = _merge_menu_items(current, [_item("b", "Dal", price=120)], drop={"c"})
+
+    assert _ids(merged) == ["a", "b"]
+    assert merged[1]["price"] == 120
+
+
+def test_merge_inserts_new_and_reordered_items_in_menu_order():
+    current = [_item("a", "Biryani", recommended=True), _item("b", "Dal"), _item("c", "Naan")]
+    fresh = [
+        _item("c", "Naan", recommended=True),  # now recommended: moves up
+        _item("d", "Kulfi"),                   # new
+        _item("e", "Aloo Gobi"),               # new
+    ]
+
+    merged = _merge_menu_items(current, fresh, drop=set())
+
+    assert _ids(merged) == ["a", "c", "e", "b", "d"]
+    assert merged[1]["is_recommended"]
+
+
+def test_merge_ignores_dropped_ids_that_come_back_fresh():
+    current = [_item("a", "Biryani"), _item("b", "Dal")]
+
+    merged = _merge_menu_items(current, [_item("b", "Dal", price=90)], drop={"b"})
+
+    assert _ids(merged) == ["a", "b"]
+    assert merged[1]["price"] == 90
+
+
+class _FakeVectorDB:
+    """Menu collection keyed by item id; records what was re-embedded."""
+
+    def __init__(self, items):
+        self.vectors = {item["id"]: item for item in items if item.get("price", 0) > 0}
+        self.upserted = []
+        self.cleared = 0
+        self.menu_collection = types.SimpleNamespace(count=lambda: len(self.vectors))
+
+    async def upsert_menu_items(self, items):
+        self.upserted.extend(item["id"] for item in items)
+        self.vectors.update({item["id"]: item for item in items})
+
+    async def bulk_index_menu_items(self, items):
+        self.vectors.update({item["id"]: item for item in items})
+
+    def delete_menu_items(self, item_ids):
+        for item_id in item_ids:
+            self.vectors.pop(item_id, None)
+
+    def clear_collection(self):
+        self.cleared += 1
+        self.vectors = {}
+
+    def get_embedding_matrix(self):
+        ids = list(self.vectors)
+        return ids, np.ones((len(ids), 2), dtype=np.float32)
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    def install(items):
+        vdb = _FakeVectorDB(items)
+        module = types.SimpleNamespace(get_vector_db_service=lambda: vdb)
+        monkeypatch.setitem(sys.modules, "app.ai_services.vector_db_service", module)
+        return vdb
+    return install
+
+
+@pytest.mark.asyncio
+async def test_version_change_reembeds_only_changed_items(vector_db):
+    previous_items = [_item("a", "Biryani"), _item("b", "Dal"), _item("c", "Naan")]
+    vdb = vector_db(previous_items)
+    preloader = MenuPreloader()
+    previous = _MenuSnapshot(previous_items, "v1")
+    preloader._set_menu([_item("a", "Biryani"), _item("b", "Dal", price=120), _item("d", "Kulfi")], "v2")
+
+    await preloader._sync_vector_db(previous=previous)
+
+    assert sorted(vdb.upserted) == ["b", "d"]
+    assert sorted(vdb.vectors) == ["a", "b", "d"]
+    assert vdb.cleared == 0
+
+
+@pytest.mark.asyncio
+async def test_count_mismatch_or_reindex_rebuilds_the_collection(vector_db):
+    items = [_item("a", "Biryani"), _item("b", "Dal")]
+    preloader = MenuPreloader()
+    preloader._set_menu(items, "v2")
+
+    # The index lost an item the diff knows nothing about
+    vdb = vector_db(items[:1])
+    await preloader._sync_vector_db(previous=_MenuSnapshot(items, "v1"))
+    assert vdb.cleared == 1 and sorted(vdb.vectors) == ["a", "b"]
+
+    vdb = vector_db(items)
+    await preloader._sync_vector_db(previous=_MenuSnapshot(items, "v1"), reindex=True)
+    assert vdb.cleared == 1
+
+
+@pytest.fixture
+def menu_cache(redis_client, monkeypatch):
+    monkeypatch.setattr(menu_cache_module, "get_redis_client", lambda: redis_client)
+    service = MenuCacheService()
+    reloads = []
+
+    async def load_menu_from_db():
+        reloads.append(1)
+
+    service.load_menu_from_db = load_menu_from_db
+    service.reloads = reloads
+    return service
+
+
+@pytest.mark.asyncio
+async def test_failed_change_set_falls_back_to_full_reload(menu_cache):
+    async def refresh_items(item_ids):
+        raise ConnectionError("database unavailable")
+
+    menu_cache.refresh_items = refresh_items
+
+    applied = await menu_cache.apply_menu_changes({"change_id": "c1", "items": {"updated": ["a"]}})
+
+    assert applied["reloaded"] == 1
+    assert menu_cache.reloads == [1]
+
+
+@pytest.mark.asyncio
+async def test_change_set_is_applied_once(menu_cache):
+    refreshed = []
+
+    async def refresh_items(item_ids):
+        refreshed.append(item_ids)
+        return {"refreshed": len(item_ids), "removed": 0}
+
+    menu_cache.refresh_items = refresh_items
+    change = {"change_id": "c1", "items": {"updated": ["a"]}, "stock": {"out": ["a", "b"]}}
+
+    assert (await menu_cache.apply_menu_changes(change))["refreshed"] == 2
+    assert (await menu_cache.apply_menu_changes(change))["refreshed"] == 0
+    assert refreshed == [["a", "b"]]
+    assert menu_cache.reloads == []
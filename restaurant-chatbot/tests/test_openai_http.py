@@ -0,0 +1,46 @@
+"""Tests for the per-event-loop pooled OpenAI HTTP clients."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.ai_services.openai_http import PooledHTTPClient
+
+
+def _in_thread_loop(pool):
+    """(client, cached object) seen from a coroutine on another thread's loop."""
+    seen = {}
+
+    async def use_pool():
+        seen["client"] = pool.client
+        seen["cached"] = pool.cached("sdk", lambda client: {"client": client})
+
+    thread = threading.Thread(target=lambda: asyncio.run(use_pool()))
+    thread.start()
+    thread.join()
+    return seen["client"], seen["cached"]
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_within_a_loop():
+    pool = PooledHTTPClient("test")
+
+    assert pool.client is pool.client
+    assert pool.cached("sdk", lambda client: {"client": client})["client"] is pool.client
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_each_loop_gets_its_own_client():
+    pool = PooledHTTPClient("test")
+    client = pool.client
+    cached = pool.cached("sdk", lambda client: {"client": client})
+
+    other_client, other_cached = _in_thread_loop(pool)
+
+    assert other_client is not client
+    assert other_cached is not cached and other_cached["client"] is other_client
+    assert pool.cached("sdk", lambda client: {"client": client}) is cached
+    await pool.aclose()
+    assert pool.get_stats()["event_loops"] == 0
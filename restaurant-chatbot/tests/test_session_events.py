@@ -0,0 +1,112 @@
+"""Tests for the cart snapshot store and the batched session event writer."""
+
+import pytest
+
+from app.core.session_events import CartSnapshotStore, EventType, SessionEventWriter
+
+
+ITEM = {
+    "item_id": "item-1",
+    "item_name": "Paneer Tikka",
+    "quantity": 1,
+    "price": 250.0,
+    "special_instructions": None,
+}
+
+
+@pytest.mark.asyncio
+async def test_seed_during_write_does_not_double_apply(redis_client):
+    store = CartSnapshotStore()
+    session_cart = []
+
+    async def loader():
+        return [dict(row) for row in session_cart]
+
+    await store.begin("s1")
+    session_cart.append({**ITEM, "is_active": True})
+    # A reader seeds between the DB write and apply(): its rows already hold the item
+    seeded = await store.get("s1", loader)
+    await store.apply("s1", EventType.ITEM_ADDED, ITEM)
+
+    assert seeded[0]["quantity"] == 1
+    cart = await store.get("s1", loader)
+    assert [(row["item_id"], row["quantity"]) for row in cart] == [("item-1", 1)]
+    assert store.get_stats()["seeds_deferred"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_applies_event_to_snapshot(redis_client):
+    store = CartSnapshotStore()
+
+    async def loader():
+        return []
+
+    assert await store.get("s1", loader) == []
+    async with store.write("s1", EventType.ITEM_ADDED, ITEM):
+        pass
+
+    cart = await store.get("s1", loader)
+    assert cart[0]["item_id"] == "item-1" and cart[0]["is_active"]
+    assert await redis_client.hget(store.key("s1"), "w") == "0"
+
+
+@pytest.mark.asyncio
+async def test_failed_write_drops_snapshot_rows(redis_client):
+    store = CartSnapshotStore()
+    session_cart = []
+
+    async def loader():
+        return [dict(row) for row in session_cart]
+
+    await store.get("s1", loader)
+    with pytest.raises(RuntimeError):
+        async with store.write("s1", EventType.ITEM_ADDED, ITEM):
+            # The upsert landed, the statement after it failed
+            session_cart.append({**ITEM, "is_active": True})
+            raise RuntimeError("database unavailable")
+
+    assert await redis_client.hget(store.key("s1"), "cart") is None
+    cart = await store.get("s1", loader)
+    assert [row["item_id"] for row in cart] == ["item-1"]
+    assert await redis_client.hget(store.key("s1"), "w") == "0"
+
+
+@pytest.mark.asyncio
+async def test_flush_dead_letters_rows_that_fail_alone():
+    writer = SessionEventWriter()
+    written = []
+
+    async def write(rows):
+        if any(row[3] == "bad" for row in rows):
+            raise ValueError("invalid input syntax")
+        written.extend(rows)
+
+    writer._write = write
+    event_ids = [
+        writer.enqueue("s1", None, event_type, {})
+        for event_type in ["ok", "ok", "bad", "ok", "ok", "ok", "bad", "ok"]
+    ]
+
+    assert await writer.flush() == 6
+    assert [row[0] for row in written] == [event_ids[i] for i in (0, 1, 3, 4, 5, 7)]
+    stats = writer.get_stats()
+    assert stats["dead_lettered"] == 2
+    assert stats["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_requeues_on_transient_failure():
+    writer = SessionEventWriter()
+
+    async def write(rows):
+        raise ConnectionResetError("connection lost")
+
+    writer._write = write
+    for _ in range(3):
+        writer.enqueue("s1", None, "ok", {})
+
+    with pytest.raises(ConnectionResetError):
+        await writer.flush()
+    stats = writer.get_stats()
+    assert stats["pending"] == 3
+    assert stats["dead_lettered"] == 0
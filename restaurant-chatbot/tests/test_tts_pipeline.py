@@ -0,0 +1,114 @@
+"""Tests for SentenceTTSPipeline ordering, prefetch bound and stop()."""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+import app.services.tts_pipeline as tts_module
+from app.services.tts_pipeline import SentenceTTSPipeline
+
+
+@pytest.fixture(autouse=True)
+def no_phrase_cache(monkeypatch):
+    monkeypatch.setattr(tts_module, "TTS_CACHE_ENABLED", False)
+
+
+class _FakeSpeech:
+    """Stands in for client.audio.speech.with_streaming_response."""
+
+    def __init__(self, delays=None, block=()):
+        self.delays = delays or {}
+        self.block = set(block)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = []
+        self.cancelled = []
+
+    def create(self, *, input, **kwargs):
+        return _FakeResponse(self, input)
+
+
+class _FakeResponse:
+    def __init__(self, speech, text):
+        self.speech = speech
+        self.text = text
+
+    async def __aenter__(self):
+        self.speech.started.append(self.text)
+        self.speech.in_flight += 1
+        self.speech.max_in_flight = max(self.speech.max_in_flight, self.speech.in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.speech.in_flight -= 1
+
+    async def iter_bytes(self, chunk_size):
+        try:
+            if self.text in self.speech.block:
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.speech.delays.get(self.text, 0))
+            for part in (1, 2):
+                yield f"{self.text}:{part}".encode()
+        except asyncio.CancelledError:
+            self.speech.cancelled.append(self.text)
+            raise
+
+
+class _FakeClient:
+    def __init__(self, speech):
+        self.audio = type("Audio", (), {})()
+        self.audio.speech = type("Speech", (), {})()
+        self.audio.speech.with_streaming_response = speech
+
+
+def _sentences(*texts):
+    queue = asyncio.Queue()
+    for text in texts:
+        queue.put_nowait(text)
+    queue.put_nowait(None)
+    return queue
+
+
+@pytest.mark.asyncio
+async def test_audio_is_played_in_sentence_order():
+    # Later sentences finish first; playback must still follow the text
+    speech = _FakeSpeech(delays={"one": 0.05, "two": 0.01, "three": 0})
+    pipeline = SentenceTTSPipeline(_FakeClient(speech), prefetch=3)
+
+    chunks = [chunk async for chunk in pipeline.stream(_sentences("one", " ", "two", "three"))]
+
+    assert chunks == [b"one:1", b"one:2", b"two:1", b"two:2", b"three:1", b"three:2"]
+    assert pipeline.timings()["sentences"] == 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_bounds_requests_in_flight():
+    speech = _FakeSpeech(delays={text: 0.01 for text in ("a", "b", "c", "d", "e")})
+    pipeline = SentenceTTSPipeline(_FakeClient(speech), prefetch=2)
+
+    chunks = [chunk async for chunk in pipeline.stream(_sentences("a", "b", "c", "d", "e"))]
+
+    assert len(chunks) == 10
+    assert speech.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_requests_in_flight():
+    speech = _FakeSpeech(block={"two", "three"})
+    pipeline = SentenceTTSPipeline(_FakeClient(speech), prefetch=3)
+    received = []
+
+    async with aclosing(pipeline.stream(_sentences("one", "two", "three"))) as chunks:
+        async for chunk in chunks:
+            received.append(chunk)
+            if len(received) == 2:
+                # Let the prefetched requests start before stopping
+                await asyncio.sleep(0.01)
+                pipeline.stop()
+
+    await asyncio.sleep(0)
+    assert received == [b"one:1", b"one:2"]
+    assert pipeline.stopped
+    assert sorted(speech.cancelled) == ["three", "two"]
+    assert speech.in_flight == 0
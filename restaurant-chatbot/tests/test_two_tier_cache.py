@@ -0,0 +1,46 @@
+"""Tests for the process-local tier in front of Redis."""
+
+import time
+
+import pytest
+
+import app.core.two_tier_cache as two_tier_cache
+from app.core.two_tier_cache import TwoTierCache
+
+
+@pytest.fixture
+def cache(redis_client, monkeypatch):
+    monkeypatch.setattr(two_tier_cache, "get_redis_client", lambda: redis_client)
+    return TwoTierCache("test", ttl=300)
+
+
+def _expires_in(cache, key):
+    expires_at, _ = cache.local._entries[key]
+    return expires_at - time.monotonic()
+
+
+@pytest.mark.asyncio
+async def test_backfill_is_capped_at_redis_ttl(cache, redis_client):
+    await redis_client.set("item:1", "v1", ex=5)
+
+    assert await cache.get("item:1") == "v1"
+    assert 0 < _expires_in(cache, "item:1") <= 5
+
+
+@pytest.mark.asyncio
+async def test_backfill_without_redis_ttl_uses_local_ttl(cache, redis_client):
+    await redis_client.set("item:1", "v1")
+
+    assert await cache.get("item:1") == "v1"
+    assert 5 < _expires_in(cache, "item:1") <= 300
+
+
+@pytest.mark.asyncio
+async def test_mget_caps_each_key_at_its_redis_ttl(cache, redis_client):
+    await redis_client.set("item:1", "v1", ex=2)
+    await redis_client.set("item:2", "v2", ex=600)
+
+    assert await cache.mget(["item:1", "item:2", "item:3"]) == ["v1", "v2", None]
+    assert _expires_in(cache, "item:1") <= 2
+    assert 2 < _expires_in(cache, "item:2") <= 300
+    assert "item:3" not in cache.local._entries
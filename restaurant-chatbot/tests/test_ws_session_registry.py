@@ -0,0 +1,80 @@
+"""Tests for session takeovers between workers in the WebSocket session registry."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+import app.core.ws_session_registry as registry_module
+from app.core.ws_session_registry import WebSocketSessionRegistry, state_key
+
+
+class _FakeManager:
+    def __init__(self):
+        self.metadata = {}
+        self.closed = []
+
+    def preserved_state(self, session_id):
+        return dict(self.metadata.get(session_id, {}))
+
+    async def close_local(self, session_id, reason):
+        self.closed.append(session_id)
+        self.metadata.pop(session_id, None)
+
+    def local_session_ids(self):
+        return list(self.metadata)
+
+    def local_counters(self):
+        return {}
+
+
+def _registry(redis_client, worker_id):
+    registry = WebSocketSessionRegistry(redis_client)
+    registry.worker_id = worker_id
+    registry.attach(_FakeManager())
+    return registry
+
+
+@pytest_asyncio.fixture
+async def workers(redis_client):
+    old, new = _registry(redis_client, "worker-old"), _registry(redis_client, "worker-new")
+    listeners = [asyncio.create_task(registry._listen()) for registry in (old, new)]
+    # Let both subscribe before anything is published
+    await asyncio.sleep(0.2)
+    yield old, new
+    for registry, task in zip((old, new), listeners):
+        registry._stopping = True
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_takeover_loads_state_saved_by_the_old_owner(workers, redis_client):
+    old, new = workers
+    await old.claim("s1", {})
+    old._manager.metadata["s1"] = {"authenticated": False}
+    await old.heartbeat()
+
+    # Authenticated after the last heartbeat: only the old owner's memory has it
+    old._manager.metadata["s1"] = {"authenticated": True, "user_id": "u1"}
+
+    assert await new.claim("s1", {}) == "worker-old"
+    assert old._manager.closed == ["s1"]
+    assert await new.load_state("s1") == {"authenticated": True, "user_id": "u1"}
+    assert await new.owner("s1") == "worker-new"
+    assert new.stats["handoff_timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_takeover_does_not_wait_without_a_reachable_owner(redis_client, monkeypatch):
+    monkeypatch.setattr(registry_module, "WS_HANDOFF_TIMEOUT_SECONDS", 5.0)
+    new = _registry(redis_client, "worker-new")
+    await redis_client.hset("ws:session:s1", "worker", "worker-gone")
+    await redis_client.set(state_key("s1"), '{"authenticated": true}')
+
+    assert await asyncio.wait_for(new.claim("s1", {}), timeout=1.0) == "worker-gone"
+    assert await new.load_state("s1") == {"authenticated": True}
+    assert new.stats["handoff_timeouts"] == 0